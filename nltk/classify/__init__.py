@@ -89,7 +89,14 @@ from nltk.classify.naivebayes import NaiveBayesClassifier
 from nltk.classify.positivenaivebayes import PositiveNaiveBayesClassifier
 from nltk.classify.decisiontree import DecisionTreeClassifier
 from nltk.classify.rte_classify import rte_classifier, rte_features, RTEFeatureExtractor
-from nltk.classify.util import accuracy, apply_features, log_likelihood
+from nltk.classify.util import (
+    accuracy,
+    apply_features,
+    log_likelihood,
+    encode_featuresets,
+    FeaturesetEncoder,
+    EncodedFeaturesets,
+)
 from nltk.classify.scikitlearn import SklearnClassifier
 from nltk.classify.maxent import (
     MaxentClassifier,
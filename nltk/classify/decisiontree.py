@@ -12,11 +12,14 @@ on feature values, and leaves correspond to label assignments.
 """
 from __future__ import print_function, unicode_literals, division
 
-from collections import defaultdict
+import math
+from collections import Counter, defaultdict
+from functools import partial
 
 from nltk.probability import FreqDist, MLEProbDist, entropy
 from nltk.classify.api import ClassifierI
 from nltk.compat import python_2_unicode_compatible
+from nltk.util import parallel_map
 
 
 @python_2_unicode_compatible
@@ -65,6 +68,41 @@ class DecisionTreeClassifier(ClassifierI):
         else:
             return self._label
 
+    def classify_many(self, featuresets):
+        featuresets = list(featuresets)
+        labels = [None] * len(featuresets)
+        self._classify_group(featuresets, range(len(featuresets)), labels)
+        return labels
+
+    def _classify_group(self, featuresets, indices, labels):
+        """
+        Classify the featuresets at ``indices``, which have all reached
+        this node, by passing each group that takes the same branch
+        down to the child together.
+        """
+        # Decision leaf:
+        if self._fname is None:
+            for i in indices:
+                labels[i] = self._label
+            return
+
+        # Decision tree:
+        branches = defaultdict(list)
+        others = []
+        for i in indices:
+            fval = featuresets[i].get(self._fname)
+            if fval in self._decisions:
+                branches[fval].append(i)
+            else:
+                others.append(i)
+        for fval, branch in branches.items():
+            self._decisions[fval]._classify_group(featuresets, branch, labels)
+        if self._default is not None:
+            self._default._classify_group(featuresets, others, labels)
+        else:
+            for i in others:
+                labels[i] = self._label
+
     def error(self, labeled_featuresets):
         errors = 0
         for featureset, label in labeled_featuresets:
@@ -137,12 +175,41 @@ class DecisionTreeClassifier(ClassifierI):
         binary=False,
         feature_values=None,
         verbose=False,
+        criterion='error',
+        processes=1,
     ):
         """
+        Build a decision tree top-down.  At each node, the feature (or,
+        if ``binary`` is true, the feature/value pair) whose stump best
+        splits the node's training examples is chosen, and each branch
+        whose examples have a label entropy above ``entropy_cutoff`` is
+        refined in turn.
+
+        Candidate splits are scored from a table of (feature, value,
+        label) counts that is built with a single pass over the node's
+        examples, rather than by classifying every example with every
+        candidate stump.
+
+        :param entropy_cutoff: Branches whose label entropy is at most
+            this value are not refined.
+        :param depth_cutoff: The maximum depth of the tree.
+        :param support_cutoff: Nodes with at most this many training
+            examples are not refined.
         :param binary: If true, then treat all feature/value pairs as
             individual binary features, rather than using a single n-way
             branch for each feature.
+        :param criterion: How to score a split: ``'error'`` (the number
+            of training examples the stump misclassifies), ``'entropy'``
+            (the weighted label entropy of its branches) or ``'gini'``
+            (the weighted Gini impurity of its branches).  A node is only
+            split if the split scores better than the leaf.
+        :param processes: If more than 1 (or None, for one per CPU), the
+            candidate features of nodes with many training examples are
+            scored in that many worker processes.
         """
+        if criterion not in _CRITERIA:
+            raise ValueError('Unknown split criterion: {!r}'.format(criterion))
+
         # Collect a list of all feature names.
         feature_names = set()
         for featureset, label in labeled_featuresets:
@@ -159,11 +226,16 @@ class DecisionTreeClassifier(ClassifierI):
         # Start with a stump.
         if not binary:
             tree = DecisionTreeClassifier.best_stump(
-                feature_names, labeled_featuresets, verbose
+                feature_names, labeled_featuresets, verbose, criterion, processes
             )
         else:
             tree = DecisionTreeClassifier.best_binary_stump(
-                feature_names, labeled_featuresets, feature_values, verbose
+                feature_names,
+                labeled_featuresets,
+                feature_values,
+                verbose,
+                criterion,
+                processes,
             )
 
         # Refine the stump.
@@ -175,6 +247,8 @@ class DecisionTreeClassifier(ClassifierI):
             binary,
             feature_values,
             verbose,
+            criterion,
+            processes,
         )
 
         # Return it
@@ -209,6 +283,8 @@ class DecisionTreeClassifier(ClassifierI):
         binary=False,
         feature_values=None,
         verbose=False,
+        criterion='error',
+        processes=1,
     ):
         if len(labeled_featuresets) <= support_cutoff:
             return
@@ -216,13 +292,19 @@ class DecisionTreeClassifier(ClassifierI):
             return
         if depth_cutoff <= 0:
             return
-        for fval in self._decisions:
-            fval_featuresets = [
-                (featureset, label)
-                for (featureset, label) in labeled_featuresets
-                if featureset.get(self._fname) == fval
-            ]
 
+        # Split the training examples between the branches.
+        branches = dict((fval, []) for fval in self._decisions)
+        default_featuresets = []
+        for featureset, label in labeled_featuresets:
+            fval = featureset.get(self._fname)
+            if fval in branches:
+                branches[fval].append((featureset, label))
+            else:
+                default_featuresets.append((featureset, label))
+
+        for fval in self._decisions:
+            fval_featuresets = branches[fval]
             label_freqs = FreqDist(label for (featureset, label) in fval_featuresets)
             if entropy(MLEProbDist(label_freqs)) > entropy_cutoff:
                 self._decisions[fval] = DecisionTreeClassifier.train(
@@ -233,13 +315,10 @@ class DecisionTreeClassifier(ClassifierI):
                     binary,
                     feature_values,
                     verbose,
+                    criterion,
+                    processes,
                 )
         if self._default is not None:
-            default_featuresets = [
-                (featureset, label)
-                for (featureset, label) in labeled_featuresets
-                if featureset.get(self._fname) not in self._decisions
-            ]
             label_freqs = FreqDist(label for (featureset, label) in default_featuresets)
             if entropy(MLEProbDist(label_freqs)) > entropy_cutoff:
                 self._default = DecisionTreeClassifier.train(
@@ -250,23 +329,27 @@ class DecisionTreeClassifier(ClassifierI):
                     binary,
                     feature_values,
                     verbose,
+                    criterion,
+                    processes,
                 )
 
     @staticmethod
-    def best_stump(feature_names, labeled_featuresets, verbose=False):
-        best_stump = DecisionTreeClassifier.leaf(labeled_featuresets)
-        best_error = best_stump.error(labeled_featuresets)
-        for fname in feature_names:
-            stump = DecisionTreeClassifier.stump(fname, labeled_featuresets)
-            stump_error = stump.error(labeled_featuresets)
-            if stump_error < best_error:
-                best_error = stump_error
-                best_stump = stump
+    def best_stump(
+        feature_names, labeled_featuresets, verbose=False, criterion='error', processes=1
+    ):
+        split = _best_split(
+            labeled_featuresets, list(feature_names), None, criterion, processes
+        )
+        if split is None:
+            best_stump = DecisionTreeClassifier.leaf(labeled_featuresets)
+        else:
+            best_stump = DecisionTreeClassifier.stump(split[0], labeled_featuresets)
         if verbose:
+            best_error = best_stump.error(labeled_featuresets)
             print(
                 (
                     'best stump for {:6d} toks uses {:20} err={:6.4f}'.format(
-                        len(labeled_featuresets), best_stump._fname, best_error
+                        len(labeled_featuresets), str(best_stump._fname), best_error
                     )
                 )
             )
@@ -297,20 +380,24 @@ class DecisionTreeClassifier(ClassifierI):
 
     @staticmethod
     def best_binary_stump(
-        feature_names, labeled_featuresets, feature_values, verbose=False
+        feature_names,
+        labeled_featuresets,
+        feature_values,
+        verbose=False,
+        criterion='error',
+        processes=1,
     ):
-        best_stump = DecisionTreeClassifier.leaf(labeled_featuresets)
-        best_error = best_stump.error(labeled_featuresets)
-        for fname in feature_names:
-            for fval in feature_values[fname]:
-                stump = DecisionTreeClassifier.binary_stump(
-                    fname, fval, labeled_featuresets
-                )
-                stump_error = stump.error(labeled_featuresets)
-                if stump_error < best_error:
-                    best_error = stump_error
-                    best_stump = stump
+        split = _best_split(
+            labeled_featuresets, list(feature_names), feature_values, criterion, processes
+        )
+        if split is None:
+            best_stump = DecisionTreeClassifier.leaf(labeled_featuresets)
+        else:
+            best_stump = DecisionTreeClassifier.binary_stump(
+                split[0], split[1], labeled_featuresets
+            )
         if verbose:
+            best_error = best_stump.error(labeled_featuresets)
             if best_stump._decisions:
                 descr = '{0}={1}'.format(
                     best_stump._fname, list(best_stump._decisions.keys())[0]
@@ -327,6 +414,131 @@ class DecisionTreeClassifier(ClassifierI):
         return best_stump
 
 
+##//////////////////////////////////////////////////////
+##  Split Scoring
+##//////////////////////////////////////////////////////
+
+#: Nodes with fewer training examples than this are scored in the
+#: main process even if ``processes`` is more than 1.
+_PARALLEL_MIN_SIZE = 5000
+
+
+def _error(counts):
+    return sum(counts) - max(counts)
+
+
+def _entropy(counts):
+    n = sum(counts)
+    return n * math.log(n) - sum(c * math.log(c) for c in counts if c)
+
+
+def _gini(counts):
+    n = sum(counts)
+    return n - sum(c * c for c in counts) / n
+
+
+#: Impurity functions, which map the label counts of a (non-empty) node
+#: to a score that is additive over the branches of a split.
+_CRITERIA = {'error': _error, 'entropy': _entropy, 'gini': _gini}
+
+
+def _best_split(labeled_featuresets, feature_names, feature_values, criterion, processes):
+    """
+    Return the ``(fname, fval)`` stump (``fval`` is None unless
+    ``feature_values`` is given, for binary stumps) whose branches have
+    the lowest total impurity, or None if no stump scores better than
+    a leaf.  Ties go to the first stump in ``feature_names`` order (and
+    ``feature_values`` order), as they did when each stump was built
+    and scored in turn.
+    """
+    impurity = _CRITERIA[criterion]
+    label_counts = Counter(label for (featureset, label) in labeled_featuresets)
+    best_score = impurity(list(label_counts.values())) if label_counts else 0
+    best_split = None
+
+    if (processes is not None and processes <= 1) or len(
+        labeled_featuresets
+    ) < _PARALLEL_MIN_SIZE:
+        chunks = [feature_names]
+        processes = 1
+    else:
+        import multiprocessing
+
+        workers = processes or multiprocessing.cpu_count()
+        size = -(-len(feature_names) // workers)
+        chunks = [
+            feature_names[i : i + size] for i in range(0, len(feature_names), size)
+        ]
+    if feature_values is not None:
+        chunks = [
+            (chunk, dict((fname, feature_values[fname]) for fname in chunk))
+            for chunk in chunks
+        ]
+    else:
+        chunks = [(chunk, None) for chunk in chunks]
+
+    score_splits = partial(_score_splits, labeled_featuresets, label_counts, criterion)
+    for result in parallel_map(score_splits, chunks, processes, 1):
+        if result is not None and result[0] < best_score:
+            best_score, best_split = result[0], result[1:]
+    return best_split
+
+
+def _score_splits(labeled_featuresets, label_counts, criterion, chunk):
+    """
+    Score every stump on the feature names (and values) in ``chunk``
+    from a table of (feature, value, label) counts, and return
+    ``(score, fname, fval)`` for the best one, or None if there are no
+    candidates.
+    """
+    feature_names, feature_values = chunk
+    impurity = _CRITERIA[criterion]
+    labels = list(label_counts)
+    totals = [label_counts[label] for label in labels]
+
+    # Count each (fname, fval, label) triple.
+    wanted = set(feature_names)
+    triples = Counter(
+        (fname, fval, label)
+        for (featureset, label) in labeled_featuresets
+        for (fname, fval) in featureset.items()
+        if fname in wanted
+    )
+    table = defaultdict(lambda: defaultdict(Counter))
+    for (fname, fval, label), count in triples.items():
+        table[fname][fval][label] = count
+
+    best = None
+    for fname in feature_names:
+        # The label counts of each branch; examples without the
+        # feature take the None branch.
+        branches = {}
+        missing = list(totals)
+        for fval, counts in table[fname].items():
+            if fval is not None:
+                branches[fval] = [counts[label] for label in labels]
+                missing = [m - c for (m, c) in zip(missing, branches[fval])]
+        if any(missing):
+            branches[None] = missing
+
+        if feature_values is None:
+            score = sum(impurity(counts) for counts in branches.values())
+            if best is None or score < best[0]:
+                best = (score, fname, None)
+            continue
+
+        for fval in feature_values[fname]:
+            pos = branches.get(fval)
+            if pos is None:
+                score = impurity(totals)
+            else:
+                neg = [t - c for (t, c) in zip(totals, pos)]
+                score = impurity(pos) + (impurity(neg) if any(neg) else 0)
+            if best is None or score < best[0]:
+                best = (score, fname, fval)
+    return best
+
+
 ##//////////////////////////////////////////////////////
 ##  Demo
 ##//////////////////////////////////////////////////////
@@ -58,8 +58,10 @@ try:
 except ImportError:
     pass
 
+import math
 import tempfile
 import os
+from array import array
 from collections import defaultdict
 
 from six import integer_types
@@ -67,10 +69,15 @@ from six import integer_types
 from nltk import compat
 from nltk.data import gzip_open_unicode
 from nltk.util import OrderedDict
-from nltk.probability import DictionaryProbDist
+from nltk.probability import DictionaryProbDist, sum_logs
 
 from nltk.classify.api import ClassifierI
-from nltk.classify.util import CutoffChecker, accuracy, log_likelihood
+from nltk.classify.util import (
+    CutoffChecker,
+    EncodedFeaturesets,
+    accuracy,
+    log_likelihood,
+)
 from nltk.classify.megam import call_megam, write_megam_file, parse_megam_weights
 from nltk.classify.tadm import call_tadm, write_tadm_file, parse_tadm_weights
 
@@ -166,6 +173,28 @@ class MaxentClassifier(ClassifierI):
         # Normalize the dictionary to give a probability distribution
         return DictionaryProbDist(prob_dict, log=self._logarithmic, normalize=True)
 
+    def classify_many(self, featuresets):
+        return [pdist.max() for pdist in self.prob_classify_many(featuresets)]
+
+    def prob_classify_many(self, featuresets):
+        if not self._logarithmic or 'numpy' not in globals():
+            return [self.prob_classify(fs) for fs in featuresets]
+
+        # Encode the whole batch, and take the dot products of its
+        # joint-feature vectors with the weights at once.
+        labels = self._encoding.labels()
+        rows, fids, fvals, num_rows = _encode_featuresets(
+            featuresets, self._encoding, labels
+        )
+        weights = numpy.asarray(self._weights, 'd')
+        totals = numpy.bincount(rows, weights[fids] * fvals, num_rows).tolist()
+        return [
+            DictionaryProbDist(
+                dict(zip(labels, totals[i : i + len(labels)])), log=True, normalize=True
+            )
+            for i in range(0, num_rows, len(labels))
+        ]
+
     def explain(self, featureset, columns=4):
         """
         Print a table showing the effect of each of the features in
@@ -248,7 +277,7 @@ class MaxentClassifier(ClassifierI):
 
     #: A list of the algorithm names that are accepted for the
     #: ``train()`` method's ``algorithm`` parameter.
-    ALGORITHMS = ['GIS', 'IIS', 'MEGAM', 'TADM']
+    ALGORITHMS = ['GIS', 'IIS', 'LBFGS', 'MEGAM', 'TADM']
 
     @classmethod
     def train(
@@ -274,6 +303,9 @@ class MaxentClassifier(ClassifierI):
         :param train_toks: Training data, represented as a list of
             pairs, the first member of which is a featureset,
             and the second of which is a classification label.
+            The GIS, IIS and LBFGS trainers encode it fastest if it is
+            an ``EncodedFeaturesets`` with an exact vocabulary (see
+            ``nltk.classify.util.encode_featuresets()``).
 
         :type algorithm: str
         :param algorithm: A case-insensitive string, specifying which
@@ -282,6 +314,7 @@ class MaxentClassifier(ClassifierI):
 
             - Iterative Scaling Methods: Generalized Iterative Scaling (``'GIS'``),
               Improved Iterative Scaling (``'IIS'``)
+            - Limited-memory BFGS (``'LBFGS'``), implemented with numpy
             - External Libraries (requiring megam):
               LM-BFGS algorithm, with training performed by Megam (``'megam'``)
 
@@ -301,7 +334,8 @@ class MaxentClassifier(ClassifierI):
             used instead.
         :param gaussian_prior_sigma: The sigma value for a gaussian
             prior on model weights.  Currently, this is supported by
-            ``megam``. For other algorithms, its value is ignored.
+            ``megam`` and ``lbfgs``. For other algorithms, its value is
+            ignored.
         :param cutoffs: Arguments specifying various conditions under
             which the training should be halted.  (Some of the cutoff
             conditions are not supported by some algorithms.)
@@ -336,6 +370,10 @@ class MaxentClassifier(ClassifierI):
             return train_maxent_classifier_with_gis(
                 train_toks, trace, encoding, labels, **cutoffs
             )
+        elif algorithm == 'lbfgs':
+            return train_maxent_classifier_with_lbfgs(
+                train_toks, trace, encoding, labels, gaussian_prior_sigma, **cutoffs
+            )
         elif algorithm == 'megam':
             return train_maxent_classifier_with_megam(
                 train_toks, trace, encoding, labels, gaussian_prior_sigma, **cutoffs
@@ -660,6 +698,12 @@ class BinaryMaxentFeatureEncoding(MaxentFeatureEncodingI):
         :param options: Extra parameters for the constructor, such as
             ``unseen_features`` and ``alwayson_features``.
         """
+        if isinstance(train_toks, EncodedFeaturesets) and _is_categorical(
+            train_toks
+        ):
+            labels, mapping = _train_mapping(train_toks, count_cutoff, labels)
+            return cls(labels, mapping, **options)
+
         mapping = {}  # maps (fname, fval, label) -> fid
         seen_labels = set()  # The set of labels we've encountered
         count = defaultdict(int)  # maps (fname, fval) -> count
@@ -1032,6 +1076,331 @@ class TypedMaxentFeatureEncoding(MaxentFeatureEncodingI):
         return cls(labels, mapping, **options)
 
 
+######################################################################
+# { Encoded Training Data
+######################################################################
+
+
+class _EncodedTrainingSet(object):
+    """
+    The joint-feature vectors of a training corpus, for every token and
+    every label, stored as a sparse (token x label) x feature matrix
+    in coordinate form, so that the trainers call ``encoding.encode()``
+    only once per token and label rather than on every iteration.
+
+    Given the current weights (``set_weights()``), it computes the
+    model's label distributions for all the training tokens at once,
+    with the same arithmetic as ``MaxentClassifier.prob_classify()``,
+    and the feature expectations under them.  It also implements
+    ``prob_classify_many()`` and ``classify_many()`` for the training
+    featuresets, so it can stand in for the classifier being trained
+    in ``log_likelihood()``, ``accuracy()`` and ``CutoffChecker``.
+    """
+
+    def __init__(self, train_toks, encoding):
+        self._encoding = encoding
+        self._labels = list(encoding.labels())
+        label_index = dict((label, j) for j, label in enumerate(self._labels))
+
+        if isinstance(train_toks, EncodedFeaturesets):
+            featuresets, gold = train_toks, train_toks.row_labels()
+        else:
+            featuresets = (tok for tok, label in train_toks)
+            gold = (label for tok, label in train_toks)
+        self._rows, self._fids, self._fvals, num_rows = _encode_featuresets(
+            featuresets, encoding, self._labels
+        )
+        self._num_toks = len(train_toks)
+        self._gold = numpy.array(
+            [label_index.get(label, -1) for label in gold], dtype=int
+        )
+        if (self._gold < 0).any():
+            # Tokens whose label is not one of the encoding's labels.
+            self._train_toks = train_toks
+        self._logprobs = None
+
+    def labels(self):
+        return self._labels
+
+    def _reshape(self, values):
+        return values.reshape(self._num_toks, len(self._labels))
+
+    def scores(self, weights):
+        """
+        The dot product of ``weights`` with each joint-feature vector,
+        as a (tokens x labels) array.
+        """
+        return self._reshape(
+            numpy.bincount(
+                self._rows,
+                weights[self._fids] * self._fvals,
+                self._num_toks * len(self._labels),
+            )
+        )
+
+    def set_weights(self, weights):
+        """
+        Compute the label distributions for the given weights, as
+        base-2 log probabilities normalized like ``DictionaryProbDist``.
+        """
+        scores = self.scores(weights)
+        with numpy.errstate(invalid='ignore', over='ignore'):
+            value_sum = scores[:, 0]
+            for j in range(1, len(self._labels)):
+                value_sum = _add_logs(value_sum, scores[:, j])
+            logprobs = scores - value_sum[:, numpy.newaxis]
+        uniform = value_sum <= _NINF
+        logprobs[uniform] = math.log(1.0 / len(self._labels), 2)
+        self._logprobs = logprobs
+        self._pdists = None
+
+    def probs(self):
+        """
+        The probability of each label for each token, as a
+        (tokens x labels) array.
+        """
+        return 2 ** self._logprobs
+
+    def gold_logprob_sum(self):
+        """
+        The sum of the base-2 log probabilities of the training tokens'
+        labels.
+        """
+        gold = self._gold >= 0
+        return self._logprobs[gold, self._gold[gold]].sum()
+
+    def prob_classify_many(self, featuresets):
+        # The featuresets are the training featuresets.
+        if self._pdists is None:
+            labels = self._labels
+            self._pdists = [
+                DictionaryProbDist(dict(zip(labels, logprobs)), log=True)
+                for logprobs in self._logprobs.tolist()
+            ]
+        return self._pdists
+
+    def classify_many(self, featuresets):
+        return [pdist.max() for pdist in self.prob_classify_many(featuresets)]
+
+    def empirical_fcount(self):
+        """
+        Count how many times each feature occurs in the training data,
+        as ``calculate_empirical_fcount()``.
+        """
+        if hasattr(self, '_train_toks'):
+            return calculate_empirical_fcount(self._train_toks, self._encoding)
+        num_labels = len(self._labels)
+        gold_rows = self._rows % num_labels == self._gold[self._rows // num_labels]
+        return numpy.bincount(
+            self._fids[gold_rows],
+            self._fvals[gold_rows],
+            self._encoding.length(),
+        )
+
+    def estimated_fcount(self):
+        """
+        Estimate how many times each feature occurs in the training
+        data under the current weights, as
+        ``calculate_estimated_fcount()``.
+        """
+        return numpy.bincount(
+            self._fids,
+            self.probs().ravel()[self._rows] * self._fvals,
+            self._encoding.length(),
+        )
+
+    def _nfs(self):
+        # The sum of the feature values of each joint-feature vector.
+        return numpy.bincount(
+            self._rows, self._fvals, self._num_toks * len(self._labels)
+        )
+
+    def nfmap(self):
+        """
+        A map that can be used to compress ``nf``, as
+        ``calculate_nfmap()``.
+        """
+        return dict((nf, i) for (i, nf) in enumerate(set(self._nfs().tolist())))
+
+    def deltas(self, unattested, ffreq_empirical, nfmap, nfarray, nftranspose):
+        """
+        Calculate the IIS weight updates under the current weights, as
+        ``calculate_deltas()``.
+        """
+        length = self._encoding.length()
+        nf_ids = numpy.array(
+            [nfmap[nf] for nf in self._nfs().tolist()], dtype=int
+        )
+        A = numpy.bincount(
+            nf_ids[self._rows] * length + self._fids,
+            self.probs().ravel()[self._rows] * self._fvals,
+            len(nfmap) * length,
+        ).reshape(len(nfmap), length)
+        A /= self._num_toks
+        return _newton_deltas(A, unattested, ffreq_empirical, nfarray, nftranspose)
+
+
+def _encode_featuresets(featuresets, encoding, labels):
+    """
+    Encode every featureset with every label, returning the joint-feature
+    vectors as a sparse matrix in coordinate form -- arrays of row
+    numbers, feature ids and feature values -- and its number of rows.
+    The row of featureset ``i`` and label ``j`` is ``i * len(labels) + j``.
+    """
+    if isinstance(featuresets, EncodedFeaturesets):
+        if type(encoding) in (BinaryMaxentFeatureEncoding, GISEncoding) and (
+            _is_categorical(featuresets)
+        ):
+            return _encode_matrix(featuresets, encoding, labels)
+        featuresets = featuresets.featuresets()
+    sizes, fids, fvals = array('l'), array('l'), array('d')
+    for featureset in featuresets:
+        for label in labels:
+            encoded = tuple(zip(*encoding.encode(featureset, label)))
+            if encoded:
+                fids.extend(encoded[0])
+                fvals.extend(encoded[1])
+                sizes.append(len(encoded[0]))
+            else:
+                sizes.append(0)
+    num_rows = len(sizes)
+    return (
+        numpy.repeat(numpy.arange(num_rows), numpy.frombuffer(sizes, dtype='l')),
+        numpy.frombuffer(fids, dtype='l'),
+        numpy.frombuffer(fvals, dtype='d'),
+        num_rows,
+    )
+
+
+def _is_categorical(encoded):
+    """
+    True if the columns of ``encoded`` are ``(fname, fval)`` pairs.
+    """
+    return not (encoded.encoder.hashing or encoded.encoder.numeric)
+
+
+def _train_mapping(encoded, count_cutoff, labels):
+    """
+    Build the labels and the ``(fname, fval, label) -> fid`` mapping
+    that ``BinaryMaxentFeatureEncoding.train()`` builds from the
+    featuresets of ``encoded``, in the same order, from the matrix.
+    """
+    encoder = encoded.encoder
+    all_labels = encoded.labels()
+    seen_labels = set()
+    for label in all_labels:
+        if labels and label not in labels:
+            raise ValueError('Unexpected label %s' % label)
+        seen_labels.add(label)
+
+    # How many times each entry's column has occurred, up to and
+    # including the entry.
+    cols = encoded.indices
+    order = numpy.argsort(cols, kind='mergesort')
+    sorted_cols = cols[order]
+    starts = numpy.flatnonzero(numpy.r_[True, sorted_cols[1:] != sorted_cols[:-1]])
+    sizes = numpy.diff(numpy.r_[starts, len(cols)])
+    running = numpy.empty(len(cols), dtype='l')
+    running[order] = numpy.arange(len(cols)) - numpy.repeat(starts, sizes) + 1
+
+    # Joint features are numbered in order of the first entry that
+    # attests them once the cutoff has been reached.
+    num_labels = max(len(all_labels), 1)
+    label_ids = numpy.repeat(encoded.label_ids, numpy.diff(encoded.indptr))
+    keys = (cols * num_labels + label_ids)[running >= count_cutoff]
+    keys, first = numpy.unique(keys, return_index=True)
+    mapping = {}
+    for key in keys[numpy.argsort(first, kind='mergesort')].tolist():
+        col, label_id = divmod(key, num_labels)
+        fname, fval = encoder.feature(col)
+        mapping[fname, fval, all_labels[label_id]] = len(mapping)
+
+    if labels is None:
+        labels = seen_labels
+    return labels, mapping
+
+
+def _encode_matrix(encoded, encoding, labels):
+    """
+    ``_encode_featuresets()`` for an ``EncodedFeaturesets`` whose
+    columns are ``(fname, fval)`` pairs, and a ``GISEncoding`` or
+    ``BinaryMaxentFeatureEncoding``.  The joint features that each
+    column fires with each label are looked up once per column, and
+    the entries of each joint-feature vector are in the same order as
+    ``encoding.encode()`` would give them.
+    """
+    encoder = encoded.encoder
+    mapping, unseen = encoding._mapping, encoding._unseen
+
+    # The joint feature fired by each column with each label, or -1.
+    table = numpy.empty((len(encoder), len(labels)), dtype='l')
+    for col in range(len(encoder)):
+        fname, fval = encoder.feature(col)
+        fids = [mapping.get((fname, fval, label), -1) for label in labels]
+        if unseen and fname in unseen:
+            if not any((fname, fval, label) in mapping for label in encoding._labels):
+                fids = [unseen[fname] if fid < 0 else fid for fid in fids]
+        table[col] = fids
+
+    # The entries of each (token, label) row: input features in
+    # featureset order, then the always-on feature, then GIS's
+    # correction feature.  ``ranks`` orders the entries within a row.
+    num_toks, num_labels = len(encoded), len(labels)
+    num_entries = len(encoded.indices)
+    toks = numpy.repeat(numpy.arange(num_toks), numpy.diff(encoded.indptr))
+    entries = numpy.arange(num_entries)
+    totals = numpy.zeros((num_toks, num_labels), dtype='l')
+    rows, fids, fvals, ranks = [], [], [], []
+    for j in range(num_labels):
+        label_fids = table[encoded.indices, j]
+        fired = label_fids >= 0
+        rows.append(toks[fired] * num_labels + j)
+        fids.append(label_fids[fired])
+        fvals.append(numpy.ones(fired.sum()))
+        ranks.append(entries[fired])
+        totals[:, j] = numpy.bincount(toks[fired], minlength=num_toks)
+
+    if encoding._alwayson:
+        for j, label in enumerate(labels):
+            if label in encoding._alwayson:
+                rows.append(numpy.arange(num_toks) * num_labels + j)
+                fids.append(numpy.repeat(encoding._alwayson[label], num_toks))
+                fvals.append(numpy.ones(num_toks))
+                ranks.append(numpy.repeat(num_entries, num_toks))
+                totals[:, j] += 1
+
+    if isinstance(encoding, GISEncoding):
+        if (totals >= encoding.C).any():
+            raise ValueError('Correction feature is not high enough!')
+        num_rows = num_toks * num_labels
+        rows.append(numpy.arange(num_rows))
+        base_length = BinaryMaxentFeatureEncoding.length(encoding)
+        fids.append(numpy.repeat(base_length, num_rows))
+        fvals.append((encoding.C - totals).ravel().astype('d'))
+        ranks.append(numpy.repeat(num_entries + 1, num_rows))
+
+    rows, fids, fvals = [numpy.concatenate(a) for a in (rows, fids, fvals)]
+    order = numpy.lexsort((numpy.concatenate(ranks), rows))
+    return rows[order], fids[order], fvals[order], num_toks * num_labels
+
+
+# The log probability of an impossible label, as DictionaryProbDist
+# gives it; and the difference between two base-2 logs beyond which
+# add_logs() ignores the smaller one.
+_NINF = sum_logs([])
+_ADD_LOGS_MAX_DIFF = math.log(1e-30, 2)
+
+
+def _add_logs(logx, logy):
+    """
+    ``nltk.probability.add_logs()``, elementwise over two arrays.
+    """
+    base = numpy.minimum(logx, logy)
+    result = base + numpy.log(2 ** (logx - base) + 2 ** (logy - base)) / math.log(2)
+    result = numpy.where(logy < logx + _ADD_LOGS_MAX_DIFF, logx, result)
+    return numpy.where(logx < logy + _ADD_LOGS_MAX_DIFF, logy, result)
+
+
 ######################################################################
 # { Classifier Trainer: Generalized Iterative Scaling
 ######################################################################
@@ -1067,8 +1436,11 @@ def train_maxent_classifier_with_gis(
     # faster learning.
     Cinv = 1.0 / encoding.C
 
+    # Encode the training data once.
+    encoded_toks = _EncodedTrainingSet(train_toks, encoding)
+
     # Count how many times each feature occurs in the training data.
-    empirical_fcount = calculate_empirical_fcount(train_toks, encoding)
+    empirical_fcount = encoded_toks.empirical_fcount()
 
     # Check for any features that are not attested in train_toks.
     unattested = set(numpy.nonzero(empirical_fcount == 0)[0])
@@ -1079,6 +1451,7 @@ def train_maxent_classifier_with_gis(
     for fid in unattested:
         weights[fid] = numpy.NINF
     classifier = ConditionalExponentialClassifier(encoding, weights)
+    encoded_toks.set_weights(weights)
 
     # Take the log of the empirical fcount.
     log_empirical_fcount = numpy.log2(empirical_fcount)
@@ -1095,16 +1468,14 @@ def train_maxent_classifier_with_gis(
     try:
         while True:
             if trace > 2:
-                ll = cutoffchecker.ll or log_likelihood(classifier, train_toks)
-                acc = cutoffchecker.acc or accuracy(classifier, train_toks)
+                ll = cutoffchecker.ll or log_likelihood(encoded_toks, train_toks)
+                acc = cutoffchecker.acc or accuracy(encoded_toks, train_toks)
                 iternum = cutoffchecker.iter
                 print('     %9d    %14.5f    %9.3f' % (iternum, ll, acc))
 
             # Use the model to estimate the number of times each
             # feature should occur in the training data.
-            estimated_fcount = calculate_estimated_fcount(
-                classifier, train_toks, encoding
-            )
+            estimated_fcount = encoded_toks.estimated_fcount()
 
             # Take the log of estimated fcount (avoid taking log(0).)
             for fid in unattested:
@@ -1116,9 +1487,10 @@ def train_maxent_classifier_with_gis(
             weights = classifier.weights()
             weights += (log_empirical_fcount - log_estimated_fcount) * Cinv
             classifier.set_weights(weights)
+            encoded_toks.set_weights(weights)
 
             # Check the log-likelihood & accuracy cutoffs.
-            if cutoffchecker.check(classifier, train_toks):
+            if cutoffchecker.check(encoded_toks, train_toks):
                 break
 
     except KeyboardInterrupt:
@@ -1127,8 +1499,8 @@ def train_maxent_classifier_with_gis(
         raise
 
     if trace > 2:
-        ll = log_likelihood(classifier, train_toks)
-        acc = accuracy(classifier, train_toks)
+        ll = log_likelihood(encoded_toks, train_toks)
+        acc = accuracy(encoded_toks, train_toks)
         print('         Final    %14.5f    %9.3f' % (ll, acc))
 
     # Return the classifier.
@@ -1182,15 +1554,18 @@ def train_maxent_classifier_with_iis(
     if encoding is None:
         encoding = BinaryMaxentFeatureEncoding.train(train_toks, labels=labels)
 
+    # Encode the training data once.
+    encoded_toks = _EncodedTrainingSet(train_toks, encoding)
+
     # Count how many times each feature occurs in the training data.
-    empirical_ffreq = calculate_empirical_fcount(train_toks, encoding) / len(train_toks)
+    empirical_ffreq = encoded_toks.empirical_fcount() / len(train_toks)
 
     # Find the nf map, and related variables nfarray and nfident.
     # nf is the sum of the features for a given labeled text.
     # nfmap compresses this sparse set of values to a dense list.
     # nfarray performs the reverse operation.  nfident is
     # nfarray multiplied by an identity matrix.
-    nfmap = calculate_nfmap(train_toks, encoding)
+    nfmap = encoded_toks.nfmap()
     nfarray = numpy.array(sorted(nfmap, key=nfmap.__getitem__), 'd')
     nftranspose = numpy.reshape(nfarray, (len(nfarray), 1))
 
@@ -1203,6 +1578,7 @@ def train_maxent_classifier_with_iis(
     for fid in unattested:
         weights[fid] = numpy.NINF
     classifier = ConditionalExponentialClassifier(encoding, weights)
+    encoded_toks.set_weights(weights)
 
     if trace > 0:
         print('  ==> Training (%d iterations)' % cutoffs['max_iter'])
@@ -1215,30 +1591,24 @@ def train_maxent_classifier_with_iis(
     try:
         while True:
             if trace > 2:
-                ll = cutoffchecker.ll or log_likelihood(classifier, train_toks)
-                acc = cutoffchecker.acc or accuracy(classifier, train_toks)
+                ll = cutoffchecker.ll or log_likelihood(encoded_toks, train_toks)
+                acc = cutoffchecker.acc or accuracy(encoded_toks, train_toks)
                 iternum = cutoffchecker.iter
                 print('     %9d    %14.5f    %9.3f' % (iternum, ll, acc))
 
             # Calculate the deltas for this iteration, using Newton's method.
-            deltas = calculate_deltas(
-                train_toks,
-                classifier,
-                unattested,
-                empirical_ffreq,
-                nfmap,
-                nfarray,
-                nftranspose,
-                encoding,
+            deltas = encoded_toks.deltas(
+                unattested, empirical_ffreq, nfmap, nfarray, nftranspose
             )
 
             # Use the deltas to update our weights.
             weights = classifier.weights()
             weights += deltas
             classifier.set_weights(weights)
+            encoded_toks.set_weights(weights)
 
             # Check the log-likelihood & accuracy cutoffs.
-            if cutoffchecker.check(classifier, train_toks):
+            if cutoffchecker.check(encoded_toks, train_toks):
                 break
 
     except KeyboardInterrupt:
@@ -1247,8 +1617,8 @@ def train_maxent_classifier_with_iis(
         raise
 
     if trace > 2:
-        ll = log_likelihood(classifier, train_toks)
-        acc = accuracy(classifier, train_toks)
+        ll = log_likelihood(encoded_toks, train_toks)
+        acc = accuracy(encoded_toks, train_toks)
         print('         Final    %14.5f    %9.3f' % (ll, acc))
 
     # Return the classifier.
@@ -1353,14 +1723,6 @@ def calculate_deltas(
     :param nftranspose: The transpose of ``nfarray``
     :type nftranspose: array(float)
     """
-    # These parameters control when we decide that we've
-    # converged.  It probably should be possible to set these
-    # manually, via keyword arguments to train.
-    NEWTON_CONVERGE = 1e-12
-    MAX_NEWTON = 300
-
-    deltas = numpy.ones(encoding.length(), 'd')
-
     # Precompute the A matrix:
     # A[nf][id] = sum ( p(fs) * p(label|fs) * f(fs,label) )
     # over all label,fs s.t. num_features[label,fs]=nf
@@ -1379,6 +1741,22 @@ def calculate_deltas(
                 A[nfmap[nf], id] += dist.prob(label) * val
     A /= len(train_toks)
 
+    return _newton_deltas(A, unattested, ffreq_empirical, nfarray, nftranspose)
+
+
+def _newton_deltas(A, unattested, ffreq_empirical, nfarray, nftranspose):
+    """
+    Solve for the IIS deltas with Newton's method, given the ``A``
+    matrix computed by ``calculate_deltas()``.
+    """
+    # These parameters control when we decide that we've
+    # converged.  It probably should be possible to set these
+    # manually, via keyword arguments to train.
+    NEWTON_CONVERGE = 1e-12
+    MAX_NEWTON = 300
+
+    deltas = numpy.ones(A.shape[1], 'd')
+
     # Iteratively solve for delta.  Use the following variables:
     #   - nf_delta[x][y] = nfarray[x] * delta[y]
     #   - exp_nf_delta[x][y] = exp(nf[x] * delta[y])
@@ -1409,6 +1787,175 @@ def calculate_deltas(
     return deltas
 
 
+######################################################################
+# { Classifier Trainer: L-BFGS
+######################################################################
+
+
+def train_maxent_classifier_with_lbfgs(
+    train_toks, trace=3, encoding=None, labels=None, gaussian_prior_sigma=0, **cutoffs
+):
+    """
+    Train a new ``ConditionalExponentialClassifier``, using the given
+    training samples, by directly maximizing the conditional log
+    likelihood of the training data (minus a gaussian prior on the
+    weights, if ``gaussian_prior_sigma`` is nonzero) with the
+    limited-memory BFGS algorithm.  Unlike GIS and IIS, which take
+    one small scaling step per iteration, L-BFGS builds up an
+    estimate of the curvature of the likelihood, and usually needs
+    far fewer iterations.
+
+    :see: ``train_maxent_classifier()`` for parameter descriptions.
+    """
+    cutoffs.setdefault('max_iter', 100)
+    cutoffchecker = CutoffChecker(cutoffs)
+
+    # Construct an encoding from the training data.
+    if encoding is None:
+        encoding = BinaryMaxentFeatureEncoding.train(train_toks, labels=labels)
+
+    # Encode the training data once.
+    encoded_toks = _EncodedTrainingSet(train_toks, encoding)
+    empirical_fcount = encoded_toks.empirical_fcount()
+
+    # Unattested features keep a weight of -infinity, as with GIS and
+    # IIS; the other weights are optimized, starting from 0.
+    attested = empirical_fcount != 0
+    weights = numpy.zeros(len(empirical_fcount), 'd')
+    weights[~attested] = numpy.NINF
+    classifier = ConditionalExponentialClassifier(encoding, weights)
+    encoded_toks.set_weights(weights)
+
+    num_toks = float(len(train_toks))
+    inverse_variance = 1.0 / gaussian_prior_sigma ** 2 if gaussian_prior_sigma else 0
+
+    def loss_and_gradient(x):
+        # The negative log likelihood per token (in nats), and its
+        # gradient with respect to the attested weights.
+        weights[attested] = x
+        encoded_toks.set_weights(weights)
+        loss = -encoded_toks.gold_logprob_sum() * math.log(2)
+        gradient = (
+            encoded_toks.estimated_fcount() - empirical_fcount
+        )[attested] * math.log(2)
+        if inverse_variance:
+            loss += 0.5 * inverse_variance * numpy.dot(x, x)
+            gradient += inverse_variance * x
+        return loss / num_toks, gradient / num_toks
+
+    if trace > 0:
+        print('  ==> Training (%d iterations)' % cutoffs['max_iter'])
+    if trace > 2:
+        print()
+        print('      Iteration    Log Likelihood    Accuracy')
+        print('      ---------------------------------------')
+
+    # Train the classifier.
+    try:
+        optimizer = _LBFGS(loss_and_gradient, weights[attested])
+        while True:
+            if trace > 2:
+                ll = cutoffchecker.ll or log_likelihood(encoded_toks, train_toks)
+                acc = cutoffchecker.acc or accuracy(encoded_toks, train_toks)
+                iternum = cutoffchecker.iter
+                print('     %9d    %14.5f    %9.3f' % (iternum, ll, acc))
+
+            converged = not optimizer.step()
+            weights[attested] = optimizer.x
+            classifier.set_weights(weights)
+            if converged:
+                # The last weights tried were rejected.
+                encoded_toks.set_weights(weights)
+
+            # Check the log-likelihood & accuracy cutoffs.
+            if converged or cutoffchecker.check(encoded_toks, train_toks):
+                break
+
+    except KeyboardInterrupt:
+        print('      Training stopped: keyboard interrupt')
+    except:
+        raise
+
+    if trace > 2:
+        ll = log_likelihood(encoded_toks, train_toks)
+        acc = accuracy(encoded_toks, train_toks)
+        print('         Final    %14.5f    %9.3f' % (ll, acc))
+
+    # Return the classifier.
+    return classifier
+
+
+class _LBFGS(object):
+    """
+    A minimal limited-memory BFGS minimizer, with a backtracking line
+    search satisfying the Armijo condition.
+
+    :param loss_and_gradient: A function mapping a point to the value
+        and gradient of the function to minimize there.
+    :param x: The starting point.
+    :param memory: The number of past updates used to approximate the
+        inverse Hessian.
+    """
+
+    def __init__(self, loss_and_gradient, x, memory=10, tolerance=1e-10):
+        self._loss_and_gradient = loss_and_gradient
+        self.x = numpy.array(x, 'd')
+        self.loss, self.gradient = loss_and_gradient(self.x)
+        self._memory = memory
+        self._tolerance = tolerance
+        self._updates = []
+
+    def _direction(self):
+        # The two-loop recursion: approximately -H^-1 * gradient.
+        q = -self.gradient
+        alphas = []
+        for s, y, rho in reversed(self._updates):
+            alpha = rho * numpy.dot(s, q)
+            q -= alpha * y
+            alphas.append(alpha)
+        if self._updates:
+            s, y, rho = self._updates[-1]
+            q *= numpy.dot(s, y) / numpy.dot(y, y)
+        else:
+            q /= max(1.0, numpy.sqrt(numpy.dot(q, q)))
+        for (s, y, rho), alpha in zip(self._updates, reversed(alphas)):
+            q += s * (alpha - rho * numpy.dot(y, q))
+        return q
+
+    def step(self):
+        """
+        Take one step.  Return False if no step could improve the loss.
+        """
+        direction = self._direction()
+        slope = numpy.dot(self.gradient, direction)
+        if slope >= 0:
+            # Not a descent direction: start again from the gradient.
+            self._updates = []
+            direction = self._direction()
+            slope = numpy.dot(self.gradient, direction)
+        if -slope < self._tolerance:
+            return False
+
+        step_size = 1.0
+        while step_size > 1e-20:
+            x = self.x + step_size * direction
+            loss, gradient = self._loss_and_gradient(x)
+            if loss <= self.loss + 1e-4 * step_size * slope:
+                break
+            step_size *= 0.5
+        else:
+            return False
+
+        s = x - self.x
+        y = gradient - self.gradient
+        sy = numpy.dot(s, y)
+        if sy > 1e-10:
+            self._updates.append((s, y, 1.0 / sy))
+            del self._updates[: -self._memory]
+        self.x, self.loss, self.gradient = x, loss, gradient
+        return True
+
+
 ######################################################################
 # { Classifier Trainer: megam
 ######################################################################
@@ -1575,6 +2122,19 @@ def demo():
 
     classifier = names_demo(MaxentClassifier.train)
 
+    # Compare the training time of the numpy-based algorithms.
+    from time import time
+
+    for algorithm in ['GIS', 'IIS', 'LBFGS']:
+        print('%s:' % algorithm)
+        start = time()
+        names_demo(
+            lambda train_toks: MaxentClassifier.train(
+                train_toks, algorithm, trace=0, max_iter=30
+            )
+        )
+        print('%s trained and tested in %.1f sec' % (algorithm, time() - start))
+
 
 if __name__ == '__main__':
     demo()
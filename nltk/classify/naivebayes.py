@@ -31,10 +31,21 @@ sum to one:
 """
 from __future__ import print_function, unicode_literals
 
+import pickle
 from collections import defaultdict
+from functools import partial
+from itertools import islice
 
 from nltk.probability import FreqDist, DictionaryProbDist, ELEProbDist, sum_logs
 from nltk.classify.api import ClassifierI
+from nltk.classify.util import EncodedFeaturesets
+from nltk.collections import LazyMap
+from nltk.util import parallel_imap
+
+try:
+    import numpy
+except ImportError:
+    pass
 
 ##//////////////////////////////////////////////////////
 ##  Naive Bayes Classifier
@@ -62,6 +73,10 @@ class NaiveBayesClassifier(ClassifierI):
     your own features.
     """
 
+    # Defaults for classifiers pickled before these attributes existed.
+    _logprob_matrix = None
+    _counts = None
+
     def __init__(self, label_probdist, feature_probdist):
         """
         :param label_probdist: P(label), the probability distribution
@@ -82,6 +97,8 @@ class NaiveBayesClassifier(ClassifierI):
         self._label_probdist = label_probdist
         self._feature_probdist = feature_probdist
         self._labels = list(label_probdist.samples())
+        self._logprob_matrix = None
+        self._counts = None
 
     def labels(self):
         return self._labels
@@ -90,6 +107,9 @@ class NaiveBayesClassifier(ClassifierI):
         return self.prob_classify(featureset).max()
 
     def prob_classify(self, featureset):
+        if self._logprob_matrix is not None:
+            return self.prob_classify_many([featureset])[0]
+
         # Discard any feature names that we've never seen before.
         # Otherwise, we'll just assign a probability of 0 to
         # everything.
@@ -122,6 +142,107 @@ class NaiveBayesClassifier(ClassifierI):
 
         return DictionaryProbDist(logprob, normalize=True, log=True)
 
+    def compile(self):
+        """
+        Freeze this classifier into a compiled form, where every
+        ``(fname, fval)`` pair seen in training is mapped to an integer
+        id, and P(fname=fval|label) is stored in a dense matrix of log
+        probabilities with one row per id and one column per label.
+        Each feature name also has a row for the values it was never
+        seen with.  ``prob_classify_many()`` and ``classify_many()``
+        then score a whole batch of featuresets at once, and
+        ``prob_classify()`` and ``classify()`` use the matrix too.
+        An uncompiled classifier scores featuresets one at a time.
+
+        The classifier's distributions must not be modified after it
+        is compiled.  Requires numpy.
+
+        :return: this classifier
+        """
+        labels = self._labels
+        label_index = dict((label, j) for j, label in enumerate(labels))
+        # Maps fname -> {label: P(fname=fval|label)}
+        fname_probdists = defaultdict(dict)
+        for (label, fname), probdist in self._feature_probdist.items():
+            if label in label_index:
+                fname_probdists[fname][label] = probdist
+
+        # Row 0 holds P(label); every featureset starts with it.
+        rows = [[self._label_probdist.logprob(label) for label in labels]]
+        self._feature_ids = {}
+        self._unseen_ids = {}
+        for fname, probdists in fname_probdists.items():
+            fvals = set()
+            for probdist in probdists.values():
+                fvals.update(probdist.samples())
+            for fval in list(fvals) + [_UNSEEN]:
+                row = []
+                for label in labels:
+                    if label in probdists:
+                        row.append(probdists[label].logprob(fval))
+                    else:
+                        row.append(sum_logs([]))  # = -INF.
+                if fval is _UNSEEN:
+                    self._unseen_ids[fname] = len(rows)
+                else:
+                    self._feature_ids[fname, fval] = len(rows)
+                rows.append(row)
+
+        self._logprob_matrix = numpy.array(rows, dtype=numpy.float64)
+        return self
+
+    def _feature_rows(self, featureset):
+        """
+        Return the rows of the compiled matrix to sum up for
+        ``featureset``, ignoring feature names never seen in training.
+        """
+        rows = [0]
+        for fname, fval in featureset.items():
+            row = self._feature_ids.get((fname, fval))
+            if row is None:
+                row = self._unseen_ids.get(fname)
+                if row is None:
+                    continue
+            rows.append(row)
+        return rows
+
+    def _batch_logprobs(self, featuresets):
+        """
+        Return a (featuresets x labels) array with the unnormalized log
+        probability of each label for each featureset.
+        """
+        rows = []
+        owners = []
+        num_featuresets = 0
+        for featureset in featuresets:
+            feature_rows = self._feature_rows(featureset)
+            rows.extend(feature_rows)
+            owners.extend([num_featuresets] * len(feature_rows))
+            num_featuresets += 1
+        owners = numpy.array(owners, dtype=numpy.intp)
+
+        # Multiply the sparse (featureset x feature id) indicator matrix
+        # by the log probability matrix, one label column at a time.
+        # The terms are added in featureset order, as prob_classify()
+        # does.
+        logprobs = self._logprob_matrix[rows]
+        scores = numpy.empty((num_featuresets, len(self._labels)))
+        for j in range(len(self._labels)):
+            scores[:, j] = numpy.bincount(owners, logprobs[:, j], num_featuresets)
+        return scores
+
+    def prob_classify_many(self, featuresets):
+        if self._logprob_matrix is None:
+            return [self.prob_classify(fs) for fs in featuresets]
+        labels = self._labels
+        return [
+            DictionaryProbDist(dict(zip(labels, logprob)), normalize=True, log=True)
+            for logprob in self._batch_logprobs(featuresets).tolist()
+        ]
+
+    def classify_many(self, featuresets):
+        return [pdist.max() for pdist in self.prob_classify_many(featuresets)]
+
     def show_most_informative_features(self, n=10):
         # Determine the most relevant features, and display them.
         cpdist = self._feature_probdist
@@ -191,45 +312,190 @@ class NaiveBayesClassifier(ClassifierI):
         return self._most_informative_features[:n]
 
     @classmethod
-    def train(cls, labeled_featuresets, estimator=ELEProbDist):
+    def train(
+        cls,
+        labeled_featuresets,
+        estimator=ELEProbDist,
+        processes=1,
+        chunksize=10000,
+        compiled=False,
+    ):
         """
+        :param labeled_featuresets: A list of classified featuresets,
+            i.e., a list of tuples ``(featureset, label)``.  It is read
+            only once, so it can be a lazy sequence such as the result
+            of ``apply_features()``, or an iterator.  It can also be an
+            ``EncodedFeaturesets`` (see ``encode_featuresets()``) with an
+            exact vocabulary, whose features are counted directly from
+            the matrix.
+        :param processes: The number of worker processes that count
+            features, in chunks of ``chunksize`` featuresets (see
+            ``nltk.util.parallel_imap``).
+        :param compiled: If true, return a compiled classifier (see
+            ``compile()``).
+        """
+        counts = _FeatureCounts.from_featuresets(
+            labeled_featuresets, processes, chunksize
+        )
+        classifier = cls(*counts.probdists(estimator))
+        classifier._counts = counts
+        classifier._estimator = estimator
+        if compiled:
+            classifier.compile()
+        return classifier
+
+    def partial_fit(self, labeled_featuresets, processes=1, chunksize=10000):
+        """
+        Update this classifier with more classified featuresets, as if
+        they had been included in the training data.  The feature
+        counts kept from training are updated, and the probability
+        distributions (and the compiled matrix, if the classifier is
+        compiled) are rebuilt from them.
+
         :param labeled_featuresets: A list of classified featuresets,
             i.e., a list of tuples ``(featureset, label)``.
+        :return: this classifier
         """
-        label_freqdist = FreqDist()
-        feature_freqdist = defaultdict(FreqDist)
-        feature_values = defaultdict(set)
-        fnames = set()
+        if self._counts is None:
+            raise ValueError(
+                'partial_fit() requires a classifier built by '
+                'NaiveBayesClassifier.train()'
+            )
+        self._counts.merge(
+            _FeatureCounts.from_featuresets(labeled_featuresets, processes, chunksize)
+        )
+        self._label_probdist, self._feature_probdist = self._counts.probdists(
+            self._estimator
+        )
+        self._labels = list(self._label_probdist.samples())
+        if hasattr(self, '_most_informative_features'):
+            del self._most_informative_features
+        if self._logprob_matrix is not None:
+            self.compile()
+        return self
 
+
+class _FeatureCounts(object):
+    """
+    The counts that ``NaiveBayesClassifier.train()`` estimates its
+    probability distributions from.  Counts of disjoint sets of
+    featuresets can be merged, to count in parallel or incrementally.
+    """
+
+    def __init__(self):
+        self.label_freqdist = FreqDist()
+        # Maps (label, fname) -> FreqDist over fvals
+        self.feature_freqdist = defaultdict(FreqDist)
+        # Maps fname -> the set of values fname can take
+        self.feature_values = defaultdict(set)
+
+    @classmethod
+    def from_featuresets(cls, labeled_featuresets, processes=1, chunksize=10000):
+        if isinstance(labeled_featuresets, EncodedFeaturesets):
+            return cls().count_encoded(labeled_featuresets)
+        if processes is not None and processes <= 1:
+            return cls().count(labeled_featuresets)
+        # The featuresets of an apply_features() map are computed by the
+        # workers, if its feature function can be sent to them.
+        function = None
+        items = labeled_featuresets
+        if isinstance(items, LazyMap) and len(items._lists) == 1:
+            try:
+                pickle.dumps(items._func)
+                function, items = items._func, items._lists[0]
+            except (pickle.PicklingError, AttributeError, TypeError):
+                pass
+
+        counts = cls()
+        for chunk_counts in parallel_imap(
+            partial(_count_features, function), _chunks(items, chunksize), processes
+        ):
+            counts.merge(chunk_counts)
+        return counts
+
+    def count(self, labeled_featuresets):
         # Count up how many times each feature value occurred, given
         # the label and featurename.
         for featureset, label in labeled_featuresets:
-            label_freqdist[label] += 1
+            self.label_freqdist[label] += 1
             for fname, fval in featureset.items():
                 # Increment freq(fval|label, fname)
-                feature_freqdist[label, fname][fval] += 1
+                self.feature_freqdist[label, fname][fval] += 1
                 # Record that fname can take the value fval.
-                feature_values[fname].add(fval)
-                # Keep a list of all feature names.
-                fnames.add(fname)
+                self.feature_values[fname].add(fval)
+        return self
 
+    def count_encoded(self, encoded):
+        """
+        Count the labeled featuresets of an ``EncodedFeaturesets``.  The
+        (label, column) pairs of the matrix are counted all at once, and
+        the counts are then recorded in order of first occurrence, just
+        as ``count()`` would record them.
+        """
+        encoder = encoded.encoder
+        if not encoded.labeled:
+            raise ValueError('Naive Bayes requires labeled featuresets')
+        if encoder.hashing:
+            raise ValueError(
+                'Naive Bayes requires feature names and values; encode the '
+                'featuresets with an exact vocabulary'
+            )
+        if encoder.numeric:
+            return self.count(encoded)
+
+        labels = encoded.labels()
+        label_counts = numpy.bincount(encoded.label_ids, minlength=len(labels))
+        for label, count in zip(labels, label_counts.tolist()):
+            self.label_freqdist[label] += count
+
+        num_cols = max(len(encoder), 1)
+        keys = numpy.repeat(encoded.label_ids, numpy.diff(encoded.indptr))
+        keys = keys * num_cols + encoded.indices
+        keys, first, counts = numpy.unique(keys, return_index=True, return_counts=True)
+        order = numpy.argsort(first, kind='mergesort')
+        for key, count in zip(keys[order].tolist(), counts[order].tolist()):
+            label_id, col = divmod(key, num_cols)
+            fname, fval = encoder.feature(col)
+            self.feature_freqdist[labels[label_id], fname][fval] += count
+            self.feature_values[fname].add(fval)
+        return self
+
+    def merge(self, other):
+        self.label_freqdist.update(other.label_freqdist)
+        for key, freqdist in other.feature_freqdist.items():
+            self.feature_freqdist[key].update(freqdist)
+        for fname, fvals in other.feature_values.items():
+            self.feature_values[fname].update(fvals)
+        return self
+
+    def probdists(self, estimator):
+        """
+        Return P(label) and the P(fval|label, fname) distributions.
+        """
         # If a feature didn't have a value given for an instance, then
         # we assume that it gets the implicit value 'None.'  This loop
         # counts up the number of 'missing' feature values for each
         # (label,fname) pair, and increments the count of the fval
-        # 'None' by that amount.
-        for label in label_freqdist:
-            num_samples = label_freqdist[label]
-            for fname in fnames:
-                count = feature_freqdist[label, fname].N()
+        # 'None' by that amount.  The counts themselves are left as
+        # they are, so that more can be merged in later.
+        feature_freqdist = {}
+        feature_values = dict(self.feature_values)
+        for label in self.label_freqdist:
+            num_samples = self.label_freqdist[label]
+            for fname in self.feature_values:
+                freqdist = self.feature_freqdist.get((label, fname), FreqDist())
+                count = freqdist.N()
                 # Only add a None key when necessary, i.e. if there are
                 # any samples with feature 'fname' missing.
                 if num_samples - count > 0:
-                    feature_freqdist[label, fname][None] += num_samples - count
-                    feature_values[fname].add(None)
+                    freqdist = freqdist.copy()
+                    freqdist[None] += num_samples - count
+                    if None not in feature_values[fname]:
+                        feature_values[fname] = feature_values[fname] | set([None])
+                feature_freqdist[label, fname] = freqdist
 
         # Create the P(label) distribution
-        label_probdist = estimator(label_freqdist)
+        label_probdist = estimator(self.label_freqdist)
 
         # Create the P(fval|label, fname) distribution
         feature_probdist = {}
@@ -237,7 +503,26 @@ class NaiveBayesClassifier(ClassifierI):
             probdist = estimator(freqdist, bins=len(feature_values[fname]))
             feature_probdist[label, fname] = probdist
 
-        return cls(label_probdist, feature_probdist)
+        return label_probdist, feature_probdist
+
+
+def _chunks(items, size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _count_features(function, items):
+    if function is not None:
+        items = map(function, items)
+    return _FeatureCounts().count(items)
+
+
+# A feature value that no probability distribution has seen.
+_UNSEEN = object()
 
 
 ##//////////////////////////////////////////////////////
@@ -251,6 +536,22 @@ def demo():
     classifier = names_demo(NaiveBayesClassifier.train)
     classifier.show_most_informative_features()
 
+    # Compare per-featureset and compiled batch classification.
+    from time import time
+    from nltk.corpus import names
+    from nltk.classify.util import names_demo_features
+
+    featuresets = [names_demo_features(name) for name in names.words()]
+    start = time()
+    labels = [classifier.classify(featureset) for featureset in featuresets]
+    print('classify():               %.3f sec' % (time() - start))
+    start = time()
+    classifier.compile()
+    print('compile():                %.3f sec' % (time() - start))
+    start = time()
+    assert classifier.classify_many(featuresets) == labels
+    print('compiled classify_many(): %.3f sec' % (time() - start))
+
 
 if __name__ == '__main__':
     demo()
@@ -35,6 +35,7 @@ from __future__ import print_function, unicode_literals
 from six.moves import zip
 
 from nltk.classify.api import ClassifierI
+from nltk.classify.util import EncodedFeaturesets, encode_featuresets
 from nltk.probability import DictionaryProbDist
 from nltk import compat
 
@@ -70,6 +71,9 @@ class SklearnClassifier(ClassifierI):
         self._clf = estimator
         self._encoder = LabelEncoder()
         self._vectorizer = DictVectorizer(dtype=dtype, sparse=sparse)
+        self._dtype = dtype
+        self._sparse = sparse
+        self._featureset_encoder = None
 
     def __repr__(self):
         return "<SklearnClassifier(%r)>" % self._clf
@@ -82,7 +86,7 @@ class SklearnClassifier(ClassifierI):
         :return: The predicted class label for each input sample.
         :rtype: list
         """
-        X = self._vectorizer.transform(featuresets)
+        X = self._transform(featuresets)
         classes = self._encoder.classes_
         return [classes[i] for i in self._clf.predict(X)]
 
@@ -93,7 +97,7 @@ class SklearnClassifier(ClassifierI):
             strings to either numbers, booleans or strings.
         :rtype: list of ``ProbDistI``
         """
-        X = self._vectorizer.transform(featuresets)
+        X = self._transform(featuresets)
         y_proba_list = self._clf.predict_proba(X)
         return [self._make_probdist(y_proba) for y_proba in y_proba_list]
 
@@ -110,16 +114,44 @@ class SklearnClassifier(ClassifierI):
 
         :param labeled_featuresets: A list of ``(featureset, label)``
             where each ``featureset`` is a dict mapping strings to either
-            numbers, booleans or strings.
+            numbers, booleans or strings.  It can also be an
+            ``EncodedFeaturesets`` (see ``encode_featuresets()``), whose
+            matrix is passed to the estimator as it is, in place of the
+            ``DictVectorizer``'s; the featuresets to classify are then
+            encoded with the same encoder.  To get the columns that
+            ``DictVectorizer`` would give, use a ``FeaturesetEncoder``
+            with ``numeric=True``.
         """
+        if isinstance(labeled_featuresets, EncodedFeaturesets):
+            X = self._matrix(labeled_featuresets)
+            y = self._encoder.fit_transform(labeled_featuresets.row_labels())
+            self._featureset_encoder = labeled_featuresets.encoder
+            self._clf.fit(X, y)
+            return self
 
         X, y = list(zip(*labeled_featuresets))
         X = self._vectorizer.fit_transform(X)
         y = self._encoder.fit_transform(y)
+        self._featureset_encoder = None
         self._clf.fit(X, y)
 
         return self
 
+    def _transform(self, featuresets):
+        if self._featureset_encoder is None:
+            return self._vectorizer.transform(featuresets)
+        if not isinstance(featuresets, EncodedFeaturesets):
+            featuresets = encode_featuresets(
+                featuresets, self._featureset_encoder, labeled=False
+            )
+        return self._matrix(featuresets)
+
+    def _matrix(self, encoded):
+        X = encoded.tocsr(self._dtype)
+        if not self._sparse:
+            X = X.toarray()
+        return X
+
     def _make_probdist(self, y_proba):
         classes = self._encoder.classes_
         return DictionaryProbDist(dict((classes[i], p) for i, p in enumerate(y_proba)))
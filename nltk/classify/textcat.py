@@ -31,13 +31,21 @@ http://borel.slu.edu/crubadan/index.html
 # Ensure that literal strings default to unicode rather than str.
 from __future__ import print_function, unicode_literals
 
+from functools import partial
+from itertools import chain
+
 from nltk.compat import PY3
-from nltk.util import trigrams
+from nltk.util import trigrams, parallel_map
 
 if PY3:
     from sys import maxsize
 else:
-    from sys import maxint
+    from sys import maxint as maxsize
+
+try:
+    import numpy
+except ImportError:
+    pass
 
 # Note: this is NOT "re" you're likely used to. The regex module
 # is an alternative to the standard re module that supports
@@ -77,6 +85,10 @@ class TextCat(object):
         for lang in self._corpus.langs():
             self._corpus.lang_freq(lang)
 
+        self._langs = None
+        self._lang_ranks = {}
+        self._build_rank_index()
+
     def remove_punctuation(self, text):
         ''' Get rid of punctuation except apostrophes '''
         return re.sub(r"[^\P{P}\']+", "", text)
@@ -101,47 +113,124 @@ class TextCat(object):
 
         return fingerprint
 
+    def _rank_table(self, lang):
+        ''' Return a dict mapping each trigram of the language
+            profile to its rank (0 for the most frequent) '''
+        if lang not in self._lang_ranks:
+            lang_fd = self._corpus.lang_freq(lang)
+            self._lang_ranks[lang] = dict(
+                (trigram, rank) for rank, trigram in enumerate(lang_fd)
+            )
+        return self._lang_ranks[lang]
+
     def calc_dist(self, lang, trigram, text_profile):
         ''' Calculate the "out-of-place" measure between the
             text and language profile for a single trigram '''
 
-        lang_fd = self._corpus.lang_freq(lang)
-        dist = 0
-
-        if trigram in lang_fd:
-            idx_lang_profile = list(lang_fd.keys()).index(trigram)
-            idx_text = list(text_profile.keys()).index(trigram)
-
-            # print(idx_lang_profile, ", ", idx_text)
-            dist = abs(idx_lang_profile - idx_text)
-        else:
+        idx_lang_profile = self._rank_table(lang).get(trigram)
+        if idx_lang_profile is None:
             # Arbitrary but should be larger than
             # any possible trigram file length
             # in terms of total lines
-            if PY3:
-                dist = maxsize
-            else:
-                dist = maxint
-
-        return dist
+            return maxsize
+
+        idx_text = list(text_profile.keys()).index(trigram)
+        return abs(idx_lang_profile - idx_text)
+
+    def _build_rank_index(self):
+        ''' Index the ranks of all the loaded language profiles by
+            trigram: the ranks of trigram ``i`` are stored, with their
+            language numbers, at ``_offsets[i]:_offsets[i + 1]`` '''
+        all_lang_freq = self._corpus._all_lang_freq
+        self._langs = list(all_lang_freq.keys())
+        if 'numpy' not in globals():
+            return
+
+        lang_fds = [all_lang_freq[lang] for lang in self._langs]
+        vocab = dict.fromkeys(chain.from_iterable(lang_fds))
+        self._trigram_ids = dict(zip(vocab, range(len(vocab))))
+        trigram_ids = numpy.fromiter(
+            map(self._trigram_ids.__getitem__, chain.from_iterable(lang_fds)),
+            dtype=numpy.int64,
+        )
+        sizes = numpy.array([len(lang_fd) for lang_fd in lang_fds], dtype=numpy.int64)
+        # Ranks restart at 0 at the start of each language profile.
+        ranks = numpy.arange(len(trigram_ids)) - numpy.repeat(
+            numpy.cumsum(sizes) - sizes, sizes
+        )
+
+        order = numpy.argsort(trigram_ids, kind='mergesort')
+        self._rank_langs = numpy.repeat(
+            numpy.arange(len(self._langs), dtype=numpy.int32), sizes
+        )[order]
+        self._ranks = ranks[order]
+        self._offsets = numpy.zeros(len(vocab) + 1, dtype=numpy.int64)
+        numpy.cumsum(
+            numpy.bincount(trigram_ids, minlength=len(vocab)), out=self._offsets[1:]
+        )
+
+    def _profile_dists(self, profile):
+        ''' Return the summed distances of the trigrams of ``profile``
+            that occur in each language, and the numbers of those that
+            do not, as two sequences in the order of ``self._langs`` '''
+        if self._langs is None or len(self._langs) != len(
+            self._corpus._all_lang_freq
+        ):
+            self._build_rank_index()
+
+        if 'numpy' not in globals():
+            sums, missing = [], []
+            for lang in self._langs:
+                ranks = self._rank_table(lang)
+                lang_sum = lang_missing = 0
+                for idx_text, trigram in enumerate(profile):
+                    rank = ranks.get(trigram)
+                    if rank is None:
+                        lang_missing += 1
+                    else:
+                        lang_sum += abs(rank - idx_text)
+                sums.append(lang_sum)
+                missing.append(lang_missing)
+            return sums, missing
+
+        text_ranks, ids = [], []
+        for idx_text, trigram in enumerate(profile):
+            trigram_id = self._trigram_ids.get(trigram)
+            if trigram_id is not None:
+                text_ranks.append(idx_text)
+                ids.append(trigram_id)
+        starts = self._offsets[ids]
+        counts = self._offsets[numpy.array(ids, dtype=numpy.int64) + 1] - starts
+        # The positions of the ranks of all the text's trigrams.
+        positions = numpy.arange(counts.sum()) + numpy.repeat(
+            starts - numpy.cumsum(counts) + counts, counts
+        )
+        langs = self._rank_langs[positions]
+        dists = numpy.abs(
+            self._ranks[positions] - numpy.repeat(text_ranks, counts)
+        )
+        num_langs = len(self._langs)
+        sums = numpy.bincount(langs, weights=dists, minlength=num_langs)
+        missing = len(profile) - numpy.bincount(langs, minlength=num_langs)
+        return sums.astype(numpy.int64), missing
+
+    def _distances(self, sums, missing):
+        return dict(
+            (lang, int(lang_sum) + int(lang_missing) * maxsize)
+            for lang, lang_sum, lang_missing in zip(self._langs, sums, missing)
+        )
+
+    def _guess(self, sums, missing):
+        # Every distance is below maxsize, so the texts are ordered by
+        # their missing trigrams first, then by their summed distances.
+        return min(
+            zip(missing, sums, self._langs), key=lambda dist: (dist[0], dist[1])
+        )[2]
 
     def lang_dists(self, text):
         ''' Calculate the "out-of-place" measure between
             the text and all languages '''
-
-        distances = {}
-        profile = self.profile(text)
-        # For all the languages
-        for lang in self._corpus._all_lang_freq.keys():
-            # Calculate distance metric for every trigram in
-            # input text to be identified
-            lang_dist = 0
-            for trigram in profile:
-                lang_dist += self.calc_dist(lang, trigram, profile)
-
-            distances[lang] = lang_dist
-
-        return distances
+        return self._distances(*self._profile_dists(self.profile(text)))
 
     def guess_language(self, text):
         ''' Find the language with the min distance
@@ -151,6 +240,24 @@ class TextCat(object):
         return min(self.last_distances, key=self.last_distances.get)
         #################################################')
 
+    def guess_language_many(self, texts, processes=1):
+        ''' Return the ISO 639-3 code of the language guessed for each
+            of the texts, profiling them in ``processes`` worker
+            processes (see ``nltk.util.parallel_map``) '''
+        profiles = parallel_map(partial(_profile, type(self)), texts, processes)
+        guesses = []
+        for profile in profiles:
+            sums, missing = self._profile_dists(profile)
+            guesses.append(self._guess(sums, missing))
+        if profiles:
+            self.last_distances = self._distances(sums, missing)
+        return guesses
+
+
+def _profile(cls, text):
+    # Profiling uses no loaded data, so workers can do without it.
+    return cls.__new__(cls).profile(text)
+
 
 def demo():
     from nltk.corpus import udhr
@@ -180,6 +287,7 @@ def demo():
     }
 
     tc = TextCat()
+    samples = []
 
     for cur_lang in langs:
         # Get raw data from UDHR corpus
@@ -202,6 +310,25 @@ def demo():
         guess = tc.guess_language(sample)
         print('Language detection: %s (%s)' % (guess, friendly[guess]))
         print('#' * 140)
+        samples.append(sample)
+
+    # Latency of language identification against all the crubadan
+    # languages, one text at a time and as a batch.
+    from time import time
+
+    texts = [sample[i : i + 200] for sample in samples for i in range(0, 4000, 200)]
+    start = time()
+    for text in texts:
+        tc.guess_language(text)
+    elapsed = time() - start
+    print(
+        'guess_language: %.2f ms per text (%d languages)'
+        % (1000 * elapsed / len(texts), len(tc._langs))
+    )
+    start = time()
+    tc.guess_language_many(texts)
+    elapsed = time() - start
+    print('guess_language_many: %.2f ms per text' % (1000 * elapsed / len(texts)))
 
 
 if __name__ == '__main__':
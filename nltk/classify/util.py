@@ -12,10 +12,23 @@ Utility functions and classes for classifiers.
 from __future__ import print_function, division
 
 import math
+import multiprocessing
+import pickle
+import zlib
+from array import array
+from functools import partial
+from itertools import chain
+
+from six import string_types, text_type
 
 # from nltk.util import Deprecated
 import nltk.classify.util  # for accuracy & log_likelihood
-from nltk.util import LazyMap
+from nltk.util import LazyMap, parallel_map
+
+try:
+    import numpy
+except ImportError:
+    pass
 
 ######################################################################
 # { Helper Functions
@@ -61,15 +74,17 @@ def apply_features(feature_func, toks, labeled=None):
     if labeled is None:
         labeled = toks and isinstance(toks[0], (tuple, list))
     if labeled:
-
-        def lazy_func(labeled_token):
-            return (feature_func(labeled_token[0]), labeled_token[1])
-
-        return LazyMap(lazy_func, toks)
+        return LazyMap(partial(_labeled_features, feature_func), toks)
     else:
         return LazyMap(feature_func, toks)
 
 
+def _labeled_features(feature_func, labeled_token):
+    # A module-level function, so that the lazy map can be pickled
+    # (e.g. to be sent to worker processes) if feature_func can.
+    return (feature_func(labeled_token[0]), labeled_token[1])
+
+
 def attested_labels(tokens):
     """
     :return: A list of all labels that are attested in the given list
@@ -82,21 +97,66 @@ def attested_labels(tokens):
     return tuple(set(label for (tok, label) in tokens))
 
 
-def log_likelihood(classifier, gold):
-    results = classifier.prob_classify_many([fs for (fs, l) in gold])
-    ll = [pdist.prob(l) for ((fs, l), pdist) in zip(gold, results)]
+def log_likelihood(classifier, gold, processes=1, chunksize=None):
+    featuresets, labels = _unzip(gold)
+    results = _apply_many(
+        classifier, 'prob_classify_many', featuresets, processes, chunksize
+    )
+    ll = [pdist.prob(l) for (l, pdist) in zip(labels, results)]
     return math.log(sum(ll) / len(ll))
 
 
-def accuracy(classifier, gold):
-    results = classifier.classify_many([fs for (fs, l) in gold])
-    correct = [l == r for ((fs, l), r) in zip(gold, results)]
+def accuracy(classifier, gold, processes=1, chunksize=None):
+    """
+    Return the proportion of the featuresets in ``gold`` (a list of
+    ``(featureset, label)`` pairs) that ``classifier`` labels correctly.
+    Like ``log_likelihood()``, it classifies the featuresets with a
+    single call to the classifier's batch method, or, if ``processes``
+    is more than 1, splits them into chunks of ``chunksize`` (by
+    default, a few per process) that are classified in worker
+    processes (see ``nltk.util.parallel_map``).
+    """
+    featuresets, labels = _unzip(gold)
+    results = _apply_many(classifier, 'classify_many', featuresets, processes, chunksize)
+    correct = [l == r for (l, r) in zip(labels, results)]
     if correct:
         return sum(correct) / len(correct)
     else:
         return 0
 
 
+def _unzip(gold):
+    if isinstance(gold, EncodedFeaturesets):
+        # Decode the featuresets only if the classifier reads them.
+        return gold.featuresets(), gold.row_labels()
+    # Read gold only once, in case its featuresets are computed lazily.
+    featuresets, labels = [], []
+    for fs, l in gold:
+        featuresets.append(fs)
+        labels.append(l)
+    return featuresets, labels
+
+
+def _apply_many(classifier, method, featuresets, processes=1, chunksize=None):
+    if processes is not None and processes <= 1:
+        return getattr(classifier, method)(featuresets)
+    if chunksize is None:
+        workers = processes or multiprocessing.cpu_count()
+        chunksize = max(1, -(-len(featuresets) // (4 * workers)))
+    chunks = [
+        list(featuresets[i : i + chunksize])
+        for i in range(0, len(featuresets), chunksize)
+    ]
+    results = parallel_map(
+        partial(_call_method, classifier, method), chunks, processes, 1
+    )
+    return [result for chunk_results in results for result in chunk_results]
+
+
+def _call_method(classifier, method, featuresets):
+    return getattr(classifier, method)(featuresets)
+
+
 class CutoffChecker(object):
     """
     A helper class that implements cutoff checks based on number of
@@ -138,7 +198,7 @@ class CutoffChecker(object):
             self.ll = new_ll
 
         if 'max_acc' in cutoffs or 'min_accdelta' in cutoffs:
-            new_acc = nltk.classify.util.log_likelihood(classifier, train_toks)
+            new_acc = nltk.classify.util.accuracy(classifier, train_toks)
             if 'max_acc' in cutoffs and new_acc >= cutoffs['max_acc']:
                 return True  # log likelihood cutoff
             if (
@@ -152,6 +212,377 @@ class CutoffChecker(object):
             return False  # no cutoff reached.
 
 
+######################################################################
+# { Featureset Encoding
+######################################################################
+
+
+class _NumericValue(object):
+    # The fval of the key of a numeric feature's column.  It is distinct
+    # from every feature value, None included, and stays the same
+    # object when an encoder is unpickled.
+    def __repr__(self):
+        return '<numeric>'
+
+    def __reduce__(self):
+        return '_NUMERIC'
+
+
+_NUMERIC = _NumericValue()
+
+
+class FeaturesetEncoder(object):
+    """
+    A mapping from the ``(fname, fval)`` pairs of featuresets to the
+    columns of a feature matrix, used by ``encode_featuresets()``.
+
+    By default, the encoder has an exact vocabulary: each distinct
+    ``(fname, fval)`` pair is given its own column, in the order in
+    which the pairs are first encoded, and the column's value is 1.
+    If ``n_features`` is given, the encoder uses the "hashing trick"
+    instead: a pair's column is a hash of its name modulo
+    ``n_features``.  A hashing encoder needs no memory for its
+    vocabulary and can encode any featureset, but distinct pairs may
+    share a column, and columns can not be mapped back to pairs.  The
+    hash is stable, so the same pair is given the same column in every
+    run.
+
+    If ``numeric`` is true, then features whose values are not strings
+    (or None) are treated as numbers, as in scikit-learn's
+    ``DictVectorizer``: such a feature gets a single column, whose value
+    is the feature's value.
+
+        >>> from nltk.classify.util import FeaturesetEncoder
+        >>> encoder = FeaturesetEncoder()
+        >>> encoder.column('last_letter', 'a', grow=True)
+        (0, 1.0)
+        >>> encoder.column('length', 5, grow=True)
+        (1, 1.0)
+        >>> encoder.column('length', 6)
+        >>> encoder.feature(1)
+        ('length', 5)
+        >>> len(encoder)
+        2
+    """
+
+    def __init__(self, n_features=None, numeric=False):
+        """
+        :param n_features: The number of columns for the hashing trick,
+            or None for an exact vocabulary.
+        :type n_features: int
+        :param numeric: If true, then give each feature whose values
+            are not strings a single column with the feature's value.
+        """
+        self._n_features = n_features
+        self._numeric = numeric
+        self._columns = {}
+        """A dict mapping each key to its column, for an exact vocabulary."""
+        self._keys = []
+        """A list of the key of each column, for an exact vocabulary."""
+        self._fixed = False
+        """True once the encoder has encoded a list of featuresets."""
+
+    @property
+    def hashing(self):
+        """True if this encoder uses the hashing trick."""
+        return self._n_features is not None
+
+    @property
+    def numeric(self):
+        """True if this encoder gives non-string features numeric values."""
+        return self._numeric
+
+    def __len__(self):
+        """The number of columns."""
+        if self._n_features is not None:
+            return self._n_features
+        return len(self._keys)
+
+    def column(self, fname, fval, grow=False):
+        """
+        Return the column and value of the feature ``fname=fval``, as a
+        tuple ``(column, value)``; or None if the encoder has an exact
+        vocabulary that does not include the feature, and ``grow`` is
+        false.
+
+        :param grow: If true, then add the feature to an exact
+            vocabulary that does not include it yet.
+        """
+        if self._numeric and not (fval is None or isinstance(fval, string_types)):
+            key, value = (fname, _NUMERIC), float(fval)
+        else:
+            key, value = (fname, fval), 1.0
+        if self._n_features is not None:
+            return _hash_key(key) % self._n_features, value
+        col = self._columns.get(key)
+        if col is None:
+            if not grow:
+                return None
+            col = self._columns[key] = len(self._keys)
+            self._keys.append(key)
+        return col, value
+
+    def feature(self, col):
+        """
+        Return the ``(fname, fval)`` pair of the given column; ``fval``
+        is None if the column holds a numeric feature (see
+        ``is_numeric()``).  Only available for an exact vocabulary.
+        """
+        fname, fval = self._key(col)
+        if fval is _NUMERIC:
+            return fname, None
+        return fname, fval
+
+    def is_numeric(self, col):
+        """
+        Return true if the given column holds a numeric feature, whose
+        value is the column's value.  Only available for an exact
+        vocabulary.
+        """
+        return self._key(col)[1] is _NUMERIC
+
+    def _key(self, col):
+        if self._n_features is not None:
+            raise ValueError('The columns of a hashing encoder can not be decoded')
+        return self._keys[col]
+
+    def _encode(self, featuresets, grow, labels=None):
+        """
+        Encode ``featuresets`` into the arrays of a CSR matrix.  If
+        ``labels`` is a list, the featuresets are ``(featureset, label)``
+        pairs, and their labels are appended to it.
+        """
+        indptr, indices, data = array('l', [0]), array('l'), array('d')
+        columns, keys = self._columns, self._keys
+        exact = self._n_features is None and not self._numeric
+        for featureset in featuresets:
+            if labels is not None:
+                featureset, label = featureset
+                labels.append(label)
+            if exact:
+                # The common case, inlined.
+                for key in featureset.items():
+                    col = columns.get(key)
+                    if col is None:
+                        if not grow:
+                            continue
+                        col = columns[key] = len(keys)
+                        keys.append(key)
+                    indices.append(col)
+                    data.append(1.0)
+            else:
+                for fname, fval in featureset.items():
+                    encoded = self.column(fname, fval, grow)
+                    if encoded is not None:
+                        indices.append(encoded[0])
+                        data.append(encoded[1])
+            indptr.append(len(indices))
+        return (
+            numpy.frombuffer(indptr, dtype='l'),
+            numpy.frombuffer(indices, dtype='l'),
+            numpy.frombuffer(data, dtype='d'),
+        )
+
+
+def _hash_key(key):
+    # A hash that, unlike hash(), is the same in every process.
+    fname, fval = key
+    if fval is _NUMERIC:
+        name = text_type(fname)
+    else:
+        name = text_type(fname) + '=' + text_type(fval)
+    return zlib.crc32(name.encode('utf-8')) & 0xFFFFFFFF
+
+
+class EncodedFeaturesets(object):
+    """
+    A list of featuresets (or of ``(featureset, label)`` pairs) stored
+    as a sparse matrix in compressed sparse row (CSR) form, with one
+    row per featureset and the columns of a ``FeaturesetEncoder``.
+    Build it with ``encode_featuresets()``.
+
+    An encoded list is read like the list it encodes: its items are
+    featuresets or ``(featureset, label)`` pairs, decoded on demand
+    (which requires an encoder with an exact vocabulary).  But the
+    classifiers that know about encoded lists (``NaiveBayesClassifier``,
+    ``MaxentClassifier`` and ``SklearnClassifier``) train from the
+    matrix directly, without decoding it.
+
+    :ivar encoder: The ``FeaturesetEncoder`` of the columns.
+    :ivar indptr: The row ``i`` consists of the entries
+        ``indptr[i]:indptr[i+1]`` of ``indices`` and ``data``.
+    :ivar indices: The column of each entry.
+    :ivar data: The value of each entry.
+    :ivar label_ids: For labeled featuresets, the index of each row's
+        label in ``labels()``; otherwise None.
+    """
+
+    def __init__(self, encoder, indptr, indices, data, labels=None, label_ids=None):
+        self.encoder = encoder
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self._labels = labels
+        self.label_ids = label_ids
+
+    @property
+    def labeled(self):
+        """True if the rows are labeled featuresets."""
+        return self._labels is not None
+
+    def labels(self):
+        """
+        The distinct labels of the rows, in order of first occurrence.
+        """
+        return list(self._labels)
+
+    def row_labels(self):
+        """The label of each row."""
+        labels = self._labels
+        return [labels[i] for i in self.label_ids.tolist()]
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def featureset(self, i):
+        """Decode the featureset of row ``i``."""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        featureset = {}
+        for col, value in zip(
+            self.indices[start:end].tolist(), self.data[start:end].tolist()
+        ):
+            fname, fval = self.encoder._key(col)
+            featureset[fname] = value if fval is _NUMERIC else fval
+        return featureset
+
+    def featuresets(self):
+        """
+        A lazy list of the featuresets of the rows, without labels.
+        """
+        return LazyMap(self.featureset, range(len(self)))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._take(numpy.arange(len(self))[i])
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('index out of range')
+        if self._labels is None:
+            return self.featureset(i)
+        return (self.featureset(i), self._labels[self.label_ids[i]])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _take(self, rows):
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        sizes = ends - starts
+        indptr = numpy.zeros(len(rows) + 1, dtype=self.indptr.dtype)
+        numpy.cumsum(sizes, out=indptr[1:])
+        entries = numpy.repeat(starts - indptr[:-1], sizes) + numpy.arange(indptr[-1])
+        label_ids = None if self.label_ids is None else self.label_ids[rows]
+        return EncodedFeaturesets(
+            self.encoder,
+            indptr,
+            self.indices[entries],
+            self.data[entries],
+            self._labels,
+            label_ids,
+        )
+
+    def tocsr(self, dtype=float):
+        """
+        Return the matrix as a ``scipy.sparse.csr_matrix``.  Requires
+        scipy.
+        """
+        from scipy.sparse import csr_matrix
+
+        matrix = csr_matrix(
+            (self.data.astype(dtype), self.indices, self.indptr),
+            shape=(len(self), len(self.encoder)),
+        )
+        matrix.sum_duplicates()
+        return matrix
+
+    def save(self, filename):
+        """Save the encoded featuresets to ``filename``."""
+        with open(filename, 'wb') as outfile:
+            pickle.dump(self, outfile, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(filename):
+        """Load encoded featuresets saved with ``save()``."""
+        with open(filename, 'rb') as infile:
+            return pickle.load(infile)
+
+    def __repr__(self):
+        return '<EncodedFeaturesets with %d rows, %d columns, %d entries>' % (
+            len(self),
+            len(self.encoder),
+            len(self.indices),
+        )
+
+
+def encode_featuresets(toks, encoder=None, labeled=None):
+    """
+    Encode a list of featuresets (or of ``(featureset, label)`` pairs)
+    as a sparse matrix, reading ``toks`` only once; so ``toks`` can be
+    the lazy list returned by ``apply_features()``, or an iterator.
+    The result, an ``EncodedFeaturesets``, can be passed to
+    ``NaiveBayesClassifier.train()``, ``MaxentClassifier.train()`` or
+    ``SklearnClassifier.train()`` in place of ``toks``, so that the
+    training algorithm does not have to hash the featuresets' feature
+    names and values again on every pass.
+
+        >>> from nltk.classify.util import encode_featuresets
+        >>> train = [({'a': 1, 'b': 'x'}, 'yes'), ({'a': 2}, 'no')]
+        >>> encoded = encode_featuresets(train)
+        >>> encoded
+        <EncodedFeaturesets with 2 rows, 3 columns, 3 entries>
+        >>> encoded[1]
+        ({'a': 2}, 'no')
+        >>> encoded.labels()
+        ['yes', 'no']
+        >>> encode_featuresets([{'a': 2, 'c': 3}], encoded.encoder)[0]
+        {'a': 2}
+
+    :param toks: The featuresets or labeled featuresets to encode.
+    :param encoder: The ``FeaturesetEncoder`` that maps features to
+        columns; by default, a new encoder with an exact vocabulary.
+        The vocabulary of an encoder is built by the first call that
+        uses it, and is fixed after that: features that it does not
+        include are left out of the matrix.  So pass the training set's
+        encoder to encode a test set.
+    :param labeled: If true, then ``toks`` contains labeled featuresets.
+        (Default: auto-detect based on types.)
+    :rtype: EncodedFeaturesets
+    """
+    if encoder is None:
+        encoder = FeaturesetEncoder()
+    grow, encoder._fixed = not encoder._fixed, True
+    toks = iter(toks)
+    first = next(toks, None)
+    if labeled is None:
+        labeled = isinstance(first, (tuple, list))
+    if first is not None:
+        toks = chain([first], toks)
+
+    labels = [] if labeled else None
+    indptr, indices, data = encoder._encode(toks, grow, labels)
+    label_values = label_ids = None
+    if labeled:
+        label_index = {}
+        label_ids = numpy.fromiter(
+            (label_index.setdefault(label, len(label_index)) for label in labels),
+            dtype='l',
+            count=len(labels),
+        )
+        label_values = sorted(label_index, key=label_index.get)
+    return EncodedFeaturesets(encoder, indptr, indices, data, label_values, label_ids)
+
+
 ######################################################################
 # { Demos
 ######################################################################
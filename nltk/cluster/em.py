@@ -40,6 +40,7 @@ class EMClusterer(VectorSpaceClusterer):
         bias=0.1,
         normalise=False,
         svd_dimensions=None,
+        diagonal=False,
     ):
         """
         Creates an EM clusterer with the given starting parameters,
@@ -62,6 +63,10 @@ class EMClusterer(VectorSpaceClusterer):
         :param  svd_dimensions: number of dimensions to use in reducing vector
                                dimensionsionality with SVD
         :type   svd_dimensions: int
+        :param  diagonal: should the covariance matrices be diagonal, and
+                          stored as vectors of variances, which suits
+                          vectors of many dimensions
+        :type   diagonal: boolean
         """
         VectorSpaceClusterer.__init__(self, normalise, svd_dimensions)
         self._means = numpy.array(initial_means, numpy.float64)
@@ -70,115 +75,150 @@ class EMClusterer(VectorSpaceClusterer):
         self._covariance_matrices = covariance_matrices
         self._priors = priors
         self._bias = bias
+        self._diagonal = diagonal
+        self._factors = None
 
     def num_clusters(self):
         return self._num_clusters
 
     def cluster_vectorspace(self, vectors, trace=False):
         assert len(vectors) > 0
+        vectors = numpy.asarray(vectors, numpy.float64)
 
         # set the parameters to initial values
-        dimensions = len(vectors[0])
+        dimensions = vectors.shape[1]
         means = self._means
-        priors = self._priors
-        if not priors:
-            priors = self._priors = (
+        if self._priors is None or len(self._priors) == 0:
+            self._priors = (
                 numpy.ones(self._num_clusters, numpy.float64) / self._num_clusters
             )
+        priors = self._priors = numpy.array(self._priors, numpy.float64)
         covariances = self._covariance_matrices
         if not covariances:
-            covariances = self._covariance_matrices = [
+            covariances = [
                 numpy.identity(dimensions, numpy.float64)
                 for i in range(self._num_clusters)
             ]
+        covariances = [numpy.array(cvm, numpy.float64) for cvm in covariances]
+        if self._diagonal:
+            covariances = [
+                cvm.diagonal().copy() if cvm.ndim == 2 else cvm for cvm in covariances
+            ]
+        self._covariance_matrices = covariances
+        if self._diagonal:
+            bias = self._bias
+        else:
+            bias = self._bias * numpy.identity(dimensions, numpy.float64)
 
         # do the E and M steps until the likelihood plateaus
-        lastl = self._loglikelihood(vectors, priors, means, covariances)
+        h, lastl = _expectations(vectors, priors, means, _factorise(covariances))
         converged = False
 
         while not converged:
             if trace:
                 print('iteration; loglikelihood', lastl)
-            # E-step, calculate hidden variables, h[i,j]
-            h = numpy.zeros((len(vectors), self._num_clusters), numpy.float64)
-            for i in range(len(vectors)):
-                for j in range(self._num_clusters):
-                    h[i, j] = priors[j] * self._gaussian(
-                        means[j], covariances[j], vectors[i]
-                    )
-                h[i, :] /= sum(h[i, :])
 
             # M-step, update parameters - cvm, p, mean
+            sum_h = h.sum(axis=0)
             for j in range(self._num_clusters):
-                covariance_before = covariances[j]
-                new_covariance = numpy.zeros((dimensions, dimensions), numpy.float64)
-                new_mean = numpy.zeros(dimensions, numpy.float64)
-                sum_hj = 0.0
-                for i in range(len(vectors)):
-                    delta = vectors[i] - means[j]
-                    new_covariance += h[i, j] * numpy.multiply.outer(delta, delta)
-                    sum_hj += h[i, j]
-                    new_mean += h[i, j] * vectors[i]
-                covariances[j] = new_covariance / sum_hj
-                means[j] = new_mean / sum_hj
-                priors[j] = sum_hj / len(vectors)
+                delta = vectors - means[j]
+                weighted_delta = h[:, j, None] * delta
+                if self._diagonal:
+                    covariances[j] = (weighted_delta * delta).sum(axis=0) / sum_h[j]
+                else:
+                    covariances[j] = numpy.dot(weighted_delta.T, delta) / sum_h[j]
 
                 # bias term to stop covariance matrix being singular
-                covariances[j] += self._bias * numpy.identity(dimensions, numpy.float64)
+                covariances[j] += bias
+            means[:] = numpy.dot(h.T, vectors) / sum_h[:, None]
+            priors[:] = sum_h / len(vectors)
 
-            # calculate likelihood - FIXME: may be broken
-            l = self._loglikelihood(vectors, priors, means, covariances)
+            # E-step, calculate hidden variables, h[i,j], and the likelihood
+            h, l = _expectations(vectors, priors, means, _factorise(covariances))
 
             # check for convergence
             if abs(lastl - l) < self._conv_threshold:
                 converged = True
             lastl = l
+        self._factors = None
 
     def classify_vectorspace(self, vector):
-        best = None
-        for j in range(self._num_clusters):
-            p = self._priors[j] * self._gaussian(
-                self._means[j], self._covariance_matrices[j], vector
-            )
-            if not best or p > best[0]:
-                best = (p, j)
-        return best[1]
+        log_p = self._log_gaussians([vector])[0] + numpy.log(self._priors)
+        return int(log_p.argmax())
 
     def likelihood_vectorspace(self, vector, cluster):
         cid = self.cluster_names().index(cluster)
-        return self._priors[cluster] * self._gaussian(
-            self._means[cluster], self._covariance_matrices[cluster], vector
-        )
+        log_p = self._log_gaussians([vector])[0, cluster]
+        return self._priors[cluster] * numpy.exp(log_p)
 
-    def _gaussian(self, mean, cvm, x):
-        m = len(mean)
-        assert cvm.shape == (m, m), 'bad sized covariance matrix, %s' % str(cvm.shape)
-        try:
-            det = numpy.linalg.det(cvm)
-            inv = numpy.linalg.inv(cvm)
-            a = det ** -0.5 * (2 * numpy.pi) ** (-m / 2.0)
-            dx = x - mean
-            print(dx, inv)
-            b = -0.5 * numpy.dot(numpy.dot(dx, inv), dx)
-            return a * numpy.exp(b)
-        except OverflowError:
-            # happens when the exponent is negative infinity - i.e. b = 0
-            # i.e. the inverse of cvm is huge (cvm is almost zero)
-            return 0
+    def _log_gaussians(self, vectors):
+        # the Cholesky factors are cached between classifications
+        if self._factors is None:
+            self._factors = _factorise(self._covariance_matrices)
+        vectors = numpy.asarray(vectors, numpy.float64)
+        return _log_gaussians(vectors, self._means, self._factors)
 
     def _loglikelihood(self, vectors, priors, means, covariances):
-        llh = 0.0
-        for vector in vectors:
-            p = 0
-            for j in range(len(priors)):
-                p += priors[j] * self._gaussian(means[j], covariances[j], vector)
-            llh += numpy.log(p)
-        return llh
+        vectors = numpy.asarray(vectors, numpy.float64)
+        return _expectations(vectors, priors, means, _factorise(covariances))[1]
 
     def __repr__(self):
         return '<EMClusterer means=%s>' % list(self._means)
 
 
+def _factorise(covariances):
+    """
+    The whitening transforms and log determinants of the covariance
+    matrices, or of diagonal ones given as vectors of variances.  For
+    ``cvm = dot(L, L.T)``, ``dot(dx, inv(L).T)`` has length one when ``dx``
+    is one standard deviation from the mean.
+    """
+    factors = []
+    for cvm in covariances:
+        if cvm.ndim == 1:
+            factors.append((cvm ** -0.5, numpy.log(cvm).sum()))
+        else:
+            m = len(cvm)
+            assert cvm.shape == (m, m), 'bad sized covariance matrix, %s' % (cvm.shape,)
+            cholesky = numpy.linalg.cholesky(cvm)
+            factors.append(
+                (numpy.linalg.inv(cholesky).T, 2 * numpy.log(cholesky.diagonal()).sum())
+            )
+    return factors
+
+
+def _log_gaussians(vectors, means, factors):
+    """
+    The log densities of each of the vectors (rows) for each of the
+    Gaussians (columns) with the given means and factorised covariances.
+    """
+    log_densities = numpy.empty((len(vectors), len(means)), numpy.float64)
+    for j, (mean, (whitening, log_det)) in enumerate(zip(means, factors)):
+        delta = vectors - mean
+        if whitening.ndim == 1:
+            delta *= whitening
+        else:
+            delta = numpy.dot(delta, whitening)
+        distance = (delta * delta).sum(axis=1)
+        log_densities[:, j] = -0.5 * (
+            len(mean) * numpy.log(2 * numpy.pi) + log_det + distance
+        )
+    return log_densities
+
+
+def _expectations(vectors, priors, means, factors):
+    """
+    The membership probabilities of each of the vectors (rows) in each of
+    the clusters (columns), and the log likelihood of the vectors, which
+    are normalised in log space to avoid underflow.
+    """
+    with numpy.errstate(divide='ignore'):
+        log_h = _log_gaussians(vectors, means, factors) + numpy.log(priors)
+    top = log_h.max(axis=1)
+    log_p = top + numpy.log(numpy.exp(log_h - top[:, None]).sum(axis=1))
+    return numpy.exp(log_h - log_p[:, None]), log_p.sum()
+
+
 def demo():
     """
     Non-interactive demonstration of the clusterers with simple 2-D data.
@@ -216,6 +256,20 @@ def demo():
     pdist = clusterer.classification_probdist(vector)
     for sample in pdist.samples():
         print('%s => %.0f%%' % (sample, pdist.prob(sample) * 100))
+    print()
+
+    # time the clustering of 100000 vectors around 5 random centres, with
+    # full and diagonal covariance matrices
+    from time import time
+
+    rng = numpy.random.RandomState(0)
+    centres = rng.randn(5, 10) * 3
+    vectors = centres[rng.randint(0, 5, 100000)] + rng.randn(100000, 10)
+    for diagonal in (False, True):
+        clusterer = cluster.EMClusterer(centres + 1, diagonal=diagonal)
+        start = time()
+        clusterer.cluster(vectors)
+        print('diagonal=%-5s %6.2fs' % (diagonal, time() - start))
 
 
 #
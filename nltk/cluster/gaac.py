@@ -6,6 +6,8 @@
 # For license information, see LICENSE.TXT
 from __future__ import print_function, unicode_literals, division
 
+import heapq
+
 try:
     import numpy
 except ImportError:
@@ -29,11 +31,38 @@ class GAAClusterer(VectorSpaceClusterer):
     efficient speed-up in the clustering process.
     """
 
-    def __init__(self, num_clusters=1, normalise=True, svd_dimensions=None):
+    def __init__(
+        self,
+        num_clusters=1,
+        normalise=True,
+        svd_dimensions=None,
+        dtype='float64',
+        num_neighbours=None,
+    ):
+        """
+        :param num_clusters: the number of clusters to stop merging at
+        :type num_clusters: int
+        :param normalise: should vectors be normalised to length 1
+        :type normalise: boolean
+        :param svd_dimensions: number of dimensions to use in reducing
+            vector dimensionsionality with SVD
+        :type svd_dimensions: int
+        :param dtype: the numpy type of the N x N distance matrix;
+            ``'float32'`` halves its size, but merges clusters whose
+            distances differ by less than its precision in arbitrary order
+        :type dtype: str
+        :param num_neighbours: if given, cluster approximately: only
+            merges of clusters that contain one of each other's
+            ``num_neighbours`` nearest vectors are considered, and no
+            N x N matrix is built
+        :type num_neighbours: int
+        """
         VectorSpaceClusterer.__init__(self, normalise, svd_dimensions)
         self._num_clusters = num_clusters
         self._dendrogram = None
         self._groups_values = None
+        self._dtype = dtype
+        self._num_neighbours = num_neighbours
 
     def cluster(self, vectors, assign_clusters=False, trace=False):
         # stores the merge order
@@ -43,21 +72,34 @@ class GAAClusterer(VectorSpaceClusterer):
         return VectorSpaceClusterer.cluster(self, vectors, assign_clusters, trace)
 
     def cluster_vectorspace(self, vectors, trace=False):
+        if self._num_neighbours is not None and self._num_neighbours < len(vectors) - 1:
+            self._cluster_approximately(vectors, trace)
+        else:
+            self._cluster_exactly(vectors, trace)
+        self.update_clusters(self._num_clusters)
+
+    def _cluster_exactly(self, vectors, trace=False):
         # variables describing the initial situation
         N = len(vectors)
         cluster_len = [1] * N
         cluster_count = N
-        index_map = numpy.arange(N)
+        positions = _Positions(N)
 
-        # construct the similarity matrix
-        dims = (N, N)
-        dist = numpy.ones(dims, dtype=numpy.float) * numpy.inf
-        for i in range(N):
-            for j in range(i + 1, N):
-                dist[i, j] = cosine_distance(vectors[i], vectors[j])
+        # construct the distance matrix, which holds the distance between
+        # clusters i and j at [i, j] for i < j, and infinity elsewhere
+        dist = _cosine_distances(vectors, self._dtype)
+
+        # the first of the nearest clusters after each cluster i (or -1),
+        # and its distance, so that the closest pair of clusters -- the
+        # first in row-major order, on ties -- is found without scanning
+        # the whole matrix
+        nearest = dist.argmin(axis=1)
+        nearest_dist = dist[numpy.arange(N), nearest]
+        nearest[nearest_dist == numpy.inf] = -1
 
         while cluster_count > max(self._num_clusters, 1):
-            i, j = numpy.unravel_index(dist.argmin(), dims)
+            i = int(nearest_dist.argmin())
+            j = int(nearest[i])
             if trace:
                 print("merging %d and %d" % (i, j))
 
@@ -70,15 +112,98 @@ class GAAClusterer(VectorSpaceClusterer):
 
             # merge the clusters
             cluster_len[i] = cluster_len[i] + cluster_len[j]
-            self._dendrogram.merge(index_map[i], index_map[j])
+            self._dendrogram.merge(positions.index(i), positions.index(j))
+            positions.remove(j)
             cluster_count -= 1
 
-            # update the index map to reflect the indexes if we
-            # had removed j
-            index_map[j + 1 :] -= 1
-            index_map[j] = N
+            # update the nearest clusters: the rows before i, whose
+            # distance to i changed, and the rows whose nearest cluster
+            # was i or j, which are searched again
+            nearest[j], nearest_dist[j] = -1, numpy.inf
+            before = nearest[:i]
+            stale = (before == i) | (before == j)
+            new_dist = dist[:i, i]
+            closer = ~stale & (
+                (new_dist < nearest_dist[:i])
+                | ((new_dist == nearest_dist[:i]) & (i < before))
+            )
+            before[closer] = i
+            nearest_dist[:i][closer] = new_dist[closer]
+            stale = numpy.flatnonzero(stale).tolist() + [i]
+            stale += (i + 1 + numpy.flatnonzero(nearest[i + 1 : j] == j)).tolist()
+            for k in stale:
+                nearest[k] = dist[k].argmin()
+                nearest_dist[k] = dist[k, nearest[k]]
+                if nearest_dist[k] == numpy.inf:
+                    nearest[k] = -1
+
+    def _cluster_approximately(self, vectors, trace=False):
+        # The group average cosine distance between two clusters is one
+        # minus the dot product of the sums of their (normalised)
+        # vectors, divided by the product of their sizes.  Only pairs of
+        # clusters linked through the nearest neighbours of their vectors
+        # are considered, in a heap of candidate merges.
+        N = len(vectors)
+        sums = _unit_rows(vectors)
+        cluster_len = numpy.ones(N)
+        cluster_count = N
+        positions = _Positions(N)
+
+        # candidates hold the number of merges into each of their
+        # clusters when pushed, and are stale once either has changed
+        version = [0] * N
+
+        def push(i, others):
+            distances = 1 - sums[others].dot(sums[i]) / (
+                cluster_len[i] * cluster_len[others]
+            )
+            for k, d in zip(others, distances.tolist()):
+                if k < i:
+                    heapq.heappush(heap, (d, k, i, version[k], version[i]))
+                else:
+                    heapq.heappush(heap, (d, i, k, version[i], version[k]))
+
+        links = [set() for i in range(N)]
+        for i, neighbours in enumerate(_nearest_neighbours(sums, self._num_neighbours)):
+            for j in neighbours:
+                links[i].add(j)
+                links[j].add(i)
+        heap = []
+        for i in range(N):
+            push(i, [j for j in links[i] if j > i])
+
+        while cluster_count > max(self._num_clusters, 1):
+            if not heap:
+                # link the clusters that no neighbours connect
+                remaining = [i for i in range(N) if version[i] >= 0]
+                for i in remaining:
+                    links[i].update(remaining)
+                    links[i].discard(i)
+                    push(i, [j for j in remaining if j > i])
+
+            d, i, j, version_i, version_j = heapq.heappop(heap)
+            if version_i != version[i] or version_j != version[j]:
+                continue
+            if trace:
+                print("merging %d and %d" % (i, j))
 
-        self.update_clusters(self._num_clusters)
+            # merge j into i
+            sums[i] += sums[j]
+            cluster_len[i] += cluster_len[j]
+            version[i] += 1
+            version[j] = -1
+            self._dendrogram.merge(positions.index(i), positions.index(j))
+            positions.remove(j)
+            cluster_count -= 1
+
+            # i's candidate merges are now those of i and j
+            neighbours = (links[i] | links[j]) - set((i, j))
+            for k in links[j]:
+                links[k].discard(j)
+            for k in neighbours:
+                links[k].add(i)
+            links[i], links[j] = neighbours, None
+            push(i, list(neighbours))
 
     def _merge_similarities(self, dist, cluster_len, i, j):
         # the new cluster i merged from i and j adopts the average of
@@ -140,6 +265,72 @@ class GAAClusterer(VectorSpaceClusterer):
         return '<GroupAverageAgglomerative Clusterer n=%d>' % self._num_clusters
 
 
+# the number of distances computed at a time
+_BLOCK_SIZE = 1 << 22
+
+
+def _unit_rows(vectors):
+    X = numpy.asarray(vectors, dtype=numpy.float64)
+    return X / numpy.sqrt((X * X).sum(axis=1))[:, None]
+
+
+def _cosine_distances(vectors, dtype):
+    """
+    The N x N matrix holding the cosine distance between vectors i and j
+    at [i, j] for i < j, and infinity elsewhere.
+    """
+    X = numpy.asarray(vectors, dtype=numpy.float64)
+    norms = numpy.sqrt((X * X).sum(axis=1))
+    N = len(X)
+    dist = numpy.empty((N, N), dtype)
+    columns = numpy.arange(N)
+    rows = max(1, _BLOCK_SIZE // N)
+    for start in range(0, N, rows):
+        end = min(start + rows, N)
+        block = 1 - X[start:end].dot(X.T) / numpy.outer(norms[start:end], norms)
+        block[columns <= columns[start:end, None]] = numpy.inf
+        dist[start:end] = block
+    return dist
+
+
+def _nearest_neighbours(X, k):
+    """
+    The indices of the k nearest neighbours of each of the unit vectors X.
+    """
+    N = len(X)
+    rows = max(1, _BLOCK_SIZE // N)
+    for start in range(0, N, rows):
+        end = min(start + rows, N)
+        similarity = X[start:end].dot(X.T)
+        similarity[numpy.arange(end - start), numpy.arange(start, end)] = -numpy.inf
+        for neighbours in numpy.argpartition(-similarity, k - 1, axis=1)[:, :k]:
+            yield neighbours.tolist()
+
+
+class _Positions(object):
+    """
+    The positions of the remaining clusters among the dendrogram's items,
+    which shift as clusters are merged away: a Fenwick tree counting the
+    remaining clusters before each one.
+    """
+
+    def __init__(self, n):
+        self._tree = [i & -i for i in range(n + 1)]
+
+    def index(self, i):
+        position = 0
+        while i > 0:
+            position += self._tree[i]
+            i -= i & -i
+        return position
+
+    def remove(self, i):
+        i += 1
+        while i < len(self._tree):
+            self._tree[i] -= 1
+            i += i & -i
+
+
 def demo():
     """
     Non-interactive demonstration of the clusterers with simple 2-D data.
@@ -168,6 +359,18 @@ def demo():
     print(clusterer.classify(vector))
     print()
 
+    # time the clustering of 2000 vectors around 10 random centres, exactly
+    # (in double and single precision) and approximately
+    from time import time
+
+    rng = numpy.random.RandomState(0)
+    centres = rng.randn(10, 20) * 3
+    vectors = list(centres[rng.randint(0, 10, 2000)] + rng.randn(2000, 20))
+    for options in ({}, {'dtype': 'float32'}, {'num_neighbours': 10}):
+        start = time()
+        GAAClusterer(10, **options).cluster(vectors)
+        print('%-24s %6.2fs' % (options, time() - start))
+
 
 if __name__ == '__main__':
     demo()
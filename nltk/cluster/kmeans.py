@@ -9,6 +9,7 @@ from __future__ import print_function, unicode_literals, division
 import copy
 import random
 import sys
+from functools import partial
 
 try:
     import numpy
@@ -16,8 +17,9 @@ except ImportError:
     pass
 
 
-from nltk.cluster.util import VectorSpaceClusterer
+from nltk.cluster.util import VectorSpaceClusterer, euclidean_distance, cosine_distance
 from nltk.compat import python_2_unicode_compatible
+from nltk.util import parallel_map
 
 
 @python_2_unicode_compatible
@@ -30,8 +32,23 @@ class KMeansClusterer(VectorSpaceClusterer):
     hill-climbing algorithm which may converge to a local maximum. Hence the
     clustering is often repeated with random initial means and the most
     commonly occurring output means are chosen.
+
+    The initial means are either vectors chosen at random, or chosen by
+    k-means++ seeding, which picks each mean with probability
+    proportional to its squared distance from the means already picked.
+    For large sets of vectors, mini-batch k-means moves the means
+    towards random batches of vectors instead of recomputing them from
+    all the vectors at every iteration.
+
+    With ``euclidean_distance`` or ``cosine_distance`` (and numpy), the
+    vectors are assigned to the means and the means recomputed with
+    matrix operations; with any other distance function, one vector and
+    one mean at a time.
     """
 
+    # The random number generator of the current trial's mini-batches.
+    _batch_rng = None
+
     def __init__(
         self,
         num_means,
@@ -43,6 +60,10 @@ class KMeansClusterer(VectorSpaceClusterer):
         svd_dimensions=None,
         rng=None,
         avoid_empty_clusters=False,
+        init_method='random',
+        batch_size=None,
+        max_iter=None,
+        processes=1,
     ):
 
         """
@@ -68,6 +89,21 @@ class KMeansClusterer(VectorSpaceClusterer):
                                      of next one; avoids undefined behavior
                                      when clusters become empty
         :type avoid_empty_clusters: boolean
+        :param init_method: how to choose the initial means: ``'random'``
+                            (distinct vectors chosen uniformly) or
+                            ``'k-means++'``
+        :type init_method: str
+        :param batch_size:  if given, run mini-batch k-means, moving the
+                            means towards this many randomly chosen
+                            vectors per iteration
+        :type batch_size:   int
+        :param max_iter:    the maximum number of iterations per trial
+                            (default: until convergence)
+        :type max_iter:     int
+        :param processes:   the number of processes that run the
+                            trials; the distance function must then be
+                            picklable (a module-level function)
+        :type processes:    int
         """
         VectorSpaceClusterer.__init__(self, normalise, svd_dimensions)
         self._num_means = num_means
@@ -80,19 +116,35 @@ class KMeansClusterer(VectorSpaceClusterer):
         self._repeats = repeats
         self._rng = rng if rng else random.Random()
         self._avoid_empty_clusters = avoid_empty_clusters
+        assert init_method in ('random', 'k-means++')
+        self._init_method = init_method
+        self._batch_size = batch_size
+        self._max_iter = max_iter
+        self._processes = processes
 
     def cluster_vectorspace(self, vectors, trace=False):
         if self._means and self._repeats > 1:
             print('Warning: means will be discarded for subsequent trials')
 
-        meanss = []
+        # Choose the initial means of all the trials first, and the seed
+        # of each trial's mini-batches, so that they do not depend on how
+        # the trials are run.
+        initial_meanss = []
+        seeds = []
         for trial in range(self._repeats):
-            if trace:
-                print('k-means trial', trial)
-            if not self._means or trial > 1:
-                self._means = self._rng.sample(list(vectors), self._num_means)
-            self._cluster_vectorspace(vectors, trace)
-            meanss.append(self._means)
+            if self._means and trial == 0:
+                initial_meanss.append(self._means)
+            else:
+                initial_meanss.append(self._initial_means(vectors))
+            seeds.append(self._rng.getrandbits(32) if self._batch_size else None)
+
+        processes = self._processes if self._repeats > 1 else 1
+        meanss = parallel_map(
+            partial(_kmeans_trial, self, vectors, trace),
+            zip(range(self._repeats), initial_meanss, seeds),
+            processes,
+        )
+        self._means = meanss[-1]
 
         if len(meanss) > 1:
             # sort the means first (so that different cluster numbering won't
@@ -113,33 +165,150 @@ class KMeansClusterer(VectorSpaceClusterer):
             # use the best means
             self._means = min_means
 
+    def _initial_means(self, vectors):
+        if self._init_method == 'random' or self._num_means >= len(vectors):
+            return self._rng.sample(list(vectors), self._num_means)
+
+        # k-means++: choose each mean with probability proportional to
+        # the squared distance to the closest mean chosen so far.
+        indices = [self._rng.randrange(len(vectors))]
+        if self._vectorised():
+            X = numpy.asarray(vectors, dtype=numpy.float64)
+            nearest = _distances(X, X[indices])[:, 0]
+        else:
+            first = vectors[indices[0]]
+            nearest = numpy.array([self._distance(v, first) for v in vectors])
+        while len(indices) < self._num_means:
+            weights = numpy.cumsum(nearest ** 2)
+            if not weights[-1] > 0:
+                # The remaining vectors all coincide with a mean.
+                index = self._rng.randrange(len(vectors))
+            else:
+                target = self._rng.random() * weights[-1]
+                index = numpy.searchsorted(weights, target, 'right')
+                index = min(int(index), len(vectors) - 1)
+            indices.append(index)
+            if self._vectorised():
+                distances = _distances(X, X[[index]])[:, 0]
+            else:
+                distances = [self._distance(v, vectors[index]) for v in vectors]
+            nearest = numpy.minimum(nearest, distances)
+        return [vectors[i] for i in indices]
+
+    def _vectorised(self):
+        return self._distance in _VECTORISED and 'numpy' in globals()
+
     def _cluster_vectorspace(self, vectors, trace=False):
         if self._num_means < len(vectors):
-            # perform k-means clustering
-            converged = False
-            while not converged:
-                # assign the tokens to clusters based on minimum distance to
-                # the cluster means
-                clusters = [[] for m in range(self._num_means)]
-                for vector in vectors:
-                    index = self.classify_vectorspace(vector)
-                    clusters[index].append(vector)
-
-                if trace:
-                    print('iteration')
-                # for i in range(self._num_means):
-                # print '  mean', i, 'allocated', len(clusters[i]), 'vectors'
-
-                # recalculate cluster means by computing the centroid of each cluster
-                new_means = list(map(self._centroid, clusters, self._means))
-
-                # measure the degree of change from the previous step for convergence
-                difference = self._sum_distances(self._means, new_means)
-                if difference < self._max_difference:
-                    converged = True
-
-                # remember the new means
-                self._means = new_means
+            if self._batch_size:
+                self._cluster_minibatch(vectors, trace)
+            elif self._vectorised():
+                self._cluster_matrix(vectors, trace)
+            else:
+                self._cluster_vectors(vectors, trace)
+
+    def _cluster_vectors(self, vectors, trace=False):
+        # perform k-means clustering
+        converged = False
+        iterations = 0
+        while not converged:
+            # assign the tokens to clusters based on minimum distance to
+            # the cluster means
+            clusters = [[] for m in range(self._num_means)]
+            for vector in vectors:
+                index = self.classify_vectorspace(vector)
+                clusters[index].append(vector)
+
+            if trace:
+                print('iteration')
+            # for i in range(self._num_means):
+            # print '  mean', i, 'allocated', len(clusters[i]), 'vectors'
+
+            # recalculate cluster means by computing the centroid of each cluster
+            new_means = list(map(self._centroid, clusters, self._means))
+
+            # measure the degree of change from the previous step for convergence
+            difference = self._sum_distances(self._means, new_means)
+            iterations += 1
+            if difference < self._max_difference or iterations == self._max_iter:
+                converged = True
+
+            # remember the new means
+            self._means = new_means
+
+    def _cluster_matrix(self, vectors, trace=False):
+        # k-means clustering, with the vectors as the rows of a matrix
+        X = numpy.asarray(vectors, dtype=numpy.float64)
+        squares = (X * X).sum(axis=1)
+        converged = False
+        iterations = 0
+        while not converged:
+            means = numpy.asarray(self._means, dtype=numpy.float64)
+            assignments = _nearest(X, means, self._distance, squares)[0]
+
+            if trace:
+                print('iteration')
+
+            sums, counts = _cluster_sums(X, assignments, self._num_means)
+            if self._avoid_empty_clusters:
+                new_means = (means + sums) / (1 + counts)[:, numpy.newaxis]
+            else:
+                empty = numpy.flatnonzero(counts == 0)
+                if len(empty):
+                    raise ValueError(
+                        'No centroid defined for empty cluster %d; try setting '
+                        'avoid_empty_clusters to True' % empty[0]
+                    )
+                new_means = sums / counts[:, numpy.newaxis]
+            new_means = list(new_means)
+
+            difference = self._sum_distances(self._means, new_means)
+            iterations += 1
+            if difference < self._max_difference or iterations == self._max_iter:
+                converged = True
+
+            self._means = new_means
+
+    def _cluster_minibatch(self, vectors, trace=False):
+        # mini-batch k-means: each mean is the running average of the
+        # vectors of all the batches that were assigned to it.
+        rng = self._batch_rng if self._batch_rng is not None else self._rng
+        vectorised = self._vectorised()
+        if vectorised:
+            vectors = numpy.asarray(vectors, dtype=numpy.float64)
+        means = numpy.array(self._means, dtype=numpy.float64)
+        counts = numpy.zeros(self._num_means)
+        batch_size = min(self._batch_size, len(vectors))
+        converged = False
+        iterations = 0
+        while not converged:
+            batch = rng.sample(range(len(vectors)), batch_size)
+            if vectorised:
+                X = vectors[batch]
+                assignments = _nearest(X, means, self._distance)[0]
+            else:
+                X = numpy.array([vectors[i] for i in batch], dtype=numpy.float64)
+                assignments = [self.classify_vectorspace(x) for x in X]
+                assignments = numpy.array(assignments, dtype=int)
+
+            if trace:
+                print('iteration')
+
+            sums, batch_counts = _cluster_sums(X, assignments, self._num_means)
+            new_counts = counts + batch_counts
+            new_means = means.copy()
+            hit = batch_counts > 0
+            new_means[hit] = (
+                counts[hit, numpy.newaxis] * means[hit] + sums[hit]
+            ) / new_counts[hit, numpy.newaxis]
+
+            difference = self._sum_distances(list(means), list(new_means))
+            iterations += 1
+            if difference < self._max_difference or iterations == self._max_iter:
+                converged = True
+
+            means, counts = new_means, new_counts
+            self._means = list(means)
 
     def classify_vectorspace(self, vector):
         # finds the closest cluster centroid
@@ -192,6 +361,75 @@ class KMeansClusterer(VectorSpaceClusterer):
         return '<KMeansClusterer means=%s repeats=%d>' % (self._means, self._repeats)
 
 
+#: The distance functions that ``_distances()`` implements with
+#: matrix operations.
+_VECTORISED = (euclidean_distance, cosine_distance)
+
+#: The number of vectors whose distances to the means are computed at
+#: once, to bound the memory used for the distance matrix.
+_BLOCK_SIZE = 4096
+
+
+def _kmeans_trial(clusterer, vectors, trace, trial_means):
+    trial, means, seed = trial_means
+    if trace:
+        print('k-means trial', trial)
+    clusterer._means = means
+    clusterer._batch_rng = None if seed is None else random.Random(seed)
+    clusterer._cluster_vectorspace(vectors, trace)
+    return clusterer._means
+
+
+def _distances(X, means, distance=euclidean_distance, squares=None):
+    """
+    The distance between each row of ``X`` and each row of ``means``,
+    as a matrix, for ``euclidean_distance`` or ``cosine_distance``.
+    ``squares`` may give the squared norms of the rows of ``X``.
+    """
+    if squares is None:
+        squares = (X * X).sum(axis=1)
+    products = numpy.dot(X, means.T)
+    mean_squares = (means * means).sum(axis=1)
+    if distance is cosine_distance:
+        return 1 - products / numpy.sqrt(numpy.outer(squares, mean_squares))
+    products *= -2
+    products += squares[:, numpy.newaxis]
+    products += mean_squares
+    return numpy.sqrt(numpy.maximum(products, 0))
+
+
+def _nearest(X, means, distance, squares=None):
+    """
+    The index of the nearest mean to each row of ``X`` (the first, on
+    ties), and the distance to it.
+    """
+    if squares is None:
+        squares = (X * X).sum(axis=1)
+    indices = numpy.empty(len(X), dtype=int)
+    distances = numpy.empty(len(X))
+    for start in range(0, len(X), _BLOCK_SIZE):
+        block = slice(start, start + _BLOCK_SIZE)
+        block_distances = _distances(X[block], means, distance, squares[block])
+        indices[block] = block_distances.argmin(axis=1)
+        distances[block] = block_distances[
+            numpy.arange(len(indices[block])), indices[block]
+        ]
+    return indices, distances
+
+
+def _cluster_sums(X, assignments, num_means):
+    """
+    The sum of the rows of ``X`` assigned to each mean, and their number.
+    """
+    sums = numpy.zeros((num_means, X.shape[1]))
+    means = numpy.arange(num_means)
+    for start in range(0, len(X), _BLOCK_SIZE):
+        block = slice(start, start + _BLOCK_SIZE)
+        members = assignments[block] == means[:, numpy.newaxis]
+        sums += numpy.dot(members.astype(numpy.float64), X[block])
+    return sums, numpy.bincount(assignments, minlength=num_means)
+
+
 #################################################################################
 
 
@@ -229,6 +467,29 @@ def demo():
     print(clusterer.classify(vector))
     print()
 
+    # time the clustering of 20000 vectors around 10 random centres, with
+    # the matrix operations for the euclidean distance, with a distance
+    # function that is clustered one vector at a time, and in mini-batches
+
+    from time import time
+
+    rng = numpy.random.RandomState(0)
+    centres = rng.randn(10, 20) * 3
+    vectors = list(centres[rng.randint(10, size=20000)] + rng.randn(20000, 20))
+
+    for name, distance, options in [
+        ('euclidean', euclidean_distance, {}),
+        ('euclidean, k-means++', euclidean_distance, {'init_method': 'k-means++'}),
+        ('custom distance', lambda u, v: euclidean_distance(u, v), {}),
+        ('mini-batch', euclidean_distance, {'batch_size': 1000, 'max_iter': 20}),
+    ]:
+        clusterer = KMeansClusterer(
+            10, distance, rng=random.Random(0), avoid_empty_clusters=True, **options
+        )
+        start = time()
+        clusterer.cluster(vectors)
+        print('%-22s %6.2fs' % (name, time() - start))
+
 
 if __name__ == '__main__':
     demo()
@@ -32,8 +32,10 @@ from nltk.metrics.distance import (
     custom_distance,
     presence,
     fractional_presence,
+    pairwise_distances,
 )
 from nltk.metrics.paice import Paice
+from nltk.metrics.stringindex import BKTree, NgramIndex
 from nltk.metrics.segmentation import windowdiff, ghd, pk
 from nltk.metrics.agreement import AnnotationTask
 from nltk.metrics.association import (
@@ -43,6 +43,13 @@ Pi (Scott 1955)
 
 TODO: Describe handling of multiple coders and missing data
 
+The metrics are computed from an integer-coded form of the data: a
+matrix of the label of each item by each coder, the label counts of
+each coder and of each item, and the matrix of distances between the
+labels, so that large annotation sets can be handled.  With NumPy, the
+metrics are computed with array operations; the pairwise results are
+kept until more data is loaded.
+
 Expected results from the Artstein and Poesio survey paper:
 
     >>> from nltk.metrics.agreement import AnnotationTask
@@ -82,8 +89,164 @@ from nltk.compat import python_2_unicode_compatible
 
 from nltk.metrics.distance import binary_distance
 
+try:
+    import numpy
+except ImportError:
+    pass
+
 log = logging.getLogger(__name__)
 
+# The greatest number of item by label counts that alpha() puts in a
+# matrix at a time.
+_MAX_BLOCK_SIZE = 2 ** 22
+
+
+class _EncodedData(object):
+    """
+    The data of an ``AnnotationTask`` with coders, items and labels
+    replaced by integer codes, in NumPy arrays, and the results that
+    have been computed from it.
+    """
+
+    def __init__(self, data):
+        self.size = len(data)
+        self.coders, self.coder_codes = self._encode(data, 'coder')
+        self.items, self.item_codes = self._encode(data, 'item')
+        self.labels, self.label_codes = self._encode(data, 'labels')
+        num_coders = len(self.coders)
+        num_labels = len(self.labels)
+
+        # The label of each item by each coder, or -1, and the position in
+        # the data of the first label of each item by each coder.
+        cells = self.item_codes * num_coders + self.coder_codes
+        cells, positions = numpy.unique(cells, return_index=True)
+        self.label_matrix = numpy.full((len(self.items), num_coders), -1)
+        self.label_matrix.flat[cells] = self.label_codes[positions]
+        self.position_matrix = numpy.zeros(self.label_matrix.shape, dtype=int)
+        self.position_matrix.flat[cells] = positions
+
+        # The number of times each coder assigned each label.
+        self.label_coder_counts = numpy.bincount(
+            self.label_codes * num_coders + self.coder_codes,
+            minlength=num_labels * num_coders,
+        ).reshape(num_labels, num_coders)
+
+        self.label_list = sorted(self.labels, key=self.labels.get)
+
+        self.distance = None
+        self.distance_matrix = None
+        self.cache = {}
+
+    @staticmethod
+    def _encode(data, field):
+        """
+        The code of each value of ``field`` in ``data``, and the array of
+        the codes of the values.
+        """
+        values = list(map(itemgetter(field), data))
+        codes = dict((value, i) for i, value in enumerate(set(values)))
+        array = numpy.fromiter(map(codes.__getitem__, values), int, len(values))
+        return codes, array
+
+    def use_distance(self, distance):
+        """
+        Compute the results from now on with ``distance``, forgetting the
+        results computed with another distance function.
+        """
+        if distance is not self.distance:
+            self.distance = distance
+            self.distance_matrix = None
+            self.cache = {}
+
+    def distances(self, distance):
+        """
+        The matrix of ``distance`` between each pair of labels.
+        """
+        self.use_distance(distance)
+        if self.distance_matrix is None:
+            labels = self.label_list
+            self.distance_matrix = numpy.array(
+                [[float(distance(j, l)) for l in labels] for j in labels]
+            ).reshape(len(labels), len(labels))
+        return self.distance_matrix
+
+    def pair_distances(self, distance, cA, cB):
+        """
+        The ``distance`` between the labels of the coders ``cA`` and ``cB``
+        on each item that either of them labeled, with the label that
+        comes first in the data as the first argument.  Unless the matrix
+        of all the distances has been computed, ``distance`` is only
+        called on the pairs of labels that occur.
+        """
+        self.use_distance(distance)
+        if cA not in self.coders or cB not in self.coders:
+            raise ValueError(
+                "Coders %r and %r did not label the same items" % (cA, cB)
+            )
+        a = self.label_matrix[:, self.coders[cA]]
+        b = self.label_matrix[:, self.coders[cB]]
+        labeled = (a >= 0) | (b >= 0)
+        if ((a >= 0) != (b >= 0)).any():
+            raise ValueError(
+                "Coders %r and %r did not label the same items" % (cA, cB)
+            )
+        first = (
+            self.position_matrix[labeled, self.coders[cA]]
+            < self.position_matrix[labeled, self.coders[cB]]
+        )
+        a, b = (
+            numpy.where(first, a[labeled], b[labeled]),
+            numpy.where(first, b[labeled], a[labeled]),
+        )
+        if self.distance_matrix is not None:
+            return self.distance_matrix[a, b]
+        pairs, inverse = numpy.unique(a * len(self.labels) + b, return_inverse=True)
+        labels = self.label_list
+        pair_distances = numpy.array(
+            [
+                float(distance(labels[j], labels[l]))
+                for j, l in zip(*divmod(pairs, len(self.labels)))
+            ]
+        )
+        return pair_distances[inverse].reshape(-1)
+
+    def coincidences(self):
+        """
+        The coincidence matrix of the labels on the items with at least two
+        labels: the number of pairs of labels of each item that are each
+        pair of labels, with each item weighted by one over its number of
+        labels minus one, and the number of times that each label was
+        assigned to those items.
+        """
+        if 'coincidences' not in self.cache:
+            num_labels = len(self.labels)
+            item_counts = numpy.bincount(self.item_codes, minlength=len(self.items))
+            valid = item_counts[self.item_codes] >= 2
+            item_codes = self.item_codes[valid]
+            label_codes = self.label_codes[valid]
+            label_counts = numpy.bincount(label_codes, minlength=num_labels)
+
+            order = numpy.argsort(item_codes, kind='mergesort')
+            item_codes = item_codes[order]
+            label_codes = label_codes[order]
+            coincidences = numpy.zeros((num_labels, num_labels))
+            block_size = max(1, _MAX_BLOCK_SIZE // num_labels)
+            items = numpy.unique(item_codes)
+            for start in range(0, len(items), block_size):
+                block_items = items[start : start + block_size]
+                lo, hi = numpy.searchsorted(
+                    item_codes, [block_items[0], block_items[-1] + 1]
+                )
+                rows = numpy.searchsorted(block_items, item_codes[lo:hi])
+                counts = numpy.bincount(
+                    rows * num_labels + label_codes[lo:hi],
+                    minlength=len(block_items) * num_labels,
+                ).reshape(len(block_items), num_labels)
+                weights = 1.0 / (item_counts[block_items] - 1)
+                coincidences += counts.T.dot(counts * weights[:, None])
+            self.cache['coincidences'] = coincidences, label_counts
+        return self.cache['coincidences']
+
 
 @python_2_unicode_compatible
 class AnnotationTask(object):
@@ -115,6 +278,7 @@ class AnnotationTask(object):
         self.K = set()
         self.C = set()
         self.data = []
+        self._encoded = None
         if data is not None:
             self.load_array(data)
 
@@ -138,6 +302,30 @@ class AnnotationTask(object):
             self.K.add(labels)
             self.I.add(item)
             self.data.append({'coder': coder, 'labels': labels, 'item': item})
+        self._encoded = None
+
+    def _encoded_data(self):
+        """
+        The integer-coded form of the data, or None without NumPy.
+        """
+        try:
+            numpy
+        except NameError:
+            return None
+        if self._encoded is None or self._encoded.size != len(self.data):
+            self._encoded = _EncodedData(self.data)
+        return self._encoded
+
+    def _pairwise_result(self, encoded, name, cA, cB, function):
+        """
+        The result of ``function(encoded)`` for the coders ``cA`` and ``cB``,
+        computed once for the current data and distance function.
+        """
+        encoded.use_distance(self.distance)
+        key = (name, cA, cB)
+        if key not in encoded.cache:
+            encoded.cache[key] = function(encoded)
+        return encoded.cache[key]
 
     def agr(self, cA, cB, i, data=None):
         """Agreement between two coders on a given item
@@ -164,12 +352,34 @@ class AnnotationTask(object):
         return ret
 
     def Nk(self, k):
+        encoded = self._encoded_data()
+        if encoded is not None:
+            if k not in encoded.labels:
+                return 0.0
+            return float(encoded.label_coder_counts[encoded.labels[k]].sum())
         return float(sum(1 for x in self.data if x['labels'] == k))
 
     def Nik(self, i, k):
+        encoded = self._encoded_data()
+        if encoded is not None:
+            if i not in encoded.items or k not in encoded.labels:
+                return 0.0
+            return float(
+                (
+                    (encoded.item_codes == encoded.items[i])
+                    & (encoded.label_codes == encoded.labels[k])
+                ).sum()
+            )
         return float(sum(1 for x in self.data if x['item'] == i and x['labels'] == k))
 
     def Nck(self, c, k):
+        encoded = self._encoded_data()
+        if encoded is not None:
+            if c not in encoded.coders or k not in encoded.labels:
+                return 0.0
+            return float(
+                encoded.label_coder_counts[encoded.labels[k], encoded.coders[c]]
+            )
         return float(sum(1 for x in self.data if x['coder'] == c and x['labels'] == k))
 
     @deprecated('Use Nk, Nik or Nck instead')
@@ -198,12 +408,23 @@ class AnnotationTask(object):
         """Observed agreement between two coders on all items.
 
         """
-        data = self._grouped_data(
-            'item', (x for x in self.data if x['coder'] in (cA, cB))
-        )
-        ret = sum(self.agr(cA, cB, item, item_data) for item, item_data in data) / len(
-            self.I
-        )
+        encoded = self._encoded_data()
+        if encoded is not None:
+            agreement = self._pairwise_result(
+                encoded,
+                'Ao',
+                cA,
+                cB,
+                lambda e: float((1.0 - e.pair_distances(self.distance, cA, cB)).sum()),
+            )
+            ret = agreement / len(self.I)
+        else:
+            data = self._grouped_data(
+                'item', (x for x in self.data if x['coder'] in (cA, cB))
+            )
+            ret = sum(
+                self.agr(cA, cB, item, item_data) for item, item_data in data
+            ) / len(self.I)
         log.debug("Observed agreement between %s and %s: %f", cA, cB, ret)
         return ret
 
@@ -234,11 +455,23 @@ class AnnotationTask(object):
         """The observed disagreement for the weighted kappa coefficient.
 
         """
-        total = 0.0
-        data = (x for x in self.data if x['coder'] in (cA, cB))
-        for i, itemdata in self._grouped_data('item', data):
-            # we should have two items; distance doesn't care which comes first
-            total += self.distance(next(itemdata)['labels'], next(itemdata)['labels'])
+        encoded = self._encoded_data()
+        if encoded is not None:
+            total = self._pairwise_result(
+                encoded,
+                'Do_Kw',
+                cA,
+                cB,
+                lambda e: float(e.pair_distances(self.distance, cA, cB).sum()),
+            )
+        else:
+            total = 0.0
+            data = (x for x in self.data if x['coder'] in (cA, cB))
+            for i, itemdata in self._grouped_data('item', data):
+                # we should have two items; distance doesn't care which comes first
+                total += self.distance(
+                    next(itemdata)['labels'], next(itemdata)['labels']
+                )
 
         ret = total / (len(self.I) * max_distance)
         log.debug("Observed disagreement between %s and %s: %f", cA, cB, ret)
@@ -268,16 +501,30 @@ class AnnotationTask(object):
         Equivalent to K from Siegel and Castellan (1988).
 
         """
-        total = 0.0
-        label_freqs = FreqDist(x['labels'] for x in self.data)
-        for k, f in iteritems(label_freqs):
-            total += f ** 2
+        encoded = self._encoded_data()
+        if encoded is not None:
+            label_freqs = encoded.label_coder_counts.sum(axis=1)
+            total = float((label_freqs ** 2).sum())
+        else:
+            total = 0.0
+            label_freqs = FreqDist(x['labels'] for x in self.data)
+            for k, f in iteritems(label_freqs):
+                total += f ** 2
         Ae = total / ((len(self.I) * len(self.C)) ** 2)
         return (self.avg_Ao() - Ae) / (1 - Ae)
 
     def Ae_kappa(self, cA, cB):
         Ae = 0.0
         nitems = float(len(self.I))
+        encoded = self._encoded_data()
+        if encoded is not None:
+            if cA not in encoded.coders or cB not in encoded.coders:
+                # A coder without annotations has no label frequencies.
+                return Ae
+            label_freqs = encoded.label_coder_counts
+            freqs_a = label_freqs[:, encoded.coders[cA]] / nitems
+            freqs_b = label_freqs[:, encoded.coders[cB]] / nitems
+            return float((freqs_a * freqs_b).sum())
         label_freqs = ConditionalFreqDist((x['labels'], x['coder']) for x in self.data)
         for k in label_freqs.conditions():
             Ae += (label_freqs[k][cA] / nitems) * (label_freqs[k][cB] / nitems)
@@ -328,6 +575,19 @@ class AnnotationTask(object):
         if len(self.C) == 1 and len(self.I) == 1:
             raise ValueError("Cannot calculate alpha, only one coder and item present!")
 
+        encoded = self._encoded_data()
+        if encoded is not None:
+            distances = encoded.distances(self.distance)
+            coincidences, label_freqs = encoded.coincidences()
+            # the coincidence matrix is symmetric, so the order of the
+            # labels doesn't matter
+            total_do = float((coincidences * distances).sum())
+            total_labels = int(label_freqs.sum())
+            do = total_do / total_labels
+            pairs = float(label_freqs.dot(distances).dot(label_freqs))
+            de = 1.0 * pairs / (total_labels * (total_labels - 1))
+            return 1.0 - do / de
+
         total_disagreement = 0.0
         total_ratings = 0
         all_valid_labels_freq = FreqDist([])
@@ -353,13 +613,26 @@ class AnnotationTask(object):
         """Cohen 1968
 
         """
-        total = 0.0
-        label_freqs = ConditionalFreqDist(
-            (x['coder'], x['labels']) for x in self.data if x['coder'] in (cA, cB)
-        )
-        for j in self.K:
-            for l in self.K:
-                total += label_freqs[cA][j] * label_freqs[cB][l] * self.distance(j, l)
+        encoded = self._encoded_data()
+        if encoded is not None and not (cA in encoded.coders and cB in encoded.coders):
+            # A coder without annotations has no label frequencies.
+            total = 0.0
+        elif encoded is not None:
+            distances = encoded.distances(self.distance)
+            label_freqs = encoded.label_coder_counts
+            freqs_a = label_freqs[:, encoded.coders[cA]]
+            freqs_b = label_freqs[:, encoded.coders[cB]]
+            total = float(freqs_a.dot(distances).dot(freqs_b))
+        else:
+            total = 0.0
+            label_freqs = ConditionalFreqDist(
+                (x['coder'], x['labels']) for x in self.data if x['coder'] in (cA, cB)
+            )
+            for j in self.K:
+                for l in self.K:
+                    total += (
+                        label_freqs[cA][j] * label_freqs[cB][l] * self.distance(j, l)
+                    )
         De = total / (max_distance * pow(len(self.I), 2))
         log.debug("Expected disagreement between %s and %s: %f", cA, cB, De)
         Do = self.Do_Kw_pairwise(cA, cB)
@@ -25,6 +25,13 @@ from __future__ import division
 
 import warnings
 import operator
+from functools import partial
+
+try:
+    import numpy
+except ImportError:
+    pass
+
 
 def _edit_dist_init(len1, len2):
     lev = []
@@ -58,7 +65,110 @@ def _edit_dist_step(lev, i, j, s1, s2, substitution_cost=1, transpositions=False
     lev[i][j] = min(a, b, c, d)
 
 
-def edit_distance(s1, s2, substitution_cost=1, transpositions=False):
+def _edit_dist_pattern(s1):
+    """
+    The bitmasks of the positions of each item of ``s1``, for
+    ``_bit_parallel_edit_distance``.
+    """
+    pattern = {}
+    for i, c in enumerate(s1):
+        pattern[c] = pattern.get(c, 0) | 1 << i
+    return pattern
+
+
+def _bit_parallel_edit_distance(pattern, len1, s2, transpositions, max_dist):
+    """
+    The edit distance with unit costs between a sequence of length
+    ``len1``, whose positions are given by ``pattern``, and ``s2``.
+
+    A column of the dynamic programming matrix of ``edit_distance`` is
+    kept as two bit vectors of the positions where the distance goes up
+    or down by one from the cell above, so that a whole column is
+    computed with a few operations on integers:
+
+        Heikki Hyyrö (2001). Explaining and extending the bit-parallel
+        approximate string matching algorithm of Myers.
+
+        Heikki Hyyrö (2002). Bit-parallel approximate string matching
+        algorithms with transposition.
+
+    Returns ``max_dist + 1`` as soon as the distance is known to be
+    greater than ``max_dist``.
+    """
+    if len1 == 0:
+        return len(s2)
+    mask = (1 << len1) - 1
+    last = 1 << len1 - 1
+    vp = mask  # the distance goes up by one from the cell above
+    vn = 0  # the distance goes down by one from the cell above
+    d0 = 0  # the distance is the same as in the cell above and to the left
+    prev_eq = 0
+    distance = len1
+    remaining = len(s2)
+    for c in s2:
+        eq = pattern.get(c, 0)
+        if transpositions:
+            # the diagonal is also the same where the transposition of this
+            # and the previous item of s2 matches
+            d0 = (((~d0 & eq) << 1) & prev_eq) | (((eq & vp) + vp) ^ vp) | eq | vn
+            prev_eq = eq
+        else:
+            d0 = (((eq & vp) + vp) ^ vp) | eq | vn
+        hp = vn | ~(d0 | vp) & mask
+        hn = vp & d0
+        if hp & last:
+            distance += 1
+        elif hn & last:
+            distance -= 1
+        remaining -= 1
+        if max_dist is not None and distance - remaining > max_dist:
+            return max_dist + 1
+        hp = (hp << 1 | 1) & mask
+        hn = (hn << 1) & mask
+        vp = hn | ~(d0 | hp) & mask
+        vn = hp & d0
+    return distance
+
+
+def _banded_edit_distance(s1, s2, substitution_cost, transpositions, max_dist):
+    """
+    ``edit_distance`` with a dynamic programming matrix of one row at a
+    time, of which only the cells within ``max_dist`` of the diagonal are
+    computed when ``max_dist`` is given: reaching the others takes more
+    than ``max_dist`` insertions or deletions.
+    """
+    len1 = len(s1)
+    len2 = len(s2)
+    inf = float('inf')
+    band = len1 + len2 if max_dist is None else max_dist
+    prev_row = None
+    row = [j if j <= band else inf for j in range(len2 + 1)]
+    for i in range(1, len1 + 1):
+        prev_prev_row, prev_row = prev_row, row
+        row = [inf] * (len2 + 1)
+        if i <= band:
+            row[0] = i
+        c1 = s1[i - 1]
+        for j in range(max(1, i - band), min(len2, i + band) + 1):
+            c2 = s2[j - 1]
+            # skipping a character in s1, in s2, or substitution
+            a = prev_row[j] + 1
+            b = row[j - 1] + 1
+            c = prev_row[j - 1] + (substitution_cost if c1 != c2 else 0)
+            # transposition
+            d = c + 1  # never picked by default
+            if transpositions and i > 1 and j > 1:
+                if s1[i - 2] == c2 and s2[j - 2] == c1:
+                    d = prev_prev_row[j - 2] + 1
+            row[j] = min(a, b, c, d)
+        if max_dist is not None and min(row) > max_dist:
+            return max_dist + 1
+    if max_dist is not None and row[len2] > max_dist:
+        return max_dist + 1
+    return row[len2]
+
+
+def edit_distance(s1, s2, substitution_cost=1, transpositions=False, max_dist=None):
     """
     Calculate the Levenshtein edit-distance between two strings.
     The edit distance is the number of characters that need to be
@@ -75,32 +185,38 @@ def edit_distance(s1, s2, substitution_cost=1, transpositions=False):
     This also optionally allows transposition edits (e.g., "ab" -> "ba"),
     though this is disabled by default.
 
+    When only distances up to some maximum matter, as when looking for
+    spelling candidates, ``max_dist`` stops the computation as soon as
+    the distance is known to be greater, and ``max_dist + 1`` is returned.
+
+        >>> edit_distance("rain", "shine")
+        3
+        >>> edit_distance("rain", "shine", max_dist=2)
+        3
+        >>> edit_distance("rain", "shine", max_dist=1)
+        2
+
     :param s1, s2: The strings to be analysed
     :param transpositions: Whether to allow transposition edits
+    :param max_dist: The greatest distance of interest
     :type s1: str
     :type s2: str
     :type substitution_cost: int
     :type transpositions: bool
+    :type max_dist: int
     :rtype int
     """
-    # set up a 2-D array
-    len1 = len(s1)
-    len2 = len(s2)
-    lev = _edit_dist_init(len1 + 1, len2 + 1)
-
-    # iterate over the array
-    for i in range(len1):
-        for j in range(len2):
-            _edit_dist_step(
-                lev,
-                i + 1,
-                j + 1,
-                s1,
-                s2,
-                substitution_cost=substitution_cost,
-                transpositions=transpositions,
+    if max_dist is not None and abs(len(s1) - len(s2)) > max_dist:
+        return max_dist + 1
+    if substitution_cost == 1:
+        # with unit costs, the rows can be computed as bit vectors
+        try:
+            return _bit_parallel_edit_distance(
+                _edit_dist_pattern(s1), len(s1), s2, transpositions, max_dist
             )
-    return lev[len1][len2]
+        except TypeError:  # unhashable items
+            pass
+    return _banded_edit_distance(s1, s2, substitution_cost, transpositions, max_dist)
 
 
 def _edit_dist_backtrace(lev):
@@ -304,16 +420,32 @@ def jaro_similarity(s1, s2):
     flagged_1 = []  # positions in s1 which are matches to some character in s2
     flagged_2 = []  # positions in s2 which are matches to some character in s1
 
+    # The positions of each character in s2, and the index of the first
+    # of them that is neither matched yet nor before the match bounds.
+    # As the bounds only move forward and each character is matched at
+    # its first such position, the positions before it are never looked
+    # at again.
+    positions_2 = {}
+    for j, c in enumerate(s2):
+        positions_2.setdefault(c, []).append(j)
+    next_position = dict.fromkeys(positions_2, 0)
+
     # Iterate through sequences, check for matches and compute transpositions.
-    for i in range(len_s1):  # Iterate through each character.
+    for i, c in enumerate(s1):  # Iterate through each character.
+        positions = positions_2.get(c)
+        if positions is None:
+            continue
         upperbound = min(i + match_bound, len_s2 - 1)
         lowerbound = max(0, i - match_bound)
-        for j in range(lowerbound, upperbound + 1):
-            if s1[i] == s2[j] and j not in flagged_2:
-                matches += 1
-                flagged_1.append(i)
-                flagged_2.append(j)
-                break
+        k = next_position[c]
+        while k < len(positions) and positions[k] < lowerbound:
+            k += 1
+        if k < len(positions) and positions[k] <= upperbound:
+            matches += 1
+            flagged_1.append(i)
+            flagged_2.append(positions[k])
+            k += 1
+        next_position[c] = k
     flagged_2.sort()
     for i, j in zip(flagged_1, flagged_2):
         if s1[i] != s2[j]:
@@ -451,6 +583,44 @@ def jaro_winkler_similarity(s1, s2, p=0.1, max_l=4):
     return jaro_sim + (l * p * (1 - jaro_sim))
 
 
+def pairwise_distances(list_a, list_b, metric=edit_distance):
+    """
+    The distances between each item of ``list_a`` and each item of
+    ``list_b``, as a NumPy array with a row for each item of ``list_a``.
+
+    With the default ``metric``, the bit vectors of each item of
+    ``list_a`` are computed only once for the whole row.
+
+        >>> from nltk.metrics.distance import pairwise_distances
+        >>> pairwise_distances(["rain", "shine"], ["rain", "shine", "sin"])
+        array([[0., 3., 2.],
+               [3., 0., 2.]])
+
+    :param list_a, list_b: The items to compare
+    :param metric: A function of two items that returns their distance,
+        such as ``edit_distance``, or a similarity, such as
+        ``jaro_similarity``.
+    :rtype: numpy.ndarray
+    """
+    list_b = list(list_b)
+    distances = numpy.empty((len(list_a), len(list_b)))
+    for i, a in enumerate(list_a):
+        distance = partial(metric, a)
+        if metric is edit_distance:
+            try:
+                distance = partial(
+                    _bit_parallel_edit_distance,
+                    _edit_dist_pattern(a),
+                    len(a),
+                    transpositions=False,
+                    max_dist=None,
+                )
+            except TypeError:  # unhashable items
+                pass
+        distances[i] = [distance(b) for b in list_b]
+    return distances
+
+
 def demo():
     string_distance_examples = [
         ("rain", "shine"),
@@ -482,6 +652,42 @@ def demo():
     print("Jaccard distance:", jaccard_distance(s1, s2))
     print("MASI distance:", masi_distance(s1, s2))
 
+    # Time the string distances on random pairs of word-like strings
+    import random
+    import time
+
+    rng = random.Random(0)
+    words = [
+        ''.join(rng.choice('etaoinshrdlu') for _ in range(rng.randint(3, 12)))
+        for _ in range(1000)
+    ]
+    pairs = list(zip(words, reversed(words)))
+    for name, function in [
+        ("edit_distance", edit_distance),
+        (
+            "edit_distance with transpositions",
+            partial(edit_distance, transpositions=True),
+        ),
+        (
+            "edit_distance with substitution_cost=2",
+            partial(edit_distance, substitution_cost=2),
+        ),
+        ("edit_distance with max_dist=2", partial(edit_distance, max_dist=2)),
+        ("edit_distance_align", edit_distance_align),
+        ("jaro_similarity", jaro_similarity),
+        ("jaro_winkler_similarity", jaro_winkler_similarity),
+    ]:
+        start = time.time()
+        for _ in range(10):
+            for s1, s2 in pairs:
+                function(s1, s2)
+        microseconds = (time.time() - start) * 1e5 / len(pairs)
+        print("%s: %.1fus per pair" % (name, microseconds))
+    start = time.time()
+    pairwise_distances(words[:100], words)
+    microseconds = (time.time() - start) * 1e4 / len(words)
+    print("pairwise_distances: %.1fus per pair" % microseconds)
+
 
 if __name__ == '__main__':
     demo()
@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+# Natural Language Toolkit: Approximate String Matching Indexes
+#
+# Copyright (C) 2001-2019 NLTK Project
+# URL: <http://nltk.org/>
+# For license information, see LICENSE.TXT
+
+"""
+Indexes of a vocabulary for finding the words that are close to a query
+word, such as the spelling corrections of a misspelled word, without
+computing the distance from the query to every word.
+
+``BKTree`` works with any metric, such as ``edit_distance``.
+``NgramIndex`` works with character n-grams: it finds the words whose
+n-gram sets are within a ``jaccard_distance`` of the query's, and uses
+the n-grams that words share to rule out most words before computing
+their ``edit_distance``.
+
+    >>> from nltk.metrics.stringindex import BKTree, NgramIndex
+    >>> vocabulary = ['rain', 'brain', 'train', 'shine', 'shin', 'spain', 'rainy']
+    >>> tree = BKTree(vocabulary)
+    >>> tree.within('rein', 1)
+    [(1, 'rain')]
+    >>> tree.nearest('sprain', 2)
+    [(1, 'spain'), (2, 'brain')]
+    >>> index = NgramIndex(vocabulary)
+    >>> index.within('rein', 2)
+    [(1, 'rain'), (2, 'brain'), (2, 'rainy'), (2, 'shin'), (2, 'train')]
+    >>> index.similar('rainn', 0.3) # doctest: +ELLIPSIS
+    [(0.166..., 'rain')]
+
+Both can be built from a corpus word list and saved for reuse, for
+example to suggest spelling corrections, or lemmas for words that
+WordNet's ``morphy`` does not find:
+
+    >>> from nltk.corpus import words, wordnet
+    >>> tree = BKTree(words.words()) # doctest: +SKIP
+    >>> tree.save('words.pickle') # doctest: +SKIP
+    >>> lemmas = BKTree(wordnet.all_lemma_names()) # doctest: +SKIP
+    >>> lemmas.nearest('recieve') # doctest: +SKIP
+    [(2, 'receive')]
+"""
+from __future__ import division, print_function
+
+import heapq
+import pickle
+from collections import defaultdict
+
+from nltk.metrics.distance import (
+    _bit_parallel_edit_distance,
+    _edit_dist_pattern,
+    edit_distance,
+)
+from nltk.util import ngrams
+
+
+def _distances_from(word, distance):
+    """
+    ``distance`` from ``word`` as a function of the other word and
+    optionally of the greatest distance of interest, ``max_dist``.  For
+    ``edit_distance``, the bit vectors of ``word`` are computed once.
+    """
+    if distance is edit_distance:
+        try:
+            pattern = _edit_dist_pattern(word)
+        except TypeError:  # unhashable items
+            pass
+        else:
+            length = len(word)
+
+            def distance_from(other, max_dist=None):
+                if max_dist is not None and abs(len(other) - length) > max_dist:
+                    return max_dist + 1
+                return _bit_parallel_edit_distance(
+                    pattern, length, other, False, max_dist
+                )
+
+            return distance_from
+
+    def distance_from(other, max_dist=None):
+        return distance(word, other)
+
+    return distance_from
+
+
+class _StringIndex(object):
+    """
+    The methods that the indexes share.
+    """
+
+    def __len__(self):
+        return len(self._words)
+
+    def __iter__(self):
+        return iter(self._words)
+
+    def __contains__(self, word):
+        return bool(self.within(word, 0))
+
+    def save(self, path):
+        """
+        Save the index to the file ``path``.  The distance function is
+        saved by reference, so it must be a module-level function.
+
+        :type path: str
+        """
+        with open(path, 'wb') as fp:
+            pickle.dump(self, fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index saved with ``save()``.  Only load files that you
+        trust, since they are pickles.
+
+        :type path: str
+        """
+        with open(path, 'rb') as fp:
+            return pickle.load(fp)
+
+
+class BKTree(_StringIndex):
+    """
+    A Burkhard-Keller tree of words under a metric.  Each child of a
+    word is at a different distance from it, and all the words in the
+    subtree of that child are at that distance from it, so that by the
+    triangle inequality, only the subtrees at distances close enough to
+    the distance from the query need to be searched.
+
+        Walter A. Burkhard and Robert M. Keller (1973). Some approaches
+        to best-match file searching. Communications of the ACM 16 (4).
+
+    :param words: The words to index
+    :param distance: A metric on the words, by default ``edit_distance``
+    """
+
+    def __init__(self, words=(), distance=edit_distance):
+        self._distance = distance
+        self._words = []
+        # the index of the child of each word at each distance from it
+        self._children = []
+        self.update(words)
+
+    def add(self, word):
+        """
+        Add ``word`` to the tree, if it is not in it yet.
+        """
+        if not self._words:
+            self._words.append(word)
+            self._children.append({})
+            return
+        distance_from = _distances_from(word, self._distance)
+        node = 0
+        while True:
+            distance = distance_from(self._words[node])
+            if distance == 0:
+                return
+            children = self._children[node]
+            if distance not in children:
+                children[distance] = len(self._words)
+                self._words.append(word)
+                self._children.append({})
+                return
+            node = children[distance]
+
+    def update(self, words):
+        """
+        Add each of ``words`` to the tree.
+        """
+        for word in words:
+            self.add(word)
+
+    def within(self, query, radius):
+        """
+        The words within ``radius`` of ``query``.
+
+        :return: The distance of each of the words, and the word, in
+            increasing order
+        :rtype: list(tuple(int, str))
+        """
+        distance_from = _distances_from(query, self._distance)
+        results = []
+        nodes = [0] if self._words else []
+        while nodes:
+            node = nodes.pop()
+            children = self._children[node]
+            # Only the exact distances up to this one make a difference.
+            max_dist = radius + max(children) if children else radius
+            distance = distance_from(self._words[node], max_dist)
+            if distance <= radius:
+                results.append((distance, self._words[node]))
+            for child_distance, child in children.items():
+                if abs(child_distance - distance) <= radius:
+                    nodes.append(child)
+        results.sort()
+        return results
+
+    def nearest(self, query, k=1, max_dist=None):
+        """
+        The ``k`` words nearest to ``query``, of those within
+        ``max_dist`` of it, if given.  Ties are broken by the order of
+        the words.
+
+        :return: The distance of each of the words, and the word, in
+            increasing order
+        :rtype: list(tuple(int, str))
+        """
+        distance_from = _distances_from(query, self._distance)
+        radius = float('inf') if max_dist is None else max_dist
+        results = []
+        # the negated distances of the k nearest words so far
+        nearest = []
+        # the subtrees to search, by the least distance of their words
+        nodes = [(0, 0)] if self._words else []
+        while nodes:
+            bound, node = heapq.heappop(nodes)
+            if bound > radius:
+                break
+            children = self._children[node]
+            max_dist = None
+            if radius != float('inf'):
+                max_dist = radius + max(children) if children else radius
+            distance = distance_from(self._words[node], max_dist)
+            if distance <= radius:
+                results.append((distance, self._words[node]))
+                heapq.heappush(nearest, -distance)
+                if len(nearest) > k:
+                    heapq.heappop(nearest)
+                if len(nearest) == k:
+                    radius = -nearest[0]
+            for child_distance, child in children.items():
+                bound = abs(child_distance - distance)
+                if bound <= radius:
+                    heapq.heappush(nodes, (bound, child))
+        results.sort()
+        return results[:k]
+
+
+class NgramIndex(_StringIndex):
+    """
+    An inverted index from the character n-grams of words, padded at
+    both ends, to the words that they occur in.
+
+    The words within an ``edit_distance`` of ``radius`` from a query
+    share at least ``max(len(query), len(word)) + n - 1 - radius * n``
+    n-grams with it, since each edit changes at most ``n`` n-grams, so
+    the other words are ruled out without computing their distance.
+
+        Esko Ukkonen (1992). Approximate string-matching with q-grams
+        and maximal matches. Theoretical Computer Science 92 (1).
+
+    :param words: The words to index
+    :param n: The length of the n-grams
+    """
+
+    def __init__(self, words=(), n=2):
+        self._n = n
+        self._words = []
+        self._word_ids = {}
+        # the number of different n-grams of each word
+        self._sizes = []
+        # the ids of the words of each length
+        self._lengths = defaultdict(list)
+        # the ids of the words that each n-gram occurs in, with the
+        # number of times that it does
+        self._postings = defaultdict(list)
+        self.update(words)
+
+    def _ngram_counts(self, word):
+        counts = defaultdict(int)
+        for ngram in ngrams(word, self._n, pad_left=True, pad_right=True):
+            counts[ngram] += 1
+        return counts
+
+    def add(self, word):
+        """
+        Add ``word`` to the index, if it is not in it yet.
+        """
+        if word in self._word_ids:
+            return
+        word_id = len(self._words)
+        self._words.append(word)
+        self._word_ids[word] = word_id
+        counts = self._ngram_counts(word)
+        self._sizes.append(len(counts))
+        self._lengths[len(word)].append(word_id)
+        for ngram, count in counts.items():
+            self._postings[ngram].append((word_id, count))
+
+    def update(self, words):
+        """
+        Add each of ``words`` to the index.
+        """
+        for word in words:
+            self.add(word)
+
+    def _shared(self, counts):
+        """
+        The number of different n-grams, and of n-grams, that each word
+        shares with the n-gram ``counts`` of a query, for the words that
+        share any.
+        """
+        shared_ngrams = defaultdict(int)
+        shared_counts = defaultdict(int)
+        for ngram, count in counts.items():
+            for word_id, word_count in self._postings.get(ngram, ()):
+                shared_ngrams[word_id] += 1
+                shared_counts[word_id] += min(count, word_count)
+        return shared_ngrams, shared_counts
+
+    def similar(self, query, max_distance=0.5):
+        """
+        The words whose sets of n-grams are within a ``jaccard_distance``
+        of ``max_distance`` from that of ``query``.
+
+        :return: The Jaccard distance of each of the words, and the word,
+            in increasing order
+        :rtype: list(tuple(float, str))
+        """
+        counts = self._ngram_counts(query)
+        shared_ngrams, _ = self._shared(counts)
+        if max_distance >= 1:
+            word_ids = range(len(self._words))
+        else:
+            word_ids = shared_ngrams
+        results = []
+        for word_id in word_ids:
+            shared = shared_ngrams.get(word_id, 0)
+            union = len(counts) + self._sizes[word_id] - shared
+            distance = (union - shared) / union
+            if distance <= max_distance:
+                results.append((distance, self._words[word_id]))
+        results.sort()
+        return results
+
+    def within(self, query, radius):
+        """
+        The words within an ``edit_distance`` of ``radius`` from
+        ``query``.
+
+        :return: The distance of each of the words, and the word, in
+            increasing order
+        :rtype: list(tuple(int, str))
+        """
+        n = self._n
+        query_length = len(query)
+        _, shared_counts = self._shared(self._ngram_counts(query))
+        candidates_by_length = defaultdict(list)
+        for word_id, shared in shared_counts.items():
+            candidates_by_length[len(self._words[word_id])].append((word_id, shared))
+
+        distance_from = _distances_from(query, edit_distance)
+        results = []
+        for length in range(max(0, query_length - radius), query_length + radius + 1):
+            min_shared = max(query_length, length) + n - 1 - radius * n
+            if min_shared <= 0:
+                candidates = self._lengths.get(length, ())
+            else:
+                candidates = [
+                    word_id
+                    for word_id, shared in candidates_by_length.get(length, ())
+                    if shared >= min_shared
+                ]
+            for word_id in candidates:
+                word = self._words[word_id]
+                distance = distance_from(word, radius)
+                if distance <= radius:
+                    results.append((distance, word))
+        results.sort()
+        return results
+
+    def nearest(self, query, k=1, max_dist=None):
+        """
+        The ``k`` words nearest to ``query`` by ``edit_distance``, of
+        those within ``max_dist`` of it, if given.  Ties are broken by
+        the order of the words.
+
+        :return: The distance of each of the words, and the word, in
+            increasing order
+        :rtype: list(tuple(int, str))
+        """
+        # No word is further than the longer of the two.
+        longest = max([len(query)] + list(self._lengths))
+        if max_dist is not None:
+            longest = min(longest, max_dist)
+        radius = 0
+        while True:
+            results = self.within(query, min(radius, longest))
+            if len(results) >= k or radius >= longest:
+                return results[:k]
+            radius = 2 * radius + 1
+
+
+def demo(num_words=20000, num_queries=200):
+    """
+    Time finding spelling corrections in a vocabulary with the indexes,
+    compared to computing the distance to every word.
+    """
+    import random
+    import time
+
+    try:
+        from nltk.corpus import words
+
+        vocabulary = words.words()[:num_words]
+    except LookupError:
+        rng = random.Random(0)
+        letters = 'etaoinshrdlucmfwyp'
+        vocabulary = [
+            ''.join(rng.choice(letters) for _ in range(rng.randint(3, 12)))
+            for _ in range(num_words)
+        ]
+
+    rng = random.Random(0)
+    queries = []
+    for word in rng.sample(vocabulary, num_queries):
+        i = rng.randrange(len(word))
+        queries.append(word[:i] + rng.choice('aeiou') + word[i + 1 :])
+
+    start = time.time()
+    tree = BKTree(vocabulary)
+    print("BKTree of %d words built in %.2fs" % (len(tree), time.time() - start))
+    start = time.time()
+    index = NgramIndex(vocabulary)
+    print("NgramIndex built in %.2fs" % (time.time() - start))
+
+    def linear_scan(query, radius):
+        return [word for word in vocabulary if edit_distance(query, word) <= radius]
+
+    for name, within in [
+        ("Linear scan", linear_scan),
+        ("BKTree", tree.within),
+        ("NgramIndex", index.within),
+    ]:
+        for radius in (1, 2):
+            start = time.time()
+            for query in queries:
+                within(query, radius)
+            milliseconds = (time.time() - start) * 1000 / len(queries)
+            print("%s, radius %d: %.2fms per query" % (name, radius, milliseconds))
+
+
+if __name__ == '__main__':
+    demo()
@@ -48,3 +48,92 @@ def test_megam():
 
 def test_tadm():
     assert_classifier_correct('TADM')
+
+
+def test_lbfgs():
+    assert_classifier_correct('LBFGS')
+
+
+def test_classify_many():
+    gold = list(zip(TEST, 'yyyx'))
+    classifiers = [
+        classify.MaxentClassifier.train(TRAIN, 'GIS', trace=0, max_iter=10),
+        classify.DecisionTreeClassifier.train(TRAIN, entropy_cutoff=0),
+        classify.NaiveBayesClassifier.train(TRAIN),
+    ]
+    for classifier in classifiers:
+        labels = classifier.classify_many(TEST)
+        assert labels == [classifier.classify(fs) for fs in TEST]
+        acc = classify.accuracy(classifier, gold)
+        assert acc == sum(l == g for (l, (fs, g)) in zip(labels, gold)) / 4.0
+        assert classify.accuracy(classifier, gold, processes=2, chunksize=1) == acc
+
+    for classifier in (classifiers[0], classifiers[2]):
+        for featureset, pdist in zip(TEST, classifier.prob_classify_many(TEST)):
+            expected = classifier.prob_classify(featureset)
+            for label in 'xy':
+                assert abs(pdist.prob(label) - expected.prob(label)) < 1e-12
+
+
+def test_decision_tree_parallel_training():
+    from nltk.classify import decisiontree
+
+    min_size = decisiontree._PARALLEL_MIN_SIZE
+    decisiontree._PARALLEL_MIN_SIZE = 0
+    try:
+        for binary in (False, True):
+            args = dict(entropy_cutoff=0, support_cutoff=0, binary=binary)
+            serial = classify.DecisionTreeClassifier.train(TRAIN, **args)
+            parallel = classify.DecisionTreeClassifier.train(
+                TRAIN, processes=2, **args
+            )
+            assert serial.pseudocode(depth=10) == parallel.pseudocode(depth=10)
+    finally:
+        decisiontree._PARALLEL_MIN_SIZE = min_size
+
+
+def test_encoded_featuresets():
+    import os
+    import tempfile
+
+    encoded = classify.encode_featuresets(TRAIN)
+    assert list(encoded) == TRAIN
+    assert list(encoded[2:4]) == TRAIN[2:4]
+
+    nb, nb_encoded = [
+        classify.NaiveBayesClassifier.train(toks) for toks in (TRAIN, encoded)
+    ]
+    me, me_encoded = [
+        classify.MaxentClassifier.train(toks, 'GIS', trace=0, max_iter=10)
+        for toks in (TRAIN, encoded)
+    ]
+    for featureset in TEST:
+        for a, b in ((nb, nb_encoded), (me, me_encoded)):
+            assert a.prob_classify(featureset).prob('x') == b.prob_classify(
+                featureset
+            ).prob('x')
+
+    filename = os.path.join(tempfile.mkdtemp(), 'train.pickle')
+    try:
+        encoded.save(filename)
+        assert list(classify.EncodedFeaturesets.load(filename)) == TRAIN
+    finally:
+        os.remove(filename)
+        os.rmdir(os.path.dirname(filename))
+
+
+def test_encoded_none_valued_features():
+    from nltk.classify.util import FeaturesetEncoder
+
+    train = [
+        (dict(a=None, b='u'), 'x'),
+        (dict(a=1, b=None), 'y'),
+        (dict(a=2.5, b='v'), 'y'),
+    ]
+    for encoder in (FeaturesetEncoder(), FeaturesetEncoder(numeric=True)):
+        encoded = classify.encode_featuresets(train, encoder)
+        assert list(encoded) == train
+
+    encoded = classify.encode_featuresets(train)
+    classifier = classify.NaiveBayesClassifier.train(encoded)
+    assert classify.accuracy(classifier, encoded) == 1.0
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for nltk.cluster.
+"""
+from __future__ import division, unicode_literals
+
+import random
+import unittest
+
+import numpy
+
+from nltk.cluster import (
+    EMClusterer,
+    GAAClusterer,
+    KMeansClusterer,
+    euclidean_distance,
+    cosine_distance,
+)
+
+
+def _blobs(num_means=3, size=50, seed=0):
+    rng = numpy.random.RandomState(seed)
+    centres = rng.randn(num_means, 4) * 10
+    return [centres[i % num_means] + rng.randn(4) for i in range(num_means * size)]
+
+
+class KMeansClustererTest(unittest.TestCase):
+    def test_matches_custom_distance(self):
+        vectors = _blobs()
+        for distance in (euclidean_distance, cosine_distance):
+            results = []
+            for dist in (distance, lambda u, v: distance(u, v)):
+                clusterer = KMeansClusterer(3, dist, rng=random.Random(1))
+                results.append((clusterer.cluster(vectors, True), clusterer.means()))
+            self.assertEqual(results[0][0], results[1][0])
+            for mean1, mean2 in zip(results[0][1], results[1][1]):
+                self.assertTrue(numpy.allclose(mean1, mean2))
+
+    def test_init_methods(self):
+        vectors = _blobs()
+        expected = [i % 3 for i in range(len(vectors))]
+        for options in (
+            dict(init_method='k-means++'),
+            dict(init_method='k-means++', batch_size=30, max_iter=50),
+        ):
+            clusterer = KMeansClusterer(
+                3, euclidean_distance, rng=random.Random(2), **options
+            )
+            clusters = clusterer.cluster(vectors, True)
+            # The same partition as the blobs, up to the cluster numbering.
+            self.assertEqual(len(set(zip(clusters, expected))), 3)
+
+    def test_parallel_repeats(self):
+        vectors = _blobs()
+        meanss = []
+        for processes in (1, 2):
+            clusterer = KMeansClusterer(
+                3,
+                euclidean_distance,
+                repeats=3,
+                rng=random.Random(3),
+                processes=processes,
+            )
+            clusterer.cluster(vectors)
+            meanss.append(clusterer.means())
+        for mean1, mean2 in zip(*meanss):
+            self.assertTrue(numpy.array_equal(mean1, mean2))
+
+    def test_parallel_minibatch_repeats(self):
+        vectors = list(numpy.random.RandomState(0).rand(200, 4))
+        meanss = []
+        for processes in (1, 2):
+            clusterer = KMeansClusterer(
+                3,
+                euclidean_distance,
+                repeats=3,
+                rng=random.Random(0),
+                batch_size=20,
+                max_iter=5,
+                processes=processes,
+            )
+            clusterer.cluster(vectors)
+            meanss.append(clusterer.means())
+        for mean1, mean2 in zip(*meanss):
+            self.assertTrue(numpy.array_equal(mean1, mean2))
+
+    def test_empty_cluster(self):
+        # arrange
+        vectors = _blobs()
+        initial_means = [vectors[0], vectors[1], numpy.full(4, 1000.0)]
+        clusterer = KMeansClusterer(3, euclidean_distance, initial_means=initial_means)
+
+        # act
+        with self.assertRaises(ValueError) as context:
+            clusterer.cluster(vectors)
+
+        # assert
+        self.assertIn('empty cluster 2', str(context.exception))
+
+
+def _group_average_groups(vectors, num_clusters):
+    # Merges the closest pair of clusters found by searching all of them.
+    clusters = [[vector] for vector in vectors]
+    while len(clusters) > num_clusters:
+        pairs = [
+            (
+                numpy.mean(
+                    [cosine_distance(u, v) for u in clusters[i] for v in clusters[j]]
+                ),
+                i,
+                j,
+            )
+            for i in range(len(clusters))
+            for j in range(i + 1, len(clusters))
+        ]
+        d, i, j = min(pairs)
+        clusters[i] += clusters.pop(j)
+    return sorted(sorted(map(tuple, cluster)) for cluster in clusters)
+
+
+class GAAClustererTest(unittest.TestCase):
+    def _groups(self, clusterer, vectors, num_clusters):
+        clusterer.cluster(vectors)
+        groups = clusterer.dendrogram().groups(num_clusters)
+        return sorted(sorted(map(tuple, group)) for group in groups)
+
+    def test_matches_exhaustive_search(self):
+        vectors = list(numpy.random.RandomState(4).randn(30, 3))
+        for num_clusters in (2, 5, 12):
+            self.assertEqual(
+                self._groups(GAAClusterer(num_clusters), vectors, num_clusters),
+                _group_average_groups(vectors, num_clusters),
+            )
+
+    def test_approximate(self):
+        vectors = _blobs()
+        expected = self._groups(GAAClusterer(3), vectors, 3)
+        for options in (dict(dtype='float32'), dict(num_neighbours=5)):
+            clusterer = GAAClusterer(3, **options)
+            self.assertEqual(self._groups(clusterer, vectors, 3), expected)
+            self.assertEqual(len(clusterer.dendrogram().groups(1)[0]), len(vectors))
+
+
+class EMClustererTest(unittest.TestCase):
+    def test_covariances(self):
+        vectors = _blobs()
+        expected = [i % 3 for i in range(len(vectors))]
+        means = [vector + 1 for vector in vectors[:3]]
+        for diagonal in (False, True):
+            clusterer = EMClusterer(means, diagonal=diagonal)
+            self.assertEqual(clusterer.cluster(vectors, True), expected)
+            self.assertEqual(clusterer._covariance_matrices[0].ndim, 2 - diagonal)
+
+    def test_distant_vectors(self):
+        # The densities of the vectors underflow, but not their logarithms.
+        vectors = [vector * 1000 for vector in _blobs()]
+        clusterer = EMClusterer(vectors[:3], bias=0.01)
+        clusters = clusterer.cluster(vectors, True)
+        self.assertEqual(clusters, [i % 3 for i in range(len(vectors))])
+        self.assertTrue(numpy.isfinite(clusterer._priors).all())
@@ -3,12 +3,20 @@ from __future__ import absolute_import, unicode_literals
 
 import unittest
 import contextlib
+import shutil
 import sys
+import tempfile
 
 from nose import with_setup
 
 from nltk.corpus import gutenberg
-from nltk.text import Text
+from nltk.text import (
+    Text,
+    TextIndex,
+    TokenSearcher,
+    ConcordanceIndex,
+    ContextIndex,
+)
 
 try:
     from StringIO import StringIO
@@ -105,3 +113,125 @@ class TestConcordance(unittest.TestCase):
             return raw_str.replace(" ", "")
 
         self.assertEqual(strip_space(print_out), strip_space(stdout.getvalue()))
+
+
+class TestTextIndex(unittest.TestCase):
+    def setUp(self):
+        self.tokens = (
+            'The cat sat on the mat . The dog sat on the log . '
+            'A cat and a dog met on the mat , and the cat sat down .'
+        ).split()
+        self.index = TextIndex(
+            self.tokens, key=lambda s: s.lower(), filter=lambda x: x.isalpha()
+        )
+
+    def test_offsets(self):
+        concordance_index = ConcordanceIndex(self.tokens, key=lambda s: s.lower())
+        for word in set(self.tokens) | set(['unknown']):
+            self.assertEqual(
+                self.index.offsets(word), concordance_index.offsets(word)
+            )
+
+    def test_contexts(self):
+        context_index = ContextIndex(
+            self.tokens, filter=lambda x: x.isalpha(), key=lambda s: s.lower()
+        )
+        self.assertEqual(
+            self.index.common_contexts(['cat', 'dog']),
+            context_index.common_contexts(['cat', 'dog']),
+        )
+        self.assertEqual(
+            self.index.contexts('mat'), [('the', 'the'), ('the', 'and')]
+        )
+        self.assertEqual(self.index.similar_words('cat'), ['dog'])
+        self.assertEqual(self.index.similar_words('unknown'), [])
+
+    def test_save_load(self):
+        path = tempfile.mkdtemp()
+        try:
+            self.index.save(path)
+            text = Text.from_index(TextIndex.load(path, key=lambda s: s.lower()))
+            self.assertEqual(list(text), self.tokens)
+            for word in ('cat', 'sat', 'on', 'unknown'):
+                with stdout_redirect(StringIO()) as expected:
+                    Text(self.tokens).similar(word)
+                    Text(self.tokens).concordance(word)
+                with stdout_redirect(StringIO()) as stdout:
+                    text.similar(word)
+                    text.concordance(word)
+                self.assertEqual(stdout.getvalue(), expected.getvalue())
+        finally:
+            shutil.rmtree(path)
+
+
+class TestTokenSearcher(unittest.TestCase):
+    def setUp(self):
+        self.tokens = 'a man saw a dog and the dog saw a big man'.split()
+
+    def test_findall(self):
+        searcher = TokenSearcher(self.tokens)
+        self.assertEqual(searcher.findall('<a>(<.*>)<man>'), [['big']])
+        self.assertEqual(
+            searcher.findall('<a>(<.*>)*?<man>'), [[''], ['big']]
+        )
+        self.assertEqual(
+            searcher.findall('(?:<a>|<the>)<d.*>'), [['a', 'dog'], ['the', 'dog']]
+        )
+        self.assertEqual(searcher.findall('<saw><.*>{2}'), [
+            ['saw', 'a', 'dog'], ['saw', 'a', 'big']
+        ])
+        self.assertEqual(searcher.findall('<cat>+'), [])
+        # Patterns outside the token-id subset use the marked-up string.
+        self.assertEqual(searcher.findall('<dog>(?=<saw>)'), [['dog']])
+
+    def test_index_and_stream(self):
+        index = ConcordanceIndex(self.tokens)
+        for pattern in ('<a><.*>', '<saw>(<.*>)', '<a>(<man>|<dog>)+'):
+            expected = TokenSearcher(self.tokens).findall(pattern)
+            self.assertEqual(
+                TokenSearcher(self.tokens, index).findall(pattern), expected
+            )
+            self.assertEqual(TokenSearcher(iter(self.tokens)).findall(pattern), expected)
+
+    def test_generator(self):
+        for pattern in ('<dog>(?=<saw>)', '<a>(<.*>)<man>'):
+            # arrange
+            expected = TokenSearcher(self.tokens).findall(pattern)
+            searcher = TokenSearcher(token for token in self.tokens)
+
+            # act
+            first = searcher.findall('<a>(<.*>)<man>')
+            second = searcher.findall(pattern)
+
+            # assert
+            self.assertEqual(first, [['big']])
+            self.assertEqual(second, expected)
+            self.assertTrue(second)
+
+    def test_too_many_types(self):
+        # arrange
+        searcher = TokenSearcher(token for token in self.tokens)
+        searcher._MAX_TYPES = 3
+
+        # act
+        hits = searcher.findall('<a>(<.*>)')
+
+        # assert
+        self.assertEqual(hits, [['man'], ['dog'], ['big']])
+        self.assertEqual(searcher.findall('<dog>(?=<saw>)'), [['dog']])
+
+    def test_patterns_across_tokens(self):
+        # arrange
+        tokens = 'the cat sat on the mat'.split()
+        searcher = TokenSearcher(tokens)
+
+        for pattern, expected in (
+            (r'<cat> <\D+> <the>', [['cat', 'sat', 'on', 'the']]),
+            (r'<cat> <[^x]+> <the>', [['cat', 'sat', 'on', 'the']]),
+            (r'<cat> <\w+> <the>', []),
+        ):
+            # act
+            hits = searcher.findall(pattern)
+
+            # assert
+            self.assertEqual(hits, expected)
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals
+import random
 import unittest
 
 from nltk.metrics.agreement import AnnotationTask
+from nltk.metrics.distance import binary_distance, interval_distance
 
 class TestDisagreement(unittest.TestCase):
 
@@ -140,3 +142,97 @@ class TestDisagreement(unittest.TestCase):
         annotation_task = AnnotationTask(data)
         self.assertAlmostEqual(annotation_task.alpha(), 0.743421052632)
 
+
+
+class TestEncodedAgreement(unittest.TestCase):
+
+    '''
+    The integer-coded computations agree with the pure Python ones.
+    '''
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.data = [('c%d' % coder, 'i%d' % item, rng.choice('abc'))
+                     for item in range(40) for coder in range(4)
+                     if rng.random() < 0.9 or coder < 2]
+
+    def assertSameAgreement(self, data, **kwargs):
+        # arrange
+        task = AnnotationTask(data, **kwargs)
+        python_task = AnnotationTask(data, **kwargs)
+        python_task._encoded_data = lambda: None
+
+        for name in ('alpha', 'avg_Ao', 'multi_kappa'):
+            # act
+            value = getattr(task, name)()
+
+            # assert
+            self.assertAlmostEqual(value, getattr(python_task, name)())
+
+    def test_complete_data(self):
+        self.assertSameAgreement([x for x in self.data if x[0] in ('c0', 'c1')])
+
+    def test_missing_data(self):
+        # arrange
+        task = AnnotationTask(self.data)
+        python_task = AnnotationTask(self.data)
+        python_task._encoded_data = lambda: None
+
+        # act
+        alpha = task.alpha()
+
+        # assert
+        self.assertAlmostEqual(alpha, python_task.alpha())
+        with self.assertRaises(ValueError):
+            task.Do_Kw()
+
+    def test_interval_distance(self):
+        data = [(c, i, ord(l)) for c, i, l in self.data if c in ('c0', 'c1')]
+        self.assertSameAgreement(data, distance=interval_distance)
+
+    def test_load_array_resets_cache(self):
+        # arrange
+        task = AnnotationTask(self.data[:20])
+        alpha = task.alpha()
+
+        # act
+        task.load_array(self.data[20:])
+
+        # assert
+        self.assertNotAlmostEqual(task.alpha(), alpha)
+        self.assertAlmostEqual(task.alpha(), AnnotationTask(self.data).alpha())
+
+    def test_pairwise_distances_of_occurring_labels(self):
+        # arrange
+        data = [(c, i, '%d-%d' % (i, c % 2)) for i in range(50) for c in range(3)]
+        calls = []
+
+        def distance(label1, label2):
+            calls.append((label1, label2))
+            return binary_distance(label1, label2)
+
+        task = AnnotationTask(data, distance=distance)
+        python_task = AnnotationTask(data, distance=binary_distance)
+        python_task._encoded_data = lambda: None
+
+        # act
+        avg_Ao = task.avg_Ao()
+
+        # assert
+        self.assertAlmostEqual(avg_Ao, python_task.avg_Ao())
+        self.assertLessEqual(len(calls), 2 * len(data))
+
+    def test_Ae_kappa_unknown_coder(self):
+        # arrange
+        task = AnnotationTask(self.data)
+        python_task = AnnotationTask(self.data)
+        python_task._encoded_data = lambda: None
+
+        # act
+        Ae = task.Ae_kappa('c0', 'nobody')
+
+        # assert
+        self.assertEqual(Ae, python_task.Ae_kappa('c0', 'nobody'))
+        self.assertEqual(Ae, 0.0)
+        self.assertRaises(ValueError, task.Ao, 'c0', 'nobody')
+        self.assertRaises(ValueError, task.weighted_kappa_pairwise, 'c0', 'nobody')
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the string distance metrics
+"""
+
+import random
+import unittest
+
+from nltk.metrics.distance import (
+    _banded_edit_distance,
+    edit_distance,
+    jaro_similarity,
+    pairwise_distances,
+)
+
+
+class TestEditDistance(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.pairs = [
+            tuple(
+                ''.join(rng.choice('abc') for _ in range(rng.randint(0, 10)))
+                for _ in range(2)
+            )
+            for _ in range(500)
+        ]
+
+    def test_bit_parallel_and_dynamic_programming_agree(self):
+        for s1, s2 in self.pairs:
+            for transpositions in (False, True):
+                # act
+                distance = edit_distance(s1, s2, transpositions=transpositions)
+
+                # assert
+                expected_distance = _banded_edit_distance(
+                    s1, s2, 1, transpositions, None
+                )
+                self.assertEqual(distance, expected_distance)
+
+    def test_max_dist(self):
+        for s1, s2 in self.pairs:
+            for substitution_cost in (1, 2):
+                # act
+                distance = edit_distance(
+                    s1, s2, substitution_cost=substitution_cost, max_dist=3
+                )
+
+                # assert
+                expected_distance = edit_distance(
+                    s1, s2, substitution_cost=substitution_cost
+                )
+                self.assertEqual(distance, min(expected_distance, 4))
+
+    def test_transpositions(self):
+        self.assertEqual(edit_distance('abcdef', 'acbdef'), 2)
+        self.assertEqual(edit_distance('abcdef', 'acbdef', transpositions=True), 1)
+
+    def test_unhashable_items(self):
+        # act
+        distance = edit_distance([[1], [2], [3]], [[1], [3]])
+
+        # assert
+        self.assertEqual(distance, 1)
+
+
+class TestPairwiseDistances(unittest.TestCase):
+    def test_pairwise_distances(self):
+        # arrange
+        list_a = ['rain', 'shine', '']
+        list_b = ['rain', 'brainy', 'shin']
+
+        for metric in (edit_distance, jaro_similarity):
+            # act
+            distances = pairwise_distances(list_a, list_b, metric)
+
+            # assert
+            self.assertEqual(distances.shape, (3, 3))
+            for i, a in enumerate(list_a):
+                for j, b in enumerate(list_b):
+                    self.assertEqual(distances[i, j], metric(a, b))
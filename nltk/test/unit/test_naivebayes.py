@@ -2,6 +2,7 @@
 from __future__ import print_function, unicode_literals
 
 
+import pickle
 import unittest
 from nltk.classify.naivebayes import NaiveBayesClassifier
 
@@ -22,3 +23,80 @@ class NaiveBayesClassifierTest(unittest.TestCase):
         result = classifier.prob_classify({'bad': True})
         self.assertTrue(result.prob('positive') < result.prob('negative'))
         self.assertEqual(result.max(), 'negative')
+
+    def test_compile(self):
+        training_features = [
+            ({'nice': True, 'good': True, 'stars': 4}, 'positive'),
+            ({'nice': True, 'stars': 5}, 'positive'),
+            ({'bad': True, 'mean': True, 'stars': 1}, 'negative'),
+            ({'good': False, 'stars': 2}, 'negative'),
+        ]
+        featuresets = [
+            {'nice': True},
+            {'bad': True, 'stars': 3},
+            {'unknown': True, 'good': False},
+            {},
+        ]
+
+        classifier = NaiveBayesClassifier.train(training_features)
+        expected = [classifier.prob_classify(fs) for fs in featuresets]
+        self.assertEqual(
+            classifier.classify_many(featuresets), [p.max() for p in expected]
+        )
+        self.assertIsNone(classifier._logprob_matrix)
+
+        self.assertIs(classifier.compile(), classifier)
+        compiled = NaiveBayesClassifier.train(training_features, compiled=True)
+        self.assertIsNotNone(compiled._logprob_matrix)
+        results = classifier.prob_classify_many(featuresets)
+        for result, pdist in zip(results, expected):
+            for label in ('positive', 'negative'):
+                self.assertAlmostEqual(result.prob(label), pdist.prob(label))
+        self.assertEqual(
+            classifier.classify_many(featuresets), [p.max() for p in expected]
+        )
+        self.assertEqual(classifier.classify({'nice': True}), 'positive')
+
+    def test_partial_fit(self):
+        training_features = [
+            ({'nice': True, 'good': True}, 'positive'),
+            ({'nice': True, 'stars': 5}, 'positive'),
+            ({'bad': True, 'mean': True}, 'negative'),
+            ({'good': False, 'stars': 2}, 'negative'),
+        ]
+        expected = NaiveBayesClassifier.train(training_features)
+
+        classifier = NaiveBayesClassifier.train(training_features[:1])
+        classifier.partial_fit(iter(training_features[1:]))
+        parallel = NaiveBayesClassifier.train(
+            training_features, processes=2, chunksize=1
+        )
+        for result in (classifier, parallel):
+            self.assertEqual(
+                sorted(result.labels()), sorted(expected.labels())
+            )
+            for key, probdist in expected._feature_probdist.items():
+                for fval in (True, False, 5, 2, None):
+                    self.assertAlmostEqual(
+                        result._feature_probdist[key].prob(fval), probdist.prob(fval)
+                    )
+
+    def test_unpickle_old_classifier(self):
+        # arrange
+        training_features = [
+            ({'nice': True, 'good': True}, 'positive'),
+            ({'bad': True, 'mean': True}, 'negative'),
+        ]
+        classifier = NaiveBayesClassifier.train(training_features)
+        # A classifier pickled before the compiled tables and the
+        # training counts were kept.
+        for name in ('_logprob_matrix', '_counts', '_estimator'):
+            del classifier.__dict__[name]
+
+        # act
+        old = pickle.loads(pickle.dumps(classifier))
+
+        # assert
+        self.assertEqual(old.classify({'nice': True}), 'positive')
+        self.assertEqual(old.classify_many([{'bad': True}]), ['negative'])
+        self.assertRaises(ValueError, old.partial_fit, training_features)
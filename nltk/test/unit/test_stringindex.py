@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the approximate string matching indexes
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from nltk.metrics.distance import edit_distance
+from nltk.metrics.stringindex import BKTree, NgramIndex
+
+
+class TestStringIndex(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.vocabulary = sorted(
+            set(
+                ''.join(rng.choice('abcd') for _ in range(rng.randint(0, 7)))
+                for _ in range(300)
+            )
+        )
+        self.queries = [
+            ''.join(rng.choice('abcde') for _ in range(rng.randint(0, 8)))
+            for _ in range(50)
+        ]
+        self.indexes = [
+            BKTree(self.vocabulary),
+            NgramIndex(self.vocabulary),
+            NgramIndex(self.vocabulary, n=3),
+        ]
+
+    def distances(self, query):
+        return sorted((edit_distance(query, word), word) for word in self.vocabulary)
+
+    def test_within(self):
+        for query in self.queries:
+            distances = self.distances(query)
+            for radius in (0, 1, 2):
+                for index in self.indexes:
+                    # act
+                    results = index.within(query, radius)
+
+                    # assert
+                    expected_results = [d for d in distances if d[0] <= radius]
+                    self.assertEqual(results, expected_results)
+
+    def test_nearest(self):
+        for query in self.queries:
+            distances = self.distances(query)
+            for index in self.indexes:
+                # act
+                results = index.nearest(query, 3)
+
+                # assert
+                self.assertEqual(results, distances[:3])
+
+    def test_save_and_load(self):
+        # arrange
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'index.pickle')
+
+        for index in self.indexes:
+            # act
+            index.save(path)
+            loaded = index.load(path)
+
+            # assert
+            self.assertEqual(sorted(loaded), self.vocabulary)
+            self.assertEqual(loaded.within('abc', 1), index.within('abc', 1))
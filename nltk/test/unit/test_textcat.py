@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the TextCat language identifier
+"""
+from __future__ import unicode_literals
+
+import random
+import unittest
+
+from nltk.classify import textcat
+from nltk.classify.textcat import TextCat
+from nltk.probability import FreqDist
+from nltk.util import trigrams
+
+
+class _ToyCorpus(object):
+    """
+    A stand-in for the crubadan corpus reader, with random trigram
+    profiles over a small alphabet.
+    """
+
+    def __init__(self, rng):
+        alphabet = '<>abcde'
+        all_trigrams = [a + b + c for a in alphabet for b in alphabet for c in alphabet]
+        self._all_lang_freq = {}
+        for lang in ('aaa', 'bbb', 'ccc', 'ddd'):
+            lang_trigrams = rng.sample(all_trigrams, rng.randint(20, 200))
+            counts = range(1000, 1000 - len(lang_trigrams), -1)
+            self._all_lang_freq[lang] = FreqDist(dict(zip(lang_trigrams, counts)))
+
+    def lang_freq(self, lang):
+        return self._all_lang_freq[lang]
+
+
+class _ToyTextCat(TextCat):
+    def __init__(self, corpus):
+        # TextCat.__init__ loads the crubadan corpus.
+        self._corpus = corpus
+        self._langs = None
+        self._lang_ranks = {}
+        self._build_rank_index()
+
+    def profile(self, text):
+        # Like TextCat.profile, without the punkt tokenizer.
+        fingerprint = FreqDist()
+        for token in text.split():
+            for trigram in trigrams(self._START_CHAR + token + self._END_CHAR):
+                fingerprint[''.join(trigram)] += 1
+        return fingerprint
+
+
+def _lang_dists(corpus, profile):
+    # The previous computation, one trigram at a time.
+    distances = {}
+    for lang, lang_fd in corpus._all_lang_freq.items():
+        distances[lang] = 0
+        for trigram in profile:
+            if trigram in lang_fd:
+                idx_lang_profile = list(lang_fd.keys()).index(trigram)
+                idx_text = list(profile.keys()).index(trigram)
+                distances[lang] += abs(idx_lang_profile - idx_text)
+            else:
+                distances[lang] += textcat.maxsize
+    return distances
+
+
+class TestTextCat(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.corpus = _ToyCorpus(rng)
+        self.texts = [
+            ' '.join(
+                ''.join(rng.choice('abcde') for _ in range(rng.randint(1, 6)))
+                for _ in range(rng.randint(1, 10))
+            )
+            for _ in range(50)
+        ]
+
+    def assertMatchesPerTrigram(self, classifier):
+        for text in self.texts:
+            # act
+            distances = classifier.lang_dists(text)
+            guess = classifier.guess_language(text)
+
+            # assert
+            expected = _lang_dists(self.corpus, classifier.profile(text))
+            self.assertEqual(distances, expected)
+            self.assertEqual(guess, min(expected, key=expected.get))
+
+    def test_lang_dists(self):
+        self.assertMatchesPerTrigram(_ToyTextCat(self.corpus))
+
+    def test_lang_dists_without_numpy(self):
+        numpy = textcat.numpy
+        del textcat.numpy
+        try:
+            self.assertMatchesPerTrigram(_ToyTextCat(self.corpus))
+        finally:
+            textcat.numpy = numpy
+
+    def test_guess_language_many(self):
+        # arrange
+        classifier = _ToyTextCat(self.corpus)
+        expected = [classifier.guess_language(text) for text in self.texts]
+
+        for processes in (1, 2):
+            # act
+            guesses = classifier.guess_language_many(self.texts, processes)
+
+            # assert
+            self.assertEqual(guesses, expected)
+            self.assertEqual(
+                classifier.last_distances, classifier.lang_dists(self.texts[-1])
+            )
@@ -16,8 +16,15 @@ from nltk.tokenize import (
     word_tokenize,
     TweetTokenizer,
     StanfordSegmenter,
+    TextTilingTokenizer,
     TreebankWordTokenizer,
+    WhitespaceTokenizer,
+    WordPunctTokenizer,
+    RegexpTokenizer,
+    PunktSentenceTokenizer,
+    casual_tokenize,
 )
+from nltk.tokenize import casual
 
 
 class TestTokenize(unittest.TestCase):
@@ -254,6 +261,94 @@ class TestTokenize(unittest.TestCase):
         result = tokenizer.tokenize(test7)
         self.assertEqual(result, expected)
 
+    def test_tweet_tokenizer_normalization_passes(self):
+        """
+        Test that TweetTokenizer gives the same tokens as applying each of
+        the normalization passes from casual.py in turn.
+        """
+
+        def reference_tokenize(text, preserve_case, reduce_len, strip_handles):
+            text = casual._replace_html_entities(text)
+            if strip_handles:
+                text = casual.remove_handles(text)
+            if reduce_len:
+                text = casual.reduce_lengthening(text)
+            text = casual.HANG_RE.sub(r'\1\1\1', text)
+            words = casual.WORD_RE.findall(text)
+            if not preserve_case:
+                words = [
+                    w if casual.EMOTICON_RE.search(w) else w.lower() for w in words
+                ]
+            return words
+
+        tweets = [
+            "@remy: This is waaaaayyyy too much for you!!!!!!",
+            "RT @NLTK_org: Check out http://www.nltk.org/ #NLP :D :P XD",
+            "Price: &pound;100 &amp; &#64;shop &#x40;shop &bogus; &#150;",
+            b"Bytes &lt;3 \xc3\xa9t\xc3\xa9 @user",
+            "Dots.\n\n\n\n\n.... and ----> <---- arrows ?????",
+            "Call +1 (800) 555-1234 or foo.bar@example.com ;-) <3 <3",
+            "Soooo HAPPPPY!!!\t\t\t\t:-D :-D @abcdefghijklmnopqrstu@abcde",
+            "",
+        ]
+        for options in [
+            (True, False, False),
+            (False, False, False),
+            (True, True, False),
+            (False, True, True),
+            (True, False, True),
+        ]:
+            tokenizer = TweetTokenizer(*options)
+            for tweet in tweets:
+                self.assertEqual(
+                    tokenizer.tokenize(tweet), reference_tokenize(tweet, *options)
+                )
+            self.assertEqual(
+                tokenizer.tokenize_sents(tweets),
+                [reference_tokenize(tweet, *options) for tweet in tweets],
+            )
+            self.assertEqual(
+                casual_tokenize(tweets[0], *options), tokenizer.tokenize(tweets[0])
+            )
+        self.assertEqual(
+            tokenizer.tokenize_sents(tweets, processes=2),
+            tokenizer.tokenize_sents(tweets),
+        )
+
+    def test_texttiling_block_comparison(self):
+        """
+        Test that the count-based block comparison of TextTilingTokenizer
+        gives the same gap scores as the token table based one.
+        """
+        words = (
+            "apple banana cherry apple date egg fig grape apple banana "
+            "kiwi lemon mango kiwi nut olive pear kiwi lemon quince"
+        ).split()
+        paragraphs = []
+        for i in range(12):
+            paragraphs.append(' '.join(words[(i * 7) % 20 :] + words[: (i * 3) % 20]))
+        text = '\n\n'.join(paragraphs)
+
+        for k in (2, 5, 10):
+            tt = TextTilingTokenizer(w=6, k=k, stopwords=[])
+            par_breaks = tt._mark_paragraph_breaks(text)
+            tokseqs = tt._divide_to_tokensequences(text)
+            token_table = tt._create_token_table(tokseqs, par_breaks)
+            self.assertEqual(
+                tt._block_comparison_counts(*tt._count_tokens(tokseqs, par_breaks)),
+                tt._block_comparison(tokseqs, token_table),
+            )
+
+    def test_texttiling_depth_scores(self):
+        """
+        Test TextTilingTokenizer._depth_scores on plateaus and slopes.
+        """
+        tt = TextTilingTokenizer(stopwords=[])
+        scores = [0.5, 0.9, 0.9, 0.4, 0.2, 0.2, 0.6, 0.8, 0.3, 0.3, 0.7, 0.1]
+        expected = [0, 0, 0.0, 0.5, 1.3, 1.3, 0.2, 0.0, 0.9, 0.9, 0, 0]
+        for result, value in zip(tt._depth_scores(scores), expected):
+            self.assertAlmostEqual(result, value)
+
     def test_treebank_span_tokenizer(self):
         """
         Test TreebankWordTokenizer.span_tokenize function
@@ -351,6 +446,29 @@ class TestTokenize(unittest.TestCase):
         result = list(tokenizer.span_tokenize(test3))
         self.assertEqual(result, expected)
 
+    def test_compact_span_tokenize(self):
+        """
+        Test that compact_span_tokenize matches span_tokenize
+        """
+        text = "Good muffins cost $3.88\nin New (York).  Please buy me\n\ntwo. Thanks. "
+        tokenizers = [
+            WhitespaceTokenizer(),
+            WordPunctTokenizer(),
+            RegexpTokenizer(r'\s', gaps=True, discard_empty=False),
+            TreebankWordTokenizer(),
+            PunktSentenceTokenizer(),
+        ]
+        for tokenizer in tokenizers:
+            spans = list(tokenizer.span_tokenize(text))
+            result = tokenizer.compact_span_tokenize(text)
+            self.assertEqual(list(result.spans()), spans)
+            self.assertEqual(result, [text[start:end] for start, end in spans])
+            self.assertEqual(result.nbytes(), 8 * len(spans))
+        result = WhitespaceTokenizer().compact_span_tokenize(text)
+        self.assertEqual(result[-1], 'Thanks.')
+        self.assertEqual(result[2:4], ['cost', '$3.88'])
+        self.assertEqual(result.span(3), (18, 23))
+
     def test_word_tokenize(self):
         """
         Test word_tokenize function
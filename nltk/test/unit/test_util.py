@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for nltk.util.
+"""
+
+import unittest
+
+from nltk.util import parallel_imap
+
+
+class TestParallelImap(unittest.TestCase):
+    def test_results_in_order(self):
+        for processes in (1, 2):
+            # act
+            results = parallel_imap(abs, iter(range(-20, 0)), processes, chunksize=3)
+
+            # assert
+            self.assertEqual(list(results), list(range(20, 0, -1)))
+
+    def test_bounded_read_ahead(self):
+        # arrange
+        read = []
+
+        def items():
+            for i in range(1000):
+                read.append(i)
+                yield i
+
+        # act
+        results = parallel_imap(abs, items(), processes=2, chunksize=5)
+        first = next(results)
+
+        # assert
+        self.assertEqual(first, 0)
+        # At most two chunks per worker are read ahead.
+        self.assertLessEqual(len(read), 2 * 2 * 5)
+        self.assertEqual(list(results), list(range(1, 1000)))
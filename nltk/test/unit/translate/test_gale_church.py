@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the Gale-Church sentence aligner
+"""
+
+import random
+import unittest
+
+from nltk.translate.gale_church import align_blocks, align_texts, ialign_texts
+
+
+class TestGaleChurch(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.source = [rng.randint(10, 200) for _ in range(300)]
+        self.target = []
+        for length in self.source:
+            r = rng.random()
+            if r < 0.03:
+                continue
+            if r < 0.06 and self.target:
+                self.target[-1] += length
+                continue
+            self.target.append(int(length * rng.uniform(0.85, 1.2)))
+
+    def test_band_gives_the_same_alignment(self):
+        # act
+        alignment = align_blocks(self.source, self.target)
+        banded_alignment = align_blocks(self.source, self.target, band_width=5)
+
+        # assert
+        self.assertEqual(banded_alignment, alignment)
+
+    def test_ialign_texts(self):
+        # arrange
+        source_blocks = [self.source[:100], self.source[100:]]
+        target_blocks = [self.target[:97], self.target[97:]]
+
+        # act
+        alignments = ialign_texts(iter(source_blocks), iter(target_blocks))
+
+        # assert
+        self.assertEqual(list(alignments), align_texts(source_blocks, target_blocks))
+
+    def test_ialign_texts_with_different_number_of_blocks(self):
+        # arrange
+        source_blocks = [self.source[:100], self.source[100:]]
+        target_blocks = [self.target]
+
+        # act
+        alignments = ialign_texts(iter(source_blocks), iter(target_blocks))
+
+        # assert
+        next(alignments)
+        with self.assertRaises(ValueError):
+            next(alignments)
@@ -74,3 +74,23 @@ class TestIBMModel1(unittest.TestCase):
         lexical_translation = 0.98 * 0.98 * 0.98 * 0.98 * 0.98 * 0.98
         expected_probability = lexical_translation
         self.assertEqual(round(probability, 4), round(expected_probability, 4))
+
+    def test_train_matches_unencoded_training(self):
+        # arrange
+        corpus = [
+            AlignedSent(['ham', 'eggs'], ['schinken', 'schinken', 'eier']),
+            AlignedSent(['spam', 'spam', 'spam', 'spam'], ['spam', 'spam']),
+            AlignedSent(['eggs', 'and', 'spam'], ['eier', 'und', 'spam']),
+        ]
+        model1 = IBMModel1(corpus, 0)
+        expected = IBMModel1(corpus, 0)
+
+        # act
+        model1.train(corpus, 3, processes=2)
+        for n in range(3):
+            expected._train(corpus)
+
+        # assert
+        for t in expected.translation_table:
+            for s, prob in expected.translation_table[t].items():
+                self.assertAlmostEqual(model1.translation_table[t][s], prob)
@@ -87,3 +87,28 @@ class TestIBMModel2(unittest.TestCase):
         alignment = 0.97 * 0.97 * 0.97 * 0.97 * 0.96 * 0.96
         expected_probability = lexical_translation * alignment
         self.assertEqual(round(probability, 4), round(expected_probability, 4))
+
+    def test_train_matches_unencoded_training(self):
+        # arrange
+        corpus = [
+            AlignedSent(['ham', 'eggs'], ['schinken', 'schinken', 'eier']),
+            AlignedSent(['spam', 'spam', 'spam', 'spam'], ['spam', 'spam']),
+            AlignedSent(['eggs', 'and', 'spam'], ['eier', 'und', 'spam']),
+        ]
+        model2 = IBMModel2(corpus, 0)
+        expected = IBMModel2(corpus, 0)
+
+        # act
+        model2.train(corpus, 3, processes=2)
+        for n in range(3):
+            expected._train(corpus)
+
+        # assert
+        for t in expected.translation_table:
+            for s, prob in expected.translation_table[t].items():
+                self.assertAlmostEqual(model2.translation_table[t][s], prob)
+        for i, j_s in expected.alignment_table.items():
+            for j, l_s in j_s.items():
+                for l, m_s in l_s.items():
+                    for m, prob in m_s.items():
+                        self.assertAlmostEqual(model2.alignment_table[i][j][l][m], prob)
@@ -106,3 +106,38 @@ class TestIBMModel3(unittest.TestCase):
             null_generation * fertility * lexical_translation * distortion
         )
         self.assertEqual(round(probability, 4), round(expected_probability, 4))
+
+    def test_sample_matches_hill_climbing_over_alignment_infos(self):
+        # arrange
+        corpus = [
+            AlignedSent(
+                ['klein', 'ist', 'das', 'haus'], ['the', 'house', 'is', 'small']
+            ),
+            AlignedSent(
+                ['das', 'haus', 'ist', 'ja', 'groß'], ['the', 'house', 'is', 'big']
+            ),
+            AlignedSent(
+                ['das', 'buch', 'ist', 'ja', 'klein'], ['the', 'book', 'is', 'small']
+            ),
+            AlignedSent(['das', 'haus'], ['the', 'house']),
+            AlignedSent(['ein', 'buch'], ['a', 'book']),
+        ]
+        model3 = IBMModel3(corpus, 2)
+        model3._alignment_scorer = lambda sentence_pair: None
+        expected_samples = [model3.sample(sentence_pair) for sentence_pair in corpus]
+        del model3._alignment_scorer
+
+        # act
+        samples = list(model3._sample_all(corpus, processes=2))
+
+        # assert
+        for sample, expected_sample in zip(samples, expected_samples):
+            sampled_alignments, best_alignment = sample
+            expected_alignments, expected_best_alignment = expected_sample
+            self.assertEqual(sampled_alignments, expected_alignments)
+            self.assertEqual(best_alignment, expected_best_alignment)
+            self.assertEqual(best_alignment.score, expected_best_alignment.score)
+            for alignment_info in sampled_alignments:
+                self.assertEqual(
+                    alignment_info.score, model3.prob_t_a_given_s(alignment_info)
+                )
@@ -121,3 +121,41 @@ class TestIBMModel4(unittest.TestCase):
             null_generation * fertility * lexical_translation * distortion
         )
         self.assertEqual(round(probability, 4), round(expected_probability, 4))
+
+    def test_sample_matches_hill_climbing_over_alignment_infos(self):
+        # arrange
+        corpus = [
+            AlignedSent(
+                ['klein', 'ist', 'das', 'haus'], ['the', 'house', 'is', 'small']
+            ),
+            AlignedSent(
+                ['das', 'haus', 'ist', 'ja', 'groß'], ['the', 'house', 'is', 'big']
+            ),
+            AlignedSent(
+                ['das', 'buch', 'ist', 'ja', 'klein'], ['the', 'book', 'is', 'small']
+            ),
+            AlignedSent(['das', 'haus'], ['the', 'house']),
+            AlignedSent(['ein', 'buch'], ['a', 'book']),
+        ]
+        # classify words by their length
+        src_classes = {s: len(s) % 3 for pair in corpus for s in pair.mots}
+        trg_classes = {t: len(t) % 3 for pair in corpus for t in pair.words}
+        model4 = IBMModel4(corpus, 2, src_classes, trg_classes)
+        model4._alignment_scorer = lambda sentence_pair: None
+        expected_samples = [model4.sample(sentence_pair) for sentence_pair in corpus]
+        del model4._alignment_scorer
+
+        # act
+        samples = [model4.sample(sentence_pair) for sentence_pair in corpus]
+
+        # assert
+        for sample, expected_sample in zip(samples, expected_samples):
+            sampled_alignments, best_alignment = sample
+            expected_alignments, expected_best_alignment = expected_sample
+            self.assertEqual(sampled_alignments, expected_alignments)
+            self.assertEqual(best_alignment, expected_best_alignment)
+            self.assertEqual(best_alignment.score, expected_best_alignment.score)
+            for alignment_info in sampled_alignments:
+                self.assertEqual(
+                    alignment_info.score, model4.prob_t_a_given_s(alignment_info)
+                )
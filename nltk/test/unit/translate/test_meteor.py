@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the METEOR score
+"""
+
+import random
+import unittest
+
+from nltk.translate.meteor_score import (
+    _enum_allign_words,
+    corpus_meteor,
+    meteor_score,
+)
+
+
+class _Lemma(object):
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
+class _Synset(object):
+    def __init__(self, names):
+        self._lemmas = [_Lemma(name) for name in names]
+
+    def lemmas(self):
+        return self._lemmas
+
+
+class _ToyWordNet(object):
+    """
+    A WordNet with the synsets {w0, w1}, {w1, w2}, ..., plus multiword
+    lemmas, which METEOR ignores.
+    """
+
+    def synsets(self, word):
+        number = int(word[1:])
+        return [
+            _Synset(['w%d' % (number - 1), word, 'w%d_x' % number]),
+            _Synset([word, 'w%d' % (number + 1)]),
+        ]
+
+
+class _CountingStemmer(object):
+    """
+    Stems 'w12' and 'w13' to 'w1', and counts its calls.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def stem(self, word):
+        self.calls += 1
+        return word[:2]
+
+
+def _pairwise_match(enum_hypothesis_list, enum_reference_list, keys, key):
+    # The previous algorithm, which compares every pair of words.
+    word_match = []
+    for i in range(len(enum_hypothesis_list))[::-1]:
+        for j in range(len(enum_reference_list))[::-1]:
+            if key(enum_reference_list[j][1]) in keys(enum_hypothesis_list[i][1]):
+                word_match.append(
+                    (enum_hypothesis_list[i][0], enum_reference_list[j][0])
+                )
+                enum_hypothesis_list.pop(i)
+                enum_reference_list.pop(j)
+                break
+    return word_match
+
+
+def _pairwise_allign_words(enum_hypothesis_list, enum_reference_list, stemmer, wordnet):
+    def synonyms(word):
+        return set(
+            lemma.name()
+            for synset in wordnet.synsets(word)
+            for lemma in synset.lemmas()
+            if '_' not in lemma.name()
+        ) | {word}
+
+    enum_hypothesis_list = list(enum_hypothesis_list)
+    enum_reference_list = list(enum_reference_list)
+    exact_matches = _pairwise_match(
+        enum_hypothesis_list, enum_reference_list, lambda w: {w}, lambda w: w
+    )
+    # The stem matched words stay available to the synonym stage.
+    stem_matches = _pairwise_match(
+        list(enum_hypothesis_list),
+        list(enum_reference_list),
+        lambda w: {stemmer.stem(w)},
+        stemmer.stem,
+    )
+    synonym_matches = _pairwise_match(
+        enum_hypothesis_list, enum_reference_list, synonyms, lambda w: w
+    )
+    return (
+        sorted(
+            exact_matches + stem_matches + synonym_matches,
+            key=lambda wordpair: wordpair[0],
+        ),
+        enum_hypothesis_list,
+        enum_reference_list,
+    )
+
+
+class TestMeteor(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+
+        def sentence():
+            return ' '.join(
+                'w%d' % rng.randint(0, 30) for _ in range(rng.randint(1, 15))
+            )
+
+        self.hypotheses = [sentence() for _ in range(100)]
+        self.list_of_references = [
+            [sentence() for _ in range(rng.randint(1, 3))] for _ in self.hypotheses
+        ]
+        self.wordnet = _ToyWordNet()
+
+    def test_alignment_matches_pairwise_algorithm(self):
+        stemmer = _CountingStemmer()
+        for hypothesis, references in zip(self.hypotheses, self.list_of_references):
+            for reference in references:
+                # arrange
+                enum_hypothesis_list = list(enumerate(hypothesis.split()))
+                enum_reference_list = list(enumerate(reference.split()))
+
+                # act
+                alignment = _enum_allign_words(
+                    enum_hypothesis_list,
+                    enum_reference_list,
+                    stemmer=stemmer,
+                    wordnet=self.wordnet,
+                    stems={},
+                    synonyms={},
+                )
+
+                # assert
+                expected = _pairwise_allign_words(
+                    enum_hypothesis_list, enum_reference_list, stemmer, self.wordnet
+                )
+                self.assertEqual(alignment, expected)
+
+    def test_corpus_meteor(self):
+        # arrange
+        stemmer = _CountingStemmer()
+
+        # act
+        score = corpus_meteor(
+            self.list_of_references,
+            self.hypotheses,
+            stemmer=stemmer,
+            wordnet=self.wordnet,
+        )
+
+        # assert
+        scores = [
+            meteor_score(references, hypothesis, wordnet=self.wordnet, stemmer=stemmer)
+            for references, hypothesis in zip(self.list_of_references, self.hypotheses)
+        ]
+        self.assertAlmostEqual(score, sum(scores) / len(scores))
+        self.assertEqual(corpus_meteor([], []), 0.0)
+
+    def test_corpus_meteor_stem_cache(self):
+        # arrange
+        stemmer = _CountingStemmer()
+        words = set(
+            word
+            for sentence in self.hypotheses + sum(self.list_of_references, [])
+            for word in sentence.split()
+        )
+
+        # act
+        corpus_meteor(
+            self.list_of_references,
+            self.hypotheses,
+            stemmer=stemmer,
+            wordnet=self.wordnet,
+        )
+
+        # assert
+        self.assertLessEqual(stemmer.calls, len(words))
+
+    def test_corpus_meteor_processes(self):
+        # arrange
+        args = (self.list_of_references, self.hypotheses)
+        kwargs = dict(stemmer=_CountingStemmer(), wordnet=self.wordnet)
+        expected = corpus_meteor(*args, **kwargs)
+
+        for processes in (2, None):
+            # act
+            score = corpus_meteor(*args, processes=processes, **kwargs)
+
+            # assert
+            self.assertEqual(score, expected)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the reference sets of the corpus-level translation metrics
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from nltk.translate.bleu_score import corpus_bleu
+from nltk.translate.chrf_score import corpus_chrf
+from nltk.translate.gleu_score import corpus_gleu
+from nltk.translate.nist_score import corpus_nist
+from nltk.translate.references import ReferenceSet
+
+
+class TestReferenceSet(unittest.TestCase):
+    def setUp(self):
+        self.list_of_references = [
+            [
+                'the cat is on the mat'.split(),
+                'there is a cat on the mat'.split(),
+            ],
+            ['he read the book because he was interested in history'.split()],
+            [
+                'it is a guide to action that ensures that the army obeys'.split(),
+                'it is the guiding principle of the army'.split(),
+            ],
+        ]
+        self.systems = [
+            [
+                'the cat the cat on the mat'.split(),
+                'he was interested in history because he read the book'.split(),
+                'it is a guide to action which ensures the army obeys'.split(),
+            ],
+            [
+                'a cat is on the mat'.split(),
+                'he read a book on world history'.split(),
+                'the guiding principle of the army'.split(),
+            ],
+        ]
+
+    def test_corpus_metrics_give_the_same_scores(self):
+        # arrange
+        references = ReferenceSet(self.list_of_references)
+        single_references = [refs[0] for refs in self.list_of_references]
+        single_reference_set = ReferenceSet([[ref] for ref in single_references])
+
+        for hypotheses in self.systems:
+            # act
+            scores = [
+                corpus_bleu(references, hypotheses),
+                corpus_nist(references, hypotheses),
+                corpus_gleu(references, hypotheses),
+                corpus_chrf(single_reference_set, hypotheses),
+            ]
+
+            # assert
+            expected_scores = [
+                corpus_bleu(self.list_of_references, hypotheses),
+                corpus_nist(self.list_of_references, hypotheses),
+                corpus_gleu(self.list_of_references, hypotheses),
+                corpus_chrf(single_references, hypotheses),
+            ]
+            self.assertEqual(scores, expected_scores)
+
+    def test_corpus_metrics_with_processes(self):
+        # arrange
+        references = ReferenceSet(self.list_of_references)
+        hypotheses = self.systems[0]
+
+        # act
+        scores = [
+            corpus_bleu(references, hypotheses, processes=2),
+            corpus_nist(references, hypotheses, processes=2),
+            corpus_gleu(references, hypotheses, processes=2),
+        ]
+
+        # assert
+        expected_scores = [
+            corpus_bleu(references, hypotheses),
+            corpus_nist(references, hypotheses),
+            corpus_gleu(references, hypotheses),
+        ]
+        self.assertEqual(scores, expected_scores)
+
+    def test_save_and_load(self):
+        # arrange
+        references = ReferenceSet(self.list_of_references)
+        hypotheses = self.systems[1]
+        expected_score = corpus_nist(references, hypotheses)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'references.pickle')
+
+        # act
+        references.save(path)
+        loaded = ReferenceSet.load(path)
+
+        # assert
+        self.assertEqual(len(loaded), len(self.list_of_references))
+        self.assertEqual(loaded.lengths(), references.lengths())
+        self.assertEqual(corpus_nist(loaded, hypotheses), expected_score)
+
+    def test_chrf_needs_one_reference_per_segment(self):
+        # arrange
+        references = ReferenceSet(self.list_of_references)
+
+        # act / assert
+        with self.assertRaises(ValueError):
+            corpus_chrf(references, self.systems[0])
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the significance tests of the translation evaluation metrics
+"""
+from __future__ import division
+
+import random
+import unittest
+
+import numpy
+
+from nltk.translate.bleu_score import corpus_bleu, corpus_bleu_statistics
+from nltk.translate.chrf_score import corpus_chrf, corpus_chrf_statistics
+from nltk.translate.nist_score import corpus_nist, corpus_nist_statistics
+from nltk.translate.significance import (
+    approximate_randomization,
+    bleu_from_statistics,
+    bootstrap_confidence_interval,
+    chrf_from_statistics,
+    nist_from_statistics,
+    paired_bootstrap,
+)
+
+
+class TestSignificance(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        vocabulary = [str(i) for i in range(50)]
+
+        def output(reference, accuracy):
+            return [
+                word if rng.random() < accuracy else rng.choice(vocabulary)
+                for word in reference
+            ]
+
+        self.references = [
+            [[rng.choice(vocabulary) for _ in range(rng.randint(5, 20))]]
+            for _ in range(200)
+        ]
+        self.good = [output(refs[0], 0.9) for refs in self.references]
+        self.bad = [output(refs[0], 0.5) for refs in self.references]
+
+    def test_scores_from_statistics(self):
+        # arrange
+        single_references = [refs[0] for refs in self.references]
+
+        # act
+        bleu = bleu_from_statistics(
+            numpy.sum(corpus_bleu_statistics(self.references, self.good), axis=0)
+        )
+        nist = nist_from_statistics(
+            numpy.sum(corpus_nist_statistics(self.references, self.good), axis=0)
+        )
+        chrf = chrf_from_statistics(
+            numpy.mean(corpus_chrf_statistics(single_references, self.good), axis=0)
+        )
+
+        # assert
+        self.assertAlmostEqual(bleu, corpus_bleu(self.references, self.good))
+        self.assertAlmostEqual(nist, corpus_nist(self.references, self.good))
+        self.assertAlmostEqual(chrf, corpus_chrf(single_references, self.good))
+
+    def test_bootstrap_confidence_interval(self):
+        # arrange
+        statistics = corpus_bleu_statistics(self.references, self.good)
+
+        # act
+        score, lower, upper = bootstrap_confidence_interval(
+            statistics, bleu_from_statistics, samples=200, seed=0
+        )
+
+        # assert
+        self.assertAlmostEqual(score, corpus_bleu(self.references, self.good))
+        self.assertTrue(lower < score < upper)
+
+    def test_significant_difference(self):
+        # arrange
+        statistics_good = corpus_bleu_statistics(self.references, self.good)
+        statistics_bad = corpus_bleu_statistics(self.references, self.bad)
+
+        # act
+        bootstrap = paired_bootstrap(
+            statistics_good, statistics_bad, bleu_from_statistics, seed=0
+        )
+        randomization = approximate_randomization(
+            statistics_bad, statistics_good, bleu_from_statistics, seed=0
+        )
+
+        # assert
+        self.assertEqual(bootstrap, (1 / 1001, 0, 1000))
+        self.assertEqual(randomization, (1 / 1000, 0, 999))
+
+    def test_same_system_is_not_significant(self):
+        # arrange
+        statistics = corpus_bleu_statistics(self.references, self.good)
+
+        # act
+        significance, count, shuffles = approximate_randomization(
+            statistics, statistics, bleu_from_statistics, seed=0
+        )
+
+        # assert
+        self.assertEqual(significance, 1)
+        self.assertEqual(count, shuffles)
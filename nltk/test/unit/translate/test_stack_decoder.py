@@ -133,6 +133,61 @@ class TestStackDecoder(unittest.TestCase):
         # assert
         self.assertEqual(phrase_spans, [(0, 1), (1, 2), (3, 5), (4, 5), (4, 6)])
 
+    def test_translation_options(self):
+        # arrange
+        phrase_table = TestStackDecoder.create_fake_phrase_table()
+        stack_decoder = StackDecoder(phrase_table, None)
+        sentence = ('my', 'hovercraft', 'is', 'full', 'of', 'eels')
+
+        # act
+        translation_options = stack_decoder.translation_options(sentence)
+
+        # assert
+        spans = [span for span, _, _ in translation_options]
+        self.assertEqual(spans, [(0, 2), (1, 2), (2, 3), (3, 5), (3, 6), (5, 6)])
+        span, mask, options = translation_options[4]  # 'full of eels'
+        self.assertEqual(mask, 0b111000)
+        self.assertEqual(options, phrase_table.translations_for(('full', 'of', 'eels')))
+
+    def test_recombination_state(self):
+        # arrange
+        language_model = TestStackDecoder.create_fake_language_model()
+        language_model.order = 2
+        stack_decoder = StackDecoder(None, language_model)
+        root = _Hypothesis()
+        hypothesis = _Hypothesis(
+            src_phrase_span=(0, 2), trg_phrase=('a', 'b'), previous=root
+        )
+        hypothesis = _Hypothesis(
+            src_phrase_span=(3, 4), trg_phrase=('c',), previous=hypothesis
+        )
+
+        # act
+        state = stack_decoder.recombination_state(hypothesis)
+
+        # assert
+        self.assertEqual(state, (0b1011, (4,), ('c',)))
+
+    def test_translate_many(self):
+        # arrange
+        phrase_table = PhraseTable()
+        phrase_table.add(('niemand',), ('nobody',), log(0.8))
+        phrase_table.add(('niemand',), ('no', 'one'), log(0.2))
+        phrase_table.add(('erwartet',), ('expects',), log(0.8))
+        phrase_table.add(('erwartet',), ('expecting',), log(0.2))
+        language_model = TestStackDecoder.create_fake_language_model()
+        language_model.probability_change = lambda context, phrase: log(0.1)
+        stack_decoder = StackDecoder(phrase_table, language_model)
+        sentences = [['niemand', 'erwartet'], ['erwartet', 'niemand'], ['niemand']]
+
+        # act
+        translations = stack_decoder.translate_many(sentences)
+
+        # assert
+        expected_translations = [stack_decoder.translate(s) for s in sentences]
+        self.assertEqual(translations, expected_translations)
+        self.assertEqual(translations[0], ['nobody', 'expects'])
+
     @staticmethod
     def create_fake_phrase_table():
         phrase_table = PhraseTable()
@@ -221,6 +276,13 @@ class TestHypothesis(unittest.TestCase):
         # assert
         self.assertEqual(untranslated_spans, [(0, 1), (2, 3), (7, 10)])
 
+    def test_last_translated_words(self):
+        # act
+        last_words = self.hypothesis_chain.last_translated_words(3)
+
+        # assert
+        self.assertEqual(last_words, ('world', 'and', 'goodbye'))
+
     def test_untranslated_spans_for_empty_hypothesis(self):
         # arrange
         hypothesis = _Hypothesis()
@@ -293,3 +355,19 @@ class TestStack(unittest.TestCase):
 
         # assert
         self.assertEqual(stack.best(), None)
+
+    def test_push_recombines_hypotheses_with_the_same_state(self):
+        # arrange
+        stack = _Stack(3)
+        poor_hypothesis = _Hypothesis(0.1)
+        better_hypothesis = _Hypothesis(0.2)
+        other_hypothesis = _Hypothesis(0.15)
+
+        # act
+        stack.push(poor_hypothesis, 'state')
+        stack.push(better_hypothesis, 'state')
+        stack.push(other_hypothesis, 'other state')
+        stack.push(_Hypothesis(0.05), 'state')
+
+        # assert
+        self.assertEqual(list(stack), [better_hypothesis, other_hypothesis])
@@ -18,13 +18,21 @@ from __future__ import print_function, division, unicode_literals, absolute_impo
 from math import log
 from collections import defaultdict, Counter, namedtuple
 from functools import reduce
+import io
+import json
+import os
 import re
 
-from six import text_type
+from six import text_type, unichr
+
+try:
+    import numpy
+except ImportError:
+    pass
 
 from nltk.probability import FreqDist
 from nltk.probability import ConditionalFreqDist as CFD
-from nltk.util import tokenwrap, LazyConcatenation
+from nltk.util import tokenwrap, LazyConcatenation, LazyMap
 from nltk.metrics import f_measure, BigramAssocMeasures
 from nltk.collocations import BigramCollocationFinder
 from nltk.compat import python_2_unicode_compatible
@@ -83,9 +91,16 @@ class ContextIndex(object):
         word = self._key(word)
         word_contexts = set(self._word_to_contexts[word])
 
-        scores = {}
-        for w, w_contexts in self._word_to_contexts.items():
-            scores[w] = f_measure(word_contexts, set(w_contexts))
+        # Only the words that share a context with ``word`` can get a
+        # non-zero score.
+        scores = dict(
+            (w, 0 if w_contexts and word_contexts else None)
+            for w, w_contexts in self._word_to_contexts.items()
+        )
+        for c in word_contexts:
+            for w in self._context_to_words[c]:
+                if not scores[w]:
+                    scores[w] = f_measure(word_contexts, set(self._word_to_contexts[w]))
 
         return scores
 
@@ -240,6 +255,271 @@ class ConcordanceIndex(object):
                 print(concordance_line.line)
 
 
+class TextIndex(ConcordanceIndex):
+    """
+    A compact positional index of a document, which can be saved to a
+    directory and loaded back instantly by memory-mapping its arrays.
+
+    Like ``ConcordanceIndex``, it maps each word (or key) to the sorted
+    offsets at which it occurs.  Like ``ContextIndex``, it also records
+    the contexts in which each word occurs, where the context of a word
+    is the pair of keys of the words to its left and right (or
+    ``'*START*'`` and ``'*END*'``).  Words and contexts are coded as
+    integers, so that ``similar_words()`` and ``common_contexts()`` only
+    look at the words that share a context with their arguments, instead
+    of scanning the whole vocabulary.
+
+        >>> from nltk.text import TextIndex
+        >>> tokens = 'the cat sat on the mat and the dog sat on the log'.split()
+        >>> index = TextIndex(tokens)
+        >>> index.offsets('sat')
+        [2, 9]
+        >>> index.similar_words('cat')
+        ['dog']
+        >>> sorted(index.common_contexts(['cat', 'dog']))
+        [('the', 'sat')]
+
+    Building the index requires NumPy.
+
+    :param tokens: The document (list of tokens) to index.
+    :param key: A function that maps each token to a normalized version
+        that will be used as a key in the index.  The same function must be
+        given when the index is loaded.
+    :param filter: A function that selects the tokens that are used when
+        finding contexts.  Other tokens are skipped over.
+    """
+
+    _START, _END = -1, -2
+
+    def __init__(self, tokens, key=lambda x: x, filter=None):
+        self._key = key
+
+        type_ids = {}
+        token_ids = [type_ids.setdefault(t, len(type_ids)) for t in tokens]
+        words = [None] * len(type_ids)
+        for t, i in type_ids.items():
+            words[i] = t
+
+        key_ids = {}
+        type_keys = [key_ids.setdefault(key(t), len(key_ids)) for t in words]
+        keys = [None] * len(key_ids)
+        for k, i in key_ids.items():
+            keys[i] = k
+
+        token_ids = numpy.array(token_ids, dtype=numpy.int32)
+        token_keys = numpy.array(type_keys, dtype=numpy.int32)[token_ids]
+        num_keys = len(keys)
+
+        # word -> offsets
+        offsets = numpy.argsort(token_keys, kind='mergesort').astype(numpy.int64)
+        offset_starts = _csr_starts(token_keys, num_keys)
+
+        # contexts of the selected tokens
+        if filter:
+            selected = numpy.array([bool(filter(t)) for t in words], dtype=bool)
+            context_keys = token_keys[selected[token_ids]]
+        else:
+            context_keys = token_keys
+        left = numpy.concatenate(([self._START], context_keys[:-1]))
+        right = numpy.concatenate((context_keys[1:], [self._END]))
+        if len(context_keys) == 0:
+            left, right = context_keys, context_keys
+        context_codes = (left.astype(numpy.int64) + 2) * (num_keys + 2) + right + 2
+        context_codes, word_contexts = numpy.unique(context_codes, return_inverse=True)
+        contexts = numpy.empty((len(context_codes), 2), dtype=numpy.int32)
+        contexts[:, 0] = context_codes // (num_keys + 2) - 2
+        contexts[:, 1] = context_codes % (num_keys + 2) - 2
+
+        # word -> (context, count), in order of first occurrence
+        pair_codes = context_keys.astype(numpy.int64) * len(contexts) + word_contexts
+        pair_codes, first, counts = numpy.unique(
+            pair_codes, return_index=True, return_counts=True
+        )
+        pair_words = pair_codes // max(len(contexts), 1)
+        pair_contexts = pair_codes % max(len(contexts), 1)
+        order = numpy.lexsort((first, pair_words))
+        # context -> (word, count), in order of word
+        rorder = numpy.lexsort((pair_words, pair_contexts))
+
+        self._tokens = LazyMap(words.__getitem__, token_ids)
+        self._words = words
+        self._keys = keys
+        self._key_ids = key_ids
+        self._arrays = {
+            'token_ids': token_ids,
+            'offsets': offsets,
+            'offset_starts': offset_starts,
+            'contexts': contexts,
+            'word_contexts': pair_contexts[order].astype(numpy.int32),
+            'word_context_counts': counts[order].astype(numpy.int32),
+            'word_context_starts': _csr_starts(pair_words, num_keys),
+            'context_words': pair_words[rorder].astype(numpy.int32),
+            'context_word_counts': counts[rorder].astype(numpy.int32),
+            'context_word_starts': _csr_starts(pair_contexts, len(contexts)),
+        }
+
+    def save(self, path):
+        """
+        Save this index to the directory ``path``, which is created if
+        needed.
+
+        :type path: str
+        """
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        with io.open(os.path.join(path, 'vocab.json'), 'w', encoding='utf8') as fp:
+            fp.write(
+                text_type(
+                    json.dumps({'words': self._words, 'keys': self._keys}, ensure_ascii=False)
+                )
+            )
+        for name, array in self._arrays.items():
+            numpy.save(os.path.join(path, name + '.npy'), array)
+
+    @classmethod
+    def load(cls, path, key=lambda x: x, mmap=True):
+        """
+        Load an index saved with ``save()``.
+
+        :param path: The directory the index was saved to.
+        :type path: str
+        :param key: The key function the index was built with.
+        :param mmap: If true, the arrays are memory-mapped instead of read
+            into memory, so that loading takes constant time.
+        :type mmap: bool
+        :rtype: TextIndex
+        """
+        index = cls.__new__(cls)
+        index._key = key
+        with io.open(os.path.join(path, 'vocab.json'), encoding='utf8') as fp:
+            vocab = json.load(fp)
+        index._words = vocab['words']
+        index._keys = vocab['keys']
+        index._key_ids = dict((k, i) for i, k in enumerate(index._keys))
+        index._arrays = {}
+        for filename in os.listdir(path):
+            if filename.endswith('.npy'):
+                index._arrays[filename[:-4]] = numpy.load(
+                    os.path.join(path, filename), mmap_mode='r' if mmap else None
+                )
+        index._tokens = LazyMap(index._words.__getitem__, index._arrays['token_ids'])
+        return index
+
+    def _rows(self, name, i):
+        starts = self._arrays[name + '_starts']
+        return slice(starts[i], starts[i + 1])
+
+    def _context_name(self, i):
+        if i == self._START:
+            return '*START*'
+        if i == self._END:
+            return '*END*'
+        return self._keys[i]
+
+    def offsets(self, word):
+        """
+        :rtype: list(int)
+        :return: A list of the offset positions at which the given
+            word occurs.  If a key function was specified for the
+            index, then given word's key will be looked up.
+        """
+        i = self._key_ids.get(self._key(word))
+        if i is None:
+            return []
+        return self._arrays['offsets'][self._rows('offset', i)].tolist()
+
+    def contexts(self, word):
+        """
+        :rtype: list(tuple(str, str))
+        :return: The contexts in which the given word occurs, in order of
+            their first occurrence.
+        """
+        i = self._key_ids.get(self._key(word))
+        if i is None:
+            return []
+        contexts = self._arrays['contexts']
+        return [
+            (self._context_name(left), self._context_name(right))
+            for left, right in contexts[self._arrays['word_contexts'][
+                self._rows('word_context', i)
+            ]].tolist()
+        ]
+
+    def similar_words(self, word, n=20):
+        """
+        Find the words that occur in the most contexts in common with the
+        given word.  Ties are ordered by the first occurrence of the words.
+
+        :param word: The word used to seed the similarity search
+        :type word: str
+        :param n: The number of words to return
+        :type n: int
+        :rtype: list(str)
+        """
+        i = self._key_ids.get(self._key(word))
+        if i is None:
+            return []
+        contexts = self._arrays['word_contexts'][self._rows('word_context', i)]
+        starts = self._arrays['context_word_starts']
+        candidates = self._arrays['context_words'][
+            _ranges(starts[contexts], starts[contexts + 1])
+        ]
+        candidates, scores = numpy.unique(candidates, return_counts=True)
+        keep = candidates != i
+        candidates, scores = candidates[keep], scores[keep]
+        best = numpy.lexsort((candidates, -scores))[:n]
+        return [self._keys[j] for j in candidates[best].tolist()]
+
+    def common_contexts(self, words, fail_on_unknown=False):
+        """
+        Find contexts where the specified words can all appear; and
+        return a frequency distribution mapping each context to the
+        number of times that context was used.
+
+        :param words: The words used to seed the similarity search
+        :type words: str
+        :param fail_on_unknown: If true, then raise a value error if
+            any of the given words do not occur at all in the index.
+        """
+        words = [self._key(w) for w in words]
+        contexts = [self.contexts(w) for w in words]
+        empty = [words[i] for i in range(len(words)) if not contexts[i]]
+        common = reduce(set.intersection, [set(c) for c in contexts])
+        if empty and fail_on_unknown:
+            raise ValueError("The following word(s) were not found:", " ".join(words))
+        elif not common:
+            # nothing in common -- just return an empty freqdist.
+            return FreqDist()
+        else:
+            return FreqDist(c for cs in contexts for c in cs if c in common)
+
+    def __repr__(self):
+        return '<TextIndex for %d tokens (%d types)>' % (
+            len(self._tokens),
+            len(self._keys),
+        )
+
+
+def _csr_starts(rows, num_rows):
+    """
+    Return the start of each row in a list of entries sorted by ``rows``,
+    followed by the total number of entries.
+    """
+    starts = numpy.zeros(num_rows + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(rows, minlength=num_rows), out=starts[1:])
+    return starts
+
+
+def _ranges(starts, ends):
+    """
+    Return the concatenation of ``range(start, end)`` for each pair of
+    ``starts`` and ``ends``, as an array.
+    """
+    lengths = ends - starts
+    offsets = numpy.cumsum(lengths) - lengths
+    return numpy.repeat(starts - offsets, lengths) + numpy.arange(lengths.sum())
+
+
 class TokenSearcher(object):
     """
     A class that makes it easier to use regular expressions to search
@@ -249,10 +529,80 @@ class TokenSearcher(object):
     passed to the ``findall()`` method is modified to treat angle
     brackets as non-capturing parentheses, in addition to matching the
     token boundaries; and to have ``'.'`` not match the angle brackets.
+
+    Patterns that are built only from token patterns (``<...>``),
+    groups, alternatives and quantifiers, and whose token patterns can
+    not match ``'>'`` (as negated character classes, ``\\D``, ``\\W`` or
+    ``\\S`` can), are compiled to work on token ids instead: each
+    distinct token is coded as a single character, and each token
+    pattern becomes the set of characters of the tokens it matches.
+    The tokens are read only once, so they may be streamed
+    from a corpus view, and the coded string is several times smaller
+    than the marked-up one, which is only built for other patterns.
+
+    :param tokens: The tokens to search.
+    :param index: An optional ``ConcordanceIndex`` (or ``TextIndex``)
+        over ``tokens``, used to jump straight to the occurrences of a
+        literal first token.  Its key may normalize the tokens (e.g.
+        ignore case), as long as equal tokens have equal keys.
     """
 
-    def __init__(self, tokens):
-        self._raw = ''.join('<' + w + '>' for w in tokens)
+    # Token ids are coded as characters, so there can be at most this
+    # many distinct tokens.
+    _MAX_TYPES = 0x110000
+
+    _LITERAL_RE = re.compile(r'[^.^$*+?{}\[\]\\|()]+$')
+
+    # Token patterns that may match '>' (negated classes, \D, \W, \S and
+    # escaped characters), and so run across token boundaries in the
+    # marked-up string.
+    _CROSSING_RE = re.compile(r'\[\^|\\[DWSxuUN0-7]')
+
+    def __init__(self, tokens, index=None):
+        self._tokens = tokens
+        self._index = index
+        self._compiled = {}
+
+    @property
+    def _raw(self):
+        if '_raw_string' not in self.__dict__:
+            # The tokens are read only once, by _code_tokens().
+            if self._code_tokens():
+                types = self._types
+                tokens = (types[ord(char)] for char in self._ids)
+            else:
+                tokens = self._tokens
+            self._raw_string = ''.join('<' + w + '>' for w in tokens)
+        return self._raw_string
+
+    def _code_tokens(self):
+        """
+        Code each token as the character whose ordinal is its type id,
+        setting ``self._types`` and ``self._ids``.  Returns False if
+        there are too many distinct tokens; in that case, a stream of
+        tokens is kept as a list for the marked-up string.
+        """
+        if '_ids' not in self.__dict__:
+            type_ids = {}
+            types = []
+            chars = []
+            tokens = iter(self._tokens)
+            for token in tokens:
+                char = type_ids.get(token)
+                if char is None:
+                    if len(types) == self._MAX_TYPES:
+                        if tokens is self._tokens:
+                            self._tokens = [types[ord(c)] for c in chars]
+                            self._tokens.append(token)
+                            self._tokens.extend(tokens)
+                        self._types = self._ids = None
+                        return False
+                    char = type_ids[token] = unichr(len(types))
+                    types.append(token)
+                chars.append(char)
+            self._types = types
+            self._ids = ''.join(chars)
+        return self._ids is not None
 
     def findall(self, regexp):
         """
@@ -280,6 +630,13 @@ class TokenSearcher(object):
         """
         # preprocess the regular expression
         regexp = re.sub(r'\s', '', regexp)
+
+        if regexp not in self._compiled:
+            self._compiled[regexp] = self._compile(regexp)
+        compiled = self._compiled[regexp]
+        if compiled is not None:
+            return self._findall_ids(*compiled)
+
         regexp = re.sub(r'<', '(?:<(?:', regexp)
         regexp = re.sub(r'>', ')>)', regexp)
         regexp = re.sub(r'(?<!\\)\.', '[^>]', regexp)
@@ -296,6 +653,229 @@ class TokenSearcher(object):
         hits = [h[1:-1].split('><') for h in hits]
         return hits
 
+    def _compile(self, regexp):
+        """
+        Translate ``regexp`` into a regular expression over the coded
+        tokens.  Returns the compiled expression and the literal first
+        token of every match (or None); or returns None if ``regexp``
+        must be searched for in the marked-up string instead.
+        """
+        parser = _TokenPatternParser(regexp)
+        try:
+            tree = parser.parse()
+        except ValueError:
+            return None
+        # Patterns that match the empty string, or with several groups,
+        # behave differently (or fail) over the marked-up string.
+        if parser.groups > 1 or _TokenPatternParser.nullable(tree):
+            return None
+        if any(
+            self._CROSSING_RE.search(pattern)
+            for pattern in _TokenPatternParser.token_patterns(tree)
+        ):
+            return None
+        if not self._code_tokens():
+            return None
+
+        first = _TokenPatternParser.first(tree)
+        literal = None
+        if first is not None and self._LITERAL_RE.match(first[1]):
+            literal = first[1]
+        return re.compile(self._translate(tree)), literal
+
+    def _translate(self, node):
+        kind = node[0]
+        if kind == 'token':
+            return self._char_class(node[1])
+        elif kind == 'seq':
+            return ''.join(self._translate(item) for item in node[1])
+        elif kind == 'alt':
+            return '(?:%s)' % '|'.join(self._translate(o) for o in node[1])
+        elif kind == 'group':
+            return '(%s)' % self._translate(node[1])
+        elif kind == 'repeat':
+            body, low, high, greedy = node[1:]
+            quantifier = '{%d,%s}' % (low, '' if high is None else high)
+            return '(?:%s)%s%s' % (self._translate(body), quantifier, '' if greedy else '?')
+
+    def _char_class(self, pattern):
+        """
+        A character class matching the ids of the token types that
+        ``pattern`` matches in the marked-up string.
+        """
+        pattern = re.sub(r'(?<!\\)\.', '[^>]', pattern)
+        token_re = re.compile(r'(?:%s)\Z' % pattern)
+        ranges = []
+        for i, token in enumerate(self._types):
+            if token_re.match(token):
+                if ranges and ranges[-1][1] == i - 1:
+                    ranges[-1][1] = i
+                else:
+                    ranges.append([i, i])
+        if not ranges:
+            return '(?!)'
+        return '[%s]' % ''.join(
+            _escape_class_char(a) + ('-' + _escape_class_char(b) if b > a else '')
+            for a, b in ranges
+        )
+
+    def _findall_ids(self, compiled, literal):
+        if literal is not None and self._index is not None:
+            matches = []
+            end = 0
+            for pos in self._index.offsets(literal):
+                if pos >= end:
+                    match = compiled.match(self._ids, pos)
+                    if match:
+                        matches.append(match)
+                        end = match.end()
+        else:
+            matches = compiled.finditer(self._ids)
+
+        types = self._types
+        if compiled.groups:
+            return [
+                [types[ord(c)] for c in m.group(1)] if m.group(1) else ['']
+                for m in matches
+            ]
+        return [[types[ord(c)] for c in m.group()] for m in matches]
+
+
+def _escape_class_char(i):
+    char = unichr(i)
+    return '\\' + char if char in '\\]^-[' else char
+
+
+class _TokenPatternParser(object):
+    """
+    A parser for ``TokenSearcher`` patterns, producing a tree of tuples:
+    ``('token', pattern)``, ``('seq', items)``, ``('alt', options)``,
+    ``('group', node)`` and ``('repeat', node, min, max, greedy)``.
+    Raises ValueError if the pattern uses anything else.
+    """
+
+    _QUANTIFIER_RE = re.compile(r'\*|\+|\?|\{(\d*)(,?)(\d*)\}')
+
+    def __init__(self, regexp):
+        self._regexp = regexp
+        self._pos = 0
+        self.groups = 0
+
+    def parse(self):
+        tree = self._alternatives()
+        if self._pos != len(self._regexp):
+            raise ValueError('Unexpected %r' % self._regexp[self._pos])
+        return tree
+
+    @classmethod
+    def nullable(cls, node):
+        """Whether ``node`` can match the empty sequence."""
+        kind = node[0]
+        if kind == 'token':
+            return False
+        elif kind == 'seq':
+            return all(cls.nullable(item) for item in node[1])
+        elif kind == 'alt':
+            return any(cls.nullable(option) for option in node[1])
+        elif kind == 'group':
+            return cls.nullable(node[1])
+        return node[2] == 0 or cls.nullable(node[1])
+
+    @classmethod
+    def token_patterns(cls, node):
+        """The token patterns of ``node``."""
+        kind = node[0]
+        if kind == 'token':
+            yield node[1]
+        elif kind in ('seq', 'alt'):
+            for item in node[1]:
+                for pattern in cls.token_patterns(item):
+                    yield pattern
+        else:
+            for pattern in cls.token_patterns(node[1]):
+                yield pattern
+
+    @classmethod
+    def first(cls, node):
+        """The token pattern that every match of ``node`` starts with."""
+        kind = node[0]
+        if kind == 'token':
+            return node
+        elif kind == 'seq':
+            return cls.first(node[1][0]) if node[1] else None
+        elif kind == 'group':
+            return cls.first(node[1])
+        elif kind == 'repeat' and node[2] > 0:
+            return cls.first(node[1])
+        return None
+
+    def _peek(self, string):
+        return self._regexp.startswith(string, self._pos)
+
+    def _alternatives(self):
+        options = [self._sequence()]
+        while self._peek('|'):
+            self._pos += 1
+            options.append(self._sequence())
+        return options[0] if len(options) == 1 else ('alt', options)
+
+    def _sequence(self):
+        items = []
+        while self._pos < len(self._regexp) and not (
+            self._peek('|') or self._peek(')')
+        ):
+            items.append(self._quantified(self._atom()))
+        return ('seq', items)
+
+    def _atom(self):
+        if self._peek('<'):
+            end = self._regexp.find('>', self._pos)
+            pattern = self._regexp[self._pos + 1 : end]
+            if end < 0 or '<' in pattern:
+                raise ValueError('Unbalanced token pattern')
+            try:
+                re.compile(pattern)
+            except re.error:
+                raise ValueError('Bad token pattern')
+            self._pos = end + 1
+            return ('token', pattern)
+        elif self._peek('(?:') or (self._peek('(') and not self._peek('(?')):
+            capture = not self._peek('(?:')
+            self._pos += 1 if capture else 3
+            self.groups += capture
+            node = self._alternatives()
+            if not self._peek(')'):
+                raise ValueError('Unbalanced parenthesis')
+            self._pos += 1
+            return ('group', node) if capture else node
+        raise ValueError('Expected a token pattern or a group')
+
+    def _quantified(self, node):
+        match = self._QUANTIFIER_RE.match(self._regexp, self._pos)
+        if not match:
+            return node
+        if match.group() == '*':
+            low, high = 0, None
+        elif match.group() == '+':
+            low, high = 1, None
+        elif match.group() == '?':
+            low, high = 0, 1
+        else:
+            low_digits, comma, high_digits = match.groups()
+            if not (low_digits or high_digits):
+                raise ValueError('Bad quantifier')
+            low = int(low_digits or 0)
+            high = int(high_digits) if high_digits else (None if comma else low)
+            if high is not None and high < low:
+                raise ValueError('Bad quantifier')
+        self._pos = match.end()
+        greedy = not self._peek('?')
+        if not greedy:
+            self._pos += 1
+        if self._QUANTIFIER_RE.match(self._regexp, self._pos):
+            raise ValueError('Multiple repeat')
+        return ('repeat', node, low, high, greedy)
+
 
 @python_2_unicode_compatible
 class Text(object):
@@ -343,6 +923,25 @@ class Text(object):
         else:
             self.name = " ".join(text_type(tok) for tok in tokens[:8]) + "..."
 
+    @classmethod
+    def from_index(cls, index, name=None):
+        """
+        Create a Text object whose tokens, concordances and word contexts
+        all come from a ``TextIndex``, so that nothing needs to be
+        computed.  To get the same results as a Text created from the
+        tokens, build the index with ``key=lambda s: s.lower()`` and
+        ``filter=lambda x: x.isalpha()``.
+
+        :param index: The index of the source text.
+        :type index: TextIndex
+        """
+        text = cls.__new__(cls)
+        text._COPY_TOKENS = False
+        text.__init__(index.tokens(), name)
+        text._concordance_index = index
+        text._word_context_index = index
+        return text
+
     # ////////////////////////////////////////////////////////////
     # Support item & slice access
     # ////////////////////////////////////////////////////////////
@@ -476,19 +1075,26 @@ class Text(object):
         # words = self._word_context_index.similar_words(word, num)
 
         word = word.lower()
-        wci = self._word_context_index._word_to_contexts
-        if word in wci.conditions():
-            contexts = set(wci[word])
-            fd = Counter(
-                w
-                for w in wci.conditions()
-                for c in wci[w]
-                if c in contexts and not w == word
-            )
-            words = [w for w, _ in fd.most_common(num)]
-            print(tokenwrap(words))
+        words = None
+        if isinstance(self._word_context_index, TextIndex):
+            if self._word_context_index.contexts(word):
+                words = self._word_context_index.similar_words(word, num)
         else:
+            wci = self._word_context_index._word_to_contexts
+            if word in wci.conditions():
+                contexts = set(wci[word])
+                fd = Counter(
+                    w
+                    for w in wci.conditions()
+                    for c in wci[w]
+                    if c in contexts and not w == word
+                )
+                words = [w for w, _ in fd.most_common(num)]
+
+        if words is None:
             print("No matches")
+        else:
+            print(tokenwrap(words))
 
     def common_contexts(self, words, num=20):
         """
@@ -582,7 +1188,9 @@ class Text(object):
         """
 
         if "_token_searcher" not in self.__dict__:
-            self._token_searcher = TokenSearcher(self)
+            self._token_searcher = TokenSearcher(
+                self.tokens, self.__dict__.get('_concordance_index')
+            )
 
         hits = self._token_searcher.findall(regexp)
         hits = [' '.join(h) for h in hits]
@@ -709,6 +1317,7 @@ if __name__ == '__main__':
 __all__ = [
     "ContextIndex",
     "ConcordanceIndex",
+    "TextIndex",
     "TokenSearcher",
     "Text",
     "TextCollection",
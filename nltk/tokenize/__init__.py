@@ -86,7 +86,11 @@ from nltk.tokenize.simple import (
 from nltk.tokenize.texttiling import TextTilingTokenizer
 from nltk.tokenize.toktok import ToktokTokenizer
 from nltk.tokenize.treebank import TreebankWordTokenizer
-from nltk.tokenize.util import string_span_tokenize, regexp_span_tokenize
+from nltk.tokenize.util import (
+    string_span_tokenize,
+    regexp_span_tokenize,
+    TokenSpans,
+)
 from nltk.tokenize.stanford_segmenter import StanfordSegmenter
 
 
@@ -14,7 +14,7 @@ from abc import ABCMeta, abstractmethod
 from six import add_metaclass
 
 from nltk.internals import overridden
-from nltk.tokenize.util import string_span_tokenize
+from nltk.tokenize.util import string_span_tokenize, TokenSpans
 
 
 @add_metaclass(ABCMeta)
@@ -43,6 +43,16 @@ class TokenizerI(object):
         """
         raise NotImplementedError()
 
+    def compact_span_tokenize(self, s):
+        """
+        Identify the tokens as by ``self.span_tokenize()``, returning
+        them as a ``TokenSpans``: arrays of integer offsets into *s*,
+        whose tokens are only sliced out of *s* when accessed.
+
+        :rtype: TokenSpans
+        """
+        return TokenSpans.from_spans(s, self.span_tokenize(s))
+
     def tokenize_sents(self, strings):
         """
         Apply ``self.tokenize()`` to each element of ``strings``.  I.e.:
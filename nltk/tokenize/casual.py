@@ -37,10 +37,13 @@ domains and tasks. The basic logic is this:
 
 from __future__ import unicode_literals
 import re
+from functools import partial
 
 from six import int2byte, unichr
 from six.moves import html_entities
 
+from nltk.util import parallel_map
+
 ######################################################################
 # The following strings are components in the regular expression
 # that is used for tokenizing. It's important that phone_number
@@ -178,6 +181,16 @@ EMOTICON_RE = re.compile(EMOTICONS, re.VERBOSE | re.I | re.UNICODE)
 # These are for regularizing HTML entities to Unicode:
 ENT_RE = re.compile(r'&(#?(x?))([^&;\s]+);')
 
+# These are for the normalization functions:
+HANDLES_RE = re.compile(
+    r"(?<![A-Za-z0-9_!@#\$%&*])@(([A-Za-z0-9_]){20}(?!@))|(?<![A-Za-z0-9_!@#\$%&*])@(([A-Za-z0-9_]){1,19})(?![A-Za-z0-9_]*@)"
+)
+REDUCE_LEN_RE = re.compile(r"(.)\1{2,}")
+
+# When lengthening is reduced, the HANG_RE pass can only ever match runs of
+# newlines (which ``.`` does not match), so both passes are done at once:
+REDUCE_LEN_HANG_RE = re.compile(r"(.)\1{2,}|([^a-zA-Z0-9])\2{3,}")
+
 
 ######################################################################
 # Functions for converting html entities
@@ -273,10 +286,15 @@ class TweetTokenizer:
         [':', 'This', 'is', 'waaayyy', 'too', 'much', 'for', 'you', '!', '!', '!']
     """
 
+    # The maximum number of distinct tokens whose case-folded form is
+    # remembered when `preserve_case=False`.
+    case_cache_size = 100000
+
     def __init__(self, preserve_case=True, reduce_len=False, strip_handles=False):
         self.preserve_case = preserve_case
         self.reduce_len = reduce_len
         self.strip_handles = strip_handles
+        self._case_cache = {}
 
     def tokenize(self, text):
         """
@@ -285,25 +303,66 @@ class TweetTokenizer:
         :return: a tokenized list of strings; concatenating this list returns\
         the original string if `preserve_case=False`
         """
+        text = _str_to_unicode(text)
         # Fix HTML character entities:
-        text = _replace_html_entities(text)
+        if '&' in text:
+            text = _replace_html_entities(text)
         # Remove username handles
-        if self.strip_handles:
-            text = remove_handles(text)
-        # Normalize word lengthening
+        if self.strip_handles and '@' in text:
+            text = HANDLES_RE.sub(' ', text)
+        # Normalize word lengthening and shorten problematic sequences of
+        # characters
         if self.reduce_len:
-            text = reduce_lengthening(text)
-        # Shorten problematic sequences of characters
-        safe_text = HANG_RE.sub(r'\1\1\1', text)
+            safe_text = REDUCE_LEN_HANG_RE.sub(_reduce_len_hang, text)
+        else:
+            safe_text = HANG_RE.sub(r'\1\1\1', text)
         # Tokenize:
         words = WORD_RE.findall(safe_text)
         # Possibly alter the case, but avoid changing emoticons like :D into :d:
         if not self.preserve_case:
-            words = list(
-                map((lambda x: x if EMOTICON_RE.search(x) else x.lower()), words)
-            )
+            words = self._fold_case(words)
         return words
 
+    def tokenize_sents(self, strings, processes=1):
+        """
+        Tokenize each of the given texts.  I.e.:
+
+            return [self.tokenize(s) for s in strings]
+
+        Large batches can be spread over several worker processes.
+
+        :param strings: the texts to tokenize
+        :type strings: list(str)
+        :param processes: the number of worker processes, or None for one
+            per CPU
+        :type processes: int or None
+        :rtype: list(list(str))
+        """
+        if processes is not None and processes <= 1:
+            return [self.tokenize(s) for s in strings]
+        return parallel_map(partial(_tokenize, self), strings, processes)
+
+    def _fold_case(self, words):
+        cache = self._case_cache
+        folded = []
+        for word in words:
+            fold = cache.get(word)
+            if fold is None:
+                if len(cache) >= self.case_cache_size:
+                    cache.clear()
+                fold = word if EMOTICON_RE.search(word) else word.lower()
+                cache[word] = fold
+            folded.append(fold)
+        return folded
+
+
+def _tokenize(tokenizer, text):
+    return tokenizer.tokenize(text)
+
+
+def _reduce_len_hang(match):
+    return (match.group(1) or match.group(2)) * 3
+
 
 ######################################################################
 # Normalization Functions
@@ -315,19 +374,15 @@ def reduce_lengthening(text):
     Replace repeated character sequences of length 3 or greater with sequences
     of length 3.
     """
-    pattern = re.compile(r"(.)\1{2,}")
-    return pattern.sub(r"\1\1\1", text)
+    return REDUCE_LEN_RE.sub(r"\1\1\1", text)
 
 
 def remove_handles(text):
     """
     Remove Twitter username handles from text.
     """
-    pattern = re.compile(
-        r"(?<![A-Za-z0-9_!@#\$%&*])@(([A-Za-z0-9_]){20}(?!@))|(?<![A-Za-z0-9_!@#\$%&*])@(([A-Za-z0-9_]){1,19})(?![A-Za-z0-9_]*@)"
-    )
     # Substitute handles with ' ' to ensure that text on either side of removed handles are tokenized correctly
-    return pattern.sub(' ', text)
+    return HANDLES_RE.sub(' ', text)
 
 
 ######################################################################
@@ -345,3 +400,39 @@ def casual_tokenize(text, preserve_case=True, reduce_len=False, strip_handles=Fa
 
 
 ###############################################################################
+
+
+def demo():
+    """
+    Compare the speed of tokenizing a batch of tweets one at a time with
+    `casual_tokenize` against reusing a single `TweetTokenizer`.
+    """
+    import time
+
+    tweets = [
+        "@remy: This is waaaaayyyy too much for you!!!!!! :-) &amp; <3",
+        "RT @nltk_org Check out http://www.nltk.org/ #NLP #python :D",
+        "Price: &pound;100 ... that's sooooo cheap!!! @shop_owner >:(",
+        "Call me at +1 (800) 555-1234 or mail foo.bar@example.com ;-P",
+    ] * 2500
+
+    print("Tokenizing %d tweets:" % len(tweets))
+    print(casual_tokenize(tweets[0], preserve_case=False, reduce_len=True))
+
+    start = time.time()
+    for tweet in tweets:
+        casual_tokenize(tweet, preserve_case=False, reduce_len=True)
+    print("  casual_tokenize, one at a time: %.3fs" % (time.time() - start))
+
+    tokenizer = TweetTokenizer(preserve_case=False, reduce_len=True)
+    start = time.time()
+    tokenizer.tokenize_sents(tweets)
+    print("  TweetTokenizer.tokenize_sents: %.3fs" % (time.time() - start))
+
+    start = time.time()
+    tokenizer.tokenize_sents(tweets, processes=2)
+    print("  TweetTokenizer.tokenize_sents, 2 processes: %.3fs" % (time.time() - start))
+
+
+if __name__ == '__main__':
+    demo()
@@ -114,6 +114,7 @@ from six import string_types
 from nltk.compat import unicode_repr, python_2_unicode_compatible
 from nltk.probability import FreqDist
 from nltk.tokenize.api import TokenizerI
+from nltk.tokenize.util import TokenSpans
 
 ######################################################################
 # { Orthographic Context Constants
@@ -1321,6 +1322,16 @@ class PunktSentenceTokenizer(PunktBaseClass, TokenizerI):
         for sl in slices:
             yield (sl.start, sl.stop)
 
+    def compact_span_tokenize(self, text, realign_boundaries=True):
+        """
+        Given a text, returns the spans of its sentences as a
+        ``TokenSpans``, which only slices the sentences out of the text
+        when they are accessed.
+        """
+        return TokenSpans.from_spans(
+            text, self.span_tokenize(text, realign_boundaries)
+        )
+
     def sentences_from_text(self, text, realign_boundaries=True):
         """
         Given a text, generates the sentences in that text by only
@@ -68,9 +68,10 @@ argument.  This differs from the conventions used by Python's
 from __future__ import unicode_literals
 
 import re
+from array import array
 
 from nltk.tokenize.api import TokenizerI
-from nltk.tokenize.util import regexp_span_tokenize
+from nltk.tokenize.util import regexp_span_tokenize, TokenSpans
 from nltk.compat import python_2_unicode_compatible
 
 
@@ -146,6 +147,34 @@ class RegexpTokenizer(TokenizerI):
             for m in re.finditer(self._regexp, text):
                 yield m.span()
 
+    def compact_span_tokenize(self, text):
+        self._check_regexp()
+        typecode = TokenSpans.typecode(text)
+        starts = array(typecode)
+        ends = array(typecode)
+        add_start = starts.append
+        add_end = ends.append
+
+        if self._gaps:
+            # As regexp_span_tokenize(): the tokens lie between
+            # successive separator matches.
+            left = 0
+            for m in self._regexp.finditer(text):
+                right, next = m.span()
+                if right != left:
+                    add_start(left)
+                    add_end(right)
+                left = next
+            if not (self._discard_empty and left == len(text)):
+                add_start(left)
+                add_end(len(text))
+        else:
+            for m in self._regexp.finditer(text):
+                start, end = m.span()
+                add_start(start)
+                add_end(end)
+        return TokenSpans(text, starts, ends)
+
     def __repr__(self):
         return '%s(pattern=%r, gaps=%r, discard_empty=%r, flags=%r)' % (
             self.__class__.__name__,
@@ -8,6 +8,7 @@
 
 import re
 import math
+import bisect
 
 try:
     import numpy
@@ -92,9 +93,7 @@ class TextTilingTokenizer(TokenizerI):
         # Tokenization step starts here
 
         # Remove punctuation
-        nopunct_text = ''.join(
-            c for c in lowercase_text if re.match("[a-z\-\' \n\t]", c)
-        )
+        nopunct_text = re.sub("[^a-z\-\' \n\t]", '', lowercase_text)
         nopunct_par_breaks = self._mark_paragraph_breaks(nopunct_text)
 
         tokseqs = self._divide_to_tokensequences(nopunct_text)
@@ -107,17 +106,16 @@ class TextTilingTokenizer(TokenizerI):
         # words = _stem_words(words)
 
         # Filter stopwords
+        stopwords = set(self.stopwords)
         for ts in tokseqs:
-            ts.wrdindex_list = [
-                wi for wi in ts.wrdindex_list if wi[0] not in self.stopwords
-            ]
+            ts.wrdindex_list = [wi for wi in ts.wrdindex_list if wi[0] not in stopwords]
 
-        token_table = self._create_token_table(tokseqs, nopunct_par_breaks)
+        token_counts = self._count_tokens(tokseqs, nopunct_par_breaks)
         # End of the Tokenization step
 
         # Lexical score determination
         if self.similarity_method == BLOCK_COMPARISON:
-            gap_scores = self._block_comparison(tokseqs, token_table)
+            gap_scores = self._block_comparison_counts(*token_counts)
         elif self.similarity_method == VOCABULARY_INTRODUCTION:
             raise NotImplementedError("Vocabulary introduction not implemented")
         else:
@@ -161,7 +159,9 @@ class TextTilingTokenizer(TokenizerI):
         return segmented_text
 
     def _block_comparison(self, tokseqs, token_table):
-        """Implements the block comparison method"""
+        """Implements the block comparison method over a token table built
+        by ``_create_token_table()``.  ``tokenize()`` uses the equivalent,
+        much faster ``_block_comparison_counts()``."""
 
         def blk_frq(tok, block):
             ts_occs = filter(lambda o: o[0] in block, token_table[tok].ts_occurences)
@@ -198,6 +198,103 @@ class TextTilingTokenizer(TokenizerI):
 
         return gap_scores
 
+    def _count_tokens(self, token_sequences, par_breaks):
+        """Counts the occurrences of each word in each token sequence.
+
+        Returns a tuple ``(seqs, words, counts, num_seqs)``, where ``seqs``,
+        ``words`` and ``counts`` are parallel arrays holding one entry per
+        distinct (token sequence, word id) pair, sorted by word id and
+        then by token sequence."""
+        if len(par_breaks) < 2:
+            raise ValueError("No paragraph breaks were found(text too short perhaps?)")
+
+        word_ids = {}
+        seq_list, word_list = [], []
+        for seq, ts in enumerate(token_sequences):
+            for word, index in ts.wrdindex_list:
+                word_list.append(word_ids.setdefault(word, len(word_ids)))
+                seq_list.append(seq)
+
+        num_seqs = len(token_sequences)
+        keys = numpy.array(word_list, dtype=numpy.int64) * num_seqs + numpy.array(
+            seq_list, dtype=numpy.int64
+        )
+        keys, counts = numpy.unique(keys, return_counts=True)
+        return keys % num_seqs, keys // num_seqs, counts.astype(numpy.float64), num_seqs
+
+    def _block_comparison_counts(self, seqs, words, counts, num_seqs):
+        """Implements the block comparison method over the output of
+        ``_count_tokens()``.
+
+        The block similarities only depend on the dot products between the
+        word count vectors of token sequences that are less than ``2 * k``
+        sequences apart.  These are computed for each offset in one pass
+        over the counts, and cumulative sums over them give the dot
+        products between the blocks on either side of every gap."""
+        numgaps = num_seqs - 1
+        if numgaps < 1:
+            return []
+
+        # window_size and block limits, as in _block_comparison()
+        gaps = numpy.arange(numgaps)
+        window_size = numpy.where(
+            gaps < self.k - 1,
+            gaps + 1,
+            numpy.where(gaps > numgaps - self.k, numgaps - gaps, self.k),
+        )
+        b1_start = gaps - window_size + 1
+        b2_end = numpy.minimum(gaps + window_size, num_seqs - 1)
+
+        # Leave room between words so that keys + offset never reach the
+        # next word's sequences
+        keys = words * (num_seqs + 2 * self.k) + seqs
+
+        # offset_sums[d] holds the cumulative sums over i of the dot
+        # product of the counts in sequences i and i + d
+        max_offset = min(2 * self.k - 1, num_seqs - 1)
+        offset_sums = []
+        for offset in range(max_offset + 1):
+            if offset == 0:
+                products, product_seqs = counts * counts, seqs
+            else:
+                pos = numpy.searchsorted(keys, keys + offset)
+                pos[pos == len(keys)] = 0
+                match = keys[pos] == keys + offset
+                products = counts[match] * counts[pos[match]]
+                product_seqs = seqs[match]
+            products = numpy.bincount(
+                product_seqs, weights=products, minlength=num_seqs - offset
+            )
+            offset_sums.append(numpy.concatenate(([0.0], numpy.cumsum(products))))
+
+        def block_product(start1, end1, start2, end2, offset):
+            # sum over i in [start1, end1], i + offset in [start2, end2]
+            first = numpy.maximum(start1, start2 - offset)
+            last = numpy.minimum(end1, end2 - offset)
+            valid = last >= first
+            sums = offset_sums[offset]
+            return numpy.where(
+                valid,
+                sums[numpy.where(valid, last + 1, 0)] - sums[numpy.where(valid, first, 0)],
+                0.0,
+            )
+
+        score_dividend = numpy.zeros(numgaps)
+        score_divisor_b1 = block_product(b1_start, gaps, b1_start, gaps, 0)
+        score_divisor_b2 = block_product(gaps + 1, b2_end, gaps + 1, b2_end, 0)
+        for offset in range(1, max_offset + 1):
+            score_dividend += block_product(b1_start, gaps, gaps + 1, b2_end, offset)
+            score_divisor_b1 += 2 * block_product(b1_start, gaps, b1_start, gaps, offset)
+            score_divisor_b2 += 2 * block_product(
+                gaps + 1, b2_end, gaps + 1, b2_end, offset
+            )
+
+        score_divisor = numpy.sqrt(score_divisor_b1 * score_divisor_b2)
+        nonzero = score_divisor != 0
+        gap_scores = numpy.zeros(numgaps)
+        gap_scores[nonzero] = score_dividend[nonzero] / score_divisor[nonzero]
+        return gap_scores.tolist()
+
     def _smooth_scores(self, gap_scores):
         "Wraps the smooth function from the SciPy Cookbook"
         return list(
@@ -304,14 +401,9 @@ class TextTilingTokenizer(TokenizerI):
         hp = list(filter(lambda x: x[0] > cutoff, depth_tuples))
 
         for dt in hp:
-            boundaries[dt[1]] = 1
-            for dt2 in hp:  # undo if there is a boundary close already
-                if (
-                    dt[1] != dt2[1]
-                    and abs(dt2[1] - dt[1]) < 4
-                    and boundaries[dt2[1]] == 1
-                ):
-                    boundaries[dt[1]] = 0
+            # undo if there is a boundary close already
+            near = boundaries[max(dt[1] - 3, 0) : dt[1] + 4]
+            boundaries[dt[1]] = 0 if 1 in near else 1
         return boundaries
 
     def _depth_scores(self, scores):
@@ -324,24 +416,23 @@ class TextTilingTokenizer(TokenizerI):
         # pseudosentences for small texts and around 5 for larger ones.
 
         clip = min(max(len(scores) // 10, 2), 5)
-        index = clip
-
-        for gapscore in scores[clip:-clip]:
-            lpeak = gapscore
-            for score in scores[index::-1]:
-                if score >= lpeak:
-                    lpeak = score
-                else:
-                    break
-            rpeak = gapscore
-            for score in scores[index:]:
-                if score >= rpeak:
-                    rpeak = score
-                else:
-                    break
-            depth_scores[index] = lpeak + rpeak - 2 * gapscore
-            index += 1
-
+        if len(scores) <= 2 * clip:
+            return depth_scores
+
+        # The left (right) peak of a gap is the score at the far end of the
+        # non-increasing run of scores to its left (right).
+        scores = numpy.asarray(scores)
+        index = numpy.arange(len(scores))
+        lstart = numpy.ones(len(scores), dtype=bool)
+        lstart[1:] = scores[:-1] < scores[1:]
+        lpeak = scores[numpy.maximum.accumulate(numpy.where(lstart, index, 0))]
+        rstart = numpy.ones(len(scores), dtype=bool)
+        rstart[:-1] = scores[1:] < scores[:-1]
+        rindex = numpy.where(rstart, index, len(scores))
+        rpeak = scores[numpy.minimum.accumulate(rindex[::-1])[::-1]]
+
+        depth = lpeak + rpeak - 2 * scores
+        depth_scores[clip:-clip] = depth[clip:-clip].tolist()
         return depth_scores
 
     def _normalize_boundaries(self, text, boundaries, paragraph_breaks):
@@ -349,31 +440,34 @@ class TextTilingTokenizer(TokenizerI):
         paragraph breaks"""
 
         norm_boundaries = []
-        char_count, word_count, gaps_seen = 0, 0, 0
-        seen_word = False
-
-        for char in text:
-            char_count += 1
-            if char in " \t\n" and seen_word:
-                seen_word = False
-                word_count += 1
-            if char not in " \t\n" and not seen_word:
-                seen_word = True
-            if gaps_seen < len(boundaries) and word_count > (
-                max(gaps_seen * self.w, self.w)
-            ):
-                if boundaries[gaps_seen] == 1:
-                    # find closest paragraph break
-                    best_fit = len(text)
-                    for br in paragraph_breaks:
-                        if best_fit > abs(br - char_count):
-                            best_fit = abs(br - char_count)
-                            bestbr = br
-                        else:
-                            break
-                    if bestbr not in norm_boundaries:  # avoid duplicates
-                        norm_boundaries.append(bestbr)
-                gaps_seen += 1
+        seen_boundaries = set()
+
+        # The gaps are reached one character at a time, as soon as more
+        # than max(gap * w, w) words have ended.
+        word_ends = [m.start() + 1 for m in re.finditer("[^ \t\n][ \t\n]", text)]
+        char_index = -1
+
+        for gap, boundary in enumerate(boundaries):
+            words_needed = max(gap * self.w, self.w)
+            if words_needed >= len(word_ends):
+                break
+            char_index = max(char_index + 1, word_ends[words_needed])
+            if char_index >= len(text):
+                break
+            if boundary == 1:
+                # find closest paragraph break
+                char_count = char_index + 1
+                i = bisect.bisect_left(paragraph_breaks, char_count)
+                if i == len(paragraph_breaks) or (
+                    i > 0
+                    and char_count - paragraph_breaks[i - 1]
+                    <= paragraph_breaks[i] - char_count
+                ):
+                    i -= 1
+                bestbr = paragraph_breaks[i]
+                if bestbr not in seen_boundaries:  # avoid duplicates
+                    seen_boundaries.add(bestbr)
+                    norm_boundaries.append(bestbr)
 
         return norm_boundaries
 
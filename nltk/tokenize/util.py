@@ -6,9 +6,12 @@
 # URL: <http://nltk.sourceforge.net>
 # For license information, see LICENSE.TXT
 
+from array import array
 from re import finditer
 from xml.sax.saxutils import escape, unescape
 
+from six import PY3
+
 
 def string_span_tokenize(s, sep):
     r"""
@@ -93,6 +96,127 @@ def spans_to_relative(spans):
         prev = right
 
 
+class TokenSpans(object):
+    r"""
+    A compact sequence of tokens, stored as two arrays of 32-bit start
+    and end offsets into the original text.  Tokens are only sliced out
+    of the text when they are accessed, so a ``TokenSpans`` takes 8
+    bytes per token, where a list of strings or of ``(start, end)``
+    tuples takes around 60 to 120.
+
+        >>> from nltk.tokenize import WhitespaceTokenizer
+        >>> s = "Good muffins cost $3.88\nin New York."
+        >>> tokens = WhitespaceTokenizer().compact_span_tokenize(s)
+        >>> tokens
+        TokenSpans(['Good', 'muffins', 'cost', '$3.88', 'in', 'New', 'York.'])
+        >>> len(tokens), tokens[1], tokens.span(1)
+        (7, 'muffins', (5, 12))
+        >>> tokens[-2:]
+        TokenSpans(['New', 'York.'])
+        >>> list(tokens.spans())[:3]
+        [(0, 4), (5, 12), (13, 17)]
+
+    Offsets are stored as 64-bit integers for texts longer than 2**31
+    characters.
+
+    :param text: the text that the offsets refer to
+    :type text: str
+    :param starts: the start offset of each token
+    :type starts: array
+    :param ends: the end offset of each token
+    :type ends: array
+    """
+
+    def __init__(self, text, starts, ends):
+        if len(starts) != len(ends):
+            raise ValueError("starts and ends must have the same length")
+        self.text = text
+        self.starts = starts
+        self.ends = ends
+
+    @staticmethod
+    def typecode(text):
+        """
+        The array typecode used for offsets into *text*.
+        """
+        if len(text) < 2 ** 31:
+            return 'i'
+        return 'q' if PY3 else 'l'
+
+    @classmethod
+    def from_spans(cls, text, spans):
+        """
+        Build a ``TokenSpans`` from an iterable of ``(start, end)``
+        offsets, without keeping the tuples.
+
+        :type text: str
+        :type spans: iter(tuple(int, int))
+        :rtype: TokenSpans
+        """
+        typecode = cls.typecode(text)
+        starts = array(typecode)
+        ends = array(typecode)
+        add_start = starts.append
+        add_end = ends.append
+        for start, end in spans:
+            add_start(start)
+            add_end(end)
+        return cls(text, starts, ends)
+
+    def span(self, i):
+        """
+        The ``(start, end)`` offsets of the *i*-th token.
+        """
+        return self.starts[i], self.ends[i]
+
+    def spans(self):
+        """
+        Iterate over the ``(start, end)`` offsets of the tokens.
+
+        :rtype: iter(tuple(int, int))
+        """
+        return zip(self.starts, self.ends)
+
+    def nbytes(self):
+        """
+        The number of bytes used by the offset arrays.
+        """
+        return (len(self.starts) + len(self.ends)) * self.starts.itemsize
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return TokenSpans(self.text, self.starts[i], self.ends[i])
+        return self.text[self.starts[i] : self.ends[i]]
+
+    def __iter__(self):
+        text = self.text
+        for start, end in zip(self.starts, self.ends):
+            yield text[start:end]
+
+    def __eq__(self, other):
+        if isinstance(other, TokenSpans):
+            return list(self) == list(other)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        if len(self) > 20:
+            tokens = repr(list(self[:20]))[:-1] + ', ...]'
+        else:
+            tokens = repr(list(self))
+        return 'TokenSpans(%s)' % tokens
+
+
 class CJKChars(object):
     """
     An object that enumerates the code points of the CJK characters as listed on
@@ -23,3 +23,4 @@ from nltk.translate.ribes_score import sentence_ribes as ribes
 from nltk.translate.meteor_score import meteor_score as meteor
 from nltk.translate.metrics import alignment_error_rate
 from nltk.translate.stack_decoder import StackDecoder
+from nltk.translate.references import ReferenceSet
@@ -16,7 +16,8 @@ import fractions
 import warnings
 from collections import Counter
 
-from nltk.util import ngrams
+from nltk.translate.references import ReferenceSet
+from nltk.util import ngrams, parallel_map
 
 try:
     fractions.Fraction(0, 1000, _normalize=False)
@@ -113,6 +114,7 @@ def corpus_bleu(
     weights=(0.25, 0.25, 0.25, 0.25),
     smoothing_function=None,
     auto_reweigh=False,
+    processes=1,
 ):
     """
     Calculate a single corpus-level BLEU score (aka. system-level BLEU) for all
@@ -154,8 +156,11 @@ def corpus_bleu(
     >>> (score1 + score2) / 2 # doctest: +ELLIPSIS
     0.6223...
 
+    To score several sets of hypotheses against the same references, pass
+    the references as a ``ReferenceSet``, which keeps their n-gram counts.
+
     :param list_of_references: a corpus of lists of reference sentences, w.r.t. hypotheses
-    :type list_of_references: list(list(list(str)))
+    :type list_of_references: list(list(list(str))) or ReferenceSet
     :param hypotheses: a list of hypothesis sentences
     :type hypotheses: list(list(str))
     :param weights: weights for unigrams, bigrams, trigrams and so on
@@ -164,6 +169,9 @@ def corpus_bleu(
     :type smoothing_function: SmoothingFunction
     :param auto_reweigh: Option to re-normalize the weights uniformly.
     :type auto_reweigh: bool
+    :param processes: the number of processes that count the n-grams of
+        the hypotheses
+    :type processes: int
     :return: The corpus-level BLEU score.
     :rtype: float
     """
@@ -177,20 +185,23 @@ def corpus_bleu(
         "The number of hypotheses and their reference(s) should be the " "same "
     )
 
+    if not isinstance(list_of_references, ReferenceSet):
+        list_of_references = ReferenceSet(list_of_references)
+
     # Iterate through each hypothesis and their corresponding references.
-    for references, hypothesis in zip(list_of_references, hypotheses):
-        # For each order of ngram, calculate the numerator and
-        # denominator for the corpus-level modified precision.
+    for statistics in corpus_bleu_statistics(
+        list_of_references, hypotheses, len(weights), processes
+    ):
+        # For each order of ngram, add the numerator and denominator for
+        # the corpus-level modified precision.
         for i, _ in enumerate(weights, start=1):
-            p_i = modified_precision(references, hypothesis, i)
-            p_numerators[i] += p_i.numerator
-            p_denominators[i] += p_i.denominator
+            p_numerators[i] += statistics[2 * i]
+            p_denominators[i] += statistics[2 * i + 1]
 
-        # Calculate the hypothesis length and the closest reference length.
-        # Adds them to the corpus-level hypothesis and reference counts.
-        hyp_len = len(hypothesis)
-        hyp_lengths += hyp_len
-        ref_lengths += closest_ref_length(references, hyp_len)
+        # Adds the hypothesis length and the closest reference length to
+        # the corpus-level hypothesis and reference counts.
+        hyp_lengths += statistics[0]
+        ref_lengths += statistics[1]
 
     # Calculate corpus-level brevity penalty.
     bp = brevity_penalty(ref_lengths, hyp_lengths)
@@ -213,6 +224,10 @@ def corpus_bleu(
     if p_numerators[1] == 0:
         return 0
 
+    # The smoothing functions get the last segment
+    references = list_of_references[-1]
+    hypothesis = hypotheses[-1]
+
     # If there's no smoothing, set use method0 from SmoothinFunction class.
     if not smoothing_function:
         smoothing_function = SmoothingFunction().method0
@@ -228,6 +243,43 @@ def corpus_bleu(
     return s
 
 
+def corpus_bleu_statistics(list_of_references, hypotheses, max_n=4, processes=1):
+    """
+    The sufficient statistics of BLEU for each hypothesis: its length, the
+    closest reference length, and the clipped ngram matches and the number
+    of ngrams (at least 1) for each ngram order up to ``max_n``.
+    ``corpus_bleu`` sums them over the corpus, and
+    ``nltk.translate.significance`` resamples them.
+
+        >>> hyp = ['the', 'cat', 'the', 'cat', 'on', 'the', 'mat']
+        >>> refs = [['the', 'cat', 'is', 'on', 'the', 'mat'],
+        ...         ['there', 'is', 'a', 'cat', 'on', 'the', 'mat']]
+        >>> corpus_bleu_statistics([refs], [hyp], max_n=2)
+        [[7, 7, 5, 7, 4, 6]]
+
+    :param list_of_references: a corpus of lists of reference sentences, w.r.t. hypotheses
+    :type list_of_references: list(list(list(str))) or ReferenceSet
+    :param hypotheses: a list of hypothesis sentences
+    :type hypotheses: list(list(str))
+    :param max_n: the highest ngram order
+    :type max_n: int
+    :param processes: the number of processes that count the n-grams of
+        the hypotheses
+    :type processes: int
+    :return: ``[hyp_len, ref_len, matches_1, total_1, ..., matches_n,
+        total_n]`` for each hypothesis
+    :rtype: list(list(int))
+    """
+    if not isinstance(list_of_references, ReferenceSet):
+        list_of_references = ReferenceSet(list_of_references)
+
+    # Each hypothesis with the lengths of its references and the maximum
+    # count of each ngram of each order in them.
+    max_counts = [list_of_references.max_ngram_counts(i) for i in range(1, max_n + 1)]
+    segments = zip(zip(*max_counts), list_of_references.lengths(), hypotheses)
+    return parallel_map(_segment_statistics, segments, processes)
+
+
 def modified_precision(references, hypothesis, n):
     """
     Calculate modified ngram precision.
@@ -339,6 +391,29 @@ def modified_precision(references, hypothesis, n):
     return Fraction(numerator, denominator, _normalize=False)
 
 
+def _segment_statistics(segment):
+    """
+    The BLEU statistics of a hypothesis from the maximum reference counts
+    of each ngram order and the reference lengths
+    """
+    max_counts, ref_lens, hypothesis = segment
+    hyp_len = len(hypothesis)
+    closest_ref_len = min(
+        ref_lens, key=lambda ref_len: (abs(ref_len - hyp_len), ref_len)
+    )
+    statistics = [hyp_len, closest_ref_len]
+    for n, max_counts_n in enumerate(max_counts, start=1):
+        counts = Counter(ngrams(hypothesis, n)) if hyp_len >= n else Counter()
+        statistics.append(
+            sum(
+                min(count, max_counts_n.get(ngram, 0))
+                for ngram, count in counts.items()
+            )
+        )
+        statistics.append(max(1, sum(counts.values())))
+    return statistics
+
+
 def closest_ref_length(references, hyp_len):
     """
     This function finds the reference that is the closest length to the
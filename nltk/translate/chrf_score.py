@@ -10,9 +10,11 @@
 """ ChrF score implementation """
 from __future__ import division
 from collections import Counter, defaultdict
+from functools import partial
 import re
 
-from nltk.util import ngrams
+from nltk.translate.references import ReferenceSet
+from nltk.util import ngrams, parallel_map
 
 
 def sentence_chrf(
@@ -136,7 +138,14 @@ def chrf_precision_recall_fscore_support(
     """
     ref_ngrams = Counter(ngrams(reference, n))
     hyp_ngrams = Counter(ngrams(hypothesis, n))
+    return _precision_recall_fscore_support(ref_ngrams, hyp_ngrams, beta, epsilon)
 
+
+def _precision_recall_fscore_support(ref_ngrams, hyp_ngrams, beta, epsilon=1e-16):
+    """
+    The precision, recall, fscore and support of the ngram overlaps, from
+    the ngram counts of the reference and the hypothesis.
+    """
     # calculate the number of ngram matches
     overlap_ngrams = ref_ngrams & hyp_ngrams
     tp = sum(overlap_ngrams.values())  # True positives.
@@ -154,7 +163,13 @@ def chrf_precision_recall_fscore_support(
 
 
 def corpus_chrf(
-    references, hypotheses, min_len=1, max_len=6, beta=3.0, ignore_whitespace=True
+    references,
+    hypotheses,
+    min_len=1,
+    max_len=6,
+    beta=3.0,
+    ignore_whitespace=True,
+    processes=1,
 ):
     """
     Calculates the corpus level CHRF (Character n-gram F-score), it is the
@@ -174,8 +189,12 @@ def corpus_chrf(
         >>> corpus_chrf([ref1, ref2, ref1, ref2], [hyp1, hyp2, hyp2, hyp1]) # doctest: +ELLIPSIS
         0.3910...
 
+    To score several sets of hypotheses against the same references, pass
+    them as a ``ReferenceSet`` with one reference for each hypothesis,
+    which keeps their character n-gram counts.
+
     :param references: a corpus of list of reference sentences, w.r.t. hypotheses
-    :type references: list(list(str))
+    :type references: list(list(str)) or ReferenceSet
     :param hypotheses: a list of hypothesis sentences
     :type hypotheses: list(list(str))
     :param min_len: The minimum order of n-gram this function should extract.
@@ -186,6 +205,9 @@ def corpus_chrf(
     :type beta: float
     :param ignore_whitespace: ignore whitespace characters in scoring
     :type ignore_whitespace: bool
+    :param processes: the number of processes that count the n-grams of
+        the hypotheses
+    :type processes: int
     :return: the sentence level CHRF score.
     :rtype: float
     """
@@ -198,20 +220,13 @@ def corpus_chrf(
     # Keep f-scores for each n-gram order separate
     ngram_fscores = defaultdict(lambda: list())
 
-    # Iterate through each hypothesis and their corresponding references.
-    for reference, hypothesis in zip(references, hypotheses):
-
-        # preprocess both reference and hypothesis
-        reference = _preprocess(reference, ignore_whitespace)
-        hypothesis = _preprocess(hypothesis, ignore_whitespace)
-
-        # Calculate f-scores for each sentence and for each n-gram order
-        # separately.
-        for n in range(min_len, max_len + 1):
-            # Compute the precision, recall, fscore and support.
-            prec, rec, fscore, tp = chrf_precision_recall_fscore_support(
-                reference, hypothesis, n, beta=beta
-            )
+    # Iterate through each hypothesis and their corresponding references,
+    # and calculate f-scores for each sentence and for each n-gram order
+    # separately.
+    for fscores in corpus_chrf_statistics(
+        references, hypotheses, min_len, max_len, beta, ignore_whitespace, processes
+    ):
+        for n, fscore in zip(range(min_len, max_len + 1), fscores):
             ngram_fscores[n].append(fscore)
 
     # how many n-gram sizes
@@ -222,3 +237,55 @@ def corpus_chrf(
 
     # macro-average over n-gram orders and over all sentences
     return (sum(total_scores) / num_ngram_sizes) / num_sents
+
+
+def corpus_chrf_statistics(
+    references,
+    hypotheses,
+    min_len=1,
+    max_len=6,
+    beta=3.0,
+    ignore_whitespace=True,
+    processes=1,
+):
+    """
+    The sufficient statistics of CHRF for each hypothesis, which are its
+    f-scores for each n-gram order from ``min_len`` to ``max_len``, since
+    the corpus level CHRF is their macro-average.  ``corpus_chrf`` averages
+    them over the corpus, and ``nltk.translate.significance`` resamples
+    them.
+
+    The parameters are those of ``corpus_chrf``.
+
+    :rtype: list(list(float))
+    """
+    if not isinstance(references, ReferenceSet):
+        references = ReferenceSet([[reference] for reference in references])
+    orders = range(min_len, max_len + 1)
+    ref_ngram_counts = [
+        references.char_ngram_counts(n, ignore_whitespace) for n in orders
+    ]
+    segments = zip(zip(*ref_ngram_counts), hypotheses)
+    return parallel_map(
+        partial(_segment_fscores, orders, beta, ignore_whitespace),
+        segments,
+        processes,
+    )
+
+
+def _segment_fscores(orders, beta, ignore_whitespace, segment):
+    """
+    The f-scores of a hypothesis for each n-gram order, from the n-gram
+    counts of its reference
+    """
+    ref_ngram_counts, hypothesis = segment
+    hypothesis = _preprocess(hypothesis, ignore_whitespace)
+    fscores = []
+    for n, ref_ngrams in zip(orders, ref_ngram_counts):
+        # Compute the precision, recall, fscore and support.
+        hyp_ngrams = Counter(ngrams(hypothesis, n))
+        prec, rec, fscore, tp = _precision_recall_fscore_support(
+            ref_ngrams, hyp_ngrams, beta
+        )
+        fscores.append(fscore)
+    return fscores
@@ -20,6 +20,11 @@ http://aclweb.org/anthology/J93-1004.pdf
 from __future__ import division
 import math
 
+try:
+    import numpy
+except ImportError:
+    pass
+
 try:
     from scipy.stats import norm
     from norm import logsf as norm_logsf
@@ -152,26 +157,235 @@ def align_log_prob(i, j, source_sents, target_sents, alignment, params):
     return -(LOG2 + norm_logsf(abs(delta)) + math.log(params.PRIORS[alignment]))
 
 
-def align_blocks(source_sents_lens, target_sents_lens, params=LanguageIndependent):
-    """Return the sentence alignment of two text blocks (usually paragraphs).
+# The largest table of log probabilities by source and target length that
+# align_blocks() computes, rather than computing each one when needed.
+_MAX_LOG_PROB_TABLE_SIZE = 2 ** 22
 
-        >>> align_blocks([5,5,5], [7,7,7])
-        [(0, 0), (1, 1), (2, 2)]
-        >>> align_blocks([10,5,5], [12,20])
-        [(0, 0), (1, 1), (2, 1)]
-        >>> align_blocks([12,20], [10,5,5])
-        [(0, 0), (1, 1), (1, 2)]
-        >>> align_blocks([10,2,10,10,2,10], [12,3,20,3,12])
-        [(0, 0), (1, 1), (2, 2), (3, 2), (4, 3), (5, 4)]
 
-    @param source_sents_lens: The list of source sentence lengths.
-    @param target_sents_lens: The list of target sentence lengths.
-    @param params: the sentence alignment parameters.
-    @return: The sentence alignments, a list of index pairs.
+class _Backlinks(object):
+    """
+    The backlinks of ``align_blocks`` kept in one array of alignment type
+    indices per anti-diagonal (``i + j``) of the dynamic programming
+    matrix, for ``trace``.  It records how far outside of the middle of
+    the band the traced positions are.
     """
 
+    def __init__(self, alignment_types, diagonals, band):
+        self._alignment_types = alignment_types
+        self._diagonals = diagonals
+        self._band = band
+        self.max_distance = 0
+
+    def __getitem__(self, position):
+        i, j = position
+        lo, types = self._diagonals[i + j]
+        index = i - lo
+        if not 0 <= index < len(types):
+            self.max_distance = float('inf')
+            return None
+        self.max_distance = max(self.max_distance, self._band.distance(i, j))
+        t = types[index]
+        return self._alignment_types[t] if t >= 0 else None
+
+
+class _Band(object):
+    """
+    The cells ``(i, j)`` of the dynamic programming matrix of
+    ``align_blocks`` that are searched.  Source sentence ``i`` is expected
+    to align with the target sentences from ``centers[i]`` to
+    ``centers[i + 1]``, those at the same relative character offsets, and
+    the band is ``width`` sentences wider on each side.  If ``width`` is
+    None, the band is the whole matrix.
+    """
+
+    def __init__(self, source_offsets, target_offsets, width):
+        self.n = n = len(source_offsets) - 1
+        self.m = m = len(target_offsets) - 1
+        self.width = width
+        if width is None or width >= m or n == 0:
+            self.width = None
+            return
+
+        if source_offsets[-1] > 0 and target_offsets[-1] > 0:
+            ratio = target_offsets[-1] / source_offsets[-1]
+            relative_offsets = source_offsets * ratio
+            centers = numpy.searchsorted(target_offsets, relative_offsets)
+        else:
+            centers = numpy.arange(n + 1) * m // n
+        centers[0] = 0
+        centers[-1] = m
+        rows = numpy.arange(n + 1)
+        self._lo = centers - width
+        self._hi = numpy.append(centers[1:], m) + width
+        # Both increase with i, so the cells of an anti-diagonal i + j = k
+        # that are in the band are a range of rows.
+        self._lo_diagonals = rows + self._lo
+        self._hi_diagonals = rows + self._hi
+
+    def rows(self, k):
+        """The first and last row ``i`` of the cells on the anti-diagonal ``k``."""
+        lo = max(0, k - self.m)
+        hi = min(self.n, k)
+        if self.width is not None:
+            lo = max(lo, numpy.searchsorted(self._hi_diagonals, k))
+            hi = min(hi, numpy.searchsorted(self._lo_diagonals, k, 'right') - 1)
+        return lo, hi
+
+    def distance(self, i, j):
+        """How many sentences the cell ``(i, j)`` is from the edge of the band."""
+        if self.width is None:
+            return 0
+        return self.width - min(j - self._lo[i], self._hi[i] - j)
+
+
+def _erfcc_array(x):
+    """``erfcc`` for an array."""
+    z = numpy.abs(x)
+    t = 1 / (1 + 0.5 * z)
+    r = t * numpy.exp(
+        -z * z
+        - 1.26551223
+        + t
+        * (
+            1.00002368
+            + t
+            * (
+                0.37409196
+                + t
+                * (
+                    0.09678418
+                    + t
+                    * (
+                        -0.18628806
+                        + t
+                        * (
+                            0.27886807
+                            + t
+                            * (
+                                -1.13520398
+                                + t * (1.48851587 + t * (-0.82215223 + t * 0.17087277))
+                            )
+                        )
+                    )
+                )
+            )
+        )
+    )
+    return numpy.where(x >= 0.0, r, 2.0 - r)
+
+
+def _length_log_probs(l_s, l_t, params):
+    """
+    The part of ``align_log_prob`` that depends on the source and target
+    lengths, for arrays of them: ``LOG2 + norm_logsf(abs(delta))``, or
+    infinity where ``align_log_prob`` is minus infinity.
+    """
+    l_s = numpy.asarray(l_s, dtype=float)
+    l_t = numpy.asarray(l_t, dtype=float)
+    with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        m = (l_s + l_t / params.AVERAGE_CHARACTERS) / 2
+        denominator = numpy.sqrt(m * params.VARIANCE_CHARACTERS)
+        delta = (l_s * params.AVERAGE_CHARACTERS - l_t) / denominator
+        # log(1 - norm_cdf(x)), as norm_logsf() computes it
+        sf = 1 - (1 - 0.5 * _erfcc_array(numpy.abs(delta) / math.sqrt(2)))
+        log_probs = LOG2 + numpy.log(sf)
+    return numpy.where(denominator == 0, float('inf'), log_probs)
+
+
+def _align_blocks_numpy(source_sents_lens, target_sents_lens, params, band_width):
+    """
+    The dynamic programming of ``align_blocks`` over the anti-diagonals of
+    the matrix, whose cells only depend on earlier anti-diagonals and so can
+    be computed together.
+    """
+    alignment_types = list(params.PRIORS.keys())
+    log_priors = [math.log(params.PRIORS[a]) for a in alignment_types]
+    n = len(source_sents_lens)
+    m = len(target_sents_lens)
+    source_offsets = numpy.cumsum([0] + list(source_sents_lens))
+    target_offsets = numpy.cumsum([0] + list(target_sents_lens))
+    depth = max(a[0] + a[1] for a in alignment_types)
+
+    # The length log probabilities of all the lengths of the alignments.
+    max_l_s = max(a[0] for a in alignment_types) * max(source_sents_lens or [0])
+    max_l_t = max(a[1] for a in alignment_types) * max(target_sents_lens or [0])
+    integer_lengths = numpy.issubdtype(
+        source_offsets.dtype, numpy.integer
+    ) and numpy.issubdtype(target_offsets.dtype, numpy.integer)
+    if integer_lengths and (max_l_s + 1) * (max_l_t + 1) <= _MAX_LOG_PROB_TABLE_SIZE:
+        table = _length_log_probs(
+            numpy.arange(max_l_s + 1)[:, None], numpy.arange(max_l_t + 1), params
+        )
+
+        def length_log_probs(l_s, l_t):
+            return table[l_s, l_t]
+
+    else:
+
+        def length_log_probs(l_s, l_t):
+            return _length_log_probs(l_s, l_t, params)
+
+    while True:
+        band = _Band(source_offsets, target_offsets, band_width)
+        # The distances of the last anti-diagonals, and the backlinks of all.
+        distances = {}
+        backlinks = []
+        for k in range(n + m + 1):
+            lo, hi = band.rows(k)
+            i = numpy.arange(lo, hi + 1)
+            j = k - i
+            min_dist = numpy.full(len(i), float('inf'))
+            min_align = numpy.full(len(i), -1, dtype=numpy.int8)
+            # Cells with a predecessor that is outside of the band, or that
+            # can't be reached itself.
+            incomplete = numpy.zeros(len(i), dtype=bool)
+            for t, a in enumerate(alignment_types):
+                prev_k = k - a[0] - a[1]
+                if prev_k == k or prev_k not in distances:
+                    continue
+                prev_lo, prev_dist = distances[prev_k]
+                index = i - a[0] - prev_lo
+                valid = (index >= 0) & (index < len(prev_dist))
+                valid[valid] = prev_dist[index[valid]] != float('inf')
+                incomplete |= (i >= a[0]) & (j >= a[1]) & ~valid
+                if not valid.any():
+                    continue
+                vi = i[valid]
+                vj = j[valid]
+                l_s = source_offsets[vi] - source_offsets[vi - a[0]]
+                l_t = target_offsets[vj] - target_offsets[vj - a[1]]
+                p = numpy.full(len(i), float('inf'))
+                with numpy.errstate(invalid='ignore'):
+                    p[valid] = prev_dist[index[valid]] + -(
+                        length_log_probs(l_s, l_t) + log_priors[t]
+                    )
+                better = p < min_dist
+                min_dist[better] = p[better]
+                min_align[better] = t
+
+            # Like in the original implementation, a cell without any possible
+            # alignment starts again from 0, but only if none of the alignments
+            # was left out because of the band.
+            min_dist[(min_dist == float('inf')) & ~incomplete] = 0
+            distances[k] = (lo, min_dist)
+            distances.pop(k - depth - 1, None)
+            backlinks.append((lo, min_align))
+
+        backlinks = _Backlinks(alignment_types, backlinks, band)
+        links = trace(backlinks, source_sents_lens, target_sents_lens)
+        # Search a wider band if the alignment comes to the edge of this one.
+        if band.width is None or backlinks.max_distance < band.width:
+            return links
+        band_width = 2 * band.width
+
+
+def _align_blocks_python(source_sents_lens, target_sents_lens, params):
     alignment_types = list(params.PRIORS.keys())
 
+    # The log probabilities of the alignments of sentences with the same
+    # lengths are the same.
+    log_probs = {}
+
     # there are always three rows in the history (with the last of them being filled)
     D = [[]]
 
@@ -186,9 +400,16 @@ def align_blocks(source_sents_lens, target_sents_lens, params=LanguageIndependen
                 prev_j = j - a[1]
                 if prev_i < -len(D) or prev_j < 0:
                     continue
-                p = D[prev_i][prev_j] + align_log_prob(
-                    i, j, source_sents_lens, target_sents_lens, a, params
+                lengths = (
+                    a,
+                    sum(source_sents_lens[i - offset - 1] for offset in range(a[0])),
+                    sum(target_sents_lens[j - offset - 1] for offset in range(a[1])),
                 )
+                if lengths not in log_probs:
+                    log_probs[lengths] = align_log_prob(
+                        i, j, source_sents_lens, target_sents_lens, a, params
+                    )
+                p = D[prev_i][prev_j] + log_probs[lengths]
                 if p < min_dist:
                     min_dist = p
                     min_align = a
@@ -206,7 +427,46 @@ def align_blocks(source_sents_lens, target_sents_lens, params=LanguageIndependen
     return trace(backlinks, source_sents_lens, target_sents_lens)
 
 
-def align_texts(source_blocks, target_blocks, params=LanguageIndependent):
+def align_blocks(
+    source_sents_lens, target_sents_lens, params=LanguageIndependent, band_width=None
+):
+    """Return the sentence alignment of two text blocks (usually paragraphs).
+
+        >>> align_blocks([5,5,5], [7,7,7])
+        [(0, 0), (1, 1), (2, 2)]
+        >>> align_blocks([10,5,5], [12,20])
+        [(0, 0), (1, 1), (2, 1)]
+        >>> align_blocks([12,20], [10,5,5])
+        [(0, 0), (1, 1), (1, 2)]
+        >>> align_blocks([10,2,10,10,2,10], [12,3,20,3,12])
+        [(0, 0), (1, 1), (2, 2), (3, 2), (4, 3), (5, 4)]
+
+    For long blocks, such as whole documents without paragraph boundaries,
+    the alignment can be restricted to a band around the diagonal, which
+    is widened until the alignment does not come near its edge.
+
+        >>> align_blocks([10,2,10,10,2,10], [12,3,20,3,12], band_width=1)
+        [(0, 0), (1, 1), (2, 2), (3, 2), (4, 3), (5, 4)]
+
+    @param source_sents_lens: The list of source sentence lengths.
+    @param target_sents_lens: The list of target sentence lengths.
+    @param params: the sentence alignment parameters.
+    @param band_width: If given, only align sentences within about this many
+        sentences of the diagonal, to begin with.  Requires NumPy.
+    @return: The sentence alignments, a list of index pairs.
+    """
+    try:
+        numpy
+    except NameError:
+        return _align_blocks_python(source_sents_lens, target_sents_lens, params)
+    return _align_blocks_numpy(
+        source_sents_lens, target_sents_lens, params, band_width
+    )
+
+
+def align_texts(
+    source_blocks, target_blocks, params=LanguageIndependent, band_width=None
+):
     """Creates the sentence alignment of two texts.
 
     Texts can consist of several blocks. Block boundaries cannot be crossed by sentence
@@ -218,6 +478,7 @@ def align_texts(source_blocks, target_blocks, params=LanguageIndependent):
     @param source_blocks: The list of blocks in the source text.
     @param target_blocks: The list of blocks in the target text.
     @param params: the sentence alignment parameters.
+    @param band_width: the initial band width of ``align_blocks``.
 
     @returns: A list of sentence alignment lists
     """
@@ -226,10 +487,33 @@ def align_texts(source_blocks, target_blocks, params=LanguageIndependent):
             "Source and target texts do not have the same number of blocks."
         )
 
-    return [
-        align_blocks(source_block, target_block, params)
-        for source_block, target_block in zip(source_blocks, target_blocks)
-    ]
+    return list(ialign_texts(source_blocks, target_blocks, params, band_width))
+
+
+def ialign_texts(
+    source_blocks, target_blocks, params=LanguageIndependent, band_width=None
+):
+    """Generates the sentence alignment of each block of two texts, like
+    ``align_texts``, reading the blocks from iterables one at a time.
+
+    @param source_blocks: The blocks in the source text.
+    @param target_blocks: The blocks in the target text.
+    @param params: the sentence alignment parameters.
+    @param band_width: the initial band width of ``align_blocks``.
+
+    @returns: An iterator of sentence alignment lists
+    """
+    source_blocks = iter(source_blocks)
+    target_blocks = iter(target_blocks)
+    for source_block in source_blocks:
+        target_block = next(target_blocks, None)
+        if target_block is None:
+            break
+        yield align_blocks(source_block, target_block, params, band_width)
+    else:
+        if next(target_blocks, None) is None:
+            return
+    raise ValueError("Source and target texts do not have the same number of blocks.")
 
 
 # File I/O functions; may belong in a corpus reader
@@ -242,15 +526,16 @@ def split_at(it, split_value):
     subiterators which need to be consumed fully before the next subiterator
     can be used.
     """
+    it = iter(it)
 
     def _chunk_iterator(first):
         v = first
         while v != split_value:
             yield v
-            v = it.next()
+            v = next(it, split_value)
 
-    while True:
-        yield _chunk_iterator(it.next())
+    for first in it:
+        yield _chunk_iterator(first)
 
 
 def parse_token_stream(stream, soft_delimiter, hard_delimiter):
@@ -10,8 +10,10 @@
 """ GLEU score implementation. """
 from __future__ import division
 from collections import Counter
+from functools import partial
 
-from nltk.util import ngrams, everygrams
+from nltk.translate.references import ReferenceSet
+from nltk.util import ngrams, parallel_map
 
 
 def sentence_gleu(references, hypothesis, min_len=1, max_len=4):
@@ -84,7 +86,7 @@ def sentence_gleu(references, hypothesis, min_len=1, max_len=4):
     return corpus_gleu([references], [hypothesis], min_len=min_len, max_len=max_len)
 
 
-def corpus_gleu(list_of_references, hypotheses, min_len=1, max_len=4):
+def corpus_gleu(list_of_references, hypotheses, min_len=1, max_len=4, processes=1):
     """
     Calculate a single corpus-level GLEU score (aka. system-level GLEU) for all
     the hypotheses and their respective references.
@@ -132,14 +134,20 @@ def corpus_gleu(list_of_references, hypotheses, min_len=1, max_len=4):
     >>> (score1 + score2) / 2 # doctest: +ELLIPSIS
     0.6144...
 
+    To score several sets of hypotheses against the same references, pass
+    the references as a ``ReferenceSet``, which keeps their n-gram counts.
+
     :param list_of_references: a list of reference sentences, w.r.t. hypotheses
-    :type list_of_references: list(list(list(str)))
+    :type list_of_references: list(list(list(str))) or ReferenceSet
     :param hypotheses: a list of hypothesis sentences
     :type hypotheses: list(list(str))
     :param min_len: The minimum order of n-gram this function should extract.
     :type min_len: int
     :param max_len: The maximum order of n-gram this function should extract.
     :type max_len: int
+    :param processes: the number of processes that count the n-grams of
+        the hypotheses
+    :type processes: int
     :return: The corpus-level GLEU score.
     :rtype: float
     """
@@ -152,30 +160,23 @@ def corpus_gleu(list_of_references, hypotheses, min_len=1, max_len=4):
     corpus_n_match = 0
     corpus_n_all = 0
 
-    for references, hypothesis in zip(list_of_references, hypotheses):
-        hyp_ngrams = Counter(everygrams(hypothesis, min_len, max_len))
-        tpfp = sum(hyp_ngrams.values())  # True positives + False positives.
-
-        hyp_counts = []
-        for reference in references:
-            ref_ngrams = Counter(everygrams(reference, min_len, max_len))
-            tpfn = sum(ref_ngrams.values())  # True positives + False negatives.
-
-            overlap_ngrams = ref_ngrams & hyp_ngrams
-            tp = sum(overlap_ngrams.values())  # True positives.
-
-            # While GLEU is defined as the minimum of precision and
-            # recall, we can reduce the number of division operations by one by
-            # instead finding the maximum of the denominators for the precision
-            # and recall formulae, since the numerators are the same:
-            #     precision = tp / tpfp
-            #     recall = tp / tpfn
-            #     gleu_score = min(precision, recall) == tp / max(tpfp, tpfn)
-            n_all = max(tpfp, tpfn)
-
-            if n_all > 0:
-                hyp_counts.append((tp, n_all))
-
+    if not isinstance(list_of_references, ReferenceSet):
+        list_of_references = ReferenceSet(list_of_references)
+    if max_len == -1:
+        # everygrams() goes up to the length of each sentence.
+        max_len = max(
+            [0]
+            + [len(hypothesis) for hypothesis in hypotheses]
+            + [max(lengths) for lengths in list_of_references.lengths() if lengths]
+        )
+    ngram_counts = [
+        list_of_references.ngram_counts(n) for n in range(min_len, max_len + 1)
+    ]
+    segments = zip(zip(*ngram_counts), hypotheses)
+
+    for hyp_counts in parallel_map(
+        partial(_segment_counts, min_len, max_len), segments, processes
+    ):
         # use the reference yielding the highest score
         if hyp_counts:
             n_match, n_all = max(hyp_counts, key=lambda hc: hc[0] / hc[1])
@@ -189,3 +190,39 @@ def corpus_gleu(list_of_references, hypotheses, min_len=1, max_len=4):
         gleu_score = corpus_n_match / corpus_n_all
 
     return gleu_score
+
+
+def _segment_counts(min_len, max_len, segment):
+    """
+    The number of matching ngrams and the larger of the number of ngrams in
+    the hypothesis and in the reference, for each reference with any ngrams,
+    from the ngram counts of the references for each order of ngram
+    """
+    ngram_counts, hypothesis = segment
+    hyp_ngrams = [
+        Counter(ngrams(hypothesis, n)) for n in range(min_len, max_len + 1)
+    ]
+    # True positives + False positives.
+    tpfp = sum(sum(counts.values()) for counts in hyp_ngrams)
+
+    hyp_counts = []
+    for ref_ngrams in zip(*ngram_counts):
+        # True positives + False negatives.
+        tpfn = sum(sum(counts.values()) for counts in ref_ngrams)
+        # True positives.
+        tp = sum(
+            sum((ref & hyp).values()) for ref, hyp in zip(ref_ngrams, hyp_ngrams)
+        )
+
+        # While GLEU is defined as the minimum of precision and
+        # recall, we can reduce the number of division operations by one by
+        # instead finding the maximum of the denominators for the precision
+        # and recall formulae, since the numerators are the same:
+        #     precision = tp / tpfp
+        #     recall = tp / tpfn
+        #     gleu_score = min(precision, recall) == tp / max(tpfp, tpfn)
+        n_all = max(tpfp, tpfn)
+
+        if n_all > 0:
+            hyp_counts.append((tp, n_all))
+    return hyp_counts
@@ -68,9 +68,14 @@ from collections import defaultdict
 from nltk.translate import AlignedSent
 from nltk.translate import Alignment
 from nltk.translate import IBMModel
-from nltk.translate.ibm_model import Counts
+from nltk.translate.ibm_model import Counts, EncodedParallelCorpus
 import warnings
 
+try:
+    import numpy
+except ImportError:
+    pass
+
 
 class IBMModel1(IBMModel):
     """
@@ -105,7 +110,13 @@ class IBMModel1(IBMModel):
 
     """
 
-    def __init__(self, sentence_aligned_corpus, iterations, probability_tables=None):
+    def __init__(
+        self,
+        sentence_aligned_corpus,
+        iterations,
+        probability_tables=None,
+        processes=1,
+    ):
         """
         Train on ``sentence_aligned_corpus`` and create a lexical
         translation model.
@@ -126,6 +137,10 @@ class IBMModel1(IBMModel):
             ``translation_table``.
             See ``IBMModel`` for the type and purpose of this table.
         :type probability_tables: dict[str]: object
+
+        :param processes: Number of processes that share the E step of
+            each iteration of training
+        :type processes: int
         """
         super(IBMModel1, self).__init__(sentence_aligned_corpus)
 
@@ -135,8 +150,7 @@ class IBMModel1(IBMModel):
             # Set user-defined probabilities
             self.translation_table = probability_tables['translation_table']
 
-        for n in range(0, iterations):
-            self.train(sentence_aligned_corpus)
+        self.train(sentence_aligned_corpus, iterations, processes)
 
         self.align_all(sentence_aligned_corpus)
 
@@ -153,7 +167,26 @@ class IBMModel1(IBMModel):
         for t in self.trg_vocab:
             self.translation_table[t] = defaultdict(lambda: initial_prob)
 
-    def train(self, parallel_corpus):
+    def train(self, parallel_corpus, iterations=1, processes=1):
+        """
+        Runs ``iterations`` iterations of the EM algorithm on
+        ``parallel_corpus``, on its integer-encoded form if numpy is
+        available.
+        """
+        if 'numpy' not in globals():
+            for n in range(0, iterations):
+                self._train(parallel_corpus)
+            return
+        if iterations <= 0:
+            return
+        corpus = EncodedParallelCorpus(parallel_corpus)
+        probs = corpus.translation_probabilities(self.translation_table)
+        for n in range(0, iterations):
+            counts = corpus.expected_counts(probs, processes=processes)
+            probs = corpus.maximize_translation_probabilities(counts)
+        corpus.update_translation_table(self.translation_table, probs)
+
+    def _train(self, parallel_corpus):
         counts = Counts()
         for aligned_sentence in parallel_corpus:
             trg_sentence = aligned_sentence.words
@@ -55,7 +55,12 @@ from nltk.translate import AlignedSent
 from nltk.translate import Alignment
 from nltk.translate import IBMModel
 from nltk.translate import IBMModel1
-from nltk.translate.ibm_model import Counts
+from nltk.translate.ibm_model import Counts, EncodedParallelCorpus
+
+try:
+    import numpy
+except ImportError:
+    pass
 
 
 class IBMModel2(IBMModel):
@@ -98,7 +103,13 @@ class IBMModel2(IBMModel):
 
     """
 
-    def __init__(self, sentence_aligned_corpus, iterations, probability_tables=None):
+    def __init__(
+        self,
+        sentence_aligned_corpus,
+        iterations,
+        probability_tables=None,
+        processes=1,
+    ):
         """
         Train on ``sentence_aligned_corpus`` and create a lexical
         translation model and an alignment model.
@@ -119,6 +130,10 @@ class IBMModel2(IBMModel):
             ``translation_table``, ``alignment_table``.
             See ``IBMModel`` for the type and purpose of these tables.
         :type probability_tables: dict[str]: object
+
+        :param processes: Number of processes that share the E step of
+            each iteration of training
+        :type processes: int
         """
         super(IBMModel2, self).__init__(sentence_aligned_corpus)
 
@@ -126,7 +141,9 @@ class IBMModel2(IBMModel):
             # Get translation probabilities from IBM Model 1
             # Run more iterations of training for Model 1, since it is
             # faster than Model 2
-            ibm1 = IBMModel1(sentence_aligned_corpus, 2 * iterations)
+            ibm1 = IBMModel1(
+                sentence_aligned_corpus, 2 * iterations, processes=processes
+            )
             self.translation_table = ibm1.translation_table
             self.set_uniform_probabilities(sentence_aligned_corpus)
         else:
@@ -134,8 +151,7 @@ class IBMModel2(IBMModel):
             self.translation_table = probability_tables['translation_table']
             self.alignment_table = probability_tables['alignment_table']
 
-        for n in range(0, iterations):
-            self.train(sentence_aligned_corpus)
+        self.train(sentence_aligned_corpus, iterations, processes)
 
         self.align_all(sentence_aligned_corpus)
 
@@ -159,7 +175,35 @@ class IBMModel2(IBMModel):
                     for j in range(1, m + 1):
                         self.alignment_table[i][j][l][m] = initial_prob
 
-    def train(self, parallel_corpus):
+    def train(self, parallel_corpus, iterations=1, processes=1):
+        """
+        Runs ``iterations`` iterations of the EM algorithm on
+        ``parallel_corpus``, on its integer-encoded form if numpy is
+        available.
+        """
+        if 'numpy' not in globals():
+            for n in range(0, iterations):
+                self._train(parallel_corpus)
+            return
+        if iterations <= 0:
+            return
+        corpus = EncodedParallelCorpus(parallel_corpus)
+        translation_probs = corpus.translation_probabilities(self.translation_table)
+        alignment_probs = corpus.alignment_probabilities(self.alignment_table)
+        for n in range(0, iterations):
+            translation_counts, alignment_counts = corpus.expected_counts(
+                translation_probs, alignment_probs, processes
+            )
+            translation_probs = corpus.maximize_translation_probabilities(
+                translation_counts
+            )
+            alignment_probs = corpus.maximize_alignment_probabilities(
+                alignment_counts
+            )
+        corpus.update_translation_table(self.translation_table, translation_probs)
+        corpus.update_alignment_table(self.alignment_table, alignment_probs)
+
+    def _train(self, parallel_corpus):
         counts = Model2Counts()
         for aligned_sentence in parallel_corpus:
             src_sentence = [None] + aligned_sentence.mots
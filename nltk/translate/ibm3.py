@@ -83,7 +83,9 @@ from nltk.translate import AlignedSent
 from nltk.translate import Alignment
 from nltk.translate import IBMModel
 from nltk.translate import IBMModel2
+from nltk.translate.ibm_model import AlignmentScorer
 from nltk.translate.ibm_model import Counts
+from nltk.translate.ibm_model import _log
 
 
 class IBMModel3(IBMModel):
@@ -136,7 +138,13 @@ class IBMModel3(IBMModel):
 
     """
 
-    def __init__(self, sentence_aligned_corpus, iterations, probability_tables=None):
+    def __init__(
+        self,
+        sentence_aligned_corpus,
+        iterations,
+        probability_tables=None,
+        processes=1,
+    ):
         """
         Train on ``sentence_aligned_corpus`` and create a lexical
         translation model, a distortion model, a fertility model, and a
@@ -159,13 +167,17 @@ class IBMModel3(IBMModel):
             ``fertility_table``, ``p1``, ``distortion_table``.
             See ``IBMModel`` for the type and purpose of these tables.
         :type probability_tables: dict[str]: object
+
+        :param processes: Number of processes that share the sampling
+            of alignments in each iteration of training
+        :type processes: int
         """
         super(IBMModel3, self).__init__(sentence_aligned_corpus)
         self.reset_probabilities()
 
         if probability_tables is None:
             # Get translation and alignment probabilities from IBM Model 2
-            ibm2 = IBMModel2(sentence_aligned_corpus, iterations)
+            ibm2 = IBMModel2(sentence_aligned_corpus, iterations, processes=processes)
             self.translation_table = ibm2.translation_table
             self.alignment_table = ibm2.alignment_table
             self.set_uniform_probabilities(sentence_aligned_corpus)
@@ -178,7 +190,7 @@ class IBMModel3(IBMModel):
             self.distortion_table = probability_tables['distortion_table']
 
         for n in range(0, iterations):
-            self.train(sentence_aligned_corpus)
+            self.train(sentence_aligned_corpus, processes)
 
     def reset_probabilities(self):
         super(IBMModel3, self).reset_probabilities()
@@ -223,25 +235,29 @@ class IBMModel3(IBMModel):
 
         self.p1 = 0.5
 
-    def train(self, parallel_corpus):
+    def train(self, parallel_corpus, processes=1):
         counts = Model3Counts()
+        samples = self._sample_all(parallel_corpus, processes)
         for aligned_sentence in parallel_corpus:
             l = len(aligned_sentence.mots)
             m = len(aligned_sentence.words)
 
             # Sample the alignment space
-            sampled_alignments, best_alignment = self.sample(aligned_sentence)
+            sampled_alignments, best_alignment = next(samples)
             # Record the most probable alignment
             aligned_sentence.alignment = Alignment(
                 best_alignment.zero_indexed_alignment()
             )
 
-            # E step (a): Compute normalization factors to weigh counts
-            total_count = self.prob_of_alignments(sampled_alignments)
+            # E step (a): Compute normalization factors to weigh counts,
+            # from the probabilities computed while sampling
+            total_count = 0
+            for alignment_info in sampled_alignments:
+                total_count += alignment_info.score
 
             # E step (b): Collect counts
             for alignment_info in sampled_alignments:
-                count = self.prob_t_a_given_s(alignment_info)
+                count = alignment_info.score
                 normalized_count = count / total_count
 
                 for j in range(1, m + 1):
@@ -276,6 +292,9 @@ class IBMModel3(IBMModel):
                         )
                         self.distortion_table[j][i][l][m] = max(estimate, MIN_PROB)
 
+    def _alignment_scorer(self, sentence_pair):
+        return Model3AlignmentScorer(self, sentence_pair)
+
     def prob_t_a_given_s(self, alignment_info):
         """
         Probability of target sentence and an alignment given the
@@ -346,3 +365,98 @@ class Model3Counts(Counts):
         i = alignment_info.alignment[j]
         self.distortion[j][i][l][m] += count
         self.distortion_for_any_j[i][l][m] += count
+
+
+class Model3AlignmentScorer(AlignmentScorer):
+    """
+    Scores alignments like ``IBMModel3.prob_t_a_given_s``, from the
+    products of probabilities that each factor of the score can take in
+    the sentence pair
+    """
+
+    def __init__(self, ibm_model, sentence_pair):
+        super(Model3AlignmentScorer, self).__init__(ibm_model, sentence_pair)
+        src_sentence = [None] + sentence_pair.mots
+        trg_sentence = ['UNUSED'] + sentence_pair.words
+        l = self.l
+        m = self.m
+        p1 = ibm_model.p1
+        p0 = 1 - p1
+        MIN_PROB = IBMModel.MIN_PROB
+
+        # NULL insertion probability and combination (m - null_fertility)
+        # choose null_fertility, or None if the probability falls below
+        # MIN_PROB on the way
+        self.null_terms = []
+        self.log_null_terms = []
+        for null_fertility in range(0, m + 1):
+            p1_term = pow(p1, null_fertility)
+            p0_term = pow(p0, m - 2 * null_fertility)
+            value = p1_term * p0_term
+            log_value = _log(p1_term) + _log(p0_term)
+            if value < MIN_PROB:
+                value = None
+            for i in range(1, null_fertility + 1):
+                factor = (m - null_fertility - i + 1) / i
+                log_value += _log(factor)
+                if value is not None:
+                    value *= factor
+                    if value < MIN_PROB:
+                        value = None
+            self.null_terms.append(value)
+            self.log_null_terms.append(log_value)
+
+        self.fertility_terms = [None]
+        for i in range(1, l + 1):
+            s = src_sentence[i]
+            self.fertility_terms.append(
+                [
+                    factorial(fertility) * ibm_model.fertility_table[fertility][s]
+                    for fertility in range(0, m + 1)
+                ]
+            )
+
+        self.translation_terms = [None]
+        for j in range(1, m + 1):
+            t = trg_sentence[j]
+            self.translation_terms.append(
+                [
+                    ibm_model.translation_table[t][src_sentence[i]]
+                    * ibm_model.distortion_table[j][i][l][m]
+                    for i in range(0, l + 1)
+                ]
+            )
+
+        self.log_fertility_terms = [None] + [
+            [_log(value) for value in terms] for terms in self.fertility_terms[1:]
+        ]
+        self.log_translation_terms = [None] + [
+            [_log(value) for value in terms] for terms in self.translation_terms[1:]
+        ]
+
+    def score(self, alignment):
+        l = self.l
+        m = self.m
+        MIN_PROB = IBMModel.MIN_PROB
+
+        fertilities = [0] * (l + 1)
+        for j in range(1, m + 1):
+            fertilities[alignment[j]] += 1
+
+        probability = self.null_terms[fertilities[0]]
+        if probability is None:
+            return MIN_PROB
+
+        fertility_terms = self.fertility_terms
+        for i in range(1, l + 1):
+            probability *= fertility_terms[i][fertilities[i]]
+            if probability < MIN_PROB:
+                return MIN_PROB
+
+        translation_terms = self.translation_terms
+        for j in range(1, m + 1):
+            probability *= translation_terms[j][alignment[j]]
+            if probability < MIN_PROB:
+                return MIN_PROB
+
+        return probability
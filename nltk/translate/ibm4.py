@@ -105,13 +105,15 @@ from __future__ import division
 
 import warnings
 from collections import defaultdict
-from math import factorial
+from math import ceil, factorial
 
 from nltk.translate import AlignedSent
 from nltk.translate import Alignment
 from nltk.translate import IBMModel
 from nltk.translate import IBMModel3
+from nltk.translate.ibm_model import AlignmentScorer
 from nltk.translate.ibm_model import Counts
+from nltk.translate.ibm_model import _log
 from nltk.translate.ibm_model import longest_target_sentence_length
 
 
@@ -174,6 +176,7 @@ class IBMModel4(IBMModel):
         source_word_classes,
         target_word_classes,
         probability_tables=None,
+        processes=1,
     ):
         """
         Train on ``sentence_aligned_corpus`` and create a lexical
@@ -206,6 +209,10 @@ class IBMModel4(IBMModel):
             ``non_head_distortion_table``. See ``IBMModel`` and
             ``IBMModel4`` for the type and purpose of these tables.
         :type probability_tables: dict[str]: object
+
+        :param processes: Number of processes that share the sampling
+            of alignments in each iteration of training
+        :type processes: int
         """
         super(IBMModel4, self).__init__(sentence_aligned_corpus)
         self.reset_probabilities()
@@ -214,7 +221,7 @@ class IBMModel4(IBMModel):
 
         if probability_tables is None:
             # Get probabilities from IBM model 3
-            ibm3 = IBMModel3(sentence_aligned_corpus, iterations)
+            ibm3 = IBMModel3(sentence_aligned_corpus, iterations, processes=processes)
             self.translation_table = ibm3.translation_table
             self.alignment_table = ibm3.alignment_table
             self.fertility_table = ibm3.fertility_table
@@ -232,7 +239,7 @@ class IBMModel4(IBMModel):
             ]
 
         for n in range(0, iterations):
-            self.train(sentence_aligned_corpus)
+            self.train(sentence_aligned_corpus, processes)
 
     def reset_probabilities(self):
         super(IBMModel4, self).reset_probabilities()
@@ -288,24 +295,28 @@ class IBMModel4(IBMModel):
             self.non_head_distortion_table[dj] = defaultdict(lambda: initial_prob)
             self.non_head_distortion_table[-dj] = defaultdict(lambda: initial_prob)
 
-    def train(self, parallel_corpus):
+    def train(self, parallel_corpus, processes=1):
         counts = Model4Counts()
+        samples = self._sample_all(parallel_corpus, processes)
         for aligned_sentence in parallel_corpus:
             m = len(aligned_sentence.words)
 
             # Sample the alignment space
-            sampled_alignments, best_alignment = self.sample(aligned_sentence)
+            sampled_alignments, best_alignment = next(samples)
             # Record the most probable alignment
             aligned_sentence.alignment = Alignment(
                 best_alignment.zero_indexed_alignment()
             )
 
-            # E step (a): Compute normalization factors to weigh counts
-            total_count = self.prob_of_alignments(sampled_alignments)
+            # E step (a): Compute normalization factors to weigh counts,
+            # from the probabilities computed while sampling
+            total_count = 0
+            for alignment_info in sampled_alignments:
+                total_count += alignment_info.score
 
             # E step (b): Collect counts
             for alignment_info in sampled_alignments:
-                count = self.prob_t_a_given_s(alignment_info)
+                count = alignment_info.score
                 normalized_count = count / total_count
 
                 for j in range(1, m + 1):
@@ -354,6 +365,9 @@ class IBMModel4(IBMModel):
                 )
                 non_head_d_table[dj][t_cls] = max(estimate, IBMModel.MIN_PROB)
 
+    def _alignment_scorer(self, sentence_pair):
+        return Model4AlignmentScorer(self, sentence_pair)
+
     def prob_t_a_given_s(self, alignment_info):
         """
         Probability of target sentence and an alignment given the
@@ -488,3 +502,153 @@ class Model4Counts(Counts):
             dj = j - previous_j
             self.non_head_distortion[dj][trg_class] += count
             self.non_head_distortion_for_any_dj[trg_class] += count
+
+
+class Model4AlignmentScorer(AlignmentScorer):
+    """
+    Scores alignments like ``IBMModel4.model4_prob_t_a_given_s``, from
+    the probabilities that each factor of the score can take in the
+    sentence pair
+
+    Distortion depends on the alignment of other words, so the score of
+    a neighbor is only bounded by leaving distortion out, which is
+    valid as long as no distortion probability is greater than 1.
+    """
+
+    def __init__(self, ibm_model, sentence_pair):
+        super(Model4AlignmentScorer, self).__init__(ibm_model, sentence_pair)
+        src_sentence = [None] + sentence_pair.mots
+        trg_sentence = ['UNUSED'] + sentence_pair.words
+        l = self.l
+        m = self.m
+        p1 = ibm_model.p1
+        p0 = 1 - p1
+        MIN_PROB = IBMModel.MIN_PROB
+
+        self.null_terms = []
+        for null_fertility in range(0, m + 1):
+            value = pow(p1, null_fertility) * pow(p0, m - 2 * null_fertility)
+            if value < MIN_PROB:
+                value = MIN_PROB
+            else:
+                for i in range(1, null_fertility + 1):
+                    value *= (m - null_fertility - i + 1) / i
+            self.null_terms.append(value)
+
+        self.fertility_terms = [None]
+        for i in range(1, l + 1):
+            s = src_sentence[i]
+            self.fertility_terms.append(
+                [
+                    factorial(fertility) * ibm_model.fertility_table[fertility][s]
+                    for fertility in range(0, m + 1)
+                ]
+            )
+
+        self.translation_terms = [None]
+        for j in range(1, m + 1):
+            t = trg_sentence[j]
+            self.translation_terms.append(
+                [ibm_model.translation_table[t][s] for s in src_sentence]
+            )
+
+        self.src_classes = [None] + [
+            ibm_model.src_classes[s] for s in sentence_pair.mots
+        ]
+        self.trg_classes = [None] + [
+            ibm_model.trg_classes[t] for t in sentence_pair.words
+        ]
+
+        # The distortion probabilities that the sentence pair can use:
+        # a head word is at most m - 1 positions away from the center of
+        # the previous cept, which lies between 0 and m
+        src_classes = set(self.src_classes)
+        trg_classes = set(self.trg_classes[1:])
+        self.head_distortions = {}
+        for dj in range(1 - m, m + 1):
+            head_d_table = ibm_model.head_distortion_table[dj]
+            for src_class in src_classes:
+                for trg_class in trg_classes:
+                    self.head_distortions[dj, src_class, trg_class] = head_d_table[
+                        src_class
+                    ][trg_class]
+        self.non_head_distortions = {}
+        for dj in range(1, m):
+            non_head_d_table = ibm_model.non_head_distortion_table[dj]
+            for trg_class in trg_classes:
+                self.non_head_distortions[dj, trg_class] = non_head_d_table[trg_class]
+
+        distortions = list(self.head_distortions.values())
+        distortions.extend(self.non_head_distortions.values())
+        if max(distortions + [1.0]) <= 1.0:
+            self.log_null_terms = [_log(value) for value in self.null_terms]
+            self.log_fertility_terms = [None] + [
+                [_log(value) for value in terms] for terms in self.fertility_terms[1:]
+            ]
+            self.log_fertility_floor = _log(MIN_PROB)
+            self.log_translation_terms = [None] + [
+                [_log(value) for value in terms]
+                for terms in self.translation_terms[1:]
+            ]
+
+    def score(self, alignment):
+        l = self.l
+        m = self.m
+        MIN_PROB = IBMModel.MIN_PROB
+
+        cepts = [[] for i in range(l + 1)]
+        for j in range(1, m + 1):
+            cepts[alignment[j]].append(j)
+
+        probability = self.null_terms[len(cepts[0])]
+        if probability < MIN_PROB:
+            return MIN_PROB
+
+        fertility_terms = self.fertility_terms
+        value = 1.0
+        for i in range(1, l + 1):
+            value *= fertility_terms[i][len(cepts[i])]
+            if value < MIN_PROB:
+                value = MIN_PROB
+                break
+        probability *= value
+        if probability < MIN_PROB:
+            return MIN_PROB
+
+        translation_terms = self.translation_terms
+        trg_classes = self.trg_classes
+        for j in range(1, m + 1):
+            i = alignment[j]
+            probability *= translation_terms[j][i]
+            if probability < MIN_PROB:
+                return MIN_PROB
+
+            if i == 0:
+                # t is aligned to NULL and not distorted
+                continue
+            tablet = cepts[i]
+            if tablet[0] == j:
+                # t is the first word of a tablet
+                previous_cept = i - 1
+                while previous_cept > 0 and not cepts[previous_cept]:
+                    previous_cept -= 1
+                if previous_cept > 0:
+                    previous_tablet = cepts[previous_cept]
+                    center = int(ceil(sum(previous_tablet) / len(previous_tablet)))
+                    src_class = self.src_classes[previous_cept]
+                else:
+                    center = 0
+                    src_class = None
+                probability *= self.head_distortions[
+                    j - center, src_class, trg_classes[j]
+                ]
+            else:
+                # t is a subsequent word of a tablet
+                previous_position = tablet[tablet.index(j) - 1]
+                probability *= self.non_head_distortions[
+                    j - previous_position, trg_classes[j]
+                ]
+            if probability < MIN_PROB:
+                return MIN_PROB
+
+        return probability
@@ -121,6 +121,7 @@ from nltk.translate import AlignedSent
 from nltk.translate import Alignment
 from nltk.translate import IBMModel
 from nltk.translate import IBMModel4
+from nltk.translate.ibm4 import Model4AlignmentScorer
 from nltk.translate.ibm_model import Counts
 from nltk.translate.ibm_model import longest_target_sentence_length
 
@@ -182,6 +183,7 @@ class IBMModel5(IBMModel):
         source_word_classes,
         target_word_classes,
         probability_tables=None,
+        processes=1,
     ):
         """
         Train on ``sentence_aligned_corpus`` and create a lexical
@@ -215,6 +217,10 @@ class IBMModel5(IBMModel):
             ``non_head_vacancy_table``. See ``IBMModel``, ``IBMModel4``,
             and ``IBMModel5`` for the type and purpose of these tables.
         :type probability_tables: dict[str]: object
+
+        :param processes: Number of processes that share the sampling
+            of alignments in each iteration of training
+        :type processes: int
         """
         super(IBMModel5, self).__init__(sentence_aligned_corpus)
         self.reset_probabilities()
@@ -228,6 +234,7 @@ class IBMModel5(IBMModel):
                 iterations,
                 source_word_classes,
                 target_word_classes,
+                processes=processes,
             )
             self.translation_table = ibm4.translation_table
             self.alignment_table = ibm4.alignment_table
@@ -250,7 +257,7 @@ class IBMModel5(IBMModel):
             self.non_head_vacancy_table = probability_tables['non_head_vacancy_table']
 
         for n in range(0, iterations):
-            self.train(sentence_aligned_corpus)
+            self.train(sentence_aligned_corpus, processes)
 
     def reset_probabilities(self):
         super(IBMModel5, self).reset_probabilities()
@@ -308,14 +315,15 @@ class IBMModel5(IBMModel):
                     lambda: initial_prob
                 )
 
-    def train(self, parallel_corpus):
+    def train(self, parallel_corpus, processes=1):
         counts = Model5Counts()
+        samples = self._sample_all(parallel_corpus, processes)
         for aligned_sentence in parallel_corpus:
             l = len(aligned_sentence.mots)
             m = len(aligned_sentence.words)
 
             # Sample the alignment space
-            sampled_alignments, best_alignment = self.sample(aligned_sentence)
+            sampled_alignments, best_alignment = next(samples)
             # Record the most probable alignment
             aligned_sentence.alignment = Alignment(
                 best_alignment.zero_indexed_alignment()
@@ -383,6 +391,16 @@ class IBMModel5(IBMModel):
         )
         return self.prune(sampled_alignments), best_alignment
 
+    def _sample_all(self, parallel_corpus, processes=1):
+        for sampled_alignments, best_alignment in super(IBMModel5, self)._sample_all(
+            parallel_corpus, processes
+        ):
+            yield self.prune(sampled_alignments), best_alignment
+
+    def _alignment_scorer(self, sentence_pair):
+        # Hill climb with Model 4 scores, like ``hillclimb``
+        return Model4AlignmentScorer(self, sentence_pair)
+
     def prune(self, alignment_infos):
         """
         Removes alignments from ``alignment_infos`` that have
@@ -395,7 +413,9 @@ class IBMModel5(IBMModel):
         best_score = 0
 
         for alignment_info in alignment_infos:
-            score = IBMModel4.model4_prob_t_a_given_s(alignment_info, self)
+            score = alignment_info.score  # Model 4 score from sampling
+            if score is None:
+                score = IBMModel4.model4_prob_t_a_given_s(alignment_info, self)
             best_score = max(score, best_score)
             alignments.append((alignment_info, score))
 
@@ -38,10 +38,19 @@ Translation: Parameter Estimation. Computational Linguistics, 19 (2),
 263-311.
 """
 from __future__ import division
+from array import array
 from bisect import insort_left
 from collections import defaultdict
-from copy import deepcopy
-from math import ceil
+from functools import partial
+from math import ceil, log
+from operator import itemgetter
+
+try:
+    import numpy
+except ImportError:
+    pass
+
+from nltk.util import parallel_imap, parallel_map
 
 
 def longest_target_sentence_length(sentence_aligned_corpus):
@@ -158,6 +167,11 @@ class IBMModel(object):
             and the best alignment of the set for convenience
         :rtype: set(AlignmentInfo), AlignmentInfo
         """
+        scorer = self._alignment_scorer(sentence_pair)
+        if scorer is not None:
+            search = _search_alignments(scorer)
+            return self._sampled_alignments(sentence_pair, *search)
+
         sampled_alignments = set()
         l = len(sentence_pair.mots)
         m = len(sentence_pair.words)
@@ -181,6 +195,58 @@ class IBMModel(object):
 
         return sampled_alignments, best_alignment
 
+    def _alignment_scorer(self, sentence_pair):
+        """
+        :return: An ``AlignmentScorer`` with which ``sample`` searches
+            the alignments of ``sentence_pair`` as plain tuples, or None
+            to search with ``hillclimb`` and ``neighboring`` instead
+        :rtype: AlignmentScorer
+        """
+        return None
+
+    def _sample_all(self, parallel_corpus, processes=1):
+        """
+        Sample the alignments of each sentence pair in
+        ``parallel_corpus`` in turn, like ``sample``, sharing the
+        searches between ``processes`` worker processes
+
+        Only models that provide an ``AlignmentScorer`` can sample in
+        other processes.
+
+        :rtype: iter(tuple(set(AlignmentInfo), AlignmentInfo))
+        """
+        scorers = (
+            self._alignment_scorer(sentence_pair) for sentence_pair in parallel_corpus
+        )
+        searches = parallel_imap(_search_alignments, scorers, processes)
+        for sentence_pair in parallel_corpus:
+            yield self._sampled_alignments(sentence_pair, *next(searches))
+
+    def _sampled_alignments(self, sentence_pair, alignments, best, best_score):
+        """
+        Rebuild the result of ``sample`` from that of
+        ``_search_alignments``. Unlike with ``hillclimb``, every sampled
+        alignment gets its score.
+        """
+        src_sentence = tuple([None] + sentence_pair.mots)
+        trg_sentence = tuple(['UNUSED'] + sentence_pair.words)
+        l = len(sentence_pair.mots)
+
+        def alignment_info(alignment):
+            cepts = [[] for i in range(l + 1)]
+            for j in range(1, len(alignment)):
+                cepts[alignment[j]].append(j)
+            return AlignmentInfo(alignment, src_sentence, trg_sentence, cepts)
+
+        sampled_alignments = set()
+        for alignment, score in alignments:
+            sampled_alignment = alignment_info(alignment)
+            sampled_alignment.score = score
+            sampled_alignments.add(sampled_alignment)
+        best_alignment = alignment_info(best)
+        best_alignment.score = best_score
+        return sampled_alignments, best_alignment
+
     def best_model2_alignment(self, sentence_pair, j_pegged=None, i_pegged=0):
         """
         Finds the best alignment according to IBM Model 2
@@ -295,7 +361,7 @@ class IBMModel(object):
                 # Add alignments that differ by one alignment point
                 for i in range(0, l + 1):
                     new_alignment = list(original_alignment)
-                    new_cepts = deepcopy(original_cepts)
+                    new_cepts = [list(cept) for cept in original_cepts]
                     old_i = original_alignment[j]
 
                     # update alignment
@@ -319,7 +385,7 @@ class IBMModel(object):
                 for other_j in range(1, m + 1):
                     if other_j != j_pegged and other_j != j:
                         new_alignment = list(original_alignment)
-                        new_cepts = deepcopy(original_cepts)
+                        new_cepts = [list(cept) for cept in original_cepts]
                         other_i = original_alignment[other_j]
                         i = original_alignment[j]
 
@@ -548,3 +614,528 @@ class Counts(object):
             phi = alignment_info.fertility_of_i(i)
             self.fertility[phi][s] += count
             self.fertility_for_any_phi[s] += count
+
+
+class AlignmentScorer(object):
+    """
+    Scores the alignments of one sentence pair under an IBM model
+
+    Alignments are plain tuples, like ``AlignmentInfo.alignment``, and
+    the probabilities they depend on are looked up once for the sentence
+    pair, so that the alignment space can be searched without the model
+    or ``AlignmentInfo`` objects, e.g. in a worker process.
+
+    Subclasses implement ``score``. They may also set the ``log_*``
+    attributes to the logs of factors whose product is at least the
+    score. ``best_neighbor`` then bounds the score of each neighbor by
+    updating the sum of those logs in constant time, and only scores the
+    neighbors that could be better than the best one so far.
+    """
+
+    LOG_TOLERANCE = 1e-7
+    """
+    Margin for rounding errors in the bounds of ``best_neighbor``
+    """
+
+    log_null_terms = None
+    """
+    list(float): Log of the factor that depends on the fertility of
+    NULL. Values accessed as ``log_null_terms[null_fertility]``.
+    """
+
+    log_fertility_terms = None
+    """
+    list(list(float)): Log of the factor that depends on the fertility
+    of the source word in position i. Values accessed as
+    ``log_fertility_terms[i][fertility]``, for i > 0.
+    """
+
+    log_fertility_floor = float('-inf')
+    """
+    float: Lower limit of the sum of ``log_fertility_terms``, for models
+    that clip the product of the fertility factors to ``MIN_PROB``
+    """
+
+    log_translation_terms = None
+    """
+    list(list(float)): Log of the factor that depends on the alignment
+    point of the target word in position j. Values accessed as
+    ``log_translation_terms[j][i]``, for j > 0.
+    """
+
+    def __init__(self, ibm_model, sentence_pair):
+        self.l = len(sentence_pair.mots)
+        self.m = len(sentence_pair.words)
+
+        self.model2_alignment = ibm_model.best_model2_alignment(sentence_pair).alignment
+        """
+        tuple(int): Best alignment according to IBM Model 2. Pegging
+        alignment point j to i in it gives the best Model 2 alignment
+        with that constraint, so it is only computed once.
+        """
+
+    def score(self, alignment):
+        """
+        Probability of the target sentence and ``alignment`` given the
+        source sentence, as computed by ``prob_t_a_given_s``
+        """
+        raise NotImplementedError()
+
+    def best_neighbor(self, alignment, probability, j_pegged=None):
+        """
+        :return: The best neighbor of ``alignment`` and its score, if
+            that is higher than ``probability``, or else None and
+            ``probability``. Of equally good neighbors, the one that
+            ``IBMModel.hillclimb`` would move to is chosen.
+        :rtype: tuple(int), float
+        """
+        if self.log_translation_terms is None:
+            return self._best_scored(
+                set(_neighboring_alignments(alignment, self.l, self.m, j_pegged)),
+                probability,
+            )
+
+        l = self.l
+        m = self.m
+        log_null_terms = self.log_null_terms
+        log_fertility_terms = self.log_fertility_terms
+        log_translation_terms = self.log_translation_terms
+        log_fertility_floor = self.log_fertility_floor
+
+        fertilities = [0] * (l + 1)
+        for j in range(1, m + 1):
+            fertilities[alignment[j]] += 1
+        null_fertility = fertilities[0]
+        log_null = log_null_terms[null_fertility]
+        log_fertility = 0.0
+        for i in range(1, l + 1):
+            log_fertility += log_fertility_terms[i][fertilities[i]]
+        log_translation = 0.0
+        for j in range(1, m + 1):
+            log_translation += log_translation_terms[j][alignment[j]]
+        log_bound = log_null + max(log_fertility, log_fertility_floor) + log_translation
+        if not -_INFINITY < log_bound < _INFINITY:
+            # Differences from an infinite or undefined log are useless
+            return self._best_scored(
+                set(_neighboring_alignments(alignment, self.l, self.m, j_pegged)),
+                probability,
+            )
+
+        threshold = log(probability) - AlignmentScorer.LOG_TOLERANCE
+        candidates = []
+
+        # Bound the neighbors that differ by one alignment point
+        for j in range(1, m + 1):
+            if j == j_pegged:
+                continue
+            old_i = alignment[j]
+            log_translation_j = log_translation - log_translation_terms[j][old_i]
+            if old_i == 0:
+                log_null_j = log_null_terms[null_fertility - 1]
+                log_fertility_j = log_fertility
+            else:
+                log_null_j = log_null
+                terms = log_fertility_terms[old_i]
+                fertility = fertilities[old_i]
+                log_fertility_j = (
+                    log_fertility - terms[fertility] + terms[fertility - 1]
+                )
+            for i in range(0, l + 1):
+                if i == old_i:
+                    continue
+                if i == 0:
+                    new_log_null = log_null_terms[null_fertility + 1]
+                    new_log_fertility = log_fertility_j
+                else:
+                    new_log_null = log_null_j
+                    terms = log_fertility_terms[i]
+                    fertility = fertilities[i]
+                    new_log_fertility = (
+                        log_fertility_j - terms[fertility] + terms[fertility + 1]
+                    )
+                if new_log_fertility < log_fertility_floor:
+                    new_log_fertility = log_fertility_floor
+                neighbor_log_bound = (
+                    new_log_null
+                    + new_log_fertility
+                    + log_translation_j
+                    + log_translation_terms[j][i]
+                )
+                if not neighbor_log_bound < threshold:
+                    candidates.append((neighbor_log_bound, j, i, 0))
+
+        # Bound the neighbors that have two alignment points swapped
+        for j in range(1, m + 1):
+            if j == j_pegged:
+                continue
+            i = alignment[j]
+            terms = log_translation_terms[j]
+            for other_j in range(j + 1, m + 1):
+                other_i = alignment[other_j]
+                if other_j == j_pegged or other_i == i:
+                    continue
+                other_terms = log_translation_terms[other_j]
+                neighbor_log_bound = (
+                    log_bound
+                    + terms[other_i]
+                    + other_terms[i]
+                    - terms[i]
+                    - other_terms[other_i]
+                )
+                if not neighbor_log_bound < threshold:
+                    candidates.append((neighbor_log_bound, j, other_i, other_j))
+
+        # Score the most promising neighbors first, to raise the
+        # threshold early
+        candidates.sort(key=itemgetter(0), reverse=True)
+        best_alignments = []
+        best_probability = probability
+        for neighbor_log_bound, j, i, other_j in candidates:
+            if neighbor_log_bound < threshold:
+                continue
+            neighbor = list(alignment)
+            if other_j:
+                neighbor[other_j] = alignment[j]
+            neighbor[j] = i
+            neighbor = tuple(neighbor)
+            neighbor_probability = self.score(neighbor)
+            if neighbor_probability > best_probability:
+                best_alignments = [neighbor]
+                best_probability = neighbor_probability
+                threshold = log(best_probability) - AlignmentScorer.LOG_TOLERANCE
+            elif neighbor_probability == best_probability and best_alignments:
+                best_alignments.append(neighbor)
+
+        if len(best_alignments) > 1:
+            # Break the tie as hill climbing over the set of neighbors would
+            best_alignments = set(best_alignments)
+            return self._best_scored(
+                (
+                    neighbor
+                    for neighbor in set(
+                        _neighboring_alignments(alignment, l, m, j_pegged)
+                    )
+                    if neighbor in best_alignments
+                ),
+                probability,
+            )
+        if best_alignments:
+            return best_alignments[0], best_probability
+        return None, probability
+
+    def _best_scored(self, alignments, probability):
+        best_alignment = None
+        for alignment in alignments:
+            alignment_probability = self.score(alignment)
+            if alignment_probability > probability:
+                best_alignment = alignment
+                probability = alignment_probability
+        return best_alignment, probability
+
+class EncodedParallelCorpus(object):
+    """
+    A sentence-aligned corpus whose words are replaced by integers, for
+    training the lexical translation and alignment probabilities of IBM
+    Models 1 and 2 with array operations.
+
+    Probabilities are held in flat arrays: one entry for each pair of a
+    target word and a source word (or NULL) that occur in the same
+    sentence pair, and one entry for each alignment (i, j, l, m) that
+    occurs in the corpus.  An EM iteration gathers these for every
+    alignment point of the corpus, normalises them, and adds up the
+    expected counts with ``numpy.bincount``.  The alignment points are
+    split into shards, which may be processed by several processes.
+
+    The E step normalises the counts of each target word by the total
+    probability of that word in the sentence pair, as in
+    ``IBMModel1.prob_all_alignments``.
+    """
+
+    SHARD_SIZE = 1 << 22
+    """
+    The approximate number of alignment points in a shard.
+    """
+
+    def __init__(self, sentence_aligned_corpus):
+        src_ids = {None: 0}
+        trg_ids = {}
+        self._shapes = {}
+        num_alignments = 0
+        keys = []
+        shards = []
+        shard = _Shard()
+        for aligned_sentence in sentence_aligned_corpus:
+            src = [src_ids.setdefault(s, len(src_ids)) for s in aligned_sentence.mots]
+            src.insert(0, 0)
+            trg = [trg_ids.setdefault(t, len(trg_ids)) for t in aligned_sentence.words]
+            l = len(src) - 1
+            m = len(trg)
+            if not m:
+                continue
+            if (l, m) not in self._shapes:
+                self._shapes[(l, m)] = num_alignments
+                num_alignments += (l + 1) * m
+
+            # the points of the sentence pair, ordered by j then i
+            keys.append(
+                numpy.add.outer(numpy.array(trg, 'int64') << 32, numpy.array(src))
+            )
+            shard.add(src, trg, self._shapes[(l, m)])
+            if shard.size >= self.SHARD_SIZE:
+                shards.append(shard)
+                shard = _Shard()
+        if shard.size:
+            shards.append(shard)
+
+        self.src_words = [None] * len(src_ids)
+        for s, s_id in src_ids.items():
+            self.src_words[s_id] = s
+        self.trg_words = [None] * len(trg_ids)
+        for t, t_id in trg_ids.items():
+            self.trg_words[t_id] = t
+
+        # number the co-occurring word pairs, and store the pair of each
+        # alignment point in the shards
+        if keys:
+            keys = numpy.concatenate([k.ravel() for k in keys])
+        else:
+            keys = numpy.zeros(0, 'int64')
+        pairs, points = numpy.unique(keys, return_inverse=True)
+        self._pair_trg = pairs >> 32
+        self._pair_src = pairs & 0xFFFFFFFF
+        start = 0
+        for shard in shards:
+            shard.finish(points[start : start + shard.size])
+            start += shard.size
+        self._shards = shards
+
+        # number the (j, l, m) of the alignments, whose probabilities add
+        # up to one, by their first alignment
+        groups = numpy.empty(num_alignments, 'l')
+        for (l, m), offset in self._shapes.items():
+            groups[offset : offset + (l + 1) * m] = offset + numpy.repeat(
+                numpy.arange(0, (l + 1) * m, l + 1), l + 1
+            )
+        self._alignment_groups = numpy.unique(groups, return_inverse=True)[1]
+
+    def translation_probabilities(self, translation_table):
+        """
+        :return: The probability of each co-occurring word pair in
+            ``translation_table``
+        """
+        return numpy.array(
+            [
+                translation_table[self.trg_words[t]][self.src_words[s]]
+                for t, s in zip(self._pair_trg.tolist(), self._pair_src.tolist())
+            ],
+            'd',
+        )
+
+    def alignment_probabilities(self, alignment_table):
+        """
+        :return: The probability of each alignment in ``alignment_table``
+        """
+        probs = numpy.empty(len(self._alignment_groups), 'd')
+        for (l, m), offset in self._shapes.items():
+            probs[offset : offset + (l + 1) * m] = [
+                alignment_table[i][j][l][m]
+                for j in range(1, m + 1)
+                for i in range(0, l + 1)
+            ]
+        return probs
+
+    def update_translation_table(self, translation_table, probs):
+        for t, s, prob in zip(
+            self._pair_trg.tolist(), self._pair_src.tolist(), probs.tolist()
+        ):
+            translation_table[self.trg_words[t]][self.src_words[s]] = prob
+
+    def update_alignment_table(self, alignment_table, probs):
+        probs = probs.tolist()
+        for (l, m), offset in self._shapes.items():
+            for j in range(1, m + 1):
+                for i in range(0, l + 1):
+                    alignment_table[i][j][l][m] = probs[offset]
+                    offset += 1
+
+    def expected_counts(self, translation_probs, alignment_probs=None, processes=1):
+        """
+        The E step: the expected number of times that each co-occurring
+        word pair, and each alignment, occurs in the corpus.  If
+        ``alignment_probs`` is None, all alignments are equally likely,
+        as in IBM Model 1, and only the word pair counts are returned.
+
+        :param processes: the number of processes that count the shards
+        :rtype: array or tuple(array, array)
+        """
+        counts = parallel_map(
+            partial(_expected_counts, translation_probs, alignment_probs),
+            self._shards,
+            processes,
+        )
+        translation_counts = numpy.zeros(len(translation_probs))
+        for c in counts:
+            translation_counts += c if alignment_probs is None else c[0]
+        if alignment_probs is None:
+            return translation_counts
+        alignment_counts = numpy.zeros(len(alignment_probs))
+        for c in counts:
+            alignment_counts += c[1]
+        return translation_counts, alignment_counts
+
+    def maximize_translation_probabilities(self, counts):
+        """
+        The M step for the probabilities of the co-occurring word pairs.
+        """
+        totals = numpy.bincount(self._pair_src, counts, len(self.src_words))
+        return numpy.maximum(counts / totals[self._pair_src], IBMModel.MIN_PROB)
+
+    def maximize_alignment_probabilities(self, counts):
+        """
+        The M step for the probabilities of the alignments.
+        """
+        totals = numpy.bincount(self._alignment_groups, counts)
+        return numpy.maximum(
+            counts / totals[self._alignment_groups], IBMModel.MIN_PROB
+        )
+
+
+class _Shard(object):
+    """
+    A run of sentence pairs of an ``EncodedParallelCorpus``.
+    """
+
+    def __init__(self):
+        self.size = 0
+        # the word pair of each alignment point
+        self.points = numpy.zeros(0, 'l')
+        # the target words of each sentence pair, numbered from 0 within
+        # the shard, and the number of points for each of them
+        self._words = array('l')
+        self._words_size = array('l')
+        self._num_words = 0
+        # the alignment of the first point of each sentence pair, less
+        # the index of that point, and the number of its points
+        self._alignments = array('l')
+        self._alignments_size = array('l')
+
+    def add(self, src, trg, offset):
+        first = {}
+        num_words = self._num_words
+        self._words.extend(first.setdefault(t, len(first)) + num_words for t in trg)
+        self._words_size.extend([len(src)] * len(trg))
+        self._num_words += len(first)
+        self._alignments.append(offset - self.size)
+        self._alignments_size.append(len(src) * len(trg))
+        self.size += len(src) * len(trg)
+
+    def finish(self, points):
+        self.points = points
+        self._words = numpy.frombuffer(self._words, 'l')
+        self._words_size = numpy.frombuffer(self._words_size, 'l')
+        self._alignments = numpy.frombuffer(self._alignments, 'l')
+        self._alignments_size = numpy.frombuffer(self._alignments_size, 'l')
+
+    def words(self):
+        return numpy.repeat(self._words, self._words_size)
+
+    def alignments(self):
+        return numpy.repeat(self._alignments, self._alignments_size) + numpy.arange(
+            self.size
+        )
+
+
+def _expected_counts(translation_probs, alignment_probs, shard):
+    probs = translation_probs[shard.points]
+    if alignment_probs is not None:
+        alignments = shard.alignments()
+        probs *= alignment_probs[alignments]
+    words = shard.words()
+    probs /= numpy.bincount(words, probs)[words]
+    counts = numpy.bincount(shard.points, probs, len(translation_probs))
+    if alignment_probs is None:
+        return counts
+    return counts, numpy.bincount(alignments, probs, len(alignment_probs))
+
+
+_INFINITY = float('inf')
+
+
+def _log(x):
+    return log(x) if x > 0 else -_INFINITY
+
+
+def _neighboring_alignments(alignment, l, m, j_pegged=None):
+    """
+    The alignments that ``IBMModel.neighboring`` creates for the
+    alignment tuple ``alignment``, in the same order
+    """
+    for j in range(1, m + 1):
+        if j != j_pegged:
+            for i in range(0, l + 1):
+                new_alignment = list(alignment)
+                new_alignment[j] = i
+                yield tuple(new_alignment)
+
+    for j in range(1, m + 1):
+        if j != j_pegged:
+            for other_j in range(1, m + 1):
+                if other_j != j_pegged and other_j != j:
+                    new_alignment = list(alignment)
+                    new_alignment[j] = alignment[other_j]
+                    new_alignment[other_j] = alignment[j]
+                    yield tuple(new_alignment)
+
+
+def _hillclimb(scorer, alignment, j_pegged=None):
+    probability = scorer.score(alignment)
+    while True:
+        neighbor, probability = scorer.best_neighbor(alignment, probability, j_pegged)
+        if neighbor is None:
+            return alignment, probability
+        alignment = neighbor
+
+
+def _search_alignments(scorer):
+    """
+    Sample the alignments of a sentence pair like ``IBMModel.sample``,
+    scoring them with the ``AlignmentScorer`` ``scorer``
+
+    :return: The sampled alignments with their scores, and the best of
+        them with its score
+    :rtype: list(tuple(tuple(int), float)), tuple(int), float
+    """
+    l = scorer.l
+    m = scorer.m
+    sampled_alignments = set()
+    # The neighbors of an alignment with a pegged alignment point are
+    # among its neighbors without one
+    expanded = set()
+
+    def add_neighbors(alignment, j_pegged=None):
+        if (alignment, None) in expanded or (alignment, j_pegged) in expanded:
+            return
+        expanded.add((alignment, j_pegged))
+        sampled_alignments.update(_neighboring_alignments(alignment, l, m, j_pegged))
+
+    # Start from the best model 2 alignment
+    model2_alignment = scorer.model2_alignment
+    best_alignment, best_score = _hillclimb(scorer, model2_alignment)
+    add_neighbors(best_alignment)
+
+    # Start from other model 2 alignments,
+    # with the constraint that j is aligned (pegged) to i
+    for j in range(1, m + 1):
+        for i in range(0, l + 1):
+            initial_alignment = list(model2_alignment)
+            initial_alignment[j] = i
+            alignment, score = _hillclimb(scorer, tuple(initial_alignment), j)
+            add_neighbors(alignment, j)
+            if score > best_score:
+                best_alignment = alignment
+                best_score = score
+
+    scored_alignments = [
+        (alignment, scorer.score(alignment)) for alignment in sampled_alignments
+    ]
+    return scored_alignments, best_alignment, best_score
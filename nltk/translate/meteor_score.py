@@ -7,9 +7,13 @@
 # For license information, see LICENSE.TXT
 
 
+from collections import defaultdict
+from functools import partial
+from itertools import chain, product
+
 from nltk.stem.porter import PorterStemmer
 from nltk.corpus import wordnet
-from itertools import chain, product
+from nltk.util import parallel_map
 
 def _generate_enums(hypothesis, reference, preprocess=str.lower):
     """
@@ -60,16 +64,99 @@ def _match_enums(enum_hypothesis_list, enum_reference_list):
              enumerated unmatched reference tuples
     :rtype: list of 2D tuples, list of 2D tuples,  list of 2D tuples
     """
+    return _match_keys(
+        enum_hypothesis_list,
+        enum_reference_list,
+        [{word} for _, word in enum_hypothesis_list],
+        [word for _, word in enum_reference_list],
+    )
+
+
+def _match_keys(
+    enum_hypothesis_list, enum_reference_list, hypothesis_keys, reference_keys
+):
+    """
+    Matches each hypothesis word, from the last to the first, to the last
+    unmatched reference word whose key is in the set of keys of the
+    hypothesis word.  The reference words are indexed by key, so that this
+    doesn't compare every pair of words.
+
+    :param hypothesis_keys: the set of keys of each hypothesis word
+    :type hypothesis_keys: list(set)
+    :param reference_keys: the key of each reference word
+    :type reference_keys: list
+    :return: enumerated matched tuples, enumerated unmatched hypothesis tuples,
+             enumerated unmatched reference tuples
+    :rtype: list of 2D tuples, list of 2D tuples,  list of 2D tuples
+    """
+    # The positions in enum_reference_list of the words with each key.
+    positions = defaultdict(list)
+    for j, key in enumerate(reference_keys):
+        positions[key].append(j)
+
     word_match = []
+    matched_hypothesis = set()
+    matched_reference = set()
     for i in range(len(enum_hypothesis_list))[::-1]:
-        for j in range(len(enum_reference_list))[::-1]:
-            if enum_hypothesis_list[i][1] == enum_reference_list[j][1]:
-                word_match.append((enum_hypothesis_list[i][0],enum_reference_list[j][0]))
-                (enum_hypothesis_list.pop(i)[1],enum_reference_list.pop(j)[1])
-                break
-    return word_match, enum_hypothesis_list, enum_reference_list
-                              
-def _enum_stem_match(enum_hypothesis_list, enum_reference_list, stemmer = PorterStemmer()):
+        keys = hypothesis_keys[i]
+        if len(keys) > len(positions):
+            keys = [key for key in positions if key in keys]
+        candidates = [positions[key] for key in keys if positions.get(key)]
+        if not candidates:
+            continue
+        j = max(candidates, key=lambda key_positions: key_positions[-1]).pop()
+        word_match.append((enum_hypothesis_list[i][0], enum_reference_list[j][0]))
+        matched_hypothesis.add(i)
+        matched_reference.add(j)
+
+    return (
+        word_match,
+        [
+            pair
+            for i, pair in enumerate(enum_hypothesis_list)
+            if i not in matched_hypothesis
+        ],
+        [
+            pair
+            for j, pair in enumerate(enum_reference_list)
+            if j not in matched_reference
+        ],
+    )
+
+
+def _stem(word, stemmer, stems):
+    if stems is None:
+        return stemmer.stem(word)
+    if word not in stems:
+        stems[word] = stemmer.stem(word)
+    return stems[word]
+
+
+def _synonyms(word, wordnet, synonyms):
+    """
+    The word and the names of the lemmas of its WordNet synsets, except
+    multiword lemmas
+    """
+    if synonyms is not None and word in synonyms:
+        return synonyms[word]
+    word_synonyms = frozenset(
+        chain(
+            [word],
+            (
+                lemma.name()
+                for synset in wordnet.synsets(word)
+                for lemma in synset.lemmas()
+                if lemma.name().find('_') < 0
+            ),
+        )
+    )
+    if synonyms is not None:
+        synonyms[word] = word_synonyms
+    return word_synonyms
+
+def _enum_stem_match(
+    enum_hypothesis_list, enum_reference_list, stemmer=PorterStemmer(), stems=None
+):
     """
     Stems each word and matches them in hypothesis and reference 
     and returns a word mapping between enum_hypothesis_list and 
@@ -82,30 +169,22 @@ def _enum_stem_match(enum_hypothesis_list, enum_reference_list, stemmer = Porter
     :type enum_reference_list:
     :param stemmer: nltk.stem.api.StemmerI object (default PorterStemmer())
     :type stemmer: nltk.stem.api.StemmerI or any class that implements a stem method
+    :param stems: a cache of the stems of words, shared between calls
+    :type stems: dict(str, str)
     :return: enumerated matched tuples, enumerated unmatched hypothesis tuples, 
              enumerated unmatched reference tuples
     :rtype: list of 2D tuples, list of 2D tuples,  list of 2D tuples
     """
-    stemmed_enum_list1 = [(word_pair[0],stemmer.stem(word_pair[1])) \
-                          for word_pair in enum_hypothesis_list]
-
-    stemmed_enum_list2 = [(word_pair[0],stemmer.stem(word_pair[1])) \
-                          for word_pair in enum_reference_list]
-
-    word_match, enum_unmat_hypo_list, enum_unmat_ref_list = \
-                    _match_enums(stemmed_enum_list1, stemmed_enum_list2)
+    word_match, _, _ = _match_keys(
+        enum_hypothesis_list,
+        enum_reference_list,
+        [{_stem(word, stemmer, stems)} for _, word in enum_hypothesis_list],
+        [_stem(word, stemmer, stems) for _, word in enum_reference_list],
+    )
 
-    enum_unmat_hypo_list = list(zip(*enum_unmat_hypo_list)) if len(enum_unmat_hypo_list)>0 else []
-
-    enum_unmat_ref_list = list(zip(*enum_unmat_ref_list)) if len(enum_unmat_ref_list)>0 else []
-
-    enum_hypothesis_list = list(filter(lambda x:x[0] not in enum_unmat_hypo_list,  
-                                       enum_hypothesis_list))
-
-    enum_reference_list = list(filter(lambda x:x[0] not in enum_unmat_ref_list, 
-                                      enum_reference_list))
-
-    return word_match, enum_hypothesis_list, enum_reference_list
+    # The stem matched words are left in the lists of unmatched words, and
+    # so can be matched again by synonyms, which the scores depend on.
+    return word_match, list(enum_hypothesis_list), list(enum_reference_list)
 
 def stem_match(hypothesis, reference, stemmer = PorterStemmer()):
     """
@@ -126,7 +205,9 @@ def stem_match(hypothesis, reference, stemmer = PorterStemmer()):
     enum_hypothesis_list, enum_reference_list = _generate_enums(hypothesis, reference)
     return _enum_stem_match(enum_hypothesis_list, enum_reference_list, stemmer = stemmer)
 
-def _enum_wordnetsyn_match(enum_hypothesis_list, enum_reference_list, wordnet = wordnet):
+def _enum_wordnetsyn_match(
+    enum_hypothesis_list, enum_reference_list, wordnet=wordnet, synonyms=None
+):
     """
     Matches each word in reference to a word in hypothesis 
     if any synonym of a hypothesis word is the exact match 
@@ -136,24 +217,18 @@ def _enum_wordnetsyn_match(enum_hypothesis_list, enum_reference_list, wordnet =
     :param enum_reference_list: enumerated reference list
     :param wordnet: a wordnet corpus reader object (default nltk.corpus.wordnet)
     :type wordnet: WordNetCorpusReader
+    :param synonyms: a cache of the synonyms of words, shared between calls
+    :type synonyms: dict(str, frozenset)
     :return: list of matched tuples, unmatched hypothesis list, unmatched reference list
     :rtype:  list of tuples, list of tuples, list of tuples
 
     """
-    word_match = []
-    for i in range(len(enum_hypothesis_list))[::-1]:
-        hypothesis_syns = set(chain(*[[lemma.name() for lemma in synset.lemmas() 
-                                        if lemma.name().find('_')<0] 
-                                       for synset in \
-                                           wordnet.synsets(
-                                               enum_hypothesis_list[i][1])]
-                                               )).union({enum_hypothesis_list[i][1]})
-        for j in range(len(enum_reference_list))[::-1]:
-            if enum_reference_list[j][1] in hypothesis_syns:
-                word_match.append((enum_hypothesis_list[i][0],enum_reference_list[j][0]))
-                enum_hypothesis_list.pop(i),enum_reference_list.pop(j)
-                break
-    return word_match, enum_hypothesis_list, enum_reference_list
+    return _match_keys(
+        enum_hypothesis_list,
+        enum_reference_list,
+        [_synonyms(word, wordnet, synonyms) for _, word in enum_hypothesis_list],
+        [word for _, word in enum_reference_list],
+    )
 
 def wordnetsyn_match(hypothesis, reference, wordnet = wordnet):
     """
@@ -170,8 +245,14 @@ def wordnetsyn_match(hypothesis, reference, wordnet = wordnet):
     enum_hypothesis_list, enum_reference_list = _generate_enums(hypothesis, reference)
     return _enum_wordnetsyn_match(enum_hypothesis_list, enum_reference_list, wordnet = wordnet)
 
-def _enum_allign_words(enum_hypothesis_list, enum_reference_list, 
-                       stemmer=PorterStemmer(), wordnet = wordnet):
+def _enum_allign_words(
+    enum_hypothesis_list,
+    enum_reference_list,
+    stemmer=PorterStemmer(),
+    wordnet=wordnet,
+    stems=None,
+    synonyms=None,
+):
     """
     Aligns/matches words in the hypothesis to reference by sequentially 
     applying exact match, stemmed match and wordnet based synonym match. 
@@ -185,23 +266,34 @@ def _enum_allign_words(enum_hypothesis_list, enum_reference_list,
     :type stemmer: nltk.stem.api.StemmerI or any class that implements a stem method
     :param wordnet: a wordnet corpus reader object (default nltk.corpus.wordnet)
     :type wordnet: WordNetCorpusReader
+    :param stems: a cache of the stems of words, shared between calls
+    :type stems: dict(str, str)
+    :param synonyms: a cache of the synonyms of words, shared between calls
+    :type synonyms: dict(str, frozenset)
     :return: sorted list of matched tuples, unmatched hypothesis list, 
              unmatched reference list
     :rtype: list of tuples, list of tuples, list of tuples
     """
-    exact_matches, enum_hypothesis_list, enum_reference_list = \
-        _match_enums(enum_hypothesis_list, enum_reference_list)
-
-    stem_matches, enum_hypothesis_list, enum_reference_list = \
-        _enum_stem_match(enum_hypothesis_list, enum_reference_list,
-                         stemmer = stemmer)
-
-    wns_matches, enum_hypothesis_list, enum_reference_list = \
-        _enum_wordnetsyn_match(enum_hypothesis_list, enum_reference_list, 
-                               wordnet = wordnet)
-
-    return (sorted(exact_matches + stem_matches + wns_matches, key=lambda wordpair:wordpair[0]), 
-            enum_hypothesis_list, enum_reference_list)
+    exact_matches, enum_hypothesis_list, enum_reference_list = _match_enums(
+        enum_hypothesis_list, enum_reference_list
+    )
+
+    stem_matches, enum_hypothesis_list, enum_reference_list = _enum_stem_match(
+        enum_hypothesis_list, enum_reference_list, stemmer=stemmer, stems=stems
+    )
+
+    wns_matches, enum_hypothesis_list, enum_reference_list = _enum_wordnetsyn_match(
+        enum_hypothesis_list, enum_reference_list, wordnet=wordnet, synonyms=synonyms
+    )
+
+    return (
+        sorted(
+            exact_matches + stem_matches + wns_matches,
+            key=lambda wordpair: wordpair[0],
+        ),
+        enum_hypothesis_list,
+        enum_reference_list,
+    )
 
 def allign_words(hypothesis, reference, stemmer = PorterStemmer(), wordnet = wordnet):
     """
@@ -294,12 +386,36 @@ def single_meteor_score(reference,
     :return: The sentence-level METEOR score.
     :rtype: float
     """
-    enum_hypothesis, enum_reference = _generate_enums(hypothesis, 
-                                                      reference, 
-                                                      preprocess = preprocess)
+    return _single_meteor_score(
+        reference, hypothesis, preprocess, stemmer, wordnet, alpha, beta, gamma
+    )
+
+
+def _single_meteor_score(
+    reference,
+    hypothesis,
+    preprocess,
+    stemmer,
+    wordnet,
+    alpha,
+    beta,
+    gamma,
+    stems=None,
+    synonyms=None,
+):
+    enum_hypothesis, enum_reference = _generate_enums(
+        hypothesis, reference, preprocess=preprocess
+    )
     translation_length = len(enum_hypothesis)
     reference_length = len(enum_reference)
-    matches, _, _ = _enum_allign_words(enum_hypothesis, enum_reference)
+    matches, _, _ = _enum_allign_words(
+        enum_hypothesis,
+        enum_reference,
+        stemmer=stemmer,
+        wordnet=wordnet,
+        stems=stems,
+        synonyms=synonyms,
+    )
     matches_count = len(matches)
     try:
         precision = float(matches_count)/translation_length
@@ -369,10 +485,107 @@ def meteor_score(references,
     :return: The sentence-level METEOR score.
     :rtype: float
     """
-    return max([single_meteor_score(reference, 
-                                    hypothesis, 
-                                    stemmer = stemmer,
-                                    wordnet = wordnet, 
-                                    alpha = alpha, 
-                                    beta = beta, 
-                                    gamma = gamma) for reference in references])
+    # The stems and synonyms of the hypothesis words are shared between
+    # the references.
+    stems = {}
+    synonyms = {}
+    return max(
+        _single_meteor_score(
+            reference,
+            hypothesis,
+            preprocess,
+            stemmer,
+            wordnet,
+            alpha,
+            beta,
+            gamma,
+            stems,
+            synonyms,
+        )
+        for reference in references
+    )
+
+
+def corpus_meteor(
+    list_of_references,
+    hypotheses,
+    preprocess=str.lower,
+    stemmer=PorterStemmer(),
+    wordnet=wordnet,
+    alpha=0.9,
+    beta=3,
+    gamma=0.5,
+    processes=1,
+):
+    """
+    Calculates the average METEOR score of a corpus of hypotheses, each with
+    multiple references, as scored by ``meteor_score``.  The stems and
+    synonyms of the words are cached for the whole corpus (for each
+    process).
+
+    >>> hypotheses = ['the cat sat on the mat', 'on the mat sat the cat']
+    >>> list_of_references = [['the cat sat on the mat'], ['the cat sat on the mat']]
+    >>> round(corpus_meteor(list_of_references, hypotheses), 4)
+    0.7488
+
+    :param list_of_references: the reference sentences of each hypothesis
+    :type list_of_references: list(list(str))
+    :param hypotheses: the hypothesis sentences
+    :type hypotheses: list(str)
+    :param processes: the number of processes that score the hypotheses
+        (see ``nltk.util.parallel_map``)
+    :type processes: int
+
+    The other parameters are those of ``meteor_score``.
+
+    :return: The corpus-level METEOR score.
+    :rtype: float
+    """
+    assert len(list_of_references) == len(
+        hypotheses
+    ), "The number of hypotheses and their reference(s) should be the same"
+    if not hypotheses:
+        return 0.0
+
+    if processes is None or processes > 1:
+        from nltk.corpus import wordnet as default_wordnet
+
+        # The worker processes load the default WordNet themselves, since
+        # the corpus reader can't be pickled.
+        if wordnet is default_wordnet:
+            wordnet = None
+    scores = parallel_map(
+        partial(
+            _segment_meteor, preprocess, stemmer, wordnet, alpha, beta, gamma, {}, {}
+        ),
+        zip(list_of_references, hypotheses),
+        processes,
+    )
+    return sum(scores) / len(scores)
+
+
+def _segment_meteor(
+    preprocess, stemmer, wordnet, alpha, beta, gamma, stems, synonyms, segment
+):
+    """
+    The METEOR score of a hypothesis with its references, with the caches
+    of stems and synonyms of the corpus
+    """
+    if wordnet is None:
+        from nltk.corpus import wordnet
+    references, hypothesis = segment
+    return max(
+        _single_meteor_score(
+            reference,
+            hypothesis,
+            preprocess,
+            stemmer,
+            wordnet,
+            alpha,
+            beta,
+            gamma,
+            stems,
+            synonyms,
+        )
+        for reference in references
+    )
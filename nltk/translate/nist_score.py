@@ -13,8 +13,10 @@ from __future__ import division
 import math
 import fractions
 from collections import Counter
+from functools import partial
 
-from nltk.util import ngrams
+from nltk.translate.references import ReferenceSet
+from nltk.util import ngrams, parallel_map
 
 
 def sentence_nist(references, hypothesis, n=5):
@@ -72,93 +74,44 @@ def sentence_nist(references, hypothesis, n=5):
     return corpus_nist([references], [hypothesis], n)
 
 
-def corpus_nist(list_of_references, hypotheses, n=5):
+def corpus_nist(list_of_references, hypotheses, n=5, processes=1):
     """
     Calculate a single corpus-level NIST score (aka. system-level BLEU) for all
     the hypotheses and their respective references.
 
+    To score several sets of hypotheses against the same references, pass
+    the references as a ``ReferenceSet``, which keeps their n-gram counts
+    and information weights.
+
     :param references: a corpus of lists of reference sentences, w.r.t. hypotheses
-    :type references: list(list(list(str)))
+    :type references: list(list(list(str))) or ReferenceSet
     :param hypotheses: a list of hypothesis sentences
     :type hypotheses: list(list(str))
     :param n: highest n-gram order
     :type n: int
+    :param processes: the number of processes that count the n-grams of
+        the hypotheses
+    :type processes: int
     """
     # Before proceeding to compute NIST, perform sanity checks.
     assert len(list_of_references) == len(
         hypotheses
     ), "The number of hypotheses and their reference(s) should be the same"
 
-    # Collect the ngram coounts from the reference sentences.
-    ngram_freq = Counter()
-    total_reference_words = 0
-    for (
-        references
-    ) in list_of_references:  # For each source sent, there's a list of reference sents.
-        for reference in references:
-            # For each order of ngram, count the ngram occurrences.
-            for i in range(1, n + 1):
-                ngram_freq.update(ngrams(reference, i))
-            total_reference_words += len(reference)
-
-    # Compute the information weights based on the reference sentences.
-    # Eqn 2 in Doddington (2002):
-    # Info(w_1 ... w_n) = log_2 [ (# of occurrences of w_1 ... w_n-1) / (# of occurrences of w_1 ... w_n) ]
-    information_weights = {}
-    for _ngram in ngram_freq:  # w_1 ... w_n
-        _mgram = _ngram[:-1]  #  w_1 ... w_n-1
-        # From https://github.com/moses-smt/mosesdecoder/blob/master/scripts/generic/mteval-v13a.pl#L546
-        # it's computed as such:
-        #     denominator = ngram_freq[_mgram] if _mgram and _mgram in ngram_freq else denominator = total_reference_words
-        #     information_weights[_ngram] = -1 * math.log(ngram_freq[_ngram]/denominator) / math.log(2)
-        #
-        # Mathematically, it's equivalent to the our implementation:
-        if _mgram and _mgram in ngram_freq:
-            numerator = ngram_freq[_mgram]
-        else:
-            numerator = total_reference_words
-        information_weights[_ngram] = math.log(numerator / ngram_freq[_ngram], 2)
-
     # Micro-average.
     nist_precision_numerator_per_ngram = Counter()
     nist_precision_denominator_per_ngram = Counter()
     l_ref, l_sys = 0, 0
-    # For each order of ngram.
-    for i in range(1, n + 1):
-        # Iterate through each hypothesis and their corresponding references.
-        for references, hypothesis in zip(list_of_references, hypotheses):
-            hyp_len = len(hypothesis)
-
-            # Find reference with the best NIST score.
-            nist_score_per_ref = []
-            for reference in references:
-                _ref_len = len(reference)
-                # Counter of ngrams in hypothesis.
-                hyp_ngrams = (
-                    Counter(ngrams(hypothesis, i))
-                    if len(hypothesis) >= i
-                    else Counter()
-                )
-                ref_ngrams = (
-                    Counter(ngrams(reference, i)) if len(reference) >= i else Counter()
-                )
-                ngram_overlaps = hyp_ngrams & ref_ngrams
-                # Precision part of the score in Eqn 3
-                _numerator = sum(
-                    information_weights[_ngram] * count
-                    for _ngram, count in ngram_overlaps.items()
-                )
-                _denominator = sum(hyp_ngrams.values())
-                _precision = 0 if _denominator == 0 else _numerator / _denominator
-                nist_score_per_ref.append(
-                    (_precision, _numerator, _denominator, _ref_len)
-                )
-            # Best reference.
-            precision, numerator, denominator, ref_len = max(nist_score_per_ref)
-            nist_precision_numerator_per_ngram[i] += numerator
-            nist_precision_denominator_per_ngram[i] += denominator
-            l_ref += ref_len
-            l_sys += hyp_len
+    # Iterate through each hypothesis and their corresponding references.
+    for statistics in corpus_nist_statistics(
+        list_of_references, hypotheses, n, processes
+    ):
+        # For each order of ngram.
+        for i in range(1, n + 1):
+            nist_precision_numerator_per_ngram[i] += statistics[2 * i]
+            nist_precision_denominator_per_ngram[i] += statistics[2 * i + 1]
+        l_sys += statistics[0]
+        l_ref += statistics[1]
 
     # Final NIST micro-average mean aggregation.
     nist_precision = 0
@@ -172,6 +125,81 @@ def corpus_nist(list_of_references, hypotheses, n=5):
     return nist_precision * nist_length_penalty(l_ref, l_sys)
 
 
+def corpus_nist_statistics(list_of_references, hypotheses, n=5, processes=1):
+    """
+    The sufficient statistics of NIST for each hypothesis: its length and
+    the length of the best reference summed over the ngram orders, as
+    ``corpus_nist`` counts them, and the information-weighted ngram matches
+    with the best reference and the number of ngrams for each ngram order up
+    to ``n``.  ``corpus_nist`` sums them over the corpus, and
+    ``nltk.translate.significance`` resamples them.
+
+    The information weights come from all the references, so the
+    statistics of a hypothesis depend on the whole reference corpus.
+
+    :param list_of_references: a corpus of lists of reference sentences, w.r.t. hypotheses
+    :type list_of_references: list(list(list(str))) or ReferenceSet
+    :param hypotheses: a list of hypothesis sentences
+    :type hypotheses: list(list(str))
+    :param n: highest n-gram order
+    :type n: int
+    :param processes: the number of processes that count the n-grams of
+        the hypotheses
+    :type processes: int
+    :return: ``[hyp_len, ref_len, info_1, total_1, ..., info_n, total_n]``
+        for each hypothesis
+    :rtype: list(list)
+    """
+    if not isinstance(list_of_references, ReferenceSet):
+        list_of_references = ReferenceSet(list_of_references)
+
+    # Compute the information weights based on the reference sentences.
+    # From https://github.com/moses-smt/mosesdecoder/blob/master/scripts/generic/mteval-v13a.pl#L546
+    # the denominator of the unigram weights is the total number of
+    # reference words, which ReferenceSet.information_weights() uses too.
+    information_weights = [
+        list_of_references.information_weights(i) for i in range(1, n + 1)
+    ]
+    # Each hypothesis with the ngram counts and lengths of its references.
+    ngram_counts = [list_of_references.ngram_counts(i) for i in range(1, n + 1)]
+    segments = zip(zip(*ngram_counts), list_of_references.lengths(), hypotheses)
+    return parallel_map(
+        partial(_segment_statistics, information_weights), segments, processes
+    )
+
+
+def _segment_statistics(information_weights, segment):
+    """
+    The NIST statistics of a hypothesis, from the ngram counts and lengths
+    of its references
+    """
+    ngram_counts, ref_lens, hypothesis = segment
+    hyp_len = len(hypothesis)
+    statistics = [0, 0]
+    for i, (weights, ref_ngram_counts) in enumerate(
+        zip(information_weights, ngram_counts), start=1
+    ):
+        # Counter of ngrams in hypothesis.
+        hyp_ngrams = Counter(ngrams(hypothesis, i)) if hyp_len >= i else Counter()
+        _denominator = sum(hyp_ngrams.values())
+        # Find reference with the best NIST score.
+        nist_score_per_ref = []
+        for ref_ngrams, _ref_len in zip(ref_ngram_counts, ref_lens):
+            ngram_overlaps = hyp_ngrams & ref_ngrams
+            # Precision part of the score in Eqn 3
+            _numerator = sum(
+                weights[_ngram] * count for _ngram, count in ngram_overlaps.items()
+            )
+            _precision = 0 if _denominator == 0 else _numerator / _denominator
+            nist_score_per_ref.append((_precision, _numerator, _denominator, _ref_len))
+        # Best reference.
+        precision, numerator, denominator, ref_len = max(nist_score_per_ref)
+        statistics[0] += hyp_len
+        statistics[1] += ref_len
+        statistics.extend((numerator, denominator))
+    return statistics
+
+
 def nist_length_penalty(ref_len, hyp_len):
     """
     Calculates the NIST length penalty, from Eq. 3 in Doddington (2002)
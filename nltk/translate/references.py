@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+# Natural Language Toolkit: Reference Sets
+#
+# Copyright (C) 2001-2019 NLTK Project
+# URL: <http://nltk.org/>
+# For license information, see LICENSE.TXT
+
+"""
+Reference translations with the n-gram statistics that the corpus-level
+metrics of ``nltk.translate`` compute from them, so that the outputs of
+many systems can be scored against the same references without
+recounting the reference n-grams each time.
+"""
+from __future__ import division, print_function
+
+import math
+import pickle
+from collections import Counter
+
+from nltk.util import ngrams
+
+
+class ReferenceSet(object):
+    """
+    The reference translations of a test set, for use with
+    ``corpus_bleu``, ``corpus_nist``, ``corpus_chrf`` and ``corpus_gleu``
+    in place of a list of references.  The statistics that these metrics
+    need from the references (n-gram counts, maximum n-gram counts per
+    segment, reference lengths and NIST information weights) are computed
+    the first time they are needed and then kept.
+
+        >>> from nltk.translate import ReferenceSet
+        >>> from nltk.translate.bleu_score import corpus_bleu
+        >>> from nltk.translate.nist_score import corpus_nist
+        >>> hyp1 = ['It', 'is', 'a', 'guide', 'to', 'action', 'which',
+        ...         'ensures', 'that', 'the', 'military', 'always',
+        ...         'obeys', 'the', 'commands', 'of', 'the', 'party']
+        >>> ref1a = ['It', 'is', 'a', 'guide', 'to', 'action', 'that',
+        ...          'ensures', 'that', 'the', 'military', 'will', 'forever',
+        ...          'heed', 'Party', 'commands']
+        >>> ref1b = ['It', 'is', 'the', 'guiding', 'principle', 'which',
+        ...          'guarantees', 'the', 'military', 'forces', 'always',
+        ...          'being', 'under', 'the', 'command', 'of', 'the', 'Party']
+        >>> hyp2 = ['he', 'read', 'the', 'book', 'because', 'he', 'was',
+        ...         'interested', 'in', 'world', 'history']
+        >>> ref2a = ['he', 'was', 'interested', 'in', 'world', 'history',
+        ...          'because', 'he', 'read', 'the', 'book']
+        >>> references = ReferenceSet([[ref1a, ref1b], [ref2a]])
+        >>> corpus_bleu(references, [hyp1, hyp2]) # doctest: +ELLIPSIS
+        0.5673...
+        >>> corpus_nist(references, [hyp1, hyp2]) # doctest: +ELLIPSIS
+        4.1236...
+
+    The statistics can be saved to a file, to reuse them in another
+    process.  Only load files that you trust, since they are pickles.
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'references.pickle')
+        >>> references.save(path)
+        >>> corpus_bleu(ReferenceSet.load(path), [hyp1, hyp2]) # doctest: +ELLIPSIS
+        0.5673...
+
+    ``corpus_chrf`` compares each hypothesis with a single reference, so
+    it can only use reference sets that have one reference per segment.
+
+    :param list_of_references: the reference sentences of each segment
+    :type list_of_references: list(list(list(str)))
+    """
+
+    def __init__(self, list_of_references):
+        self._references = [list(references) for references in list_of_references]
+        self._lengths = [
+            tuple(len(reference) for reference in references)
+            for references in self._references
+        ]
+        self._ngram_counts = {}
+        self._max_ngram_counts = {}
+        self._ngram_frequencies = {}
+        self._information_weights = {}
+        self._char_ngram_counts = {}
+
+    def __len__(self):
+        return len(self._references)
+
+    def __getitem__(self, i):
+        return self._references[i]
+
+    def __iter__(self):
+        return iter(self._references)
+
+    def lengths(self):
+        """
+        :return: The lengths of the references of each segment
+        :rtype: list(tuple(int))
+        """
+        return self._lengths
+
+    def ngram_counts(self, n):
+        """
+        :return: The counts of the n-grams of order ``n`` in each
+            reference of each segment
+        :rtype: list(list(Counter))
+        """
+        if n not in self._ngram_counts:
+            self._ngram_counts[n] = [
+                [Counter(ngrams(reference, n)) for reference in references]
+                for references in self._references
+            ]
+        return self._ngram_counts[n]
+
+    def max_ngram_counts(self, n):
+        """
+        :return: The highest count of each n-gram of order ``n`` in any
+            reference of each segment, which BLEU clips the hypothesis
+            counts to
+        :rtype: list(dict(tuple, int))
+        """
+        if n not in self._max_ngram_counts:
+            segments = []
+            for reference_counts in self.ngram_counts(n):
+                max_counts = {}
+                for counts in reference_counts:
+                    for ngram, count in counts.items():
+                        if count > max_counts.get(ngram, 0):
+                            max_counts[ngram] = count
+                segments.append(max_counts)
+            self._max_ngram_counts[n] = segments
+        return self._max_ngram_counts[n]
+
+    def information_weights(self, n):
+        """
+        :return: The NIST information weight of each n-gram of order
+            ``n`` in the references, from Eqn 2 in Doddington (2002):
+            Info(w_1 ... w_n) = log_2 [ (# of occurrences of w_1 ... w_n-1)
+            / (# of occurrences of w_1 ... w_n) ]
+        :rtype: dict(tuple, float)
+        """
+        if n not in self._information_weights:
+            frequencies = self._frequencies(n)
+            if n == 1:
+                total_reference_words = sum(sum(lengths) for lengths in self._lengths)
+                self._information_weights[n] = dict(
+                    (ngram, math.log(total_reference_words / count, 2))
+                    for ngram, count in frequencies.items()
+                )
+            else:
+                mgram_frequencies = self._frequencies(n - 1)
+                self._information_weights[n] = dict(
+                    (ngram, math.log(mgram_frequencies[ngram[:-1]] / count, 2))
+                    for ngram, count in frequencies.items()
+                )
+        return self._information_weights[n]
+
+    def _frequencies(self, n):
+        if n not in self._ngram_frequencies:
+            frequencies = Counter()
+            for reference_counts in self.ngram_counts(n):
+                for counts in reference_counts:
+                    frequencies.update(counts)
+            self._ngram_frequencies[n] = frequencies
+        return self._ngram_frequencies[n]
+
+    def char_ngram_counts(self, n, ignore_whitespace=True):
+        """
+        :return: The counts of the character n-grams of order ``n`` in the
+            reference of each segment, as ``corpus_chrf`` extracts them
+        :rtype: list(Counter)
+        """
+        from nltk.translate.chrf_score import _preprocess
+
+        key = (n, ignore_whitespace)
+        if key not in self._char_ngram_counts:
+            if any(len(references) != 1 for references in self._references):
+                raise ValueError("chrF needs exactly one reference for each segment")
+            self._char_ngram_counts[key] = [
+                Counter(ngrams(_preprocess(reference, ignore_whitespace), n))
+                for (reference,) in self._references
+            ]
+        return self._char_ngram_counts[key]
+
+    def save(self, path):
+        """
+        Save the references and the statistics computed so far to the
+        file ``path``.
+
+        :type path: str
+        """
+        with open(path, 'wb') as fp:
+            pickle.dump(self, fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a reference set saved with ``save()``.
+
+        :type path: str
+        :rtype: ReferenceSet
+        """
+        with open(path, 'rb') as fp:
+            return pickle.load(fp)
+
+
+def demo(num_segments=2000, num_systems=5, processes=1):
+    """
+    Time scoring several systems' outputs against the same references,
+    with and without a ``ReferenceSet``.
+    """
+    import random
+    import time
+    from nltk.translate.bleu_score import corpus_bleu
+    from nltk.translate.chrf_score import corpus_chrf
+    from nltk.translate.gleu_score import corpus_gleu
+    from nltk.translate.nist_score import corpus_nist
+
+    rng = random.Random(0)
+    vocabulary = ['w%d' % i for i in range(2000)]
+
+    def sentence():
+        return [
+            rng.choice(vocabulary[: 200 + rng.randrange(1800)])
+            for _ in range(rng.randint(5, 40))
+        ]
+
+    def output(reference):
+        return [
+            word if rng.random() < 0.7 else rng.choice(vocabulary) for word in reference
+        ]
+
+    list_of_references = [[sentence() for _ in range(4)] for _ in range(num_segments)]
+    systems = [
+        [output(references[0]) for references in list_of_references]
+        for _ in range(num_systems)
+    ]
+    single_references = [references[:1] for references in list_of_references]
+
+    for name, metric, refs in [
+        ('BLEU', corpus_bleu, list_of_references),
+        ('NIST', corpus_nist, list_of_references),
+        ('GLEU', corpus_gleu, list_of_references),
+        ('chrF', corpus_chrf, single_references),
+    ]:
+        plain_refs = refs if metric is not corpus_chrf else [r[0] for r in refs]
+        start = time.time()
+        for hypotheses in systems:
+            plain_score = metric(plain_refs, hypotheses)
+        plain_time = time.time() - start
+
+        start = time.time()
+        reference_set = ReferenceSet(refs)
+        for hypotheses in systems:
+            score = metric(reference_set, hypotheses, processes=processes)
+        cached_time = time.time() - start
+        print(
+            '%s: %d systems x %d segments: %.2fs with lists of references, '
+            '%.2fs with a ReferenceSet (same score: %s)'
+            % (
+                name,
+                num_systems,
+                num_segments,
+                plain_time,
+                cached_time,
+                score == plain_score,
+            )
+        )
+
+
+if __name__ == '__main__':
+    demo()
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+# Natural Language Toolkit: Significance Tests for Machine Translation Metrics
+#
+# Copyright (C) 2001-2019 NLTK Project
+# URL: <http://nltk.org/>
+# For license information, see LICENSE.TXT
+
+"""
+Bootstrap confidence intervals and paired significance tests for the
+corpus-level machine translation metrics.
+
+Recomputing ``corpus_bleu`` for each of a thousand resamples of a test set
+takes a thousand times as long as scoring it once.  Instead, these tests
+take the per-segment sufficient statistics of a metric, such as those of
+``corpus_bleu_statistics()``, and recombine them with NumPy for all the
+resamples at once.  A corpus-level score only depends on the sums of the
+statistics over the segments, and, for the metrics here, it does not
+change if all the sums are divided by the number of segments, so each
+resample is a weighted mean of the rows of the statistics.
+
+    >>> import numpy
+    >>> from nltk.translate.bleu_score import corpus_bleu, corpus_bleu_statistics
+    >>> from nltk.translate.significance import (bleu_from_statistics,
+    ...     bootstrap_confidence_interval, paired_bootstrap)
+    >>> references = [[s.split()] for s in [
+    ...     'the cat is on the mat', 'there is a cat on the mat',
+    ...     'he read the book because he was interested in history',
+    ...     'it is a guide to action', 'the party commands the army']]
+    >>> system_a = [s.split() for s in [
+    ...     'the cat is on the mat', 'there is a cat on a mat',
+    ...     'he read the book because he was interested in world history',
+    ...     'it is a guide to the action', 'the party commands the army']]
+    >>> system_b = [s.split() for s in [
+    ...     'the cat the mat', 'is a cat on the mat',
+    ...     'he read a book on world history',
+    ...     'it is the guiding principle', 'the army obeys the party']]
+    >>> statistics_a = corpus_bleu_statistics(references, system_a)
+    >>> statistics_b = corpus_bleu_statistics(references, system_b)
+    >>> score = bleu_from_statistics(numpy.sum(statistics_a, axis=0))
+    >>> abs(score - corpus_bleu(references, system_a)) < 1e-12
+    True
+    >>> score, lower, upper = bootstrap_confidence_interval(
+    ...     statistics_a, bleu_from_statistics, seed=0)
+    >>> lower <= score <= upper
+    True
+    >>> significance, count, samples = paired_bootstrap(
+    ...     statistics_a, statistics_b, bleu_from_statistics, seed=0)
+    >>> significance < 0.05
+    True
+"""
+from __future__ import division, print_function
+
+import math
+import sys
+
+try:
+    import numpy
+except ImportError:
+    pass
+
+
+# The number of segments x resamples recombined at once, which bounds the
+# memory that the resampling weights take.
+_BATCH_CELLS = 2 ** 22
+
+
+def bleu_from_statistics(statistics, weights=(0.25, 0.25, 0.25, 0.25)):
+    """
+    The BLEU score from the (summed or averaged) statistics of
+    ``corpus_bleu_statistics()``, without smoothing, like ``corpus_bleu``.
+    ``statistics`` may have any number of leading dimensions, one score is
+    computed for each row of its last dimension.
+
+    :param statistics: ``[hyp_len, ref_len, matches_1, total_1, ...]``
+    :type statistics: array_like
+    :param weights: weights for unigrams, bigrams, trigrams and so on
+    :type weights: tuple(float)
+    :rtype: float or numpy.ndarray
+    """
+    statistics = numpy.asarray(statistics, dtype=float)
+    hyp_len = statistics[..., 0]
+    ref_len = statistics[..., 1]
+    max_n = len(weights)
+    matches = statistics[..., 2 : 2 + 2 * max_n : 2]
+    totals = statistics[..., 3 : 3 + 2 * max_n : 2]
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        # Like SmoothingFunction.method0, precisions without matches are
+        # sys.float_info.min, so that their logarithm makes the score 0.
+        precisions = numpy.where(matches > 0, matches / totals, sys.float_info.min)
+        log_precision = numpy.sum(numpy.log(precisions) * weights, axis=-1)
+        bp = numpy.where(hyp_len > ref_len, 1.0, numpy.exp(1 - ref_len / hyp_len))
+    scores = numpy.where(matches[..., 0] > 0, bp * numpy.exp(log_precision), 0.0)
+    return scores[()]
+
+
+def nist_from_statistics(statistics):
+    """
+    The NIST score from the (summed or averaged) statistics of
+    ``corpus_nist_statistics()``, like ``corpus_nist``.  ``statistics`` may
+    have any number of leading dimensions, one score is computed for each
+    row of its last dimension.
+
+    :param statistics: ``[hyp_len, ref_len, info_1, total_1, ...]``
+    :type statistics: array_like
+    :rtype: float or numpy.ndarray
+    """
+    statistics = numpy.asarray(statistics, dtype=float)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        precision = numpy.sum(statistics[..., 2::2] / statistics[..., 3::2], axis=-1)
+        # Eqn 3 in Doddington(2002), as in nist_length_penalty()
+        ratio = statistics[..., 0] / statistics[..., 1]
+        beta = math.log(0.5) / math.log(1.5) ** 2
+        penalty = numpy.where(
+            (0 < ratio) & (ratio < 1),
+            numpy.exp(beta * numpy.log(ratio) ** 2),
+            numpy.clip(ratio, 0.0, 1.0),
+        )
+    return (precision * penalty)[()]
+
+
+def chrf_from_statistics(statistics):
+    """
+    The CHRF score from the averaged statistics of
+    ``corpus_chrf_statistics()``, like ``corpus_chrf``.  Since CHRF
+    macro-averages the segment scores, the statistics must be averaged
+    rather than summed over the segments.
+
+    :param statistics: the f-score of each n-gram order
+    :type statistics: array_like
+    :rtype: float or numpy.ndarray
+    """
+    return numpy.mean(numpy.asarray(statistics, dtype=float), axis=-1)[()]
+
+
+def bootstrap_confidence_interval(
+    statistics, score, samples=1000, confidence=0.95, seed=None
+):
+    """
+    Bootstrap confidence interval of a corpus-level score (Koehn, 2004),
+    from the per-segment statistics of a metric.
+
+    :param statistics: the statistics of each segment
+    :type statistics: array_like
+    :param score: computes the scores from the mean statistics of each
+        resample, e.g. ``bleu_from_statistics``
+    :type score: function
+    :param samples: the number of resamples
+    :type samples: int
+    :param confidence: the probability that the interval covers the score
+    :type confidence: float
+    :param seed: the seed of the random number generator
+    :return: the score of the test set, and the lower and upper bounds of
+        the confidence interval
+    :rtype: tuple(float)
+    """
+    statistics = numpy.asarray(statistics, dtype=float)
+    actual_score = float(score(statistics.mean(axis=0)))
+    scores = numpy.concatenate(
+        [
+            score(means)
+            for (means,) in _resampled_means(
+                [statistics], samples, numpy.random.RandomState(seed)
+            )
+        ]
+    )
+    alpha = (1 - confidence) / 2
+    lower, upper = numpy.percentile(scores, [100 * alpha, 100 * (1 - alpha)])
+    return actual_score, float(lower), float(upper)
+
+
+def paired_bootstrap(statistics_a, statistics_b, score, samples=1000, seed=None):
+    """
+    Paired bootstrap resampling test (Koehn, 2004) of whether the difference
+    between the scores of two systems on the same test set is significant.
+    The significance level is the share of resamples in which the system
+    with the better score on the test set is not better.
+
+    :param statistics_a: the statistics of each segment for one system
+    :type statistics_a: array_like
+    :param statistics_b: the statistics of the same segments for the other
+        system
+    :type statistics_b: array_like
+    :param score: computes the scores from the mean statistics of each
+        resample, e.g. ``bleu_from_statistics``
+    :type score: function
+    :param samples: the number of resamples
+    :type samples: int
+    :param seed: the seed of the random number generator
+    :return: a tuple containing the significance level, the number of
+        resamples in which the better system was not better, and the number
+        of resamples
+    :rtype: tuple
+    """
+    statistics_a, statistics_b = _paired(statistics_a, statistics_b)
+    sign = numpy.sign(
+        score(statistics_a.mean(axis=0)) - score(statistics_b.mean(axis=0))
+    )
+    count = 0
+    for means_a, means_b in _resampled_means(
+        [statistics_a, statistics_b], samples, numpy.random.RandomState(seed)
+    ):
+        count += int(numpy.sum(sign * (score(means_a) - score(means_b)) <= 0))
+    return (count + 1) / (samples + 1), count, samples
+
+
+def approximate_randomization(
+    statistics_a, statistics_b, score, shuffles=999, seed=None
+):
+    """
+    Paired approximate randomization test (Riezler and Maxwell, 2005) of
+    whether the difference between the scores of two systems on the same
+    test set is significant.  Like ``nltk.metrics.scores.approxrand``, it
+    counts the shuffles in which the absolute difference of the scores is at
+    least the actual one, where a shuffle swaps the outputs of the two
+    systems for a random half of the segments.
+
+    :param statistics_a: the statistics of each segment for one system
+    :type statistics_a: array_like
+    :param statistics_b: the statistics of the same segments for the other
+        system
+    :type statistics_b: array_like
+    :param score: computes the scores from the mean statistics,
+        e.g. ``bleu_from_statistics``
+    :type score: function
+    :param shuffles: the number of shuffles
+    :type shuffles: int
+    :param seed: the seed of the random number generator
+    :return: a tuple containing an approximate significance level, the count
+        of the number of times the pseudo-statistic varied from the
+        actual statistic, and the number of shuffles
+    :rtype: tuple
+    """
+    statistics_a, statistics_b = _paired(statistics_a, statistics_b)
+    num_segments = len(statistics_a)
+    means_a = statistics_a.mean(axis=0)
+    means_b = statistics_b.mean(axis=0)
+    actual_stat = abs(score(means_a) - score(means_b))
+    # Swapping a segment moves its difference from one system to the other.
+    differences = (statistics_b - statistics_a) / num_segments
+    rng = numpy.random.RandomState(seed)
+
+    count = 0
+    for batch in _batches(shuffles, num_segments):
+        swaps = rng.randint(2, size=(batch, num_segments)).astype(float)
+        moved = swaps.dot(differences)
+        pseudo_stat = numpy.abs(score(means_a + moved) - score(means_b - moved))
+        # Allow for rounding errors in the recombined statistics.
+        count += int(numpy.sum(pseudo_stat >= actual_stat * (1 - 1e-12)))
+    return (count + 1) / (shuffles + 1), count, shuffles
+
+
+def _paired(statistics_a, statistics_b):
+    statistics_a = numpy.asarray(statistics_a, dtype=float)
+    statistics_b = numpy.asarray(statistics_b, dtype=float)
+    if statistics_a.shape != statistics_b.shape:
+        raise ValueError(
+            "The statistics of the two systems should be of the same segments"
+        )
+    return statistics_a, statistics_b
+
+
+def _batches(samples, num_segments):
+    batch_size = max(1, _BATCH_CELLS // max(1, num_segments))
+    for start in range(0, samples, batch_size):
+        yield min(batch_size, samples - start)
+
+
+def _resampled_means(list_of_statistics, samples, rng):
+    """
+    Generate the mean statistics of batches of bootstrap resamples of the
+    segments, for each of the (paired) arrays in ``list_of_statistics``.
+    """
+    num_segments = len(list_of_statistics[0])
+    probabilities = numpy.full(num_segments, 1 / num_segments)
+    for batch in _batches(samples, num_segments):
+        # How many times each segment is drawn in each resample.
+        weights = rng.multinomial(num_segments, probabilities, size=batch)
+        weights = weights / num_segments
+        yield [weights.dot(statistics) for statistics in list_of_statistics]
+
+
+def demo(num_segments=2000, samples=1000):
+    """
+    Time a paired bootstrap test of BLEU against rescoring each resample
+    with ``corpus_bleu``.
+    """
+    import random
+    import time
+    from nltk.translate.bleu_score import corpus_bleu, corpus_bleu_statistics
+
+    rng = random.Random(0)
+    vocabulary = ['w%d' % i for i in range(1000)]
+
+    def output(reference, accuracy):
+        return [
+            word if rng.random() < accuracy else rng.choice(vocabulary)
+            for word in reference
+        ]
+
+    references = [
+        [[rng.choice(vocabulary) for _ in range(rng.randint(5, 40))]]
+        for _ in range(num_segments)
+    ]
+    system_a = [output(refs[0], 0.72) for refs in references]
+    system_b = [output(refs[0], 0.70) for refs in references]
+
+    start = time.time()
+    statistics_a = corpus_bleu_statistics(references, system_a)
+    statistics_b = corpus_bleu_statistics(references, system_b)
+    significance, count, _ = paired_bootstrap(
+        statistics_a, statistics_b, bleu_from_statistics, samples, seed=0
+    )
+    print(
+        'Paired bootstrap, %d segments x %d samples: %.2fs, significance %.4f'
+        % (num_segments, samples, time.time() - start, significance)
+    )
+
+    start = time.time()
+    rescored = 10
+    for _ in range(rescored):
+        indices = [rng.randrange(num_segments) for _ in range(num_segments)]
+        corpus_bleu([references[i] for i in indices], [system_a[i] for i in indices])
+        corpus_bleu([references[i] for i in indices], [system_b[i] for i in indices])
+    print(
+        'Rescoring with corpus_bleu: %.2fs for %d samples'
+        % ((time.time() - start) * samples / rescored, samples)
+    )
+
+
+if __name__ == '__main__':
+    demo()
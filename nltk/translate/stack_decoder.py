@@ -27,7 +27,10 @@ the number of candidate hypotheses by doing histogram and/or threshold
 pruning.
 
 Hypotheses with the same number of words translated are placed in the
-same stack. In histogram pruning, each stack has a size limit, and
+same stack. Hypotheses that can be expanded in the same ways, because
+they have translated the same source words, end at the same source
+position and have the same language model state, are recombined: only
+the best of them is kept. In histogram pruning, each stack has a size limit, and
 the hypothesis with the lowest score is removed when the stack is full.
 In threshold pruning, hypotheses that score below a certain threshold
 of the best hypothesis in that stack are removed.
@@ -42,10 +45,15 @@ Philipp Koehn. 2010. Statistical Machine Translation.
 Cambridge University Press, New York.
 """
 
+import heapq
 import warnings
 from collections import defaultdict
+from functools import partial
+from itertools import count
 from math import log
 
+from nltk.util import parallel_map
+
 
 class StackDecoder(object):
     """
@@ -159,18 +167,20 @@ class StackDecoder(object):
         empty_hypothesis = _Hypothesis()
         stacks[0].push(empty_hypothesis)
 
-        all_phrases = self.find_all_src_phrases(sentence)
+        translation_options = self.translation_options(sentence)
         future_score_table = self.compute_future_scores(sentence)
-        for stack in stacks:
+        # future scores by the coverage of the hypotheses
+        future_scores = {}
+        for total_words, stack in enumerate(stacks):
             for hypothesis in stack:
-                possible_expansions = StackDecoder.valid_phrases(
-                    all_phrases, hypothesis
-                )
-                for src_phrase_span in possible_expansions:
-                    src_phrase = sentence[src_phrase_span[0] : src_phrase_span[1]]
-                    for translation_option in self.phrase_table.translations_for(
-                        src_phrase
-                    ):
+                coverage = hypothesis.coverage
+                for src_phrase_span, mask, options in translation_options:
+                    if coverage & mask:
+                        continue
+                    new_total_words = (
+                        total_words + src_phrase_span[1] - src_phrase_span[0]
+                    )
+                    for translation_option in options:
                         raw_score = self.expansion_score(
                             hypothesis, translation_option, src_phrase_span
                         )
@@ -180,11 +190,15 @@ class StackDecoder(object):
                             trg_phrase=translation_option.trg_phrase,
                             previous=hypothesis,
                         )
-                        new_hypothesis.future_score = self.future_score(
-                            new_hypothesis, future_score_table, sentence_length
+                        new_coverage = new_hypothesis.coverage
+                        if new_coverage not in future_scores:
+                            future_scores[new_coverage] = self.future_score(
+                                new_hypothesis, future_score_table, sentence_length
+                            )
+                        new_hypothesis.future_score = future_scores[new_coverage]
+                        stacks[new_total_words].push(
+                            new_hypothesis, self.recombination_state(new_hypothesis)
                         )
-                        total_words = new_hypothesis.total_translated_words()
-                        stacks[total_words].push(new_hypothesis)
 
         if not stacks[sentence_length]:
             warnings.warn(
@@ -199,6 +213,71 @@ class StackDecoder(object):
         best_hypothesis = stacks[sentence_length].best()
         return best_hypothesis.translation_so_far()
 
+    def translate_many(self, src_sentences, processes=1):
+        """
+        Translate several sentences, optionally in several processes.
+
+        :param src_sentences: Sentences to be translated
+        :type src_sentences: list(list(str))
+
+        :param processes: The number of worker processes, or None for one
+            per CPU. With more than one, the decoder, its phrase table and
+            its language model must be picklable.
+        :type processes: int
+
+        :return: Translated sentences
+        :rtype: list(list(str))
+        """
+        return parallel_map(partial(_translate, self), src_sentences, processes)
+
+    def translation_options(self, src_sentence):
+        """
+        Finds the translations of all subsequences in ``src_sentence``
+        that are in the phrase table
+
+        :type src_sentence: tuple(str)
+
+        :return: The span of each of the subsequences, the bitmask of
+            the positions that it covers, and its translations, ordered
+            by start and then end position.
+        :rtype: list(tuple(tuple(int, int), int, list(PhraseTableEntry)))
+        """
+        translation_options = []
+        for start, ends in enumerate(self.find_all_src_phrases(src_sentence)):
+            for end in ends:
+                translation_options.append(
+                    (
+                        (start, end),
+                        (1 << end) - (1 << start),
+                        self.phrase_table.translations_for(src_sentence[start:end]),
+                    )
+                )
+        return translation_options
+
+    def recombination_state(self, hypothesis):
+        """
+        The state of ``hypothesis`` that determines how it can be
+        expanded and how its expansions are scored. Of the hypotheses
+        with the same number of words translated and the same state,
+        only the best is kept.
+
+        The state is made of the positions of the source words
+        translated so far, the end position of the last source phrase,
+        which the distortion score depends on, and the context that the
+        language model depends on. If the language model has an
+        ``order`` attribute, like those of ``nltk.lm``, the context is
+        the last ``order - 1`` target words; otherwise it is the whole
+        translation so far.
+
+        :type hypothesis: _Hypothesis
+        """
+        order = getattr(self.language_model, 'order', None)
+        if order is None:
+            context = tuple(hypothesis.translation_so_far())
+        else:
+            context = hypothesis.last_translated_words(order - 1)
+        return (hypothesis.coverage, hypothesis.src_phrase_span[1:], context)
+
     def find_all_src_phrases(self, src_sentence):
         """
         Finds all subsequences in src_sentence that have a phrase
@@ -346,9 +425,10 @@ class _Hypothesis(object):
     partial solution, a new _Hypothesis object is created, with a back
     pointer to the previous hypothesis.
 
-    To find out which words have been translated so far, look at the
-    ``src_phrase_span`` in the hypothesis chain. Similarly, the
-    translation output can be found by traversing up the chain.
+    The words that have been translated so far are kept in the
+    ``coverage`` bitmask, where bit ``i`` is set if the word at position
+    ``i`` has been translated. The translation output can be found by
+    traversing up the chain.
     """
 
     def __init__(
@@ -387,6 +467,10 @@ class _Hypothesis(object):
         self.trg_phrase = trg_phrase
         self.previous = previous
         self.future_score = future_score
+        self.coverage = 0
+        if previous is not None:
+            start, end = src_phrase_span
+            self.coverage = previous.coverage | (1 << end) - (1 << start)
 
     def score(self):
         """
@@ -406,17 +490,17 @@ class _Hypothesis(object):
 
         :rtype: list(tuple(int, int))
         """
-        translated_positions = self.translated_positions()
-        translated_positions.sort()
-        translated_positions.append(sentence_length)  # add sentinel position
-
         untranslated_spans = []
-        start = 0
-        # each untranslated span must end in one of the translated_positions
-        for end in translated_positions:
-            if start < end:
-                untranslated_spans.append((start, end))
-            start = end + 1
+        start = None
+        for position in range(sentence_length):
+            if self.coverage >> position & 1:
+                if start is not None:
+                    untranslated_spans.append((start, position))
+                    start = None
+            elif start is None:
+                start = position
+        if start is not None:
+            untranslated_spans.append((start, sentence_length))
 
         return untranslated_spans
 
@@ -427,16 +511,25 @@ class _Hypothesis(object):
 
         :rtype: list(int)
         """
-        translated_positions = []
-        current_hypothesis = self
-        while current_hypothesis.previous is not None:
-            translated_span = current_hypothesis.src_phrase_span
-            translated_positions.extend(range(translated_span[0], translated_span[1]))
-            current_hypothesis = current_hypothesis.previous
-        return translated_positions
+        coverage = self.coverage
+        return [i for i in range(coverage.bit_length()) if coverage >> i & 1]
 
     def total_translated_words(self):
-        return len(self.translated_positions())
+        return bin(self.coverage).count('1')
+
+    def last_translated_words(self, count):
+        """
+        The last ``count`` words of the translation so far, or all of
+        them if there are fewer
+
+        :rtype: tuple(str)
+        """
+        words = ()
+        hypothesis = self
+        while len(words) < count and hypothesis.previous is not None:
+            words = tuple(hypothesis.trg_phrase) + words
+            hypothesis = hypothesis.previous
+        return words[max(0, len(words) - count) :]
 
     def translation_so_far(self):
         translation = []
@@ -453,6 +546,12 @@ class _Hypothesis(object):
 class _Stack(object):
     """
     Collection of _Hypothesis objects
+
+    The hypotheses are kept in a heap with the lowest scoring one on
+    top, so that it can be removed when the stack is full. Hypotheses
+    that fall below the beam threshold, or that are replaced by a better
+    hypothesis with the same state, are only removed when they get to
+    the top of the heap, and are skipped until then.
     """
 
     def __init__(self, max_size=100, beam_threshold=0.0):
@@ -463,54 +562,148 @@ class _Stack(object):
         :type beam_threshold: float
         """
         self.max_size = max_size
+        # heap of [score, -insertion order, hypothesis, state] entries,
+        # where the hypothesis is None if it has been replaced
         self.items = []
+        self.__entries_by_state = {}
+        self.__size = 0
+        self.__best_score = float('-inf')
+        self.__insertion_order = count()
 
         if beam_threshold == 0.0:
             self.__log_beam_threshold = float('-inf')
         else:
             self.__log_beam_threshold = log(beam_threshold)
 
-    def push(self, hypothesis):
+    def push(self, hypothesis, state=None):
         """
         Add ``hypothesis`` to the stack.
         Removes lowest scoring hypothesis if the stack is full.
         After insertion, hypotheses that score less than
         ``beam_threshold`` times the score of the best hypothesis
         are removed.
+
+        :param state: If given, the hypothesis replaces a hypothesis in
+            the stack with the same state and a lower score, or is not
+            added if the score of that hypothesis is not lower.
+        :type state: hashable
         """
-        self.items.append(hypothesis)
-        self.items.sort(key=lambda h: h.score(), reverse=True)
-        while len(self.items) > self.max_size:
-            self.items.pop()
-        self.threshold_prune()
+        score = hypothesis.score()
+        #  log(score * beam_threshold) = log(score) + log(beam_threshold)
+        if score < self.__best_score + self.__log_beam_threshold:
+            return
+        if state is not None:
+            entry = self.__entries_by_state.get(state)
+            if entry is not None:
+                if entry[0] >= score:
+                    return
+                entry[2] = None
+                self.__size -= 1
+        entry = [score, -next(self.__insertion_order), hypothesis, state]
+        if state is not None:
+            self.__entries_by_state[state] = entry
+        heapq.heappush(self.items, entry)
+        self.__size += 1
+        self.__best_score = max(self.__best_score, score)
+        while self.__size > self.max_size:
+            self.__pop()
+
+    def __pop(self):
+        entry = heapq.heappop(self.items)
+        if entry[2] is None:
+            return
+        self.__size -= 1
+        if entry[3] is not None:
+            del self.__entries_by_state[entry[3]]
 
     def threshold_prune(self):
-        if not self.items:
-            return
-        #  log(score * beam_threshold) = log(score) + log(beam_threshold)
-        threshold = self.items[0].score() + self.__log_beam_threshold
-        for hypothesis in reversed(self.items):
-            if hypothesis.score() < threshold:
-                self.items.pop()
-            else:
-                break
+        threshold = self.__best_score + self.__log_beam_threshold
+        while self.items and (
+            self.items[0][2] is None or self.items[0][0] < threshold
+        ):
+            self.__pop()
 
     def best(self):
         """
         :return: Hypothesis with the highest score in the stack
         :rtype: _Hypothesis
         """
-        if self.items:
-            return self.items[0]
-        return None
+        return next(iter(self), None)
 
     def __iter__(self):
-        return iter(self.items)
+        """
+        Iterate over the hypotheses from the highest to the lowest score
+        """
+        self.threshold_prune()
+        entries = sorted(self.items, reverse=True)
+        return iter([entry[2] for entry in entries if entry[2] is not None])
 
     def __contains__(self, hypothesis):
-        return hypothesis in self.items
+        return hypothesis in list(self)
 
     def __bool__(self):
-        return len(self.items) != 0
+        return self.__size != 0
 
     __nonzero__ = __bool__
+
+
+def _translate(stack_decoder, src_sentence):
+    return stack_decoder.translate(src_sentence)
+
+
+def demo(num_sentences=20, sentence_length=20, processes=1):
+    """
+    Time the translation of random sentences with a synthetic phrase
+    table and bigram language model.
+    """
+    import random
+    import time
+    from nltk.translate import PhraseTable
+
+    rng = random.Random(0)
+    src_vocabulary = ['s%d' % i for i in range(200)]
+    trg_vocabulary = ['t%d' % i for i in range(200)]
+
+    phrase_table = PhraseTable()
+    for word in src_vocabulary:
+        for _ in range(5):
+            phrase_table.add(
+                (word,), (rng.choice(trg_vocabulary),), log(rng.uniform(0.01, 1))
+            )
+    sentences = [
+        [rng.choice(src_vocabulary) for _ in range(sentence_length)]
+        for _ in range(num_sentences)
+    ]
+    for sentence in sentences:
+        for _ in range(sentence_length):
+            start = rng.randrange(sentence_length - 1)
+            src_phrase = tuple(sentence[start : start + rng.randint(2, 3)])
+            trg_phrase = tuple(rng.choice(trg_vocabulary) for _ in src_phrase)
+            phrase_table.add(src_phrase, trg_phrase, log(rng.uniform(0.01, 1)))
+
+    bigram_log_probs = defaultdict(lambda: log(0.001))
+    for _ in range(20000):
+        bigram = (rng.choice(trg_vocabulary), rng.choice(trg_vocabulary))
+        bigram_log_probs[bigram] = log(rng.uniform(0.001, 0.1))
+
+    class BigramModel(object):
+        order = 2
+
+        def probability(self, phrase):
+            return sum(bigram_log_probs[bigram] for bigram in zip(phrase, phrase[1:]))
+
+        def probability_change(self, context, phrase):
+            phrase = context.last_translated_words(1) + phrase
+            return self.probability(phrase)
+
+    stack_decoder = StackDecoder(phrase_table, BigramModel())
+    start = time.time()
+    translations = stack_decoder.translate_many(sentences, processes)
+    print(
+        'Translated %d sentences of %d words in %.2fs'
+        % (len(translations), sentence_length, time.time() - start)
+    )
+
+
+if __name__ == '__main__':
+    demo()
@@ -825,3 +825,103 @@ def choose(n, k):
         return ntok // ktok
     else:
         return 0
+
+
+######################################################################
+# Parallel processing
+######################################################################
+
+
+def parallel_map(function, iterable, processes=1, chunksize=None):
+    """
+    Apply ``function`` to every item of ``iterable`` and return the
+    results as a list, in input order.  The work may be spread over a
+    pool of worker processes.
+
+    With ``processes=1`` (the default) this is simply
+    ``list(map(function, iterable))`` and no process is started.
+    ``processes=None`` uses one worker per CPU.  When several processes
+    are used, ``function`` and the items must be picklable, so
+    ``function`` should be a module-level function (possibly wrapped
+    in ``functools.partial``).
+
+        >>> from nltk.util import parallel_map
+        >>> parallel_map(abs, [-1, 2, -3])
+        [1, 2, 3]
+
+    :param function: a function of one argument
+    :param iterable: the items to process
+    :param processes: the number of worker processes, or None for one
+        per CPU
+    :type processes: int or None
+    :param chunksize: the number of items sent to a worker at a time;
+        by default the items are split into a few chunks per worker
+    :type chunksize: int
+    :rtype: list
+    """
+    if processes is not None and processes <= 1:
+        return list(map(function, iterable))
+
+    import multiprocessing
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        return pool.map(function, iterable, chunksize)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def parallel_imap(function, iterable, processes=1, chunksize=1):
+    """
+    Like ``parallel_map()``, but iterate over the results as they
+    become available (still in input order) rather than returning a
+    list, so that ``iterable`` can be a long stream.  When several
+    processes are used, the items are read ahead of the workers, but
+    at most two chunks per worker are read and not yet consumed at any
+    time, so memory use does not grow with the length of ``iterable``.
+
+        >>> from nltk.util import parallel_imap
+        >>> list(parallel_imap(abs, iter([-1, 2, -3])))
+        [1, 2, 3]
+
+    :param function: a function of one argument
+    :param iterable: the items to process
+    :param processes: the number of worker processes, or None for one
+        per CPU
+    :type processes: int or None
+    :param chunksize: the number of items sent to a worker at a time
+    :type chunksize: int
+    :rtype: iter
+    """
+    if processes is not None and processes <= 1:
+        for result in map(function, iterable):
+            yield result
+        return
+
+    import multiprocessing
+
+    workers = processes or multiprocessing.cpu_count()
+    items = iter(iterable)
+    pool = multiprocessing.Pool(workers)
+    try:
+        # The chunks sent to the workers, whose results are yet to be
+        # yielded.
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(islice(items, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.apply_async(_map_chunk, (function, chunk)))
+            if not pending:
+                break
+            for result in pending.popleft().get():
+                yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _map_chunk(function, chunk):
+    return [function(item) for item in chunk]